@@ -0,0 +1,7 @@
+"""Benchmarks for the BizHub data layer and API.
+
+Generate a synthetic dataset and time the hot paths:
+    python -m benchmarks --preset medium --output results.json
+
+See benchmarks/run.py for options.
+"""
@@ -0,0 +1,198 @@
+"""Synthetic dataset generator for benchmarks.
+
+Creates a database through SQLiteAdapter (so the schema, indexes, rollup and
+search triggers are the real ones), then bulk-loads realistic rows with
+chunked executemany calls inside one transaction per table.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.db import SQLiteAdapter
+
+# Row counts per table. 'years' is how far back sales, leads and hires go.
+PRESETS = {
+    'small': {
+        'items': 200, 'sales': 20_000, 'years': 1, 'employees': 50,
+        'visitors': 500, 'contacts': 1_000, 'leads': 2_000, 'activities': 5_000,
+    },
+    'medium': {
+        'items': 2_000, 'sales': 200_000, 'years': 2, 'employees': 300,
+        'visitors': 5_000, 'contacts': 10_000, 'leads': 20_000, 'activities': 50_000,
+    },
+    'large': {
+        'items': 10_000, 'sales': 1_000_000, 'years': 3, 'employees': 2_000,
+        'visitors': 20_000, 'contacts': 50_000, 'leads': 100_000, 'activities': 250_000,
+    },
+}
+
+CHUNK_SIZE = 10_000
+
+FIRST_NAMES = ['Alice', 'Bob', 'Carla', 'David', 'Emma', 'Frank', 'Grace', 'Henry', 'Ivy', 'Jack',
+               'Kiran', 'Leo', 'Maya', 'Nina', 'Omar', 'Priya', 'Quinn', 'Rita', 'Sam', 'Tina']
+LAST_NAMES = ['Johnson', 'Smith', 'Gomez', 'Lee', 'Davis', 'Moore', 'Kim', 'Wong', 'Brown', 'Patel',
+              'Rao', 'Shah', 'Ali', 'Singh', 'Torres', 'Fox', 'Carter', 'Miles', 'Park', 'Nguyen']
+COMPANIES = ['Acme', 'Beta', 'Gamma', 'Delta', 'Epsilon', 'Helix', 'Ion', 'Jade', 'Kappa', 'Lumen',
+             'Nimbus', 'Orbit', 'Pioneer', 'Quartz', 'Summit', 'Vertex']
+COMPANY_SUFFIXES = ['Co', 'LLC', 'Inc', 'Ltd', 'Group', 'Labs']
+PRODUCT_BRANDS = ['Samsung', 'Philips', 'LG', 'Sony', 'Bosch', 'Dyson', 'Havells', 'Bajaj', 'Logitech', 'Dell']
+PRODUCT_KINDS = ['Monitor', 'Keyboard', 'Mouse', 'Headphones', 'Air Fryer', 'Mixer', 'Fan', 'Vacuum',
+                 'Kettle', 'Router', 'Webcam', 'Speaker', 'Heater', 'Lamp', 'Charger', 'Hub']
+CATEGORIES = ['Electronics', 'Kitchen', 'Cooling', 'Cleaning', 'Office', 'Audio', 'Networking']
+TEAMS = ['Sales', 'Tech', 'Finance', 'HR', 'Support', 'Operations']
+DESIGNATIONS = ['Engineer', 'Analyst', 'Manager', 'Sales Rep', 'Designer', 'Support', 'Admin']
+LEAD_STAGES = ['New', 'Contacted', 'Qualified', 'Proposal', 'Won', 'Lost']
+LEAD_STAGE_WEIGHTS = [30, 20, 15, 10, 15, 10]
+ACTIVITY_TYPES = ['call', 'email', 'meeting', 'note']
+SOURCES = ['web', 'referral', 'event', 'cold call', 'partner']
+USERNAMES = ['admin', 'staff1', 'staff2', 'staff3', 'sales1', 'sales2']
+
+
+def resolve_spec(preset: str = 'small', **overrides) -> dict:
+    """Return the row counts for a preset, with any non-None overrides applied."""
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown preset: {preset}")
+    spec = dict(PRESETS[preset])
+    spec.update({k: v for k, v in overrides.items() if v is not None})
+    return spec
+
+
+def _person(rng) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _company(rng) -> str:
+    return f"{rng.choice(COMPANIES)} {rng.choice(COMPANY_SUFFIXES)}"
+
+
+def _email(name: str, n: int) -> str:
+    return f"{name.lower().replace(' ', '.')}{n}@example.com"
+
+
+def _phone(rng) -> str:
+    return f"555-{rng.randint(0, 9999):04d}"
+
+
+def _timestamps(rng, count: int, start: datetime, span_seconds: int) -> list:
+    """count random 'YYYY-MM-DD HH:MM:SS' strings in [start, start + span), sorted."""
+    offsets = sorted(rng.randrange(span_seconds) for _ in range(count))
+    return [(start + timedelta(seconds=s)).strftime('%Y-%m-%d %H:%M:%S') for s in offsets]
+
+
+def _bulk_insert(cursor, sql: str, rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            cursor.executemany(sql, chunk)
+            chunk = []
+    if chunk:
+        cursor.executemany(sql, chunk)
+
+
+def generate(db_file: str, spec: dict, seed: int = 42, now: datetime = None) -> dict:
+    """Fill db_file with a synthetic dataset. Returns seconds spent per table.
+
+    Rows are appended to whatever the database already holds; item names and
+    employee numbers carry the seed so repeated runs with different seeds
+    do not collide.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    start = now - timedelta(days=365 * spec['years'])
+    span = int((now - start).total_seconds())
+    db = SQLiteAdapter(db_file)
+    timings = {}
+
+    def timed(table, fill):
+        t0 = time.perf_counter()
+        with db._get_conn() as (conn, cursor):
+            fill(cursor)
+        timings[table] = round(time.perf_counter() - t0, 3)
+
+    items = []
+    for i in range(spec['items']):
+        name = f"{rng.choice(PRODUCT_BRANDS)} {rng.choice(PRODUCT_KINDS)} {seed}-{i:05d}"
+        cost = round(rng.uniform(2, 500), 2)
+        items.append((name, rng.randint(0, 500), rng.randint(0, 50), cost,
+                      round(cost * rng.uniform(1.1, 1.8), 2), rng.choice(CATEGORIES)))
+
+    timed('inventory', lambda cur: _bulk_insert(
+        cur, 'INSERT INTO inventory (item_name, quantity, threshold, cost_price, sale_price, description) '
+             'VALUES (?, ?, ?, ?, ?, ?)', items))
+
+    # Popular items sell more often (roughly Zipf-shaped)
+    weights = [1.0 / (rank + 1) for rank in range(len(items))]
+
+    def sales_rows():
+        picks = rng.choices(items, weights=weights, k=spec['sales'])
+        for sale_date, item in zip(_timestamps(rng, spec['sales'], start, span), picks):
+            qty = rng.randint(1, 5)
+            yield sale_date, item[0], qty, item[4], round(qty * item[4], 2), rng.choice(USERNAMES)
+
+    timed('sales', lambda cur: _bulk_insert(
+        cur, 'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+             'VALUES (?, ?, ?, ?, ?, ?)', sales_rows()))
+
+    def employee_rows():
+        for i, joined in enumerate(_timestamps(rng, spec['employees'], start, span)):
+            name = _person(rng)
+            yield (f"EMP{seed}-{i:06d}", name, joined[:10], rng.choice(DESIGNATIONS), _person(rng),
+                   rng.choice(TEAMS), _email(name, i), _phone(rng), _phone(rng), '', '',
+                   0 if rng.random() < 0.1 else 1)
+
+    timed('employees', lambda cur: _bulk_insert(
+        cur, 'INSERT INTO employees (emp_number, name, joining_date, designation, manager, team, email, '
+             'phone, emergency_contact, photo_path, notes, is_active) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        employee_rows()))
+
+    def visitor_rows():
+        for i in range(spec['visitors']):
+            name = _person(rng)
+            yield name, f"{rng.randint(1, 999)} Main St", _phone(rng), _email(name, i), _company(rng), ''
+
+    timed('visitors', lambda cur: _bulk_insert(
+        cur, 'INSERT INTO visitors (name, address, phone, email, company, notes) VALUES (?, ?, ?, ?, ?, ?)',
+        visitor_rows()))
+
+    def contact_rows():
+        for i in range(spec['contacts']):
+            name = _person(rng)
+            yield name, _company(rng), _email(name, i), _phone(rng), rng.choice(SOURCES), ''
+
+    timed('crm_contacts', lambda cur: _bulk_insert(
+        cur, 'INSERT INTO crm_contacts (name, company, email, phone, source, notes) VALUES (?, ?, ?, ?, ?, ?)',
+        contact_rows()))
+
+    with db._get_conn() as (conn, cursor):
+        first_contact, last_contact = cursor.execute('SELECT MIN(id), MAX(id) FROM crm_contacts').fetchone()
+
+    def lead_rows():
+        for created in _timestamps(rng, spec['leads'], start, span):
+            stage = rng.choices(LEAD_STAGES, weights=LEAD_STAGE_WEIGHTS)[0]
+            contact_id = rng.randint(first_contact, last_contact) if first_contact else None
+            yield (contact_id, f"{rng.choice(PRODUCT_KINDS)} deal", stage, round(rng.uniform(100, 50_000), 2),
+                   rng.randint(0, 100), rng.choice(USERNAMES), '', created, created)
+
+    timed('crm_leads', lambda cur: _bulk_insert(
+        cur, 'INSERT INTO crm_leads (contact_id, title, stage, value, probability, owner, notes, '
+             'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', lead_rows()))
+
+    with db._get_conn() as (conn, cursor):
+        first_lead, last_lead = cursor.execute('SELECT MIN(id), MAX(id) FROM crm_leads').fetchone()
+
+    def activity_rows():
+        if not first_lead:
+            return
+        for created in _timestamps(rng, spec['activities'], start, span):
+            yield (rng.randint(first_lead, last_lead), rng.choice(ACTIVITY_TYPES), 'Follow up',
+                   created[:10], rng.randint(0, 1), created)
+
+    timed('crm_activities', lambda cur: _bulk_insert(
+        cur, 'INSERT INTO crm_activities (lead_id, type, note, due_date, done, created_at) '
+             'VALUES (?, ?, ?, ?, ?, ?)', activity_rows()))
+
+    with db._get_conn() as (conn, cursor):
+        cursor.execute('ANALYZE')
+    db.close()
+    return timings
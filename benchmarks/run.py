@@ -0,0 +1,245 @@
+"""Time BizHub's hot paths against a synthetic dataset and emit JSON.
+
+Usage:
+    python -m benchmarks --preset large --output bench.json
+    python -m benchmarks --db existing.db --skip-generate --repeat 50
+    python -m benchmarks --preset small --baseline previous.json
+
+Each case reports min/median/p95/mean/max in milliseconds. The service read
+cache is disabled unless --with-cache is given, so the numbers reflect the
+queries rather than cache hits.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from benchmarks.datagen import PRESETS, generate, resolve_spec, PRODUCT_KINDS, LAST_NAMES, COMPANIES
+from src.db import SQLiteAdapter
+from src.services import AnalyticsService, CRMService, InventoryService, POSService, VisitorService
+from src.services.cache import cache_for
+
+
+def _stats(samples: list) -> dict:
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        'n': len(ms),
+        'min_ms': round(ms[0], 3),
+        'median_ms': round(statistics.median(ms), 3),
+        'p95_ms': round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        'mean_ms': round(statistics.fmean(ms), 3),
+        'max_ms': round(ms[-1], 3),
+    }
+
+
+def time_case(fn, repeat: int, warmup: int = 1) -> dict:
+    """Call fn() warmup + repeat times and summarise the timed calls."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return _stats(samples)
+
+
+def _write_import_csv(path: str, rows: int, rng):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Item Name', 'Quantity', 'Threshold', 'Cost Price', 'Sale Price', 'Description'])
+        for i in range(rows):
+            # Half the rows update existing names, half are new
+            writer.writerow([f"Imported item {i % (rows // 2 or 1):05d}",
+                             rng.randint(0, 200), rng.randint(0, 20), 5.0, 9.5, 'import'])
+
+
+def _import_csv(inventory: InventoryService, path: str) -> int:
+    """Same path as the desktop Inventory tab's CSV import."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return inventory.bulk_upsert(csv.DictReader(f))['imported']
+
+
+def _sample_items(db: SQLiteAdapter, rng, k: int = 50) -> list:
+    with db._get_conn() as (conn, cursor):
+        names = [r[0] for r in cursor.execute(
+            'SELECT item_name FROM inventory WHERE quantity > 0 ORDER BY quantity DESC LIMIT 500')]
+    return rng.sample(names, min(k, len(names)))
+
+
+def adapter_cases(db: SQLiteAdapter, rng, tmpdir: str, import_rows: int) -> dict:
+    """Service/adapter-level cases: name -> (callable, repeat multiplier)."""
+    pos, analytics = POSService(db), AnalyticsService(db)
+    inventory, crm, visitors = InventoryService(db), CRMService(db), VisitorService(db)
+    today = datetime.now()
+    month_ago = (today - timedelta(days=30)).strftime('%Y-%m-%d')
+    year_ago = (today - timedelta(days=365)).strftime('%Y-%m-%d')
+    today = today.strftime('%Y-%m-%d')
+    stock = _sample_items(db, rng)
+    import_path = os.path.join(tmpdir, 'import.csv')
+    _write_import_csv(import_path, import_rows, rng)
+
+    def checkout():
+        cart = [{'item_name': name, 'quantity': 1, 'sale_price': 1.0} for name in rng.sample(stock, 3)]
+        pos.record_checkout(cart, 'bench')
+
+    return {
+        'pos.checkout_3_items': (checkout, 1),
+        'analytics.dashboard_kpis': (lambda: analytics.get_dashboard_kpis(), 1),
+        'analytics.trend_30d': (lambda: analytics.get_sales_trend(month_ago, today), 1),
+        'analytics.trend_365d': (lambda: analytics.get_sales_trend(year_ago, today), 1),
+        'analytics.summary_365d': (lambda: analytics.get_sales_summary(year_ago, today), 1),
+        'analytics.reorder_365d': (lambda: analytics.get_reorder_recommendations(year_ago, today), 1),
+        'inventory.search': (lambda: inventory.search(rng.choice(PRODUCT_KINDS)[:3]), 1),
+        'visitors.search': (lambda: visitors.search(rng.choice(LAST_NAMES)[:4]), 1),
+        'crm.contacts_search': (lambda: crm.get_contacts(search=rng.choice(COMPANIES)), 1),
+        'inventory.get_all_items': (inventory.get_all_items, 1),
+        'inventory.page_100': (lambda: inventory.get_items_page(limit=100), 1),
+        'sales.page_100': (lambda: pos.get_sales_page(limit=100), 1),
+        'sales.page_100_filtered': (lambda: pos.get_sales_page(limit=100, start_date=month_ago,
+                                                               end_date=today), 1),
+        'crm.leads_page_100': (lambda: crm.get_leads_page(limit=100), 1),
+        'hr.employees_page_100': (lambda: db.get_employees_page(limit=100), 1),
+        f'inventory.csv_import_{import_rows}_rows': (lambda: _import_csv(inventory, import_path), 0),
+    }
+
+
+def api_cases(db_file: str, rng, use_cache: bool) -> dict:
+    """HTTP-level cases through FastAPI's TestClient (skipped if unavailable)."""
+    os.environ['DB_FILE'] = db_file
+    from fastapi.testclient import TestClient
+    from src.api import deps
+    from src.api.main import app
+    if not use_cache:
+        cache_for(deps.get_db()).disable()
+    client = TestClient(app)
+    stock = _sample_items(deps.get_db(), rng)
+
+    def get(url):
+        return lambda: client.get(url).raise_for_status()
+
+    def checkout():
+        items = [{'item_name': name, 'quantity': 1, 'sale_price': 1.0} for name in rng.sample(stock, 3)]
+        client.post('/sales/checkout', json={'items': items, 'username': 'bench'}).raise_for_status()
+
+    return {
+        'api.dashboard_kpis': (get('/dashboard/kpis'), 1),
+        'api.dashboard_trend_30d': (get('/dashboard/trend?days=30'), 1),
+        'api.sales_list': (get('/sales?limit=100'), 1),
+        'api.inventory_list': (get('/inventory?limit=100'), 1),
+        'api.contacts_search': (get(f'/contacts?search={rng.choice(COMPANIES)}'), 1),
+        'api.leads_list': (get('/leads?limit=100'), 1),
+        'api.employees_list': (get('/hr/employees?limit=100'), 1),
+        'api.checkout_3_items': (checkout, 1),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=_root, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(db_file: str, spec: dict, repeat: int = 20, seed: int = 42, generate_data: bool = True,
+        use_cache: bool = False, include_api: bool = True, import_rows: int = 1000) -> dict:
+    """Optionally generate data into db_file, run every case and return the report dict."""
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'spec': spec,
+            'seed': seed,
+            'repeat': repeat,
+            'cache': use_cache,
+        },
+        'generate_seconds': generate(db_file, spec, seed) if generate_data else None,
+        'results': {},
+    }
+    rng = random.Random(seed)
+    db = SQLiteAdapter(db_file)
+    if not use_cache:
+        cache_for(db).disable()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cases = adapter_cases(db, rng, tmpdir, import_rows)
+        for name, (fn, scale) in cases.items():
+            report['results'][name] = time_case(fn, max(1, repeat * scale), warmup=scale)
+    db.close()
+
+    if include_api:
+        try:
+            cases = api_cases(db_file, rng, use_cache)
+        except ImportError as e:
+            report['meta']['api_skipped'] = str(e)
+        else:
+            for name, (fn, scale) in cases.items():
+                report['results'][name] = time_case(fn, max(1, repeat * scale))
+    return report
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Median ratio (current / baseline) for every case present in both reports."""
+    return {
+        name: round(stats['median_ms'] / baseline['results'][name]['median_ms'], 3)
+        for name, stats in report['results'].items()
+        if baseline['results'].get(name, {}).get('median_ms')
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the BizHub data layer and API.")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small')
+    for key in PRESETS['small']:
+        parser.add_argument(f'--{key}', type=int, help=f"override the preset's {key}")
+    parser.add_argument('--db', help='database file (default: a temporary file)')
+    parser.add_argument('--skip-generate', action='store_true', help='benchmark --db as it is')
+    parser.add_argument('--repeat', type=int, default=20, help='timed calls per case')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--import-rows', type=int, default=1000, help='rows in the CSV import case')
+    parser.add_argument('--with-cache', action='store_true', help='leave the service read cache on')
+    parser.add_argument('--no-api', action='store_true', help='skip the HTTP cases')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    parser.add_argument('--baseline', help='earlier JSON report to compare medians against')
+    args = parser.parse_args(argv)
+
+    if args.skip_generate and not args.db:
+        parser.error('--skip-generate needs --db')
+    spec = resolve_spec(args.preset, **{k: getattr(args, k) for k in PRESETS['small']})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_file = args.db or os.path.join(tmpdir, 'bench.db')
+        report = run(db_file, spec, repeat=args.repeat, seed=args.seed,
+                     generate_data=not args.skip_generate, use_cache=args.with_cache,
+                     include_api=not args.no_api, import_rows=args.import_rows)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report['vs_baseline'] = compare(report, json.load(f))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
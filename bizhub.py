@@ -4,6 +4,14 @@
 Usage:
     python bizhub.py          # Run desktop Tkinter app (default)
     python bizhub.py --web    # Run web interface (future)
+    python bizhub.py --api    # Run the REST API (API_WORKERS processes)
+    python bizhub.py --migrate           # Bring the database schema up to date
+    python bizhub.py --stamp-web-schema N  # Mark migrations/*.sql up to N as applied (Postgres)
+    python bizhub.py --rebuild-rollups   # Recompute the daily sales rollup
+    python bizhub.py --export-columnar   # Append new rows to the Parquet analytics snapshots
+    python bizhub.py --archive           # Move old sales/activity rows to per-year archives
+    python bizhub.py --backup            # Snapshot the database into BACKUP_DIR
+    python bizhub.py --restore FILE      # Replace the database with a snapshot
     python bizhub.py --help   # Show help
 """
 import sys
@@ -28,6 +36,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def open_database(db_file: str):
+    """Open the configured database (DB_TYPE) with create_adapter(); --db is the default DB_FILE."""
+    from src.db import create_adapter
+    os.environ.setdefault("DB_FILE", db_file)
+    return create_adapter()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description=f"{APP_NAME} v{APP_VERSION} - Complete ERP Suite for Small Businesses"
@@ -35,22 +50,124 @@ def main():
     parser.add_argument('--web', action='store_true', help='Run web interface (future)')
     parser.add_argument('--api', action='store_true', help='Run API server (future)')
     parser.add_argument('--db', default='inventory.db', help='Database file path')
+    parser.add_argument('--migrate', action='store_true',
+                        help='Apply pending schema migrations to the configured database (and, on '
+                             'PostgreSQL, the web schema in migrations/*.sql) and exit')
+    parser.add_argument('--stamp-web-schema', type=int, metavar='N',
+                        help='Record migrations/*.sql up to N as applied without running them '
+                             '(PostgreSQL web databases set up by hand) and exit')
+    parser.add_argument('--rebuild-rollups', action='store_true',
+                        help='Recompute the daily sales rollup from raw sales and exit')
+    parser.add_argument('--export-columnar', action='store_true',
+                        help='Export rows written since the last run to Parquet (COLUMNAR_DIR) and exit')
+    parser.add_argument('--archive', action='store_true',
+                        help='Move sales and activity log rows past their retention horizon '
+                             'into per-year archive databases (ARCHIVE_DIR) and exit')
+    parser.add_argument('--backup', action='store_true',
+                        help='Take an online snapshot of the database into BACKUP_DIR and exit')
+    parser.add_argument('--list-backups', action='store_true', help='List snapshots in BACKUP_DIR and exit')
+    parser.add_argument('--restore', metavar='FILE',
+                        help='Replace the database with a verified snapshot (the current one is '
+                             'backed up first) and exit')
     parser.add_argument('--version', action='version', version=f"{APP_NAME} {APP_VERSION}")
     
     args = parser.parse_args()
     
     try:
-        if args.api:
-            import os
+        if args.rebuild_rollups:
+            db = open_database(args.db)
+            rows = db.rebuild_sales_rollup()
+            db.close()
+            if rows < 0:
+                print("Rollup rebuild failed — see bizhub.log")
+                sys.exit(1)
+            print(f"Rebuilt sales rollup: {rows} day/item rows")
+        elif args.export_columnar:
+            from src.services.columnar_service import ColumnarExportService
+            db = open_database(args.db)
+            try:
+                exported = ColumnarExportService(db).export()
+            except ImportError as exc:
+                print(exc)
+                sys.exit(1)
+            finally:
+                db.close()
+            for table, count in exported.items():
+                print(f"Exported {count} new {table} rows")
+        elif args.archive:
+            from src.services.archive_service import ArchiveService
+            db = open_database(args.db)
+            try:
+                archived = ArchiveService(db).run()
+            finally:
+                db.close()
+            for table, years in archived.items():
+                if years is None:
+                    print(f"Archiving {table} failed — see bizhub.log")
+                    sys.exit(1)
+                moved = ", ".join(f"{year}: {count}" for year, count in sorted(years.items())) or "nothing to move"
+                print(f"Archived {table}: {moved}")
+        elif args.backup or args.list_backups or args.restore:
+            from src.config import get_db_config
+            from src.services.backup_service import BackupService
             os.environ.setdefault("DB_FILE", args.db)
+            if get_db_config()['type'] != 'sqlite':
+                print("Backups are for SQLite databases; back up PostgreSQL with pg_dump "
+                      "and restore it with pg_restore")
+                sys.exit(1)
+            db = open_database(args.db)
+            backups = BackupService(db)
+            try:
+                if args.restore:
+                    safety = backups.restore(args.restore)
+                    print(f"Restored {db.db_file} from {args.restore}")
+                    print(f"Previous contents saved to {safety['path']}")
+                elif args.backup:
+                    info = backups.create_backup()
+                    print(f"Backed up to {info['path']} ({info['size']:,} bytes, integrity ok)")
+                else:
+                    for info in backups.list_backups():
+                        print(f"{info['created']}  {info['size']:>14,}  {info['path']}")
+            except (ValueError, RuntimeError) as exc:
+                print(exc)
+                sys.exit(1)
+            finally:
+                db.close()
+        elif args.migrate or args.stamp_web_schema is not None:
+            from src.config import get_db_config
+            os.environ.setdefault("DB_FILE", args.db)
+            postgres = get_db_config()['type'] == 'postgresql'
+            if args.stamp_web_schema is not None and not postgres:
+                print("--stamp-web-schema needs DB_TYPE=postgresql: the web schema lives in PostgreSQL")
+                sys.exit(1)
+            db = open_database(args.db)
+            try:
+                print(f"Database schema is at version {db.get_schema_version()}")
+                if args.stamp_web_schema is not None:
+                    stamped = db.stamp_web_schema(args.stamp_web_schema)
+                    print(f"Recorded web schema migrations {stamped or 'none (already stamped)'} as applied")
+                elif postgres:
+                    try:
+                        db.migrate_web_schema()
+                    except Exception as exc:
+                        print(f"Web schema migration failed and was rolled back: {exc}")
+                        print("If the web schema was created by hand, record it with --stamp-web-schema N")
+                        sys.exit(1)
+                if postgres:
+                    print(f"Web schema is at version {db.get_web_schema_version()}")
+            finally:
+                db.close()
+        elif args.api:
             try:
                 import uvicorn
-                from src.api.main import app
                 api_host = os.getenv("API_HOST", "0.0.0.0")
                 api_port = int(os.getenv("API_PORT", "8000"))
-                print(f"Starting BizHub API on http://localhost:{api_port}")
+                api_workers = int(os.getenv("API_WORKERS", "1"))
+                # Migrate once here so the workers start against a current schema
+                open_database(args.db).close()
+                print(f"Starting BizHub API on http://localhost:{api_port} ({api_workers} worker(s))")
                 print(f"API docs available at http://localhost:{api_port}/docs")
-                uvicorn.run(app, host=api_host, port=api_port)
+                uvicorn.run("src.api.main:app", host=api_host, port=api_port, workers=api_workers)
             except ImportError as exc:
                 print(f"FastAPI/uvicorn not installed: {exc}")
                 print("Install with: pip install fastapi 'uvicorn[standard]'")
@@ -6,7 +6,7 @@
  */
 const API_BASE = process.env.NEXT_PUBLIC_API_URL ?? 'http://localhost:8000';
 
-export async function apiFetch(path: string, options?: RequestInit) {
+async function request(path: string, options?: RequestInit) {
   const res = await fetch(`${API_BASE}${path}`, {
     headers: { 'Content-Type': 'application/json' },
     ...options,
@@ -15,7 +15,30 @@ export async function apiFetch(path: string, options?: RequestInit) {
     const text = await res.text();
     throw new Error(text || `HTTP ${res.status}`);
   }
-  return res.json();
+  return res;
+}
+
+export async function apiFetch(path: string, options?: RequestInit) {
+  return (await request(path, options)).json();
+}
+
+// List endpoints return one page (a plain array) and send the next page's
+// cursor in this header until the last page.
+const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+const PAGE_SIZE = 1000;
+
+/** GET every row of a paged list endpoint, following X-Next-Cursor. */
+export async function apiFetchAll<T = any>(path: string): Promise<T[]> {
+  const sep = path.includes('?') ? '&' : '?';
+  const rows: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const qs: string = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+    const res = await request(`${path}${sep}limit=${PAGE_SIZE}${qs}`);
+    rows.push(...(await res.json()));
+    cursor = res.headers.get(NEXT_CURSOR_HEADER);
+  } while (cursor);
+  return rows;
 }
 
 // ---- Auth ----
@@ -40,7 +63,7 @@ export async function fetchTrend(days = 30) {
 // ---- Inventory ----
 
 export async function fetchInventory() {
-  return apiFetch('/inventory');
+  return apiFetchAll('/inventory');
 }
 
 export async function createInventoryItem(data: Record<string, unknown>) {
@@ -67,7 +90,7 @@ export async function deleteInventoryItem(itemName: string) {
 
 export async function fetchContacts(search?: string) {
   const qs = search ? `?search=${encodeURIComponent(search)}` : '';
-  return apiFetch(`/contacts${qs}`);
+  return apiFetchAll(`/contacts${qs}`);
 }
 
 export async function createContact(data: Record<string, unknown>) {
@@ -92,7 +115,7 @@ export async function deleteContact(id: number) {
 
 export async function fetchLeads(stage?: string) {
   const qs = stage ? `?stage=${encodeURIComponent(stage)}` : '';
-  return apiFetch(`/leads${qs}`);
+  return apiFetchAll(`/leads${qs}`);
 }
 
 export async function fetchPipeline() {
@@ -120,13 +143,13 @@ export async function deleteLead(id: number) {
 // ---- Sales ----
 
 export async function fetchSales() {
-  return apiFetch('/sales');
+  return apiFetchAll('/sales');
 }
 
 // ---- HR / Employees ----
 
 export async function fetchEmployees() {
-  return apiFetch('/hr/employees');
+  return apiFetchAll('/hr/employees');
 }
 
 export async function createEmployee(data: Record<string, unknown>) {
@@ -1,56 +1,151 @@
-"""Shared FastAPI dependencies — DB adapter and service instances."""
+"""Shared FastAPI dependencies — DB adapter and service instances.
+
+Each API process (every uvicorn/gunicorn worker) opens its own adapter and
+connection pool, in the app's lifespan rather than at import time, so a
+pre-forking server never shares connections across workers. The adapter
+is closed when the worker shuts down.
+
+The async hot routes (checkout, sales list, KPIs, lead pipeline) use an
+AsyncDatabaseAdapter on the same database, opened in the lifespan too:
+aiosqlite / asyncpg when installed, otherwise the sync adapter on worker
+threads (API_ASYNC_DB picks).
+"""
 import os
 import sys
+import logging
+import threading
+from contextlib import asynccontextmanager
 
 # Ensure project root is in path
 _root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 if _root not in sys.path:
     sys.path.insert(0, _root)
 
-from src.db.sqlite_adapter import SQLiteAdapter
+from starlette.concurrency import run_in_threadpool
+
+from src.db import DatabaseAdapter, AsyncDatabaseAdapter, create_adapter, create_async_adapter
 from src.services import (
     AuthService, InventoryService, POSService, VisitorService,
-    AnalyticsService, CRMService,
+    AnalyticsService, CRMService, ExportService,
 )
 
-DB_FILE = os.getenv("DB_FILE", "inventory.db")
-
-# Single shared DB adapter for the API process
-_db = SQLiteAdapter(DB_FILE)
+logger = logging.getLogger(__name__)
+
+_db = None
+_async_db = None
+_services = {}
+_lock = threading.Lock()
+
+
+def open_database(db_config: dict = None) -> DatabaseAdapter:
+    """Open this process's adapter and services, once. Returns the adapter."""
+    global _db
+    with _lock:
+        if _db is None:
+            db = create_adapter(db_config)
+            _services.update(
+                auth=AuthService(db),
+                inventory=InventoryService(db),
+                pos=POSService(db),
+                visitor=VisitorService(db),
+                analytics=AnalyticsService(db),
+                crm=CRMService(db),
+                export=ExportService(db),
+            )
+            _db = db
+            logger.info("API worker %s opened %s", os.getpid(), type(db).__name__)
+        return _db
+
+
+def close_database():
+    """Close this process's adapter (and its pool). Safe to call when not open.
+
+    Close the async adapter first (close_async_database); it is only
+    dropped here.
+    """
+    global _db, _async_db
+    with _lock:
+        db, _db = _db, None
+        _async_db = None
+        _services.clear()
+    if db is not None:
+        db.close()
+
+
+async def open_async_database() -> AsyncDatabaseAdapter:
+    """Open this process's async adapter beside the sync one, once. Returns it."""
+    global _async_db
+    if _async_db is None:
+        db = _db if _db is not None else await run_in_threadpool(open_database)
+        adb = create_async_adapter(db)
+        await adb.open()
+        if _async_db is None:
+            _async_db = adb
+            logger.info("API worker %s opened %s", os.getpid(), type(adb).__name__)
+        else:  # another request opened one while this one was connecting
+            await adb.close()
+    return _async_db
+
+
+async def close_async_database():
+    """Close this process's async adapter. Safe to call when not open."""
+    global _async_db
+    adb, _async_db = _async_db, None
+    if adb is not None:
+        await adb.close()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Open the database when a worker starts and close it when it stops."""
+    await run_in_threadpool(open_database)
+    await open_async_database()
+    try:
+        yield
+    finally:
+        await close_async_database()
+        await run_in_threadpool(close_database)
+
+
+def _service(name: str):
+    if _db is None:
+        open_database()  # used without the lifespan, e.g. a bare TestClient
+    return _services[name]
+
+
+def get_db() -> DatabaseAdapter:
+    """FastAPI dependency that returns the shared DB adapter."""
+    return _db if _db is not None else open_database()
 
-# Shared service instances
-auth_service = AuthService(_db)
-inventory_service = InventoryService(_db)
-pos_service = POSService(_db)
-visitor_service = VisitorService(_db)
-analytics_service = AnalyticsService(_db)
-crm_service = CRMService(_db)
 
-
-def get_db() -> SQLiteAdapter:
-    """FastAPI dependency that returns the shared DB adapter."""
-    return _db
+async def get_async_db() -> AsyncDatabaseAdapter:
+    """FastAPI dependency that returns the async adapter for the hot routes."""
+    return _async_db if _async_db is not None else await open_async_database()
 
 
 def get_auth_service() -> AuthService:
-    return auth_service
+    return _service('auth')
 
 
 def get_inventory_service() -> InventoryService:
-    return inventory_service
+    return _service('inventory')
 
 
 def get_pos_service() -> POSService:
-    return pos_service
+    return _service('pos')
 
 
 def get_visitor_service() -> VisitorService:
-    return visitor_service
+    return _service('visitor')
 
 
 def get_analytics_service() -> AnalyticsService:
-    return analytics_service
+    return _service('analytics')
 
 
 def get_crm_service() -> CRMService:
-    return crm_service
+    return _service('crm')
+
+
+def get_export_service() -> ExportService:
+    return _service('export')
@@ -0,0 +1,32 @@
+"""Helpers for the streaming export endpoints (``/…/export?format=csv|xlsx``)."""
+from fastapi import HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from src.services import ExportService
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def format_param():
+    """Query parameter definition for the export format."""
+    return Query("csv", alias="format", pattern="^(csv|xlsx)$", description="csv or xlsx")
+
+
+def export_response(export_svc: ExportService, dataset: str, fmt: str, filename: str,
+                    **filters) -> StreamingResponse:
+    """Stream dataset as a file download; rows are read and encoded as the client consumes them."""
+    if fmt == "xlsx":
+        try:
+            chunks = export_svc.stream_xlsx(dataset, **filters)
+        except ImportError:
+            raise HTTPException(status_code=501, detail="XLSX export needs openpyxl on the server")
+    else:
+        chunks = export_svc.stream_csv(dataset, **filters)
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -4,6 +4,7 @@ Run with:
     python bizhub.py --api
     # or directly:
     uvicorn src.api.main:app --reload
+    uvicorn src.api.main:app --workers 4   # one database pool per worker process
 """
 import os
 import logging
@@ -11,6 +12,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api.routers import inventory, sales, contacts, leads, dashboard, auth, hr, settings
+from src.api.pagination import NEXT_CURSOR_HEADER
+from src.api.deps import lifespan
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +21,7 @@ app = FastAPI(
     title="BizHub API",
     version="4.0.0",
     description="BizHub ERP REST API — connects desktop data to web frontend",
+    lifespan=lifespan,
 )
 
 # Allow all origins for development; restrict in production via env vars
@@ -29,6 +33,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Register routers
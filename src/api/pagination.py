@@ -0,0 +1,53 @@
+"""Keyset pagination helpers shared by the list endpoints.
+
+List endpoints keep returning a plain JSON array (the web client relies on
+that). When more rows exist, the opaque cursor for the next page is sent in
+the ``X-Next-Cursor`` response header; pass it back as ``?cursor=``.
+"""
+import base64
+import json
+from typing import Optional
+
+from fastapi import HTTPException, Query, Response
+
+from src.db.keyset import check_after
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(key_values: list) -> str:
+    """Encode the sort-key values of a page's last row as an opaque cursor."""
+    raw = json.dumps(key_values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], keys: int) -> Optional[list]:
+    """Decode a cursor from encode_cursor() for an endpoint sorted on keys columns.
+
+    Raises 400 on a malformed cursor, or one without a scalar value per key.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        check_after(values, keys)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def limit_param(default: int = DEFAULT_PAGE_SIZE):
+    """Query parameter definition for page size."""
+    return Query(default, ge=1, le=MAX_PAGE_SIZE, description="Maximum rows to return")
+
+
+def set_next_cursor(response: Response, next_after: Optional[list]):
+    """Expose the next page's cursor (if any) via the response header."""
+    if next_after is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(next_after)
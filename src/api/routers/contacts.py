@@ -1,9 +1,10 @@
 """Contacts router — CRUD for CRM contacts."""
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from pydantic import BaseModel
 
 from src.api.deps import get_crm_service
+from src.api.pagination import decode_cursor, limit_param, set_next_cursor
 from src.services.crm_service import CRMService
 
 router = APIRouter()
@@ -45,11 +46,18 @@ def _row_to_dict(row) -> dict:
 
 @router.get("")
 def list_contacts(
+    response: Response,
     search: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = limit_param(),
+    cursor: Optional[str] = None,
     crm_svc: CRMService = Depends(get_crm_service),
 ):
-    """List all CRM contacts, optionally filtered by search string."""
-    contacts = crm_svc.get_contacts(search=search)
+    """List CRM contacts by name, one page at a time, optionally filtered."""
+    contacts, next_after = crm_svc.get_contacts_page(
+        limit=limit, after=decode_cursor(cursor, 2), search=search, status=status
+    )
+    set_next_cursor(response, next_after)
     return [_row_to_dict(c) for c in contacts]
 
 
@@ -1,10 +1,13 @@
 """HR router — employees and payroll."""
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from pydantic import BaseModel
 
-from src.api.deps import get_db
-from src.db.sqlite_adapter import SQLiteAdapter
+from src.api.deps import get_db, get_export_service
+from src.api.exports import export_response, format_param
+from src.api.pagination import decode_cursor, limit_param, set_next_cursor
+from src.db.base import DatabaseAdapter
+from src.services import ExportService
 
 router = APIRouter()
 
@@ -44,13 +47,24 @@ def _payroll_row(row) -> dict:
 
 
 @router.get("/employees")
-def list_employees(db: SQLiteAdapter = Depends(get_db)):
-    rows = db.get_all_employees() or []
+def list_employees(
+    response: Response,
+    department: Optional[str] = None,
+    active: Optional[bool] = None,
+    limit: int = limit_param(),
+    cursor: Optional[str] = None,
+    db: DatabaseAdapter = Depends(get_db),
+):
+    rows, next_after = db.get_employees_page(
+        limit=limit, after=decode_cursor(cursor, 2), team=department,
+        is_active=None if active is None else int(active),
+    )
+    set_next_cursor(response, next_after)
     return [_emp_row(r) for r in rows]
 
 
 @router.post("/employees", status_code=201)
-def create_employee(emp: EmployeeCreate, db: SQLiteAdapter = Depends(get_db)):
+def create_employee(emp: EmployeeCreate, db: DatabaseAdapter = Depends(get_db)):
     ok = db.add_employee(
         name=emp.name,
         designation=emp.designation or "",
@@ -64,7 +78,7 @@ def create_employee(emp: EmployeeCreate, db: SQLiteAdapter = Depends(get_db)):
 
 
 @router.put("/employees/{emp_id}")
-def update_employee(emp_id: int, updates: EmployeeUpdate, db: SQLiteAdapter = Depends(get_db)):
+def update_employee(emp_id: int, updates: EmployeeUpdate, db: DatabaseAdapter = Depends(get_db)):
     kwargs = {k: v for k, v in updates.dict().items() if v is not None}
     if "department" in kwargs:
         kwargs["team"] = kwargs.pop("department")
@@ -75,7 +89,7 @@ def update_employee(emp_id: int, updates: EmployeeUpdate, db: SQLiteAdapter = De
 
 
 @router.delete("/employees/{emp_id}")
-def delete_employee(emp_id: int, db: SQLiteAdapter = Depends(get_db)):
+def delete_employee(emp_id: int, db: DatabaseAdapter = Depends(get_db)):
     ok = db.delete_employee(emp_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Employee not found")
@@ -83,6 +97,15 @@ def delete_employee(emp_id: int, db: SQLiteAdapter = Depends(get_db)):
 
 
 @router.get("/payroll")
-def list_payroll(db: SQLiteAdapter = Depends(get_db)):
-    rows = db.get_all_payroll() or []
+def list_payroll(db: DatabaseAdapter = Depends(get_db)):
+    rows = db.get_all_payrolls() or []
     return [_payroll_row(r) for r in rows]
+
+
+@router.get("/payroll/export")
+def export_payroll(
+    fmt: str = format_param(),
+    export_svc: ExportService = Depends(get_export_service),
+):
+    """Download payroll records with employee details as CSV or XLSX."""
+    return export_response(export_svc, "payroll", fmt, "payroll")
@@ -1,10 +1,18 @@
-"""Inventory router — CRUD for inventory items."""
+"""Inventory router — CRUD and bulk import for inventory items."""
+import csv
+import io
+import json
+import tempfile
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
-from src.api.deps import get_inventory_service
-from src.services import InventoryService
+from src.api.deps import get_inventory_service, get_export_service
+from src.api.exports import export_response, format_param
+from src.api.pagination import decode_cursor, limit_param, set_next_cursor
+from src.services import InventoryService, ExportService
+from src.services.inventory_service import iter_xlsx_rows
 
 router = APIRouter()
 
@@ -60,10 +68,17 @@ def _row_to_dict(row) -> dict:
 
 @router.get("", response_model=list)
 def list_inventory(
+    response: Response,
+    limit: int = limit_param(),
+    cursor: Optional[str] = None,
+    low_stock: bool = False,
     inv_svc: InventoryService = Depends(get_inventory_service),
 ):
-    """List all inventory items."""
-    items = inv_svc.get_all_items()
+    """List inventory items by name, one page at a time."""
+    items, next_after = inv_svc.get_items_page(
+        limit=limit, after=decode_cursor(cursor, 1), low_stock=low_stock
+    )
+    set_next_cursor(response, next_after)
     return [_row_to_dict(r) for r in items]
 
 
@@ -87,6 +102,85 @@ def add_inventory_item(
     return {"status": "created", "item_name": item.item_name}
 
 
+@router.get("/export")
+def export_inventory(
+    fmt: str = format_param(),
+    export_svc: ExportService = Depends(get_export_service),
+):
+    """Download inventory as CSV or XLSX (same columns POST /inventory/import accepts)."""
+    return export_response(export_svc, "inventory", fmt, "inventory")
+
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_CONTENT_TYPES = ("text/csv", "application/csv", "text/plain")
+
+# Uploads larger than this are spooled to a temporary file instead of memory
+IMPORT_SPOOL_MAX_BYTES = 1024 * 1024
+
+
+async def _spool_body(request: Request):
+    """Copy the request body, chunk by chunk, into a rewound SpooledTemporaryFile."""
+    spool = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_BYTES)
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(spool.write, chunk)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def _import_spooled(inv_svc: InventoryService, spool, content_type: str) -> dict:
+    """Parse a spooled upload and feed its rows to bulk_upsert as they are read."""
+    if content_type == "application/json":
+        try:
+            rows = json.load(spool)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body is not valid JSON")
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of items")
+        return inv_svc.bulk_upsert(rows)
+    if content_type == XLSX_CONTENT_TYPE:
+        try:
+            rows = iter_xlsx_rows(spool)
+        except ImportError:
+            raise HTTPException(status_code=415, detail="Excel import needs openpyxl on the server")
+        except Exception:
+            raise HTTPException(status_code=400, detail="Body is not a readable .xlsx workbook")
+        return inv_svc.bulk_upsert(rows)
+    text = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+    try:
+        return inv_svc.bulk_upsert(csv.DictReader(text))
+    except UnicodeDecodeError:
+        # Rows before the bad bytes have already been imported.
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    finally:
+        text.detach()
+
+
+@router.post("/import")
+async def import_inventory(
+    request: Request,
+    inv_svc: InventoryService = Depends(get_inventory_service),
+):
+    """Insert or update items in bulk from the request body.
+
+    Send CSV (text/csv, same columns as the export), an .xlsx workbook, or a
+    JSON array of items. Returns counts plus a per-row error report.
+    The body is spooled to a temporary file as it arrives (large uploads go
+    to disk) and rows are parsed from there while they are written.
+    """
+    content_type = request.headers.get("content-type", "text/csv").split(";")[0].strip().lower()
+    if content_type not in ("application/json", XLSX_CONTENT_TYPE) + CSV_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail=f"Unsupported content type: {content_type}")
+    spool = await _spool_body(request)
+    try:
+        return await run_in_threadpool(_import_spooled, inv_svc, spool, content_type)
+    finally:
+        spool.close()
+
+
 @router.put("/{item_name}")
 def update_inventory_item(
     item_name: str,
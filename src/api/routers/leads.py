@@ -1,9 +1,11 @@
 """Leads router — CRUD and pipeline summary for CRM leads."""
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from pydantic import BaseModel
 
-from src.api.deps import get_crm_service
+from src.api.deps import get_crm_service, get_async_db
+from src.api.pagination import decode_cursor, limit_param, set_next_cursor
+from src.db import AsyncDatabaseAdapter
 from src.services.crm_service import CRMService
 
 router = APIRouter()
@@ -48,20 +50,28 @@ def _row_to_dict(row) -> dict:
 
 @router.get("")
 def list_leads(
+    response: Response,
     stage: Optional[str] = None,
+    owner: Optional[str] = None,
+    limit: int = limit_param(),
+    cursor: Optional[str] = None,
     crm_svc: CRMService = Depends(get_crm_service),
 ):
-    """List all CRM leads, optionally filtered by stage."""
-    leads = crm_svc.get_leads(stage=stage)
+    """List CRM leads, newest first, one page at a time, optionally filtered."""
+    leads, next_after = crm_svc.get_leads_page(
+        limit=limit, after=decode_cursor(cursor, 2), stage=stage, owner=owner
+    )
+    set_next_cursor(response, next_after)
     return [_row_to_dict(l) for l in leads]
 
 
 @router.get("/pipeline")
-def get_pipeline(
+async def get_pipeline(
     crm_svc: CRMService = Depends(get_crm_service),
+    adb: AsyncDatabaseAdapter = Depends(get_async_db),
 ):
     """Return pipeline summary grouped by stage."""
-    summary = crm_svc.get_pipeline_summary()
+    summary = await crm_svc.get_pipeline_summary_async(adb)
     return {
         stage: [_row_to_dict(l) for l in leads]
         for stage, leads in summary.items()
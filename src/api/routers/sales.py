@@ -1,11 +1,15 @@
 """Sales router — list sales and checkout endpoint."""
 from typing import Optional, List
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from pydantic import BaseModel
 
-from src.api.deps import get_pos_service
-from src.services import POSService
+from src.api.deps import get_pos_service, get_export_service, get_async_db
+from src.api.exports import export_response, format_param
+from src.api.pagination import decode_cursor, limit_param, set_next_cursor
+from src.db import AsyncDatabaseAdapter
+from src.services import POSService, ExportService
+from src.core import InsufficientStockError
 
 router = APIRouter()
 
@@ -35,38 +39,78 @@ def _sale_row_to_dict(row) -> dict:
     }
 
 
+def _check_dates(*values):
+    """Raise 400 unless each given date starts with YYYY-MM-DD."""
+    for value in values:
+        if value:
+            try:
+                datetime.strptime(value[:10], "%Y-%m-%d")
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+
+
 @router.get("")
-def list_sales(
+async def list_sales(
+    response: Response,
+    limit: int = limit_param(),
+    cursor: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    username: Optional[str] = None,
+    item_name: Optional[str] = None,
     pos_svc: POSService = Depends(get_pos_service),
+    adb: AsyncDatabaseAdapter = Depends(get_async_db),
 ):
-    """List all sales records."""
-    sales = pos_svc.get_all_sales()
+    """List sales records, newest first, one page at a time."""
+    _check_dates(start_date, end_date)
+    sales, next_after = await pos_svc.get_sales_page_async(
+        adb, limit=limit, after=decode_cursor(cursor, 2), start_date=start_date,
+        end_date=end_date, username=username, item_name=item_name,
+    )
+    set_next_cursor(response, next_after)
     return [_sale_row_to_dict(r) for r in sales]
 
 
+@router.get("/export")
+def export_sales(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    fmt: str = format_param(),
+    export_svc: ExportService = Depends(get_export_service),
+):
+    """Download sales (oldest first) as CSV or XLSX, streamed row by row."""
+    _check_dates(start_date, end_date)
+    name = "sales" + "".join(f"_{d[:10]}" for d in (start_date, end_date) if d)
+    return export_response(export_svc, "sales", fmt, name, start_date=start_date, end_date=end_date)
+
+
 @router.post("/checkout")
-def checkout(
+async def checkout(
     payload: CheckoutRequest,
     pos_svc: POSService = Depends(get_pos_service),
+    adb: AsyncDatabaseAdapter = Depends(get_async_db),
 ):
-    """Process a checkout with a list of items."""
+    """Process a checkout with a list of items as one atomic transaction."""
     if not payload.items:
         raise HTTPException(status_code=400, detail="Cart is empty")
 
+    try:
+        ok = await pos_svc.record_checkout_async(
+            adb, [item.dict() for item in payload.items], username=payload.username
+        )
+    except InsufficientStockError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Could not process sale for '{e.item_name}' — insufficient stock or item not found"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not ok:
+        raise HTTPException(status_code=500, detail="Checkout failed — no items were recorded")
+
     results = []
     total = 0.0
     for cart_item in payload.items:
-        ok = pos_svc.record_sale(
-            item_name=cart_item.item_name,
-            quantity=cart_item.quantity,
-            sale_price=cart_item.sale_price,
-            username=payload.username,
-        )
-        if not ok:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Could not process sale for '{cart_item.item_name}' — insufficient stock or item not found"
-            )
         line_total = cart_item.quantity * cart_item.sale_price
         total += line_total
         results.append({
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 from src.api.deps import get_db
-from src.db.sqlite_adapter import SQLiteAdapter
+from src.db.base import DatabaseAdapter
 
 router = APIRouter()
 
@@ -18,7 +18,7 @@ class CompanySettings(BaseModel):
 
 
 @router.get("/company")
-def get_company(db: SQLiteAdapter = Depends(get_db)):
+def get_company(db: DatabaseAdapter = Depends(get_db)):
     info = db.get_company_info() or {}
     if isinstance(info, (list, tuple)) and len(info) > 0:
         row = info[0] if isinstance(info, list) else info
@@ -29,7 +29,7 @@ def get_company(db: SQLiteAdapter = Depends(get_db)):
 
 
 @router.post("/company")
-def save_company(data: CompanySettings, db: SQLiteAdapter = Depends(get_db)):
+def save_company(data: CompanySettings, db: DatabaseAdapter = Depends(get_db)):
     kwargs = {k: v for k, v in data.dict().items() if v is not None}
     db.update_company_info(**kwargs)
     return {"status": "saved"}
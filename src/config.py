@@ -9,6 +9,54 @@ DB_TYPE = os.getenv('DB_TYPE', 'sqlite')  # 'sqlite' or 'postgresql'
 DB_URL = os.getenv('DB_URL', 'inventory.db')
 DB_FILE = os.getenv('DB_FILE', 'inventory.db')
 
+# Connection pool (one persistent connection per worker thread)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+DB_POOL_HEALTH_CHECK_SECONDS = float(os.getenv('DB_POOL_HEALTH_CHECK_SECONDS', 30))
+
+# PostgreSQL pool: connections kept open when idle (DB_POOL_SIZE is the maximum),
+# and how long a request waits for a free connection before failing
+PG_POOL_MIN_SIZE = int(os.getenv('PG_POOL_MIN_SIZE', 2))
+PG_POOL_TIMEOUT_SECONDS = float(os.getenv('PG_POOL_TIMEOUT_SECONDS', 30))
+
+# How the API's async routes reach the database: 'native' (aiosqlite / asyncpg
+# when installed) or 'threaded' (the sync adapter on worker threads)
+API_ASYNC_DB = os.getenv('API_ASYNC_DB', 'native')
+
+# SQLite storage profile ('wal', 'durable' or 'legacy') and lock handling
+DB_STORAGE_PROFILE = os.getenv('DB_STORAGE_PROFILE', 'wal')
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', 5000))
+DB_WRITE_RETRIES = int(os.getenv('DB_WRITE_RETRIES', 5))
+
+# Service read cache (LRU + TTL, invalidated by writes through the adapter)
+SERVICE_CACHE_ENABLED = os.getenv('SERVICE_CACHE_ENABLED', 'true').lower() == 'true'
+SERVICE_CACHE_TTL_SECONDS = float(os.getenv('SERVICE_CACHE_TTL_SECONDS', 30))
+SERVICE_CACHE_SIZE = int(os.getenv('SERVICE_CACHE_SIZE', 256))
+
+# Activity log: 'buffered' batches audit rows on a background thread (entries from the last
+# flush interval can be lost on a crash); 'sync' commits each entry before log() returns
+ACTIVITY_LOG_DURABILITY = os.getenv('ACTIVITY_LOG_DURABILITY', 'buffered')
+ACTIVITY_LOG_FLUSH_MS = int(os.getenv('ACTIVITY_LOG_FLUSH_MS', 250))
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv('ACTIVITY_LOG_BATCH_SIZE', 500))
+ACTIVITY_LOG_MAX_PENDING = int(os.getenv('ACTIVITY_LOG_MAX_PENDING', 10000))
+
+# Columnar analytics snapshots (Parquet, needs pyarrow); ANALYTICS_SOURCE 'sqlite' or 'columnar'
+COLUMNAR_DIR = os.getenv('COLUMNAR_DIR', 'analytics_data')
+ANALYTICS_SOURCE = os.getenv('ANALYTICS_SOURCE', 'sqlite')
+
+# Archival: rows older than these horizons move to per-year archive databases in ARCHIVE_DIR
+# (empty = next to the database file); 0 disables archiving that table
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', '')
+ARCHIVE_SALES_AFTER_DAYS = int(os.getenv('ARCHIVE_SALES_AFTER_DAYS', 730))
+ARCHIVE_ACTIVITY_AFTER_DAYS = int(os.getenv('ARCHIVE_ACTIVITY_AFTER_DAYS', 365))
+
+# Online backups (sqlite3 backup API): copied BACKUP_PAGES_PER_STEP pages at a time with a
+# pause between steps so live traffic keeps the disk; the newest BACKUP_KEEP snapshots are kept
+BACKUP_DIR = os.getenv('BACKUP_DIR', 'backups')
+BACKUP_KEEP = int(os.getenv('BACKUP_KEEP', 7))
+BACKUP_PAGES_PER_STEP = int(os.getenv('BACKUP_PAGES_PER_STEP', 256))
+BACKUP_STEP_SLEEP_MS = int(os.getenv('BACKUP_STEP_SLEEP_MS', 10))
+BACKUP_MAX_RESTARTS = int(os.getenv('BACKUP_MAX_RESTARTS', 5))
+
 # Application mode
 MODE = os.getenv('MODE', 'desktop')  # 'desktop' or 'web' or 'api'
 
@@ -18,6 +66,16 @@ SMTP_PORT = os.getenv('SMTP_PORT', 587)
 SENDER_EMAIL = os.getenv('SENDER_EMAIL', '')
 SENDER_PASSWORD = os.getenv('SENDER_PASSWORD', '')
 
+# Email outbox: queued messages are sent by a background worker over one SMTP session per batch
+EMAIL_STARTTLS = os.getenv('EMAIL_STARTTLS', 'true').lower() == 'true'
+SMTP_TIMEOUT_SECONDS = float(os.getenv('SMTP_TIMEOUT_SECONDS', 30))
+EMAIL_BATCH_SIZE = int(os.getenv('EMAIL_BATCH_SIZE', 20))
+EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', 5))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv('EMAIL_RETRY_BASE_SECONDS', 60))
+EMAIL_RETRY_MAX_SECONDS = float(os.getenv('EMAIL_RETRY_MAX_SECONDS', 3600))
+EMAIL_RATE_PER_MINUTE = float(os.getenv('EMAIL_RATE_PER_MINUTE', 30))
+EMAIL_POLL_SECONDS = float(os.getenv('EMAIL_POLL_SECONDS', 30))
+
 # Cloud settings (future)
 CLOUD_ENABLED = os.getenv('CLOUD_ENABLED', 'false').lower() == 'true'
 CLOUD_API_URL = os.getenv('CLOUD_API_URL', '')
@@ -34,10 +92,15 @@ APP_NAME = 'BzHub'
 APP_VERSION = '4.0.0'
 
 def get_db_config():
-    """Get database configuration based on mode."""
-    if DB_TYPE == 'sqlite':
-        return {'type': 'sqlite', 'path': DB_FILE}
-    elif DB_TYPE == 'postgresql':
-        return {'type': 'postgresql', 'url': DB_URL}
+    """Get database configuration based on mode.
+
+    Read from the environment at call time, so a launcher (bizhub.py --api)
+    can point the API at a database after this module was imported.
+    """
+    db_type = os.getenv('DB_TYPE', DB_TYPE)
+    if db_type == 'sqlite':
+        return {'type': 'sqlite', 'path': os.getenv('DB_FILE', DB_FILE)}
+    elif db_type == 'postgresql':
+        return {'type': 'postgresql', 'url': os.getenv('DB_URL', DB_URL)}
     else:
-        raise ValueError(f"Unknown DB_TYPE: {DB_TYPE}")
+        raise ValueError(f"Unknown DB_TYPE: {db_type}")
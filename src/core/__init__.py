@@ -79,6 +79,15 @@ class InventoryCalculator:
         return low_stock
 
 
+class InsufficientStockError(ValueError):
+    """Raised when a checkout line asks for more stock than is on hand."""
+
+    def __init__(self, item_name: str, requested: int = None):
+        self.item_name = item_name
+        self.requested = requested
+        super().__init__(f"Insufficient stock for '{item_name}'")
+
+
 class POSCalculator:
     """Core POS transaction calculations."""
     
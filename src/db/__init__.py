@@ -1,5 +1,14 @@
 """__init__ for db module."""
 from src.db.base import DatabaseAdapter
 from src.db.sqlite_adapter import SQLiteAdapter
+from src.db.postgres_adapter import PostgresAdapter
+from src.db.async_base import AsyncDatabaseAdapter, ThreadedAsyncAdapter
+from src.db.async_sqlite_adapter import AioSQLiteAdapter
+from src.db.async_postgres_adapter import AsyncPGAdapter
+from src.db.factory import create_adapter, create_async_adapter
 
-__all__ = ['DatabaseAdapter', 'SQLiteAdapter']
+__all__ = [
+    'DatabaseAdapter', 'SQLiteAdapter', 'PostgresAdapter', 'create_adapter',
+    'AsyncDatabaseAdapter', 'ThreadedAsyncAdapter', 'AioSQLiteAdapter', 'AsyncPGAdapter',
+    'create_async_adapter',
+]
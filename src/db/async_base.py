@@ -0,0 +1,82 @@
+"""Async database interface for the API's hottest routes.
+
+An AsyncDatabaseAdapter works beside the process's sync DatabaseAdapter on
+the same database: it covers only the calls the async routes make, and
+reports its writes through the sync adapter's write listeners so caches
+built on those (see src/services/cache.py) stay correct.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+
+from src.db.base import DatabaseAdapter
+
+
+class AsyncDatabaseAdapter(ABC):
+    """Abstract interface for the async hot path."""
+
+    def __init__(self, db: DatabaseAdapter):
+        self.db = db
+
+    async def open(self):
+        """Open connections ahead of the first request (optional)."""
+
+    @abstractmethod
+    async def record_checkout(self, cart: list, username: str) -> bool:
+        """Record a cart atomically, like DatabaseAdapter.record_checkout()."""
+        pass
+
+    @abstractmethod
+    async def get_sales_page(self, limit: int = 100, after=None, start_date: str = None,
+                             end_date: str = None, username: str = None, item_name: str = None,
+                             search: str = None) -> tuple:
+        """Get one page of sales, newest first. Returns (rows, next_after).
+
+        Raises ValueError for a malformed after cursor or date.
+        """
+        pass
+
+    @abstractmethod
+    async def get_dashboard_kpis(self, today: str = None) -> dict:
+        """Compute the raw dashboard KPIs, like DatabaseAdapter.get_dashboard_kpis()."""
+        pass
+
+    @abstractmethod
+    async def get_crm_leads(self, stage: str = None) -> list:
+        """Get CRM leads with contact name, optionally filtered by stage."""
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """Close this adapter's connections (the sync adapter is left open)."""
+        pass
+
+    def _notify_writes(self, tables: set):
+        """Report committed writes to the sync adapter's listeners."""
+        self.db.notify_writes(tables)
+
+
+class ThreadedAsyncAdapter(AsyncDatabaseAdapter):
+    """Runs the sync adapter's methods on worker threads.
+
+    Used when no native async driver is installed for the configured
+    database; writes are reported by the sync adapter itself.
+    """
+
+    async def record_checkout(self, cart: list, username: str) -> bool:
+        return await asyncio.to_thread(self.db.record_checkout, cart, username)
+
+    async def get_sales_page(self, limit: int = 100, after=None, start_date: str = None,
+                             end_date: str = None, username: str = None, item_name: str = None,
+                             search: str = None) -> tuple:
+        return await asyncio.to_thread(
+            self.db.get_sales_page, limit, after, start_date, end_date, username, item_name, search
+        )
+
+    async def get_dashboard_kpis(self, today: str = None) -> dict:
+        return await asyncio.to_thread(self.db.get_dashboard_kpis, today)
+
+    async def get_crm_leads(self, stage: str = None) -> list:
+        return await asyncio.to_thread(self.db.get_crm_leads, stage)
+
+    async def close(self):
+        pass
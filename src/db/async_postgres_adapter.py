@@ -0,0 +1,135 @@
+"""asyncpg implementation of AsyncDatabaseAdapter - the API's async hot path on PostgreSQL."""
+import re
+import logging
+from itertools import count
+
+from src.db.async_base import AsyncDatabaseAdapter
+from src.db.base import (
+    checkout_demand, checkout_rows, sales_page_filters, crm_leads_query, kpi_sales_params, kpi_result,
+)
+from src.db.keyset import keyset_query, split_page
+from src.db.postgres_adapter import (
+    _CHECKOUT_STOCK_SQL, _CHECKOUT_SALE_SQL, _KPI_QUERIES, _range_source,
+)
+from src.core import InsufficientStockError
+from src.config import DB_POOL_SIZE, PG_POOL_MIN_SIZE, PG_POOL_TIMEOUT_SECONDS
+
+try:
+    import asyncpg
+except ImportError:  # optional dependency, only needed for the native async API path
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+
+def _numbered(sql: str) -> str:
+    """Turn the sync adapter's %s placeholders into asyncpg's $1, $2, ..."""
+    n = count(1)
+    return re.sub(r'%s', lambda m: f'${next(n)}', sql)
+
+
+async def _configure_connection(conn):
+    """Return text timestamps in UTC, like PostgresAdapter (and SQLite)."""
+    for name in ('date', 'timestamp', 'timestamptz'):
+        await conn.set_type_codec(name, schema='pg_catalog', encoder=str, decoder=str, format='text')
+
+
+class AsyncPGAdapter(AsyncDatabaseAdapter):
+    """AsyncDatabaseAdapter on an asyncpg pool to a PostgresAdapter's database.
+
+    dsn must be a postgresql:// URL (asyncpg does not read libpq key=value
+    strings). The pool is created on open(), or on first use.
+    """
+
+    def __init__(self, db, dsn: str = None, pool_size: int = DB_POOL_SIZE,
+                 min_size: int = PG_POOL_MIN_SIZE, timeout: float = PG_POOL_TIMEOUT_SECONDS):
+        if asyncpg is None:
+            raise ImportError('AsyncPGAdapter needs asyncpg: pip install asyncpg')
+        super().__init__(db)
+        self.dsn = dsn or db.dsn
+        self.pool_size = pool_size
+        self.min_size = min(min_size, pool_size)
+        self.timeout = timeout
+        self._pool = None
+
+    async def open(self):
+        if self._pool is None:
+            self._pool = await asyncpg.create_pool(
+                self.dsn, min_size=self.min_size, max_size=self.pool_size,
+                init=_configure_connection, server_settings={'timezone': 'UTC'},
+            )
+
+    async def _acquire(self):
+        await self.open()
+        return self._pool.acquire(timeout=self.timeout)
+
+    async def record_checkout(self, cart: list, username: str) -> bool:
+        """Record every cart line and decrement stock in one transaction.
+
+        Raises InsufficientStockError, rolling back the whole checkout, when
+        a line is short on stock or names an unknown item.
+        """
+        try:
+            async with await self._acquire() as conn:
+                async with conn.transaction():
+                    for item_name, quantity in checkout_demand(cart).items():
+                        status = await conn.execute(_numbered(_CHECKOUT_STOCK_SQL), quantity, item_name, quantity)
+                        if status != 'UPDATE 1':
+                            raise InsufficientStockError(item_name, quantity)
+                    await conn.executemany(_numbered(_CHECKOUT_SALE_SQL), checkout_rows(cart, username))
+            self._notify_writes({'inventory', 'sales'})
+            return True
+        except InsufficientStockError:
+            raise
+        except Exception as e:
+            logger.error("Error recording checkout: %s", e)
+            return False
+
+    async def get_sales_page(self, limit: int = 100, after=None, start_date: str = None,
+                             end_date: str = None, username: str = None, item_name: str = None,
+                             search: str = None) -> tuple:
+        """Get one page of sales, newest first, with optional filters. Returns (rows, next_after)."""
+        filters, params = sales_page_filters(start_date, end_date, username, item_name, search, '%s', 'ILIKE')
+        try:
+            async with await self._acquire() as conn:
+                horizon = await conn.fetchval(
+                    'SELECT archived_before FROM archive_state WHERE table_name = $1', 'sales'
+                )
+                sql, params = keyset_query(
+                    f'SELECT * FROM {_range_source("sales", horizon, start_date)}', filters, params,
+                    [('sale_date', 'DESC'), ('id', 'DESC')], after, limit, placeholder='%s'
+                )
+                rows = await conn.fetch(_numbered(sql), *params)
+            return split_page([tuple(r) for r in rows], limit, (1, 0))
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting sales page: %s", e)
+            return [], None
+
+    async def get_dashboard_kpis(self, today: str = None) -> dict:
+        """Compute dashboard KPIs with the sync adapter's three aggregate queries."""
+        try:
+            rows = []
+            async with await self._acquire() as conn:
+                for sql, params in zip(_KPI_QUERIES, ((), kpi_sales_params(today), ())):
+                    rows.append(tuple(await conn.fetchrow(_numbered(sql), *params)))
+        except Exception as e:
+            logger.error("Error computing dashboard KPIs: %s", e)
+            return {}
+        return kpi_result(*rows)
+
+    async def get_crm_leads(self, stage: str = None) -> list:
+        """Get CRM leads with contact info, optionally filtered by stage."""
+        sql, params = crm_leads_query(stage, '%s')
+        try:
+            async with await self._acquire() as conn:
+                return [tuple(r) for r in await conn.fetch(_numbered(sql), *params)]
+        except Exception as e:
+            logger.error("Error getting CRM leads: %s", e)
+            return []
+
+    async def close(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await pool.close()
@@ -0,0 +1,172 @@
+"""aiosqlite implementation of AsyncDatabaseAdapter - the API's async hot path on SQLite."""
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from src.db.async_base import AsyncDatabaseAdapter
+from src.db.base import (
+    checkout_demand, checkout_rows, sales_page_filters, crm_leads_query, kpi_sales_params, kpi_result,
+)
+from src.db.keyset import keyset_query, split_page
+from src.db.storage import StorageConnection, pragma_statements
+from src.db.sqlite_adapter import _CHECKOUT_STOCK_SQL, _CHECKOUT_SALE_SQL, _KPI_QUERIES
+from src.core import InsufficientStockError
+from src.config import DB_POOL_SIZE
+
+try:
+    import aiosqlite
+except ImportError:  # optional dependency, only needed for the native async API path
+    aiosqlite = None
+
+logger = logging.getLogger(__name__)
+
+
+class AioSQLiteAdapter(AsyncDatabaseAdapter):
+    """AsyncDatabaseAdapter on aiosqlite connections to a SQLiteAdapter's database.
+
+    Connections use the sync adapter's storage profile and StorageConnection,
+    so locked writes are retried the same way (on aiosqlite's thread, not the
+    event loop). At most pool_size connections (each with its own aiosqlite
+    thread) are in use at once; further requests wait for one to be
+    returned. Returned connections are kept for reuse.
+    """
+
+    def __init__(self, db, pool_size: int = DB_POOL_SIZE):
+        if aiosqlite is None:
+            raise ImportError('AioSQLiteAdapter needs aiosqlite: pip install aiosqlite')
+        super().__init__(db)
+        self.pool_size = pool_size
+        self._idle = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self._factory = type('AsyncStorageConnection', (StorageConnection,), {'write_retries': db.write_retries})
+
+    async def _connect(self):
+        conn = await aiosqlite.connect(self.db.db_file, factory=self._factory)
+        try:
+            for statement in pragma_statements(self.db.pragmas):
+                await conn.execute(statement)
+        except Exception:
+            await conn.close()
+            raise
+        return conn
+
+    @asynccontextmanager
+    async def _connection(self):
+        """Borrow an idle connection (or open one) once fewer than pool_size are in use.
+
+        Rolls back on error.
+        """
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    await conn.rollback()
+                raise
+            finally:
+                self._idle.append(conn)
+
+    async def open(self):
+        async with self._connection():
+            pass
+
+    async def record_checkout(self, cart: list, username: str) -> bool:
+        """Record every cart line and decrement stock in one transaction.
+
+        Raises InsufficientStockError, rolling back the whole checkout, when
+        a line is short on stock or names an unknown item.
+        """
+        try:
+            async with self._connection() as conn:
+                for item_name, quantity in checkout_demand(cart).items():
+                    async with conn.execute(_CHECKOUT_STOCK_SQL, (quantity, item_name, quantity)) as cursor:
+                        if cursor.rowcount != 1:
+                            raise InsufficientStockError(item_name, quantity)
+                await conn.executemany(_CHECKOUT_SALE_SQL, checkout_rows(cart, username))
+                await conn.commit()
+            self._notify_writes({'inventory', 'sales'})
+            return True
+        except InsufficientStockError:
+            raise
+        except Exception as e:
+            logger.error("Error recording checkout: %s", e)
+            return False
+
+    async def _archive_horizon(self, table: str, start_date: str = None, end_date: str = None):
+        """The archive horizon of table if a [start_date, end_date] read reaches archived years, else None."""
+        sql = 'SELECT year FROM archive_partitions WHERE table_name = ? AND row_count > 0'
+        params = [table]
+        if start_date:
+            sql += ' AND year >= ?'
+            params.append(int(start_date[:4]))
+        if end_date:
+            sql += ' AND year <= ?'
+            params.append(int(end_date[:4]))
+        async with self._connection() as conn:
+            async with conn.execute(sql, params) as cursor:
+                years = [row[0] for row in await cursor.fetchall()]
+            if not any(os.path.exists(self.db.archive_path(y)) for y in years):
+                return None
+            async with conn.execute('SELECT archived_before FROM archive_state WHERE table_name = ?',
+                                    (table,)) as cursor:
+                row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def get_sales_page(self, limit: int = 100, after=None, start_date: str = None,
+                             end_date: str = None, username: str = None, item_name: str = None,
+                             search: str = None) -> tuple:
+        """Get one page of sales, newest first, with optional filters. Returns (rows, next_after).
+
+        Rows from the archive horizon on are read here; a page that runs past
+        them into archived years is read by the sync adapter on a worker
+        thread, since it needs the archive databases attached.
+        """
+        try:
+            horizon = await self._archive_horizon('sales', start_date, end_date)
+            src = 'sales' if horizon is None else self.db.live_source('sales', horizon)
+            filters, params = sales_page_filters(start_date, end_date, username, item_name, search)
+            sql, params = keyset_query(f'SELECT * FROM {src}', filters, params,
+                                       [('sale_date', 'DESC'), ('id', 'DESC')], after, limit)
+            async with self._connection() as conn:
+                async with conn.execute(sql, params) as cursor:
+                    rows = list(await cursor.fetchall())
+            if horizon is not None and len(rows) <= limit:
+                return await asyncio.to_thread(
+                    self.db.get_sales_page, limit, after, start_date, end_date, username, item_name, search
+                )
+            return split_page(rows, limit, (1, 0))
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting sales page: %s", e)
+            return [], None
+
+    async def get_dashboard_kpis(self, today: str = None) -> dict:
+        """Compute dashboard KPIs with the sync adapter's three aggregate queries."""
+        try:
+            rows = []
+            async with self._connection() as conn:
+                for sql, params in zip(_KPI_QUERIES, ((), kpi_sales_params(today), ())):
+                    async with conn.execute(sql, params) as cursor:
+                        rows.append(await cursor.fetchone())
+        except Exception as e:
+            logger.error("Error computing dashboard KPIs: %s", e)
+            return {}
+        return kpi_result(*rows)
+
+    async def get_crm_leads(self, stage: str = None) -> list:
+        """Get CRM leads with contact info, optionally filtered by stage."""
+        try:
+            async with self._connection() as conn:
+                async with conn.execute(*crm_leads_query(stage)) as cursor:
+                    return list(await cursor.fetchall())
+        except Exception as e:
+            logger.error("Error getting CRM leads: %s", e)
+            return []
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await conn.close()
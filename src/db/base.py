@@ -1,10 +1,110 @@
 """Abstract database interface - allows swapping SQLite for Cloud DB."""
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+# Passed to write listeners, with every table name, when the whole database
+# was replaced (e.g. restored from a backup).
+ALL_TABLES = '*'
+
+
+def checkout_demand(cart: list) -> dict:
+    """Total quantity per item across the lines of a checkout cart."""
+    demand = {}
+    for line in cart:
+        demand[line['item_name']] = demand.get(line['item_name'], 0) + line['quantity']
+    return demand
+
+
+def checkout_rows(cart: list, username: str) -> list:
+    """sales rows to insert for a checkout cart."""
+    return [(line['item_name'], line['quantity'], line['sale_price'], line['total_amount'], username)
+            for line in cart]
+
+
+def day_range(start_date: str, end_date: str = None) -> tuple:
+    """Turn inclusive YYYY-MM-DD day bounds into a half-open [start, end) range.
+
+    sale_date and the other timestamps are compared raw against day bounds,
+    which keeps the predicate on their indexes — wrapping the column in
+    DATE() would not.
+    """
+    end_date = end_date or start_date
+    next_day = datetime.strptime(end_date[:10], "%Y-%m-%d") + timedelta(days=1)
+    return start_date[:10], next_day.strftime("%Y-%m-%d")
+
+
+def sales_page_filters(start_date: str = None, end_date: str = None, username: str = None,
+                       item_name: str = None, search: str = None, placeholder: str = '?',
+                       like: str = 'LIKE') -> tuple:
+    """WHERE filters and params for get_sales_page(). Returns (filters, params).
+
+    like is the case-insensitive match operator (ILIKE on PostgreSQL).
+    """
+    filters, params = [], []
+    if start_date:
+        filters.append(f'sale_date >= {placeholder}')
+        params.append(start_date[:10])
+    if end_date:
+        filters.append(f'sale_date < {placeholder}')
+        params.append(day_range(end_date)[1])
+    if username:
+        filters.append(f'username = {placeholder}')
+        params.append(username)
+    if item_name:
+        filters.append(f'item_name = {placeholder}')
+        params.append(item_name)
+    if search:
+        filters.append(f'(item_name {like} {placeholder} OR username {like} {placeholder})')
+        params.extend([f'%{search}%'] * 2)
+    return filters, params
+
+
+def crm_leads_query(stage: str = None, placeholder: str = '?') -> tuple:
+    """SQL and params for get_crm_leads(). Returns (sql, params)."""
+    sql = 'SELECT l.*, c.name as contact_name FROM crm_leads l LEFT JOIN crm_contacts c ON l.contact_id = c.id'
+    if stage:
+        return sql + f' WHERE l.stage = {placeholder} ORDER BY l.created_at DESC', (stage,)
+    return sql + ' ORDER BY l.created_at DESC', ()
+
+
+def kpi_sales_params(today: str = None) -> tuple:
+    """Parameters of the dashboard KPI sales query: today, then the last 7 days and the 7 before."""
+    today_dt = datetime.strptime(today[:10], "%Y-%m-%d") if today else datetime.now()
+    day = today_dt.strftime("%Y-%m-%d")
+    week_ago = (today_dt - timedelta(days=7)).strftime("%Y-%m-%d")
+    two_weeks_ago = (today_dt - timedelta(days=14)).strftime("%Y-%m-%d")
+    return day, week_ago, day, two_weeks_ago, week_ago
+
+
+def kpi_result(inventory_row, sales_row, crm_row) -> dict:
+    """Assemble get_dashboard_kpis() from the rows of its three aggregate queries."""
+    inventory_value, total_items, low_stock_count = inventory_row
+    all_total, sales_days, today_total, week_total, prior_week_total = sales_row
+    pipeline_value, won, lost = crm_row
+    return {
+        'inventory_value': inventory_value,
+        'total_items': total_items,
+        'low_stock_count': low_stock_count,
+        'today_total': today_total,
+        'all_total': all_total,
+        'sales_days': sales_days,
+        'week_total': week_total,
+        'prior_week_total': prior_week_total,
+        'pipeline_value': pipeline_value,
+        'won_leads': won,
+        'lost_leads': lost,
+    }
 
 
 class DatabaseAdapter(ABC):
     """Abstract interface for database operations."""
     
+    # === SCHEMA ===
+    @abstractmethod
+    def get_schema_version(self) -> int:
+        """Get the highest schema migration applied to this database."""
+        pass
+
     # === USERS & AUTH ===
     @abstractmethod
     def create_admin_user(self, username: str, password_hash: str):
@@ -32,6 +132,11 @@ class DatabaseAdapter(ABC):
         """Get all inventory items."""
         pass
     
+    @abstractmethod
+    def get_inventory_page(self, limit: int = 100, after=None, low_stock: bool = False) -> tuple:
+        """Get one keyset page of inventory ordered by name. Returns (rows, next_after)."""
+        pass
+
     @abstractmethod
     def get_inventory_by_name(self, name: str) -> dict:
         """Get inventory item by name."""
@@ -61,6 +166,22 @@ class DatabaseAdapter(ABC):
     def search_inventory(self, query: str) -> list:
         """Search inventory by name or description."""
         pass
+
+    @abstractmethod
+    def get_inventory_count(self) -> int:
+        """Count inventory items."""
+        pass
+
+    @abstractmethod
+    def iter_inventory(self):
+        """Stream (item_name, quantity, threshold, cost_price, sale_price, description) rows."""
+        pass
+
+    @abstractmethod
+    def upsert_inventory_items(self, rows: list) -> int:
+        """Insert or update (item_name, quantity, threshold, cost_price, sale_price, description)
+        rows by item_name in one transaction. Returns rows written or -1 on error."""
+        pass
     
     # === SALES & POS ===
     @abstractmethod
@@ -69,6 +190,19 @@ class DatabaseAdapter(ABC):
         """Record a sale transaction."""
         pass
     
+    @abstractmethod
+    def record_checkout(self, cart: list, username: str) -> bool:
+        """Record every cart line and decrement stock in one transaction.
+
+        Raises InsufficientStockError (and records nothing) if any line is short.
+        """
+        pass
+
+    @abstractmethod
+    def iter_sales(self, start_date: str = None, end_date: str = None):
+        """Stream sales rows oldest first, optionally bounded by inclusive days."""
+        pass
+
     @abstractmethod
     def get_sales_by_date(self, date_str: str) -> list:
         """Get all sales for a specific date."""
@@ -79,6 +213,16 @@ class DatabaseAdapter(ABC):
         """Get all sales transactions."""
         pass
 
+    @abstractmethod
+    def get_sales_page(self, limit: int = 100, after=None, start_date: str = None,
+                       end_date: str = None, username: str = None, item_name: str = None,
+                       search: str = None) -> tuple:
+        """Get one keyset page of sales, newest first. Returns (rows, next_after).
+
+        Raises ValueError for a malformed after cursor or date.
+        """
+        pass
+
     @abstractmethod
     def get_sales_between(self, start_date: str, end_date: str) -> list:
         """Get all sales between start_date and end_date (inclusive)."""
@@ -93,6 +237,26 @@ class DatabaseAdapter(ABC):
     def get_sales_trend_by_day(self, start_date: str, end_date: str) -> list:
         """Get sales totals grouped by day between dates."""
         pass
+
+    @abstractmethod
+    def get_daily_item_quantities(self, start_date: str, end_date: str) -> list:
+        """Get (day, item_name, quantity) for every day and item with sales between dates."""
+        pass
+
+    @abstractmethod
+    def get_dashboard_kpis(self, today: str = None) -> dict:
+        """Compute inventory, sales and pipeline KPIs in aggregate queries."""
+        pass
+
+    @abstractmethod
+    def iter_changes(self, table: str, since=None, batch_size: int = 1000):
+        """Stream rows of sales/inventory/payrolls written after a watermark."""
+        pass
+
+    @abstractmethod
+    def rebuild_sales_rollup(self, start_date: str = None, end_date: str = None) -> int:
+        """Recompute the daily per-item sales rollup from raw sales."""
+        pass
     
     # === HR ===
     @abstractmethod
@@ -108,6 +272,12 @@ class DatabaseAdapter(ABC):
         """Get all employees."""
         pass
     
+    @abstractmethod
+    def get_employees_page(self, limit: int = 100, after=None, team: str = None,
+                           is_active: int = None, search: str = None) -> tuple:
+        """Get one keyset page of employees ordered by name. Returns (rows, next_after)."""
+        pass
+
     @abstractmethod
     def get_employee_by_id(self, emp_id: int) -> dict:
         """Get employee by ID."""
@@ -154,6 +324,11 @@ class DatabaseAdapter(ABC):
         """Get all visitors."""
         pass
     
+    @abstractmethod
+    def get_visitors_page(self, limit: int = 100, after=None, search: str = None) -> tuple:
+        """Get one keyset page of visitors ordered by name. Returns (rows, next_after)."""
+        pass
+
     @abstractmethod
     def update_visitor(self, visitor_id: int, **kwargs):
         """Update visitor details."""
@@ -181,6 +356,42 @@ class DatabaseAdapter(ABC):
         """Get email configuration."""
         pass
     
+    # === EMAIL QUEUE ===
+    @abstractmethod
+    def enqueue_email(self, subject: str, body: str, recipient: str = None) -> int:
+        """Queue an email for the background sender. Returns the queue id or -1."""
+        pass
+
+    @abstractmethod
+    def claim_emails(self, limit: int = 20, stale_after_seconds: int = 600) -> list:
+        """Mark due emails as 'sending'; return (id, recipient, subject, body, attempts) rows."""
+        pass
+
+    @abstractmethod
+    def release_emails(self, email_ids: list) -> bool:
+        """Put claimed emails back to 'pending' without counting an attempt."""
+        pass
+
+    @abstractmethod
+    def mark_email_sent(self, email_id: int) -> bool:
+        """Record a successful delivery."""
+        pass
+
+    @abstractmethod
+    def mark_email_failed(self, email_id: int, error: str, retry_in_seconds: float = None) -> bool:
+        """Record a failed attempt: retry after retry_in_seconds, or give up if None."""
+        pass
+
+    @abstractmethod
+    def get_queued_email(self, email_id: int) -> dict:
+        """Get one queued email's delivery status."""
+        pass
+
+    @abstractmethod
+    def get_email_queue_counts(self) -> dict:
+        """Count queued emails by status."""
+        pass
+
     # === COMPANY INFO ===
     @abstractmethod
     def save_company_info(self, company_name: str, address: str, phone: str,
@@ -200,8 +411,43 @@ class DatabaseAdapter(ABC):
         pass
     
     @abstractmethod
-    def get_activity_log(self, username: str = None) -> list:
-        """Get activity log, optionally filtered by user."""
+    def log_activities(self, entries: list) -> int:
+        """Insert (timestamp, username, action, details) rows. Returns rows written or -1."""
+        pass
+    
+    @abstractmethod
+    def get_activity_log(self, username: str = None, start_date: str = None,
+                         end_date: str = None, limit: int = None) -> list:
+        """Get activity log newest first, optionally filtered by user and day range."""
+        pass
+
+    # === BACKUP ===
+    @abstractmethod
+    def backup_to(self, dest_path: str, pages_per_step: int = 256, step_sleep_ms: int = 10,
+                  progress=None, max_restarts: int = 5) -> int:
+        """Copy a consistent snapshot of the live database to dest_path. Returns pages or -1."""
+        pass
+
+    @abstractmethod
+    def restore_from(self, src_path: str) -> bool:
+        """Replace the live database's contents with a snapshot."""
+        pass
+
+    # === ARCHIVE ===
+    @abstractmethod
+    def archive_rows(self, table: str, before: str) -> dict:
+        """Move sales/activity_log rows dated before `before` to per-year archives.
+        Returns {year: rows moved}, or None on error."""
+        pass
+
+    @abstractmethod
+    def get_archive_horizon(self, table: str) -> str:
+        """Day before which table's rows have been archived, or None."""
+        pass
+
+    @abstractmethod
+    def get_archive_partitions(self, table: str = None) -> list:
+        """List (table_name, year, row_count, path) archive partitions."""
         pass
 
     # === PAYROLL ===
@@ -218,6 +464,11 @@ class DatabaseAdapter(ABC):
         """Get all payroll records."""
         pass
 
+    @abstractmethod
+    def iter_payrolls(self):
+        """Stream payroll rows joined with employee number and name."""
+        pass
+
     @abstractmethod
     def get_payrolls_by_employee(self, employee_id: int) -> list:
         """Get payroll records for an employee."""
@@ -0,0 +1,46 @@
+"""Build the DatabaseAdapter (and its async companion) selected in src/config.py."""
+import logging
+
+from src.config import get_db_config, API_ASYNC_DB
+from src.db.base import DatabaseAdapter
+from src.db.sqlite_adapter import SQLiteAdapter
+from src.db.postgres_adapter import PostgresAdapter
+from src.db.async_base import AsyncDatabaseAdapter, ThreadedAsyncAdapter
+from src.db.async_sqlite_adapter import AioSQLiteAdapter
+from src.db.async_postgres_adapter import AsyncPGAdapter
+
+logger = logging.getLogger(__name__)
+
+
+def create_adapter(db_config: dict = None) -> DatabaseAdapter:
+    """Open the adapter described by db_config (default: get_db_config()).
+
+    Opening brings the schema up to date. Processes opening the same
+    database at once are serialised by the migration lock, so only the
+    first applies pending migrations; the rest see a current version.
+    """
+    config = db_config or get_db_config()
+    if config['type'] == 'sqlite':
+        return SQLiteAdapter(config['path'])
+    if config['type'] == 'postgresql':
+        return PostgresAdapter(config['url'])
+    raise ValueError(f"Unknown database type: {config['type']}")
+
+
+def create_async_adapter(db: DatabaseAdapter, mode: str = API_ASYNC_DB) -> AsyncDatabaseAdapter:
+    """Build the AsyncDatabaseAdapter for an open sync adapter's database.
+
+    mode 'native' uses aiosqlite or asyncpg when installed and falls back to
+    running the sync adapter on worker threads otherwise; 'threaded' always
+    does the latter.
+    """
+    if mode not in ('native', 'threaded'):
+        raise ValueError(f"Unknown async database mode: {mode}")
+    if mode == 'native':
+        native = {SQLiteAdapter: AioSQLiteAdapter, PostgresAdapter: AsyncPGAdapter}.get(type(db))
+        if native is not None:
+            try:
+                return native(db)
+            except ImportError as e:
+                logger.info("Async routes will use worker threads: %s", e)
+    return ThreadedAsyncAdapter(db)
@@ -0,0 +1,49 @@
+"""Keyset (seek) pagination shared by the adapters."""
+
+
+def keyset_query(select_sql: str, filters: list, params: list, order: list, after=None,
+                 limit: int = 100, placeholder: str = '?') -> tuple:
+    """Build a keyset-paginated SELECT fetching one row past the page. Returns (sql, params).
+
+    order is a list of (column, 'ASC'|'DESC') whose last column is unique.
+    after holds the sort-key values of the last row of the previous page;
+    raises ValueError unless it has one scalar value per sort column.
+    """
+    filters, params = list(filters), list(params)
+    if after is not None:
+        check_after(after, len(order))
+    if after:
+        # (a, b) after (x, y) in sort order  ->  a op x OR (a = x AND b op y)
+        clauses, eq_params = [], []
+        for i, (col, direction) in enumerate(order):
+            op = '<' if direction == 'DESC' else '>'
+            eq = ' AND '.join(f'{c} = {placeholder}' for c, _ in order[:i])
+            clauses.append(f'({eq + " AND " if eq else ""}{col} {op} {placeholder})')
+            params.extend(eq_params + [after[i]])
+            eq_params.append(after[i])
+        filters.append('(' + ' OR '.join(clauses) + ')')
+    sql = select_sql
+    if filters:
+        sql += ' WHERE ' + ' AND '.join(filters)
+    sql += ' ORDER BY ' + ', '.join(f'{c} {d}' for c, d in order) + f' LIMIT {placeholder}'
+    params.append(limit + 1)
+    return sql, params
+
+
+def check_after(after, keys: int):
+    """Raise ValueError unless after holds one str/int/float value for each of keys sort columns."""
+    if (not isinstance(after, (list, tuple)) or len(after) != keys
+            or not all(isinstance(v, (str, int, float)) and not isinstance(v, bool) for v in after)):
+        raise ValueError(f"Invalid page cursor: expected {keys} sort-key values")
+
+
+def split_page(rows: list, limit: int, key_index: tuple) -> tuple:
+    """Trim rows fetched by keyset_query to one page. Returns (rows, next_after).
+
+    key_index gives the positions of the sort columns in each row;
+    next_after is None when there are no further rows.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, [rows[-1][i] for i in key_index]
@@ -0,0 +1,144 @@
+"""Versioned schema migrations.
+
+Each database records the migrations applied to it in a ``schema_version``
+table. Opening an up-to-date database costs one ``MAX(version)`` lookup;
+pending migrations are applied in order inside a single transaction that
+also records them, so a failed upgrade leaves the schema as it was.
+
+The runner works on any DB-API connection. Each adapter's schema is a list
+of Python migrations (sqlite_schema, postgres_schema). The numbered
+``migrations/NNN_name.sql`` files at the project root are the Supabase web
+database's schema; they are tracked in their own ``web_schema_version``
+table so they can share a Postgres database with the adapter's schema.
+"""
+import os
+import re
+import sqlite3
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# apply is a callable(cursor) or a string of SQL statements.
+Migration = namedtuple('Migration', 'version name apply')
+
+SQL_MIGRATIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../migrations'))
+
+SQL_MIGRATIONS_TABLE = 'web_schema_version'
+
+_SQL_FILE_RE = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+_CREATE_VERSION_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# dialect -> (statements that open the migration transaction and lock out
+# other migrators, parameter placeholder)
+_DIALECTS = {
+    'sqlite': (('BEGIN IMMEDIATE', _CREATE_VERSION_TABLE), '?'),
+    # psycopg opens the transaction itself.
+    'postgres': ((_CREATE_VERSION_TABLE, 'LOCK TABLE {table} IN EXCLUSIVE MODE'), '%s'),
+}
+
+
+def load_sql_migrations(directory: str = SQL_MIGRATIONS_DIR) -> list:
+    """Read NNN_name.sql files from directory as Migrations, ordered by version."""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _SQL_FILE_RE.match(filename)
+        if match:
+            with open(os.path.join(directory, filename), encoding='utf-8') as f:
+                migrations.append(Migration(int(match.group(1)), match.group(2), f.read()))
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+def current_version(conn, table: str = 'schema_version') -> int:
+    """The highest applied migration version, or 0 for an unversioned database."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f'SELECT MAX(version) FROM {table}')
+        return cursor.fetchone()[0] or 0
+    except Exception:
+        # No version table yet; Postgres also needs the failed statement cleared.
+        conn.rollback()
+        return 0
+
+
+def migrate(conn, migrations: list, dialect: str = 'sqlite', table: str = 'schema_version') -> list:
+    """Apply every migration newer than the database's version. Returns the versions applied.
+
+    All pending migrations run in one transaction; on error it is rolled
+    back and the exception re-raised.
+    """
+    if dialect not in _DIALECTS:
+        raise ValueError(f"Unknown migration dialect: {dialect}")
+    latest = max((m.version for m in migrations), default=0)
+    if current_version(conn, table) >= latest:
+        return []
+
+    begin, placeholder = _DIALECTS[dialect]
+    cursor = conn.cursor()
+    applied = []
+    try:
+        for statement in begin:
+            cursor.execute(statement.format(table=table))
+        # Re-read under the lock: another process may have migrated meanwhile.
+        cursor.execute(f'SELECT MAX(version) FROM {table}')
+        version = cursor.fetchone()[0] or 0
+        for migration in sorted(migrations, key=lambda m: m.version):
+            if migration.version <= version:
+                continue
+            logger.info("Applying migration %03d_%s", migration.version, migration.name)
+            if callable(migration.apply):
+                migration.apply(cursor)
+            else:
+                _execute_script(cursor, migration.apply, dialect)
+            cursor.execute(
+                f'INSERT INTO {table} (version, name) VALUES ({placeholder}, {placeholder})',
+                (migration.version, migration.name)
+            )
+            applied.append(migration.version)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return applied
+
+
+def stamp(conn, migrations: list, version: int, dialect: str = 'sqlite', table: str = 'schema_version') -> list:
+    """Record migrations up to version as applied without running them.
+
+    For databases whose schema was set up by hand before it was versioned.
+    Returns the versions recorded.
+    """
+    return migrate(conn, [m._replace(apply=_skip) for m in migrations if m.version <= version], dialect, table)
+
+
+def _skip(cursor):
+    pass
+
+
+def _execute_script(cursor, sql: str, dialect: str):
+    """Run a multi-statement script on cursor without leaving the open transaction."""
+    if dialect != 'sqlite':
+        cursor.execute(sql)
+        return
+    # sqlite3's executescript() commits first, so feed complete statements one by one.
+    statement = ''
+    for line in sql.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            if statement.strip():
+                cursor.execute(statement)
+            statement = ''
+    leftover = '\n'.join(l for l in statement.splitlines() if not l.strip().startswith('--')).strip()
+    if leftover:
+        raise ValueError(f"Incomplete SQL statement in migration: {leftover[:80]}")
@@ -0,0 +1,172 @@
+"""Thread-aware SQLite connection pool used by SQLiteAdapter.
+
+Each worker thread keeps one long-lived connection to the database file, so
+FastAPI's threadpool and the Tkinter main loop stop paying the
+connect/parse-schema cost on every adapter call.
+"""
+import os
+import sqlite3
+import threading
+import time
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledConnection:
+    """A pooled connection plus the bookkeeping the pool needs."""
+
+    __slots__ = ('conn', 'thread', 'pid', 'last_used', 'depth')
+
+    def __init__(self, conn: sqlite3.Connection, thread: threading.Thread):
+        self.conn = conn
+        self.thread = thread
+        self.pid = os.getpid()
+        self.last_used = time.monotonic()
+        self.depth = 0
+
+
+class SQLiteConnectionPool:
+    """Hand out one persistent connection per thread.
+
+    - ``pool_size`` caps how many idle connections are retained. When more
+      threads than that are active, connections owned by finished threads are
+      pruned first; any remaining overflow connection is closed on release.
+    - Connections idle for longer than ``health_check_interval`` seconds are
+      probed with ``SELECT 1`` and transparently reopened if broken.
+    - Nested ``connection()`` blocks on the same thread share one connection
+      and only the outermost block commits or rolls back.
+    """
+
+    def __init__(self, db_file: str, pool_size: int = 8, health_check_interval: float = 30.0,
+                 on_connect=None, factory=sqlite3.Connection, on_commit=None):
+        self.db_file = db_file
+        self.pool_size = max(1, int(pool_size))
+        self.health_check_interval = health_check_interval
+        self.on_connect = on_connect
+        self.factory = factory
+        self.on_commit = on_commit
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._conns: dict = {}   # thread ident -> retained _PooledConnection
+        self._pid = os.getpid()
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Connection lifecycle
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        # Thread affinity is enforced by the pool itself; allowing cross-thread
+        # use lets close() and pruning clean up connections of other threads.
+        conn = sqlite3.connect(self.db_file, check_same_thread=False, factory=self.factory)
+        if self.on_connect:
+            self.on_connect(conn)
+        return conn
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _reset_after_fork(self):
+        """Drop connections inherited from a parent process (never share them)."""
+        if os.getpid() != self._pid:
+            self._conns = {}
+            self._pid = os.getpid()
+
+    def _prune_dead_threads(self):
+        for ident, pooled in list(self._conns.items()):
+            if not pooled.thread.is_alive():
+                del self._conns[ident]
+                try:
+                    pooled.conn.close()
+                except sqlite3.Error:
+                    pass
+
+    def _acquire(self) -> _PooledConnection:
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+        pooled = getattr(self._local, 'pooled', None)
+        if pooled is not None and pooled.pid == os.getpid():
+            if (pooled.depth == 0
+                    and time.monotonic() - pooled.last_used > self.health_check_interval
+                    and not self._is_healthy(pooled.conn)):
+                logger.warning("Replacing unhealthy SQLite connection for %s", self.db_file)
+                pooled.conn = self._connect()
+            return pooled
+        pooled = _PooledConnection(self._connect(), threading.current_thread())
+        self._local.pooled = pooled
+        with self._lock:
+            self._reset_after_fork()
+            # Thread idents are reused: an entry under ours belongs to a finished thread
+            stale = self._conns.pop(threading.get_ident(), None)
+            if stale is not None:
+                try:
+                    stale.conn.close()
+                except sqlite3.Error:
+                    pass
+            if len(self._conns) >= self.pool_size:
+                self._prune_dead_threads()
+            if len(self._conns) < self.pool_size:
+                self._conns[threading.get_ident()] = pooled
+        return pooled
+
+    def _release(self, pooled: _PooledConnection):
+        pooled.last_used = time.monotonic()
+        with self._lock:
+            retained = self._conns.get(threading.get_ident()) is pooled
+        if not retained or self._closed:
+            self._local.pooled = None
+            pooled.conn.close()
+
+    @staticmethod
+    def _take_written_tables(conn) -> set:
+        take = getattr(conn, 'take_written_tables', None)
+        return take() if take else set()
+
+    @contextmanager
+    def connection(self):
+        """Yield this thread's connection; the outermost block commits or rolls back.
+
+        After a successful outermost commit, on_commit (if set) receives the
+        set of tables the transaction wrote to.
+        """
+        pooled = self._acquire()
+        pooled.depth += 1
+        try:
+            yield pooled.conn
+            if pooled.depth == 1:
+                pooled.conn.commit()
+                tables = self._take_written_tables(pooled.conn)
+                if tables and self.on_commit:
+                    self.on_commit(tables)
+        except Exception:
+            if pooled.depth == 1:
+                pooled.conn.rollback()
+                self._take_written_tables(pooled.conn)
+            raise
+        finally:
+            pooled.depth -= 1
+            if pooled.depth == 0:
+                self._release(pooled)
+
+    def close(self):
+        """Close every retained connection. The pool refuses new work afterwards."""
+        with self._lock:
+            self._closed = True
+            conns, self._conns = self._conns, {}
+        for pooled in conns.values():
+            try:
+                pooled.conn.close()
+            except sqlite3.Error as e:
+                logger.error("Error closing pooled connection: %s", e)
+
+    def stats(self) -> dict:
+        """Return a small snapshot for diagnostics."""
+        with self._lock:
+            return {'size': len(self._conns), 'max_size': self.pool_size, 'closed': self._closed}
@@ -0,0 +1,1725 @@
+"""PostgreSQL implementation of DatabaseAdapter - for shared/server deployments.
+
+Needs psycopg 3 and its pool: pip install "psycopg[binary,pool]".
+Connections come from a psycopg_pool.ConnectionPool shared by every thread;
+long reads stream through server-side cursors and bulk loads use COPY.
+Rows come back in the same shape as SQLiteAdapter's, with timestamps and
+dates as 'YYYY-MM-DD HH:MM:SS' / 'YYYY-MM-DD' text.
+"""
+import re
+import logging
+import threading
+from contextlib import contextmanager
+from src.db.base import (
+    DatabaseAdapter, checkout_demand, checkout_rows, day_range, sales_page_filters, crm_leads_query,
+    kpi_sales_params, kpi_result,
+)
+from src.db.migrations import (
+    migrate, stamp, current_version, load_sql_migrations, SQL_MIGRATIONS_DIR, SQL_MIGRATIONS_TABLE,
+)
+from src.db.keyset import keyset_query, split_page
+from src.db.postgres_schema import MIGRATIONS, SEARCH_DOCUMENTS
+from src.db.storage import written_table
+from src.core import PasswordManager, InsufficientStockError
+from src.config import (
+    ADMIN_USERNAME, ADMIN_PASSWORD, DB_URL, DB_POOL_SIZE,
+    PG_POOL_MIN_SIZE, PG_POOL_TIMEOUT_SECONDS,
+)
+
+try:
+    import psycopg
+    from psycopg.types.string import TextLoader
+    from psycopg_pool import ConnectionPool
+except ImportError:  # optional dependency, only needed for DB_TYPE=postgresql
+    psycopg = None
+
+logger = logging.getLogger(__name__)
+
+_COPY_TABLE_RE = re.compile(r'^\s*COPY\s+(\w+)', re.IGNORECASE)
+
+# Prefix query over a SEARCH_DOCUMENTS expression (uses the GIN index)
+_TS_QUERY = "to_tsquery('simple', %s)"
+
+
+# Hot-path statements, shared with the async adapter
+_CHECKOUT_STOCK_SQL = ('UPDATE inventory SET quantity = quantity - %s, updated_at = CURRENT_TIMESTAMP '
+                       'WHERE item_name = %s AND quantity >= %s')
+_CHECKOUT_SALE_SQL = ('INSERT INTO sales (item_name, quantity, sale_price, total_amount, username) '
+                      'VALUES (%s, %s, %s, %s, %s)')
+
+# Dashboard KPI aggregates, in the order kpi_result() takes their rows
+_KPI_QUERIES = (
+    '''
+    SELECT COALESCE(SUM(quantity * cost_price), 0),
+           COUNT(*),
+           COUNT(*) FILTER (WHERE quantity <= threshold AND threshold > 0)
+    FROM inventory
+    ''',
+    '''
+    SELECT COALESCE(SUM(total_amount), 0),
+           COUNT(DISTINCT sale_day),
+           COALESCE(SUM(total_amount) FILTER (WHERE sale_day = %s), 0),
+           COALESCE(SUM(total_amount) FILTER (WHERE sale_day BETWEEN %s AND %s), 0),
+           COALESCE(SUM(total_amount) FILTER (WHERE sale_day BETWEEN %s AND %s), 0)
+    FROM sales_daily_item
+    ''',
+    '''
+    SELECT COALESCE(SUM(value) FILTER (WHERE COALESCE(stage, '') != 'Lost'), 0),
+           COUNT(*) FILTER (WHERE stage = 'Won'),
+           COUNT(*) FILTER (WHERE stage = 'Lost')
+    FROM crm_leads
+    ''',
+)
+
+
+def _range_source(table: str, horizon: str = None, start_date: str = None) -> str:
+    """FROM-clause source for table given its archive horizon: the table, or it UNION ALL its archive."""
+    if horizon and (not start_date or start_date[:10] < horizon):
+        return f'(SELECT * FROM {table} UNION ALL SELECT * FROM {table}_archive) AS {table}'
+    return table
+
+
+def _ts_query(query: str):
+    """Turn free text into a tsquery where every word is a prefix match.
+
+    Returns None if the text has no searchable words.
+    """
+    words = re.findall(r'\w+', query or '')
+    return ' & '.join(f'{w}:*' for w in words) or None
+
+
+class _TrackingCursor:
+    """psycopg cursor that records which tables its statements write to."""
+
+    def __init__(self, cursor, written: set):
+        self._cursor = cursor
+        self._written = written
+
+    def _note(self, table):
+        if table:
+            self._written.add(table)
+
+    def execute(self, sql, params=None):
+        self._note(written_table(sql))
+        return self._cursor.execute(sql, params)
+
+    def executemany(self, sql, params_seq):
+        self._note(written_table(sql))
+        return self._cursor.executemany(sql, params_seq)
+
+    def copy(self, statement):
+        match = _COPY_TABLE_RE.match(statement)
+        self._note(match.group(1).lower() if match else None)
+        return self._cursor.copy(statement)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class PostgresAdapter(DatabaseAdapter):
+    """PostgreSQL database adapter - implements abstract DatabaseAdapter interface."""
+
+    # Tables written implicitly by triggers when the key table changes
+    _DERIVED_TABLES = {'sales': ('sales_daily_item',)}
+
+    # Change feeds for incremental exports: table -> (watermark column, columns).
+    _CHANGE_FEEDS = {
+        'sales': ('id', ('id', 'sale_date', 'item_name', 'quantity', 'sale_price', 'total_amount', 'username')),
+        'inventory': ('updated_at', ('id', 'item_name', 'quantity', 'threshold', 'cost_price', 'sale_price',
+                                     'description', 'updated_at')),
+        'payrolls': ('updated_at', ('id', 'employee_id', 'period_start', 'period_end', 'base_salary',
+                                    'allowances', 'deductions', 'overtime_hours', 'overtime_rate',
+                                    'gross_pay', 'net_pay', 'status', 'paid_date', 'created_at', 'updated_at')),
+    }
+
+    # Tables that can be archived: table -> date column.
+    # Rows move to <table>_archive in the same database.
+    _ARCHIVE_TABLES = {'sales': 'sale_date', 'activity_log': 'timestamp'}
+
+    def __init__(self, dsn: str = DB_URL, pool_size: int = DB_POOL_SIZE,
+                 min_size: int = PG_POOL_MIN_SIZE, timeout: float = PG_POOL_TIMEOUT_SECONDS):
+        if psycopg is None:
+            raise ImportError('PostgresAdapter needs psycopg: pip install "psycopg[binary,pool]"')
+        self.dsn = dsn
+        self._local = threading.local()
+        self._write_listeners = []
+        self._pool = ConnectionPool(
+            dsn, min_size=min(min_size, pool_size), max_size=pool_size, timeout=timeout,
+            configure=self._configure_connection, check=ConnectionPool.check_connection,
+            name='bizhub', open=True,
+        )
+        self.init_database()
+
+    def add_write_listener(self, callback):
+        """Register callback(tables: set) to run after each committed write."""
+        self._write_listeners.append(callback)
+
+    def notify_writes(self, tables):
+        """Tell the write listeners about writes committed outside this adapter.
+
+        For an AsyncDatabaseAdapter on the same database; derived tables are added.
+        """
+        self._notify_writes(set(tables))
+
+    def _notify_writes(self, tables: set):
+        for table in list(tables):
+            tables.update(self._DERIVED_TABLES.get(table, ()))
+        for callback in self._write_listeners:
+            try:
+                callback(tables)
+            except Exception as e:
+                logger.error("Write listener failed: %s", e)
+
+    @staticmethod
+    def _configure_connection(conn):
+        """Make every new pooled connection return text timestamps in UTC, like SQLite."""
+        for name in ('date', 'timestamp', 'timestamptz'):
+            conn.adapters.register_loader(name, TextLoader)
+        conn.execute("SET TIME ZONE 'UTC'")
+        conn.commit()
+
+    @contextmanager
+    def _get_conn(self):
+        """Borrow a pooled connection — commits on success, rolls back on error.
+
+        Nested calls on the same thread share the connection, so only the
+        outermost block commits; write listeners run after that commit.
+        """
+        local = self._local
+        if getattr(local, 'conn', None) is not None:
+            yield local.conn, _TrackingCursor(local.conn.cursor(), local.written)
+            return
+        written = set()
+        with self._pool.connection() as conn:
+            local.conn, local.written = conn, written
+            try:
+                yield conn, _TrackingCursor(conn.cursor(), written)
+            finally:
+                local.conn = local.written = None
+        if written:
+            self._notify_writes(written)
+
+    def _iter_rows(self, sql: str, params=(), batch_size: int = 1000):
+        """Yield the rows of a long read through a server-side cursor, batch_size at a time.
+
+        Holds its own pooled connection for the life of the generator rather
+        than the thread's: streaming responses resume the generator on
+        whichever worker thread is free.
+        """
+        conn = self._pool.getconn()
+        try:
+            with conn.cursor(name='bizhub_stream') as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(sql, params)
+                yield from cursor
+        except Exception as e:
+            logger.error("Error streaming rows: %s", e)
+            raise
+        finally:
+            try:
+                conn.rollback()
+            finally:
+                self._pool.putconn(conn)
+
+    def iter_changes(self, table: str, since=None, batch_size: int = 1000):
+        """Stream rows of a change-feed table written after a watermark.
+
+        For sales, since is the last exported id (rows with a greater id are
+        returned). For inventory and payrolls it is the last exported
+        updated_at; rows stamped at or after it are returned, so a row may be
+        repeated across runs and readers keep the newest version per id.
+        Columns are those listed in _CHANGE_FEEDS, in that order.
+        """
+        if table not in self._CHANGE_FEEDS:
+            raise ValueError(f"No change feed for table: {table}")
+        key, columns = self._CHANGE_FEEDS[table]
+        sql = f'SELECT {", ".join(columns)} FROM {table}'
+        params = []
+        if since is not None:
+            sql += f' WHERE {key} {">" if key == "id" else ">="} %s'
+            params.append(since)
+        order = 'id' if key == 'id' else f'{key}, id'
+        return self._iter_rows(f'{sql} ORDER BY {order}', params, batch_size)
+
+    # === ARCHIVE ===
+
+    def _range_source(self, table: str, start_date: str = None) -> str:
+        """FROM-clause source for a read from start_date on: table, plus its archive if needed."""
+        return _range_source(table, self.get_archive_horizon(table), start_date)
+
+    def _read_range(self, table: str, sql: str, params=(), start_date: str = None, end_date: str = None) -> list:
+        """fetchall() of sql, where {src} stands for table plus its archive when the range reaches it."""
+        with self._get_conn() as (conn, cursor):
+            cursor.execute(sql.format(src=self._range_source(table, start_date)), params)
+            return cursor.fetchall()
+
+    def get_archive_horizon(self, table: str) -> str:
+        """Day before which table's rows have been archived (YYYY-MM-DD), or None."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT archived_before FROM archive_state WHERE table_name = %s', (table,))
+                row = cursor.fetchone()
+            return row[0] if row else None
+        except Exception:
+            return None
+
+    def get_archive_partitions(self, table: str = None) -> list:
+        """List (table_name, year, row_count, archive table) for every archive partition."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                if table:
+                    cursor.execute('SELECT table_name, year, row_count FROM archive_partitions '
+                                   'WHERE table_name = %s ORDER BY year', (table,))
+                else:
+                    cursor.execute('SELECT table_name, year, row_count FROM archive_partitions '
+                                   'ORDER BY table_name, year')
+                rows = cursor.fetchall()
+            return [row + (f'{row[0]}_archive',) for row in rows]
+        except Exception:
+            return []
+
+    def archive_rows(self, table: str, before: str) -> dict:
+        """Move rows of table dated before the day `before` into <table>_archive.
+
+        Each calendar year is moved (DELETE ... RETURNING into the archive
+        table) in its own transaction; a re-run after a crash picks up where
+        it stopped. Derived data (the sales_daily_item rollup) is left
+        untouched. Returns {year: rows moved}, or None on error.
+        """
+        if table not in self._ARCHIVE_TABLES:
+            raise ValueError(f"Table cannot be archived: {table}")
+        column = self._ARCHIVE_TABLES[table]
+        before = before[:10]
+        moved = {}
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(f'SELECT MIN({column}) FROM {table} WHERE {column} < %s', (before,))
+                oldest = cursor.fetchone()[0]
+            for year in range(int(oldest[:4]), int(before[:4]) + 1) if oldest else ():
+                with self._get_conn() as (conn, cursor):
+                    cursor.execute(
+                        f'''
+                        WITH moved AS (
+                            DELETE FROM {table} WHERE {column} >= %s AND {column} < %s RETURNING *
+                        ), copied AS (
+                            INSERT INTO {table}_archive SELECT * FROM moved ON CONFLICT (id) DO NOTHING
+                        )
+                        SELECT COUNT(*) FROM moved
+                        ''',
+                        (f'{year}-01-01', min(f'{year + 1}-01-01', before))
+                    )
+                    count = cursor.fetchone()[0]
+                    if count:
+                        cursor.execute(
+                            'INSERT INTO archive_partitions (table_name, year, row_count) VALUES (%s, %s, %s) '
+                            'ON CONFLICT (table_name, year) DO UPDATE SET '
+                            'row_count = archive_partitions.row_count + excluded.row_count',
+                            (table, year, count)
+                        )
+                if count:
+                    moved[year] = count
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO archive_state (table_name, archived_before) VALUES (%s, %s) '
+                    'ON CONFLICT (table_name) DO UPDATE SET '
+                    'archived_before = GREATEST(archive_state.archived_before, excluded.archived_before)',
+                    (table, before)
+                )
+        except Exception as e:
+            logger.error("Error archiving %s: %s", table, e)
+            return None
+        if moved:
+            self._notify_writes({table})
+        return moved
+
+    def _fetch_page(self, select_sql: str, filters: list, params: list, order: list,
+                    key_index: tuple, after=None, limit: int = 100, archive: tuple = None) -> tuple:
+        """Run a keyset-paginated SELECT. Returns (rows, next_after).
+
+        order is a list of (column, 'ASC'|'DESC') whose last column is unique;
+        key_index gives the positions of those columns in each result row.
+        after holds the sort-key values of the last row of the previous page.
+        next_after is None when there are no further rows.
+        archive is (table, start_date, end_date) to read through _read_range,
+        with select_sql naming the table as {src}.
+        """
+        sql, params = keyset_query(select_sql, filters, params, order, after, limit, placeholder='%s')
+        if archive:
+            rows = self._read_range(archive[0], sql, params, *archive[1:])
+        else:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+        return split_page(rows, limit, key_index)
+
+    def init_database(self):
+        """Bring the schema up to date and make sure the default admin user exists.
+
+        Pending migrations (src/db/postgres_schema.py) are applied in one
+        transaction, serialised across processes by a lock on schema_version.
+        """
+        with self._get_conn() as (conn, cursor):
+            applied = migrate(conn, MIGRATIONS, dialect='postgres')
+            if applied:
+                logger.info("Migrated PostgreSQL database to schema version %s", applied[-1])
+
+            # Create default admin user if not exists (credentials from env or config)
+            self.create_admin_user(ADMIN_USERNAME, PasswordManager.hash_password(ADMIN_PASSWORD))
+
+    def get_schema_version(self) -> int:
+        """Get the highest schema migration applied to this database."""
+        with self._get_conn() as (conn, cursor):
+            return current_version(conn)
+
+    def migrate_web_schema(self, directory: str = SQL_MIGRATIONS_DIR) -> list:
+        """Apply pending web schema migrations (migrations/NNN_name.sql). Returns the versions applied.
+
+        They are tracked in web_schema_version and run in one transaction;
+        on error it is rolled back and the exception re-raised.
+        """
+        with self._get_conn() as (conn, cursor):
+            return migrate(conn, load_sql_migrations(directory), dialect='postgres', table=SQL_MIGRATIONS_TABLE)
+
+    def stamp_web_schema(self, version: int, directory: str = SQL_MIGRATIONS_DIR) -> list:
+        """Record web schema migrations up to version as applied without running them.
+
+        For a web database whose schema was created by hand. Returns the versions recorded.
+        """
+        with self._get_conn() as (conn, cursor):
+            return stamp(conn, load_sql_migrations(directory), version, dialect='postgres',
+                         table=SQL_MIGRATIONS_TABLE)
+
+    def get_web_schema_version(self) -> int:
+        """Get the highest web schema migration applied to this database."""
+        with self._get_conn() as (conn, cursor):
+            return current_version(conn, SQL_MIGRATIONS_TABLE)
+
+    # === USERS & AUTH ===
+
+    def create_user(self, username: str, password_hash: str, role: str = 'user'):
+        """Create a new user with the specified role."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO users (username, password_hash, role) VALUES (%s, %s, %s) '
+                    'ON CONFLICT (username) DO NOTHING',
+                    (username, password_hash, role)
+                )
+                return cursor.rowcount == 1  # False if the user already exists
+        except Exception as e:
+            logger.error("Error creating user: %s", e)
+            return False
+
+    def set_user_role(self, username: str, role: str) -> bool:
+        """Set the role for an existing user."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('UPDATE users SET role = %s WHERE username = %s', (role, username))
+                return cursor.rowcount > 0
+        except Exception as e:
+            logger.error("Error setting user role: %s", e)
+            return False
+
+    def create_admin_user(self, username: str, password_hash: str):
+        """Create default admin user if not exists."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    "INSERT INTO users (username, password_hash, role) VALUES (%s, %s, 'admin') "
+                    "ON CONFLICT (username) DO NOTHING",
+                    (username, password_hash)
+                )
+        except Exception as e:
+            logger.error("Error creating admin user: %s", e)
+
+    def authenticate_user(self, username: str, password_hash: str) -> bool:
+        """Verify user credentials."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT 1 FROM users WHERE username = %s AND password_hash = %s',
+                    (username, password_hash)
+                )
+                result = cursor.fetchone()
+            return result is not None
+        except Exception:
+            return False
+
+    def get_user_role(self, username: str) -> str:
+        """Get user role (admin, user, etc)."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT role FROM users WHERE username = %s', (username,))
+                result = cursor.fetchone()
+            return result[0] if result else 'user'
+        except Exception:
+            return 'user'
+
+    def update_last_login(self, username: str):
+        """Update user's last login timestamp."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = %s',
+                    (username,)
+                )
+        except Exception as e:
+            logger.error("Error updating last login: %s", e)
+
+    # === INVENTORY ===
+
+    def get_all_inventory(self) -> list:
+        """Get all inventory items."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT item_name, quantity, threshold, cost_price, sale_price, description, image_path FROM inventory ORDER BY item_name')
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def get_inventory_page(self, limit: int = 100, after=None, low_stock: bool = False) -> tuple:
+        """Get one page of inventory ordered by name. Returns (rows, next_after)."""
+        try:
+            return self._fetch_page(
+                'SELECT item_name, quantity, threshold, cost_price, sale_price, description, image_path FROM inventory',
+                ['quantity <= threshold AND threshold > 0'] if low_stock else [], [],
+                [('item_name', 'ASC')], (0,), after, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting inventory page: %s", e)
+            return [], None
+
+    def get_inventory_by_name(self, name: str) -> dict:
+        """Get inventory item by name."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT id, item_name, quantity, threshold, cost_price, sale_price, description, image_path '
+                    'FROM inventory WHERE item_name = %s',
+                    (name,)
+                )
+                row = cursor.fetchone()
+            if row:
+                return {
+                    'id': row[0], 'item_name': row[1], 'quantity': row[2],
+                    'threshold': row[3], 'cost_price': row[4], 'sale_price': row[5],
+                    'description': row[6], 'image_path': row[7]
+                }
+            return None
+        except Exception:
+            return None
+
+    def add_inventory_item(self, item_name: str, quantity: int, threshold: int,
+                          cost_price: float, sale_price: float, description: str,
+                          image_path: str = None):
+        """Add new inventory item."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO inventory (item_name, quantity, threshold, cost_price, sale_price, description, image_path) VALUES (%s, %s, %s, %s, %s, %s, %s)',
+                    (item_name, quantity, threshold, cost_price, sale_price, description, image_path)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error adding inventory item: %s", e)
+            return False
+
+    def iter_inventory(self):
+        """Stream inventory rows (import column order) by name."""
+        return self._iter_rows(
+            'SELECT item_name, quantity, threshold, cost_price, sale_price, description '
+            'FROM inventory ORDER BY item_name'
+        )
+
+    def upsert_inventory_items(self, rows: list) -> int:
+        """Insert or update inventory rows by item_name in one transaction.
+
+        rows are (item_name, quantity, threshold, cost_price, sale_price, description)
+        tuples; image_path is left as it was. The rows are COPYed into a
+        temporary table and merged with one INSERT ... ON CONFLICT; when a
+        name repeats, its last row wins. Returns rows written or -1 on error.
+        """
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'CREATE TEMP TABLE inventory_load (n BIGINT GENERATED ALWAYS AS IDENTITY, '
+                    'item_name TEXT, quantity INTEGER, threshold INTEGER, cost_price DOUBLE PRECISION, '
+                    'sale_price DOUBLE PRECISION, description TEXT) ON COMMIT DROP'
+                )
+                with cursor.copy('COPY inventory_load (item_name, quantity, threshold, cost_price, '
+                                 'sale_price, description) FROM STDIN') as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                cursor.execute(
+                    '''INSERT INTO inventory (item_name, quantity, threshold, cost_price, sale_price, description)
+                       SELECT DISTINCT ON (item_name) item_name, quantity, threshold, cost_price, sale_price, description
+                       FROM inventory_load ORDER BY item_name, n DESC
+                       ON CONFLICT (item_name) DO UPDATE SET
+                           quantity = excluded.quantity,
+                           threshold = excluded.threshold,
+                           cost_price = excluded.cost_price,
+                           sale_price = excluded.sale_price,
+                           description = excluded.description,
+                           updated_at = CURRENT_TIMESTAMP'''
+                )
+            return len(rows)
+        except Exception as e:
+            logger.error("Error upserting inventory items: %s", e)
+            return -1
+
+    def update_inventory_item(self, item_name: str, quantity: int = None,
+                             threshold: int = None, cost_price: float = None,
+                             sale_price: float = None, description: str = None,
+                             image_path: str = None):
+        """Update inventory item."""
+        try:
+            fields = {
+                'quantity': quantity, 'threshold': threshold, 'cost_price': cost_price,
+                'sale_price': sale_price, 'description': description, 'image_path': image_path,
+            }
+            updates = [f'{key} = %s' for key, value in fields.items() if value is not None]
+            values = [value for value in fields.values() if value is not None]
+            if updates:
+                updates.append('updated_at = CURRENT_TIMESTAMP')
+                values.append(item_name)
+                with self._get_conn() as (conn, cursor):
+                    cursor.execute(f'UPDATE inventory SET {", ".join(updates)} WHERE item_name = %s', values)
+            return True
+        except Exception as e:
+            logger.error("Error updating inventory item: %s", e)
+            return False
+
+    def delete_inventory_item(self, item_name: str):
+        """Delete inventory item."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM inventory WHERE item_name = %s', (item_name,))
+            return True
+        except Exception as e:
+            logger.error("Error deleting inventory item: %s", e)
+            return False
+
+    def search_inventory(self, query: str) -> list:
+        """Search inventory by name or description (word-prefix match, best first)."""
+        ts_query = _ts_query(query)
+        try:
+            with self._get_conn() as (conn, cursor):
+                if ts_query:
+                    document = SEARCH_DOCUMENTS['inventory']
+                    cursor.execute(
+                        'SELECT item_name, quantity, threshold, cost_price, sale_price, description '
+                        f'FROM inventory, {_TS_QUERY} AS q WHERE {document} @@ q '
+                        f'ORDER BY ts_rank({document}, q) DESC, item_name',
+                        (ts_query,)
+                    )
+                else:
+                    q = f"%{query}%"
+                    cursor.execute('SELECT item_name, quantity, threshold, cost_price, sale_price, description FROM inventory WHERE item_name ILIKE %s OR description ILIKE %s ORDER BY item_name', (q, q))
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def get_inventory_count(self) -> int:
+        """Count inventory items. Returns -1 on error."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT COUNT(*) FROM inventory')
+                return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error("Error counting inventory: %s", e)
+            return -1
+
+    # === SALES & POS ===
+
+    def record_sale(self, item_name: str, quantity: int, sale_price: float,
+                   total_amount: float, username: str):
+        """Record a sale transaction."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO sales (item_name, quantity, sale_price, total_amount, username) VALUES (%s, %s, %s, %s, %s)',
+                    (item_name, quantity, sale_price, total_amount, username)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error recording sale: %s", e)
+            return False
+
+    def record_checkout(self, cart: list, username: str) -> bool:
+        """Record every cart line and decrement stock in one transaction.
+
+        cart is a list of dicts with item_name, quantity, sale_price and
+        total_amount. Stock is decremented with a guarded UPDATE per item, so
+        a line that is short on stock (or names an unknown item) raises
+        InsufficientStockError and rolls back the whole checkout.
+        """
+        try:
+            with self._get_conn() as (conn, cursor):
+                for item_name, quantity in checkout_demand(cart).items():
+                    cursor.execute(_CHECKOUT_STOCK_SQL, (quantity, item_name, quantity))
+                    if cursor.rowcount != 1:
+                        raise InsufficientStockError(item_name, quantity)
+                cursor.executemany(_CHECKOUT_SALE_SQL, checkout_rows(cart, username))
+            return True
+        except InsufficientStockError:
+            raise
+        except Exception as e:
+            logger.error("Error recording checkout: %s", e)
+            return False
+
+    def get_sales_by_date(self, date_str: str) -> list:
+        """Get all sales for a specific date (from the archive if it is that old)."""
+        try:
+            return self._read_range(
+                'sales', 'SELECT * FROM {src} WHERE sale_date >= %s AND sale_date < %s',
+                day_range(date_str), date_str, date_str
+            )
+        except Exception:
+            return []
+
+    def get_all_sales(self) -> list:
+        """Get all sales transactions, archived ones included."""
+        try:
+            return self._read_range('sales', 'SELECT * FROM {src} ORDER BY sale_date DESC')
+        except Exception:
+            return []
+
+    def get_sales_page(self, limit: int = 100, after=None, start_date: str = None,
+                       end_date: str = None, username: str = None, item_name: str = None,
+                       search: str = None) -> tuple:
+        """Get one page of sales, newest first, with optional filters. Returns (rows, next_after).
+
+        search matches a substring of the item name or the username.
+        """
+        filters, params = sales_page_filters(start_date, end_date, username, item_name, search, '%s', 'ILIKE')
+        try:
+            return self._fetch_page(
+                'SELECT * FROM {src}', filters, params,
+                [('sale_date', 'DESC'), ('id', 'DESC')], (1, 0), after, limit,
+                archive=('sales', start_date, end_date)
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting sales page: %s", e)
+            return [], None
+
+    def get_sales_between(self, start_date: str, end_date: str) -> list:
+        """Get all sales between start_date and end_date (inclusive)."""
+        try:
+            return self._read_range(
+                'sales', 'SELECT * FROM {src} WHERE sale_date >= %s AND sale_date < %s ORDER BY sale_date ASC',
+                day_range(start_date, end_date), start_date, end_date
+            )
+        except Exception:
+            return []
+
+    def iter_sales(self, start_date: str = None, end_date: str = None):
+        """Stream sales oldest first, optionally bounded by inclusive YYYY-MM-DD days."""
+        filters, params = [], []
+        if start_date:
+            filters.append('sale_date >= %s')
+            params.append(start_date[:10])
+        if end_date:
+            filters.append('sale_date < %s')
+            params.append(day_range(end_date)[1])
+        return self._iter_rows(
+            'SELECT id, sale_date, item_name, quantity, sale_price, total_amount, username FROM '
+            + self._range_source('sales', start_date)
+            + (' WHERE ' + ' AND '.join(filters) if filters else '') + ' ORDER BY sale_date',
+            params
+        )
+
+    def get_sales_summary_by_item(self, start_date: str, end_date: str) -> list:
+        """Get sales summary grouped by item between dates (from the daily rollup)."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    SELECT item_name, SUM(total_qty) as total_qty, SUM(total_amount) as total_amount
+                    FROM sales_daily_item
+                    WHERE sale_day BETWEEN %s AND %s
+                    GROUP BY item_name
+                    ORDER BY total_qty DESC
+                    ''',
+                    (start_date[:10], end_date[:10])
+                )
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def get_sales_trend_by_day(self, start_date: str, end_date: str) -> list:
+        """Get sales totals grouped by day between dates (from the daily rollup)."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    SELECT sale_day, SUM(total_amount) as total_amount
+                    FROM sales_daily_item
+                    WHERE sale_day BETWEEN %s AND %s
+                    GROUP BY sale_day
+                    ORDER BY sale_day ASC
+                    ''',
+                    (start_date[:10], end_date[:10])
+                )
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def get_daily_item_quantities(self, start_date: str, end_date: str) -> list:
+        """Get (sale_day, item_name, total_qty) between dates (from the daily rollup)."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT sale_day, item_name, total_qty FROM sales_daily_item WHERE sale_day BETWEEN %s AND %s',
+                    (start_date[:10], end_date[:10])
+                )
+                rows = cursor.fetchall()
+            return rows
+        except Exception as e:
+            logger.error("Error getting daily item quantities: %s", e)
+            return []
+
+    def get_dashboard_kpis(self, today: str = None) -> dict:
+        """Compute dashboard KPIs with three aggregate queries.
+
+        Sales figures come from the daily rollup; the week-over-week windows
+        match the original endpoint (last 7 days vs the 7 before, inclusive).
+        """
+        try:
+            with self._get_conn() as (conn, cursor):
+                rows = []
+                for sql, params in zip(_KPI_QUERIES, ((), kpi_sales_params(today), ())):
+                    cursor.execute(sql, params)
+                    rows.append(cursor.fetchone())
+        except Exception as e:
+            logger.error("Error computing dashboard KPIs: %s", e)
+            return {}
+        return kpi_result(*rows)
+
+    def rebuild_sales_rollup(self, start_date: str = None, end_date: str = None) -> int:
+        """Recompute sales_daily_item from raw sales, for all days or an inclusive day range.
+
+        Days before the sales archive horizon are kept as they are: their raw
+        rows live in sales_archive, so the rollup is their only summary.
+        Returns the number of rollup rows written, or -1 on error.
+        """
+        horizon = self.get_archive_horizon('sales')
+        if horizon and (not start_date or start_date[:10] < horizon):
+            if end_date and end_date[:10] < horizon:
+                return 0
+            start_date = horizon
+            end_date = end_date or '9999-12-30'
+        try:
+            with self._get_conn() as (conn, cursor):
+                if start_date:
+                    bounds = day_range(start_date, end_date)
+                    cursor.execute(
+                        'DELETE FROM sales_daily_item WHERE sale_day >= %s AND sale_day < %s', bounds
+                    )
+                    where, params = 'WHERE sale_date >= %s AND sale_date < %s', bounds
+                else:
+                    cursor.execute('DELETE FROM sales_daily_item')
+                    where, params = '', ()
+                cursor.execute(
+                    f'''
+                    INSERT INTO sales_daily_item (sale_day, item_name, total_qty, total_amount, txn_count)
+                    SELECT sale_date::date, item_name, SUM(quantity), SUM(total_amount), COUNT(*)
+                    FROM sales {where}
+                    GROUP BY sale_date::date, item_name
+                    ''',
+                    params
+                )
+                return cursor.rowcount
+        except Exception as e:
+            logger.error("Error rebuilding sales rollup: %s", e)
+            return -1
+
+    # === HR ===
+
+    def add_employee(self, emp_number: str, name: str, joining_date: str,
+                    designation: str, manager: str, team: str, email: str,
+                    phone: str, emergency_contact: str, photo_path: str, notes: str,
+                    is_active: int = 1):
+        """Add new employee."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO employees (emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)',
+                    (emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error adding employee: %s", e)
+            return False
+
+    def get_all_employees(self) -> list:
+        """Get all employees."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT id, emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active FROM employees ORDER BY name'
+                )
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def get_employees_page(self, limit: int = 100, after=None, team: str = None,
+                           is_active: int = None, search: str = None) -> tuple:
+        """Get one page of employees ordered by name. Returns (rows, next_after).
+
+        search matches a substring of the number, name, designation, team or email.
+        """
+        filters, params = [], []
+        if team:
+            filters.append('team = %s')
+            params.append(team)
+        if is_active is not None:
+            filters.append('is_active = %s')
+            params.append(int(is_active))
+        if search:
+            filters.append('(emp_number ILIKE %s OR name ILIKE %s OR designation ILIKE %s '
+                           'OR team ILIKE %s OR email ILIKE %s)')
+            params.extend([f'%{search}%'] * 5)
+        try:
+            return self._fetch_page(
+                'SELECT id, emp_number, name, joining_date, designation, manager, team, email, phone, '
+                'emergency_contact, photo_path, notes, is_active FROM employees',
+                filters, params, [('name', 'ASC'), ('id', 'ASC')], (2, 0), after, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting employees page: %s", e)
+            return [], None
+
+    def get_employee_by_id(self, emp_id: int) -> dict:
+        """Get employee by ID."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT id, emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active FROM employees WHERE id = %s',
+                    (emp_id,)
+                )
+                row = cursor.fetchone()
+            if row:
+                return {
+                    'id': row[0], 'emp_number': row[1], 'name': row[2],
+                    'joining_date': row[3], 'designation': row[4], 'manager': row[5],
+                    'team': row[6], 'email': row[7], 'phone': row[8],
+                    'emergency_contact': row[9], 'photo_path': row[10], 'notes': row[11],
+                    'is_active': row[12]
+                }
+            return None
+        except Exception:
+            return None
+
+    def _update_by_id(self, table: str, row_id: int, allowed: set, fields: dict, stamp: bool = True):
+        """UPDATE the allowed, non-None fields of one row; optionally bump updated_at."""
+        updates = [f'{key} = %s' for key, value in fields.items() if key in allowed and value is not None]
+        if not updates:
+            return
+        values = [value for key, value in fields.items() if key in allowed and value is not None]
+        if stamp:
+            updates.append('updated_at = CURRENT_TIMESTAMP')
+        with self._get_conn() as (conn, cursor):
+            cursor.execute(f'UPDATE {table} SET {", ".join(updates)} WHERE id = %s', values + [row_id])
+
+    def update_employee(self, emp_id: int, **kwargs):
+        """Update employee details."""
+        try:
+            self._update_by_id('employees', emp_id, {
+                'name', 'joining_date', 'designation', 'manager', 'team', 'email', 'phone',
+                'emergency_contact', 'photo_path', 'notes', 'is_active'
+            }, kwargs)
+            return True
+        except Exception as e:
+            logger.error("Error updating employee: %s", e)
+            return False
+
+    def delete_employee(self, emp_id: int):
+        """Delete employee."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM employees WHERE id = %s', (emp_id,))
+            return True
+        except Exception as e:
+            logger.error("Error deleting employee: %s", e)
+            return False
+
+    # === PAYROLL ===
+
+    def add_payroll(self, employee_id: int, period_start: str, period_end: str,
+                    base_salary: float, allowances: float, deductions: float,
+                    overtime_hours: float, overtime_rate: float, gross_pay: float,
+                    net_pay: float, status: str, paid_date: str):
+        """Add payroll record."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    INSERT INTO payrolls (employee_id, period_start, period_end, base_salary, allowances, deductions,
+                                         overtime_hours, overtime_rate, gross_pay, net_pay, status, paid_date)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ''',
+                    (employee_id, period_start, period_end, base_salary, allowances, deductions,
+                     overtime_hours, overtime_rate, gross_pay, net_pay, status, paid_date)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error adding payroll: %s", e)
+            return False
+
+    def get_all_payrolls(self) -> list:
+        """Get all payroll records."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM payrolls ORDER BY created_at DESC')
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def iter_payrolls(self):
+        """Stream payroll rows with employee number and name, in id order."""
+        return self._iter_rows(
+            '''SELECT p.id, p.employee_id, e.emp_number, e.name, p.period_start, p.period_end,
+                      p.base_salary, p.allowances, p.deductions, p.overtime_hours, p.overtime_rate,
+                      p.gross_pay, p.net_pay, p.status, p.paid_date
+               FROM payrolls p LEFT JOIN employees e ON e.id = p.employee_id
+               ORDER BY p.id'''
+        )
+
+    def get_payrolls_by_employee(self, employee_id: int) -> list:
+        """Get payroll records for an employee."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM payrolls WHERE employee_id = %s ORDER BY created_at DESC', (employee_id,))
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def update_payroll(self, payroll_id: int, **kwargs):
+        """Update payroll record."""
+        try:
+            self._update_by_id('payrolls', payroll_id, {
+                'employee_id', 'period_start', 'period_end', 'base_salary', 'allowances', 'deductions',
+                'overtime_hours', 'overtime_rate', 'gross_pay', 'net_pay', 'status', 'paid_date'
+            }, kwargs)
+            return True
+        except Exception as e:
+            logger.error("Error updating payroll: %s", e)
+            return False
+
+    def delete_payroll(self, payroll_id: int):
+        """Delete payroll record."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM payrolls WHERE id = %s', (payroll_id,))
+            return True
+        except Exception as e:
+            logger.error("Error deleting payroll: %s", e)
+            return False
+
+    # === APPRAISALS WORKFLOW ===
+
+    def create_appraisal_cycle(self, employee_id: int, period_start: str, period_end: str, created_by: str = ""):
+        """Create appraisal cycle."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    INSERT INTO appraisal_cycles (employee_id, period_start, period_end, created_by)
+                    VALUES (%s, %s, %s, %s)
+                    ''',
+                    (employee_id, period_start, period_end, created_by)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error creating appraisal: %s", e)
+            return False
+
+    def get_all_appraisal_cycles(self) -> list:
+        """Get all appraisal cycles."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM appraisal_cycles ORDER BY created_at DESC')
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def update_appraisal_cycle(self, appraisal_id: int, **kwargs):
+        """Update appraisal cycle."""
+        try:
+            self._update_by_id('appraisal_cycles', appraisal_id, {
+                'employee_id', 'period_start', 'period_end', 'status',
+                'self_text', 'self_rating', 'manager_text', 'manager_rating', 'final_rating'
+            }, kwargs)
+            return True
+        except Exception as e:
+            logger.error("Error updating appraisal: %s", e)
+            return False
+
+    def create_feedback_request(self, appraisal_id: int, requester: str, target_employee_id: int, message: str = ""):
+        """Create a 360 feedback request."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    INSERT INTO feedback_requests (appraisal_id, requester, target_employee_id, message)
+                    VALUES (%s, %s, %s, %s)
+                    ''',
+                    (appraisal_id, requester, target_employee_id, message)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error creating feedback request: %s", e)
+            return False
+
+    def get_feedback_requests(self) -> list:
+        """Get all feedback requests."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM feedback_requests ORDER BY created_at DESC')
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def update_feedback_request(self, request_id: int, **kwargs):
+        """Update feedback request."""
+        try:
+            self._update_by_id('feedback_requests', request_id, {'status', 'message'}, kwargs)
+            return True
+        except Exception as e:
+            logger.error("Error updating feedback request: %s", e)
+            return False
+
+    def add_feedback_entry(self, appraisal_id: int, from_employee_id: int, to_employee_id: int,
+                           rating: float, feedback_text: str):
+        """Add feedback entry."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    INSERT INTO feedback_entries (appraisal_id, from_employee_id, to_employee_id, rating, feedback_text)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ''',
+                    (appraisal_id, from_employee_id, to_employee_id, rating, feedback_text)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error adding feedback: %s", e)
+            return False
+
+    def get_feedback_entries(self) -> list:
+        """Get all feedback entries."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM feedback_entries ORDER BY created_at DESC')
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def add_appraisal(self, employee_id: int, appraisal_date: str, rating: str, comments: str):
+        """Add employee appraisal."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO appraisals (employee_id, appraisal_date, rating, comments) VALUES (%s, %s, %s, %s)',
+                    (employee_id, appraisal_date, rating, comments)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error adding appraisal: %s", e)
+            return False
+
+    def get_employee_appraisals(self, employee_id: int) -> list:
+        """Get all appraisals for an employee."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM appraisals WHERE employee_id = %s ORDER BY appraisal_date DESC', (employee_id,))
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def add_goal(self, employee_id: int, goal: str, status: str, due_date: str, notes: str):
+        """Add employee goal."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO goals (employee_id, goal, status, due_date, notes) VALUES (%s, %s, %s, %s, %s)',
+                    (employee_id, goal, status, due_date, notes)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error adding goal: %s", e)
+            return False
+
+    def get_employee_goals(self, employee_id: int) -> list:
+        """Get all goals for an employee."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM goals WHERE employee_id = %s ORDER BY due_date', (employee_id,))
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    # === VISITORS ===
+
+    def add_visitor(self, name: str, address: str, phone: str, email: str, company: str, notes: str):
+        """Add new visitor."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO visitors (name, address, phone, email, company, notes) VALUES (%s, %s, %s, %s, %s, %s)',
+                    (name, address, phone, email, company, notes)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error adding visitor: %s", e)
+            return False
+
+    def get_all_visitors(self) -> list:
+        """Get all visitors."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM visitors ORDER BY name')
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    def get_visitors_page(self, limit: int = 100, after=None, search: str = None) -> tuple:
+        """Get one page of visitors ordered by name. Returns (rows, next_after).
+
+        search matches name, email or phone by word prefix, or a substring
+        of the company.
+        """
+        filters, params = [], []
+        ts_query = _ts_query(search) if search else None
+        if ts_query:
+            filters.append(f"({SEARCH_DOCUMENTS['visitors']} @@ {_TS_QUERY} OR company ILIKE %s)")
+            params.extend([ts_query, f'%{search}%'])
+        elif search:
+            filters.append('(name ILIKE %s OR email ILIKE %s OR phone ILIKE %s OR company ILIKE %s)')
+            params.extend([f'%{search}%'] * 4)
+        try:
+            return self._fetch_page(
+                'SELECT * FROM visitors', filters, params,
+                [('name', 'ASC'), ('id', 'ASC')], (1, 0), after, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting visitors page: %s", e)
+            return [], None
+
+    def update_visitor(self, visitor_id: int, **kwargs):
+        """Update visitor details."""
+        try:
+            self._update_by_id('visitors', visitor_id, {'name', 'address', 'phone', 'email', 'company', 'notes'},
+                               kwargs)
+            return True
+        except Exception as e:
+            logger.error("Error updating visitor: %s", e)
+            return False
+
+    def delete_visitor(self, visitor_id: int):
+        """Delete visitor."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM visitors WHERE id = %s', (visitor_id,))
+            return True
+        except Exception as e:
+            logger.error("Error deleting visitor: %s", e)
+            return False
+
+    def search_visitors(self, query: str) -> list:
+        """Search visitors by name, email, phone (word-prefix match, best first)."""
+        ts_query = _ts_query(query)
+        try:
+            with self._get_conn() as (conn, cursor):
+                if ts_query:
+                    document = SEARCH_DOCUMENTS['visitors']
+                    cursor.execute(
+                        f'SELECT v.* FROM visitors v, {_TS_QUERY} AS q WHERE {document} @@ q '
+                        f'ORDER BY ts_rank({document}, q) DESC, v.name',
+                        (ts_query,)
+                    )
+                else:
+                    q = f"%{query}%"
+                    cursor.execute('SELECT * FROM visitors WHERE name ILIKE %s OR email ILIKE %s OR phone ILIKE %s ORDER BY name', (q, q, q))
+                rows = cursor.fetchall()
+            return rows
+        except Exception:
+            return []
+
+    # === EMAIL CONFIG ===
+
+    def save_email_config(self, smtp_server: str, smtp_port: int, sender_email: str,
+                         sender_password: str, recipient_email: str):
+        """Save email configuration."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM email_config')
+                cursor.execute(
+                    'INSERT INTO email_config (smtp_server, smtp_port, sender_email, sender_password, recipient_email) VALUES (%s, %s, %s, %s, %s)',
+                    (smtp_server, smtp_port, sender_email, sender_password, recipient_email)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error saving email config: %s", e)
+            return False
+
+    def get_email_config(self) -> dict:
+        """Get email configuration."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT smtp_server, smtp_port, sender_email, sender_password, recipient_email FROM email_config LIMIT 1')
+                row = cursor.fetchone()
+            if row:
+                return {
+                    'smtp_server': row[0], 'smtp_port': row[1], 'sender_email': row[2],
+                    'sender_password': row[3], 'recipient_email': row[4]
+                }
+            return None
+        except Exception:
+            return None
+
+    # === EMAIL QUEUE ===
+
+    def enqueue_email(self, subject: str, body: str, recipient: str = None) -> int:
+        """Queue an email for the background sender. recipient None means the
+        configured recipient. Returns the queue id or -1 on error."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO email_queue (recipient, subject, body) VALUES (%s, %s, %s) RETURNING id',
+                    (recipient, subject, body)
+                )
+                return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error("Error queueing email: %s", e)
+            return -1
+
+    def claim_emails(self, limit: int = 20, stale_after_seconds: int = 600) -> list:
+        """Mark up to limit due emails as 'sending' and return them.
+
+        Rows are (id, recipient, subject, body, attempts). Emails left in
+        'sending' for stale_after_seconds (a sender that died mid-batch) are
+        due again. Rows another sender is claiming are skipped, not waited on.
+        """
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    "UPDATE email_queue SET status = 'pending' "
+                    "WHERE status = 'sending' AND updated_at < CURRENT_TIMESTAMP - make_interval(secs => %s)",
+                    (int(stale_after_seconds),)
+                )
+                cursor.execute(
+                    "UPDATE email_queue SET status = 'sending', updated_at = CURRENT_TIMESTAMP "
+                    "WHERE id IN (SELECT id FROM email_queue WHERE status = 'pending' "
+                    "AND next_attempt_at <= CURRENT_TIMESTAMP ORDER BY next_attempt_at, id LIMIT %s "
+                    "FOR UPDATE SKIP LOCKED) "
+                    "RETURNING id, recipient, subject, body, attempts",
+                    (limit,)
+                )
+                rows = cursor.fetchall()
+            return sorted(rows)
+        except Exception as e:
+            logger.error("Error claiming emails: %s", e)
+            return []
+
+    def release_emails(self, email_ids: list) -> bool:
+        """Put claimed emails back to 'pending' without counting an attempt."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    "UPDATE email_queue SET status = 'pending', updated_at = CURRENT_TIMESTAMP "
+                    "WHERE id = ANY(%s) AND status = 'sending'",
+                    (list(email_ids),)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error releasing emails: %s", e)
+            return False
+
+    def mark_email_sent(self, email_id: int) -> bool:
+        """Record a successful delivery."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    "UPDATE email_queue SET status = 'sent', attempts = attempts + 1, last_error = NULL, "
+                    "sent_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP WHERE id = %s",
+                    (email_id,)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error marking email sent: %s", e)
+            return False
+
+    def mark_email_failed(self, email_id: int, error: str, retry_in_seconds: float = None) -> bool:
+        """Record a failed attempt: retry after retry_in_seconds, or give up if None."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                if retry_in_seconds is None:
+                    cursor.execute(
+                        "UPDATE email_queue SET status = 'failed', attempts = attempts + 1, last_error = %s, "
+                        "updated_at = CURRENT_TIMESTAMP WHERE id = %s",
+                        (error, email_id)
+                    )
+                else:
+                    cursor.execute(
+                        "UPDATE email_queue SET status = 'pending', attempts = attempts + 1, last_error = %s, "
+                        "next_attempt_at = CURRENT_TIMESTAMP + make_interval(secs => %s), "
+                        "updated_at = CURRENT_TIMESTAMP WHERE id = %s",
+                        (error, int(retry_in_seconds), email_id)
+                    )
+            return True
+        except Exception as e:
+            logger.error("Error marking email failed: %s", e)
+            return False
+
+    def get_queued_email(self, email_id: int) -> dict:
+        """Get one queued email's delivery status."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT id, recipient, subject, status, attempts, last_error, next_attempt_at, '
+                    'created_at, sent_at FROM email_queue WHERE id = %s',
+                    (email_id,)
+                )
+                row = cursor.fetchone()
+            if row:
+                keys = ('id', 'recipient', 'subject', 'status', 'attempts', 'last_error',
+                        'next_attempt_at', 'created_at', 'sent_at')
+                return dict(zip(keys, row))
+            return None
+        except Exception:
+            return None
+
+    def get_email_queue_counts(self) -> dict:
+        """Count queued emails by status."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT status, COUNT(*) FROM email_queue GROUP BY status')
+                rows = cursor.fetchall()
+            return dict(rows)
+        except Exception as e:
+            logger.error("Error counting queued emails: %s", e)
+            return {}
+
+    # === COMPANY INFO ===
+
+    def save_company_info(self, company_name: str, address: str, phone: str,
+                         email: str, tax_id: str, bank_details: str):
+        """Save company information."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM company_info')
+                cursor.execute(
+                    'INSERT INTO company_info (company_name, address, phone, email, tax_id, bank_details) VALUES (%s, %s, %s, %s, %s, %s)',
+                    (company_name, address, phone, email, tax_id, bank_details)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error saving company info: %s", e)
+            return False
+
+    def get_company_info(self) -> dict:
+        """Get company information."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT company_name, address, phone, email, tax_id, bank_details FROM company_info LIMIT 1')
+                row = cursor.fetchone()
+            if row:
+                return {
+                    'company_name': row[0], 'address': row[1], 'phone': row[2],
+                    'email': row[3], 'tax_id': row[4], 'bank_details': row[5]
+                }
+            return None
+        except Exception:
+            return None
+
+    # === ACTIVITY LOG ===
+
+    def log_activity(self, username: str, action: str, details: str = ""):
+        """Log user activity."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO activity_log (username, action, details) VALUES (%s, %s, %s)',
+                    (username, action, details)
+                )
+        except Exception as e:
+            logger.error("Error logging activity: %s", e)
+
+    def log_activities(self, entries: list) -> int:
+        """COPY (timestamp, username, action, details) rows in one transaction.
+        Returns rows written or -1 on error."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                with cursor.copy('COPY activity_log (timestamp, username, action, details) FROM STDIN') as copy:
+                    for entry in entries:
+                        copy.write_row(entry)
+            return len(entries)
+        except Exception as e:
+            logger.error("Error logging activity batch: %s", e)
+            return -1
+
+    def get_activity_log(self, username: str = None, start_date: str = None,
+                         end_date: str = None, limit: int = None) -> list:
+        """Get activity log newest first, optionally filtered by user and inclusive day range.
+
+        activity_log_archive is read only when start_date (or its absence) reaches it.
+        """
+        filters, params = [], []
+        if username:
+            filters.append('username = %s')
+            params.append(username)
+        if start_date:
+            filters.append('timestamp >= %s')
+            params.append(start_date[:10])
+        if end_date:
+            filters.append('timestamp < %s')
+            params.append(day_range(end_date)[1])
+        sql = 'SELECT * FROM {src}' + (' WHERE ' + ' AND '.join(filters) if filters else '')
+        sql += ' ORDER BY timestamp DESC, id DESC'
+        if limit:
+            sql += ' LIMIT %s'
+            params.append(limit)
+        try:
+            return self._read_range('activity_log', sql, params, start_date, end_date)
+        except Exception:
+            return []
+
+    # === CRM ===
+
+    def add_crm_contact(self, name: str, company: str = '', email: str = '',
+                        phone: str = '', source: str = '', notes: str = '') -> int:
+        """Add a new CRM contact. Returns new id or -1 on error."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO crm_contacts (name, company, email, phone, source, notes) VALUES (%s, %s, %s, %s, %s, %s) RETURNING id',
+                    (name, company, email, phone, source, notes)
+                )
+                new_id = cursor.fetchone()[0]
+            return new_id
+        except Exception as e:
+            logger.error("Error adding CRM contact: %s", e)
+            return -1
+
+    def get_crm_contacts(self, search: str = None) -> list:
+        """Get all CRM contacts, optionally filtered by search string (best match first)."""
+        ts_query = _ts_query(search) if search else None
+        try:
+            with self._get_conn() as (conn, cursor):
+                if ts_query:
+                    document = SEARCH_DOCUMENTS['crm_contacts']
+                    cursor.execute(
+                        f'SELECT c.* FROM crm_contacts c, {_TS_QUERY} AS q WHERE {document} @@ q '
+                        f'ORDER BY ts_rank({document}, q) DESC, c.name',
+                        (ts_query,)
+                    )
+                elif search:
+                    q = f"%{search}%"
+                    cursor.execute(
+                        'SELECT * FROM crm_contacts WHERE name ILIKE %s OR company ILIKE %s OR email ILIKE %s OR phone ILIKE %s ORDER BY name',
+                        (q, q, q, q)
+                    )
+                else:
+                    cursor.execute('SELECT * FROM crm_contacts ORDER BY name')
+                rows = cursor.fetchall()
+            return rows
+        except Exception as e:
+            logger.error("Error getting CRM contacts: %s", e)
+            return []
+
+    def get_crm_contacts_page(self, limit: int = 100, after=None, search: str = None,
+                              status: str = None) -> tuple:
+        """Get one page of CRM contacts ordered by name. Returns (rows, next_after)."""
+        filters, params = [], []
+        ts_query = _ts_query(search) if search else None
+        if ts_query:
+            # Pages keep their name order; the index only narrows the rows
+            filters.append(f"{SEARCH_DOCUMENTS['crm_contacts']} @@ {_TS_QUERY}")
+            params.append(ts_query)
+        elif search:
+            q = f"%{search}%"
+            filters.append('(name ILIKE %s OR company ILIKE %s OR email ILIKE %s OR phone ILIKE %s)')
+            params.extend([q, q, q, q])
+        if status:
+            filters.append('status = %s')
+            params.append(status)
+        try:
+            return self._fetch_page(
+                'SELECT * FROM crm_contacts', filters, params,
+                [('name', 'ASC'), ('id', 'ASC')], (1, 0), after, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting CRM contacts page: %s", e)
+            return [], None
+
+    def update_crm_contact(self, contact_id: int, **kwargs) -> bool:
+        """Update a CRM contact by id."""
+        try:
+            self._update_by_id('crm_contacts', contact_id,
+                               {'name', 'company', 'email', 'phone', 'source', 'status', 'notes'},
+                               kwargs, stamp=False)
+            return True
+        except Exception as e:
+            logger.error("Error updating CRM contact: %s", e)
+            return False
+
+    def delete_crm_contact(self, contact_id: int) -> bool:
+        """Delete a CRM contact by id."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM crm_contacts WHERE id = %s', (contact_id,))
+            return True
+        except Exception as e:
+            logger.error("Error deleting CRM contact: %s", e)
+            return False
+
+    def add_crm_lead(self, contact_id: int, title: str, stage: str = 'New',
+                     value: float = 0, probability: int = 0, owner: str = '', notes: str = '') -> int:
+        """Add a new CRM lead. Returns new id or -1 on error."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO crm_leads (contact_id, title, stage, value, probability, owner, notes) VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id',
+                    (contact_id, title, stage, value, probability, owner, notes)
+                )
+                new_id = cursor.fetchone()[0]
+            return new_id
+        except Exception as e:
+            logger.error("Error adding CRM lead: %s", e)
+            return -1
+
+    def get_crm_leads(self, stage: str = None) -> list:
+        """Get CRM leads with contact info, optionally filtered by stage."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(*crm_leads_query(stage, '%s'))
+                rows = cursor.fetchall()
+            return rows
+        except Exception as e:
+            logger.error("Error getting CRM leads: %s", e)
+            return []
+
+    def get_crm_leads_page(self, limit: int = 100, after=None, stage: str = None,
+                           owner: str = None) -> tuple:
+        """Get one page of CRM leads with contact name, newest first. Returns (rows, next_after)."""
+        filters, params = [], []
+        if stage:
+            filters.append('l.stage = %s')
+            params.append(stage)
+        if owner:
+            filters.append('l.owner = %s')
+            params.append(owner)
+        try:
+            return self._fetch_page(
+                'SELECT l.*, c.name as contact_name FROM crm_leads l '
+                'LEFT JOIN crm_contacts c ON l.contact_id = c.id',
+                filters, params, [('l.created_at', 'DESC'), ('l.id', 'DESC')], (8, 0), after, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting CRM leads page: %s", e)
+            return [], None
+
+    def update_crm_lead(self, lead_id: int, **kwargs) -> bool:
+        """Update a CRM lead by id."""
+        try:
+            self._update_by_id('crm_leads', lead_id,
+                               {'contact_id', 'title', 'stage', 'value', 'probability', 'owner', 'notes'},
+                               kwargs)
+            return True
+        except Exception as e:
+            logger.error("Error updating CRM lead: %s", e)
+            return False
+
+    def delete_crm_lead(self, lead_id: int) -> bool:
+        """Delete a CRM lead by id."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM crm_leads WHERE id = %s', (lead_id,))
+            return True
+        except Exception as e:
+            logger.error("Error deleting CRM lead: %s", e)
+            return False
+
+    def add_crm_activity(self, lead_id: int, activity_type: str, note: str, due_date: str) -> bool:
+        """Add a CRM activity to a lead."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO crm_activities (lead_id, type, note, due_date) VALUES (%s, %s, %s, %s)',
+                    (lead_id, activity_type, note, due_date)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error adding CRM activity: %s", e)
+            return False
+
+    def get_crm_activities(self, lead_id: int) -> list:
+        """Get all activities for a lead."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT * FROM crm_activities WHERE lead_id = %s ORDER BY created_at DESC',
+                    (lead_id,)
+                )
+                rows = cursor.fetchall()
+            return rows
+        except Exception as e:
+            logger.error("Error getting CRM activities: %s", e)
+            return []
+
+    def update_crm_activity(self, activity_id: int, done: int) -> bool:
+        """Mark a CRM activity as done or not done."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('UPDATE crm_activities SET done = %s WHERE id = %s', (done, activity_id))
+            return True
+        except Exception as e:
+            logger.error("Error updating CRM activity: %s", e)
+            return False
+
+    # === BACKUP ===
+
+    def backup_to(self, dest_path: str, pages_per_step: int = 256, step_sleep_ms: int = 10,
+                  progress=None, max_restarts: int = 5) -> int:
+        """Not supported: back up a PostgreSQL server with pg_dump or its own WAL archiving. Returns -1."""
+        logger.error("Online backups of a PostgreSQL database are made with pg_dump or server-side "
+                     "WAL archiving, not BackupService")
+        return -1
+
+    def restore_from(self, src_path: str) -> bool:
+        """Not supported: restore a PostgreSQL server with pg_restore. Returns False."""
+        logger.error("Restore a PostgreSQL database with pg_restore, not BackupService")
+        return False
+
+    def close(self):
+        """Close the connection pool."""
+        self._pool.close()
@@ -0,0 +1,339 @@
+"""PostgreSQL schema for PostgresAdapter, as an ordered list of migrations.
+
+Tables and column order mirror sqlite_schema so both adapters return the
+same rows. Timestamps are TIMESTAMP(0) in UTC (the adapter reads them back
+as 'YYYY-MM-DD HH:MM:SS' text, like SQLite); REAL becomes DOUBLE PRECISION.
+The foreign keys SQLite declared but never enforced are left out.
+Full-text search uses GIN indexes over SEARCH_DOCUMENTS.
+"""
+from src.db.migrations import Migration
+
+# Weighted tsvector per searchable table; queries must use the same expression to hit the index.
+SEARCH_DOCUMENTS = {
+    'inventory': "setweight(to_tsvector('simple', coalesce(item_name, '')), 'A') || "
+                 "setweight(to_tsvector('simple', coalesce(description, '')), 'D')",
+    'visitors': "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(phone, '')), 'B')",
+    'crm_contacts': "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+                    "setweight(to_tsvector('simple', coalesce(company, '')), 'B') || "
+                    "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(phone, '')), 'C')",
+}
+
+_ID = 'id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY'
+
+# Truncated like SQLite's CURRENT_TIMESTAMP; TIMESTAMP(0) alone would round up to a second still to come
+_NOW = "date_trunc('second', LOCALTIMESTAMP)"
+
+
+def _baseline(cursor):
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS users (
+            {_ID},
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            role TEXT DEFAULT 'user',
+            created_at TIMESTAMP(0) DEFAULT {_NOW},
+            last_login TIMESTAMP(0)
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS inventory (
+            {_ID},
+            item_name TEXT UNIQUE NOT NULL,
+            quantity INTEGER DEFAULT 0,
+            threshold INTEGER DEFAULT 0,
+            cost_price DOUBLE PRECISION DEFAULT 0,
+            sale_price DOUBLE PRECISION DEFAULT 0,
+            description TEXT,
+            image_path TEXT,
+            updated_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS sales (
+            {_ID},
+            sale_date TIMESTAMP(0) DEFAULT {_NOW},
+            item_name TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            sale_price DOUBLE PRECISION NOT NULL,
+            total_amount DOUBLE PRECISION NOT NULL,
+            username TEXT NOT NULL
+        )
+    ''')
+
+    # Daily per-item sales rollup, kept current by a trigger on sales inserts
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_daily_item (
+            sale_day DATE NOT NULL,
+            item_name TEXT NOT NULL,
+            total_qty INTEGER NOT NULL DEFAULT 0,
+            total_amount DOUBLE PRECISION NOT NULL DEFAULT 0,
+            txn_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (sale_day, item_name)
+        )
+    ''')
+    cursor.execute('''
+        CREATE OR REPLACE FUNCTION sales_daily_item_add() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO sales_daily_item (sale_day, item_name, total_qty, total_amount, txn_count)
+            VALUES (NEW.sale_date::date, NEW.item_name, NEW.quantity, NEW.total_amount, 1)
+            ON CONFLICT (sale_day, item_name) DO UPDATE SET
+                total_qty = sales_daily_item.total_qty + excluded.total_qty,
+                total_amount = sales_daily_item.total_amount + excluded.total_amount,
+                txn_count = sales_daily_item.txn_count + 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    cursor.execute('DROP TRIGGER IF EXISTS trg_sales_daily_item_insert ON sales')
+    cursor.execute('''
+        CREATE TRIGGER trg_sales_daily_item_insert AFTER INSERT ON sales
+        FOR EACH ROW EXECUTE FUNCTION sales_daily_item_add()
+    ''')
+
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS email_config (
+            {_ID},
+            smtp_server TEXT,
+            smtp_port INTEGER,
+            sender_email TEXT,
+            sender_password TEXT,
+            recipient_email TEXT
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS email_queue (
+            {_ID},
+            recipient TEXT,
+            subject TEXT NOT NULL,
+            body TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            next_attempt_at TIMESTAMP(0) DEFAULT {_NOW},
+            created_at TIMESTAMP(0) DEFAULT {_NOW},
+            updated_at TIMESTAMP(0) DEFAULT {_NOW},
+            sent_at TIMESTAMP(0)
+        )
+    ''')
+
+    # Archival bookkeeping; archived rows live in <table>_archive
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archive_state (
+            table_name TEXT PRIMARY KEY,
+            archived_before TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archive_partitions (
+            table_name TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (table_name, year)
+        )
+    ''')
+
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS company_info (
+            {_ID},
+            company_name TEXT,
+            address TEXT,
+            phone TEXT,
+            email TEXT,
+            tax_id TEXT,
+            bank_details TEXT
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS activity_log (
+            {_ID},
+            timestamp TIMESTAMP(0) DEFAULT {_NOW},
+            username TEXT NOT NULL,
+            action TEXT NOT NULL,
+            details TEXT
+        )
+    ''')
+    for table in ('sales', 'activity_log'):
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS {table}_archive (LIKE {table} INCLUDING DEFAULTS)')
+        cursor.execute(f'ALTER TABLE {table}_archive DROP CONSTRAINT IF EXISTS {table}_archive_pkey')
+        cursor.execute(f'ALTER TABLE {table}_archive ADD PRIMARY KEY (id)')
+
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS visitors (
+            {_ID},
+            name TEXT NOT NULL,
+            address TEXT,
+            phone TEXT,
+            email TEXT,
+            company TEXT,
+            notes TEXT,
+            created_at TIMESTAMP(0) DEFAULT {_NOW},
+            updated_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS employees (
+            {_ID},
+            emp_number TEXT UNIQUE,
+            name TEXT NOT NULL,
+            joining_date TEXT,
+            designation TEXT,
+            manager TEXT,
+            team TEXT,
+            email TEXT,
+            phone TEXT,
+            emergency_contact TEXT,
+            photo_path TEXT,
+            notes TEXT,
+            is_active INTEGER DEFAULT 1,
+            created_at TIMESTAMP(0) DEFAULT {_NOW},
+            updated_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS appraisals (
+            {_ID},
+            employee_id BIGINT NOT NULL,
+            appraisal_date TEXT,
+            rating TEXT,
+            comments TEXT,
+            created_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS goals (
+            {_ID},
+            employee_id BIGINT NOT NULL,
+            goal TEXT NOT NULL,
+            status TEXT,
+            due_date TEXT,
+            notes TEXT,
+            created_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS payrolls (
+            {_ID},
+            employee_id BIGINT NOT NULL,
+            period_start TEXT,
+            period_end TEXT,
+            base_salary DOUBLE PRECISION DEFAULT 0,
+            allowances DOUBLE PRECISION DEFAULT 0,
+            deductions DOUBLE PRECISION DEFAULT 0,
+            overtime_hours DOUBLE PRECISION DEFAULT 0,
+            overtime_rate DOUBLE PRECISION DEFAULT 0,
+            gross_pay DOUBLE PRECISION DEFAULT 0,
+            net_pay DOUBLE PRECISION DEFAULT 0,
+            status TEXT DEFAULT 'Draft',
+            paid_date TEXT,
+            created_at TIMESTAMP(0) DEFAULT {_NOW},
+            updated_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS appraisal_cycles (
+            {_ID},
+            employee_id BIGINT NOT NULL,
+            period_start TEXT,
+            period_end TEXT,
+            status TEXT DEFAULT 'Draft',
+            self_text TEXT,
+            self_rating DOUBLE PRECISION,
+            manager_text TEXT,
+            manager_rating DOUBLE PRECISION,
+            final_rating DOUBLE PRECISION,
+            created_by TEXT,
+            created_at TIMESTAMP(0) DEFAULT {_NOW},
+            updated_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS feedback_requests (
+            {_ID},
+            appraisal_id BIGINT,
+            requester TEXT,
+            target_employee_id BIGINT NOT NULL,
+            message TEXT,
+            status TEXT DEFAULT 'Requested',
+            created_at TIMESTAMP(0) DEFAULT {_NOW},
+            updated_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS feedback_entries (
+            {_ID},
+            appraisal_id BIGINT,
+            from_employee_id BIGINT,
+            to_employee_id BIGINT NOT NULL,
+            rating DOUBLE PRECISION,
+            feedback_text TEXT,
+            created_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS crm_contacts (
+            {_ID},
+            name TEXT NOT NULL,
+            company TEXT DEFAULT '',
+            email TEXT DEFAULT '',
+            phone TEXT DEFAULT '',
+            source TEXT DEFAULT '',
+            status TEXT DEFAULT 'active',
+            notes TEXT DEFAULT '',
+            created_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS crm_leads (
+            {_ID},
+            contact_id BIGINT REFERENCES crm_contacts(id),
+            title TEXT NOT NULL,
+            stage TEXT DEFAULT 'New',
+            value DOUBLE PRECISION DEFAULT 0,
+            probability INTEGER DEFAULT 0,
+            owner TEXT DEFAULT '',
+            notes TEXT DEFAULT '',
+            created_at TIMESTAMP(0) DEFAULT {_NOW},
+            updated_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS crm_activities (
+            {_ID},
+            lead_id BIGINT REFERENCES crm_leads(id),
+            type TEXT DEFAULT 'note',
+            note TEXT DEFAULT '',
+            due_date TEXT DEFAULT '',
+            done INTEGER DEFAULT 0,
+            created_at TIMESTAMP(0) DEFAULT {_NOW}
+        )
+    ''')
+
+    # Performance indexes (item_name and emp_number are already indexed by UNIQUE)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_date_cover '
+                   'ON sales(sale_date) INCLUDE (item_name, quantity, total_amount)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_item ON sales(item_name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_archive_date ON sales_archive(sale_date)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_visitors_date ON visitors(created_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_user ON activity_log(username)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_ts ON activity_log(timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_archive_ts ON activity_log_archive(timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_leads_stage ON crm_leads(stage)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_leads_contact ON crm_leads(contact_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_activities_lead ON crm_activities(lead_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_inventory_updated ON inventory(updated_at, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_payrolls_updated ON payrolls(updated_at, id)')
+    # Keyset pagination sort orders
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_contacts_name ON crm_contacts(name, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_visitors_name ON visitors(name, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_leads_created ON crm_leads(created_at, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_email_queue_due ON email_queue(status, next_attempt_at)')
+    # Full-text search
+    for table, document in SEARCH_DOCUMENTS.items():
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_search ON {table} USING GIN (({document}))')
+
+
+MIGRATIONS = [
+    Migration(1, 'baseline', _baseline),
+]
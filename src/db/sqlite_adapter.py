@@ -1,404 +1,575 @@
 """SQLite implementation of DatabaseAdapter - for local/desktop use."""
+import os
+import re
 import sqlite3
 import logging
+import time
 from contextlib import contextmanager
 from datetime import datetime
-from src.db.base import DatabaseAdapter
-from src.core import PasswordManager
-from src.config import ADMIN_USERNAME, ADMIN_PASSWORD
+from src.db.base import (
+    DatabaseAdapter, ALL_TABLES, checkout_demand, checkout_rows, day_range, sales_page_filters,
+    crm_leads_query, kpi_sales_params, kpi_result,
+)
+from src.db.migrations import migrate, current_version
+from src.db.keyset import keyset_query, split_page
+from src.db.sqlite_schema import MIGRATIONS
+from src.core import PasswordManager, InsufficientStockError
+from src.db.pool import SQLiteConnectionPool
+from src.db.storage import StorageConnection, resolve_profile, apply_pragmas, connect_read_only
+from src.config import (
+    ADMIN_USERNAME, ADMIN_PASSWORD, DB_POOL_SIZE, DB_POOL_HEALTH_CHECK_SECONDS,
+    DB_STORAGE_PROFILE, DB_BUSY_TIMEOUT_MS, DB_WRITE_RETRIES, ARCHIVE_DIR,
+    BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP_MS, BACKUP_MAX_RESTARTS,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# Hot-path statements, shared with the async adapter
+_CHECKOUT_STOCK_SQL = ('UPDATE inventory SET quantity = quantity - ?, updated_at = CURRENT_TIMESTAMP '
+                       'WHERE item_name = ? AND quantity >= ?')
+_CHECKOUT_SALE_SQL = ('INSERT INTO sales (item_name, quantity, sale_price, total_amount, username) '
+                      'VALUES (?, ?, ?, ?, ?)')
+
+# Dashboard KPI aggregates, in the order kpi_result() takes their rows
+_KPI_QUERIES = (
+    '''
+    SELECT COALESCE(SUM(quantity * cost_price), 0),
+           COUNT(*),
+           COALESCE(SUM(quantity <= threshold AND threshold > 0), 0)
+    FROM inventory
+    ''',
+    '''
+    SELECT COALESCE(SUM(total_amount), 0),
+           COUNT(DISTINCT sale_day),
+           COALESCE(SUM(CASE WHEN sale_day = ? THEN total_amount END), 0),
+           COALESCE(SUM(CASE WHEN sale_day BETWEEN ? AND ? THEN total_amount END), 0),
+           COALESCE(SUM(CASE WHEN sale_day BETWEEN ? AND ? THEN total_amount END), 0)
+    FROM sales_daily_item
+    ''',
+    '''
+    SELECT COALESCE(SUM(CASE WHEN COALESCE(stage, '') != 'Lost' THEN value END), 0),
+           COALESCE(SUM(stage = 'Won'), 0),
+           COALESCE(SUM(stage = 'Lost'), 0)
+    FROM crm_leads
+    ''',
+)
+
+
+# Full-text indexes: content table -> (FTS5 table, indexed columns, bm25 column weights)
+_FTS_INDEXES = {
+    'inventory': ('inventory_fts', ('item_name', 'description'), (10.0, 1.0)),
+    'visitors': ('visitors_fts', ('name', 'email', 'phone'), (10.0, 2.0, 2.0)),
+    'crm_contacts': ('crm_contacts_fts', ('name', 'company', 'email', 'phone'), (10.0, 5.0, 2.0, 2.0)),
+}
+
+_fts5_supported = None
+
+
+def _fts5_available() -> bool:
+    """True if this SQLite build has the FTS5 extension (checked once)."""
+    global _fts5_supported
+    if _fts5_supported is None:
+        probe = sqlite3.connect(':memory:')
+        try:
+            probe.execute('CREATE VIRTUAL TABLE fts5_probe USING fts5(x)')
+            _fts5_supported = True
+        except sqlite3.OperationalError:
+            _fts5_supported = False
+        finally:
+            probe.close()
+    return _fts5_supported
+
+
+def _fts_match(query: str):
+    """Turn free text into an FTS5 query where every word is a prefix match.
+
+    Returns None if the text has no searchable words.
+    """
+    words = re.findall(r'\w+', query or '')
+    return ' '.join(f'"{w}"*' for w in words) or None
+
+
 class SQLiteAdapter(DatabaseAdapter):
     def create_user(self, username: str, password_hash: str, role: str = 'user'):
         """Create a new user with the specified role."""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
         try:
-            cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
-            if not cursor.fetchone():
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
+                if cursor.fetchone():
+                    return False  # User already exists
                 cursor.execute(
                     'INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)',
                     (username, password_hash, role)
                 )
-                conn.commit()
                 return True
-            else:
-                return False  # User already exists
         except Exception as e:
             logger.error("Error creating user: %s", e)
             return False
-        finally:
-            conn.close()
 
     def set_user_role(self, username: str, role: str) -> bool:
         """Set the role for an existing user."""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
         try:
-            cursor.execute('UPDATE users SET role = ? WHERE username = ?', (role, username))
-            conn.commit()
-            return cursor.rowcount > 0
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('UPDATE users SET role = ? WHERE username = ?', (role, username))
+                return cursor.rowcount > 0
         except Exception as e:
             logger.error("Error setting user role: %s", e)
             return False
-        finally:
-            conn.close()
     """SQLite database adapter - implements abstract DatabaseAdapter interface."""
 
-    def __init__(self, db_file: str = "inventory.db"):
+    # Tables written implicitly by triggers when the key table changes
+    _DERIVED_TABLES = {'sales': ('sales_daily_item',)}
+
+    # Change feeds for incremental exports: table -> (watermark column, columns).
+    # sales is append-only (id watermark); the others are re-read when updated_at moves.
+    _CHANGE_FEEDS = {
+        'sales': ('id', ('id', 'sale_date', 'item_name', 'quantity', 'sale_price', 'total_amount', 'username')),
+        'inventory': ('updated_at', ('id', 'item_name', 'quantity', 'threshold', 'cost_price', 'sale_price',
+                                     'description', 'updated_at')),
+        'payrolls': ('updated_at', ('id', 'employee_id', 'period_start', 'period_end', 'base_salary',
+                                    'allowances', 'deductions', 'overtime_hours', 'overtime_rate',
+                                    'gross_pay', 'net_pay', 'status', 'paid_date', 'created_at', 'updated_at')),
+    }
+
+    # Tables that can be archived: table -> (date column, archive table columns).
+    # Rows move to one database per calendar year of the date column.
+    _ARCHIVE_TABLES = {
+        'sales': ('sale_date', 'id INTEGER PRIMARY KEY, sale_date TIMESTAMP, item_name TEXT NOT NULL, '
+                               'quantity INTEGER NOT NULL, sale_price REAL NOT NULL, '
+                               'total_amount REAL NOT NULL, username TEXT NOT NULL'),
+        'activity_log': ('timestamp', 'id INTEGER PRIMARY KEY, timestamp TIMESTAMP, username TEXT NOT NULL, '
+                                      'action TEXT NOT NULL, details TEXT'),
+    }
+
+    def __init__(self, db_file: str = "inventory.db", pool_size: int = DB_POOL_SIZE,
+                 storage_profile=DB_STORAGE_PROFILE, busy_timeout_ms: int = DB_BUSY_TIMEOUT_MS,
+                 write_retries: int = DB_WRITE_RETRIES, archive_dir: str = ARCHIVE_DIR):
         self.db_file = db_file
+        self.archive_dir = archive_dir or os.path.dirname(os.path.abspath(db_file))
+        self.pragmas = resolve_profile(storage_profile, busy_timeout=busy_timeout_ms)
+        self.write_retries = write_retries
+        self._write_listeners = []
+        self._pool = SQLiteConnectionPool(
+            db_file, pool_size=pool_size, health_check_interval=DB_POOL_HEALTH_CHECK_SECONDS,
+            on_connect=self._configure_connection, factory=StorageConnection,
+            on_commit=self._notify_writes,
+        )
         self.init_database()
 
+    def add_write_listener(self, callback):
+        """Register callback(tables: set) to run after each committed write."""
+        self._write_listeners.append(callback)
+
+    def notify_writes(self, tables):
+        """Tell the write listeners about writes committed outside this adapter.
+
+        For an AsyncDatabaseAdapter on the same database; derived tables are added.
+        """
+        self._notify_writes(set(tables))
+
+    def _notify_writes(self, tables: set):
+        for table in list(tables):
+            tables.update(self._DERIVED_TABLES.get(table, ()))
+        for callback in self._write_listeners:
+            try:
+                callback(tables)
+            except Exception as e:
+                logger.error("Write listener failed: %s", e)
+
+    def _configure_connection(self, conn):
+        """Apply the storage profile to every new pooled connection."""
+        conn.write_retries = self.write_retries
+        apply_pragmas(conn, self.pragmas)
+
     @contextmanager
     def _get_conn(self):
-        """Context manager for SQLite connections — handles commit/rollback/close."""
-        conn = sqlite3.connect(self.db_file)
-        try:
+        """Borrow this thread's pooled connection — handles commit/rollback.
+
+        Nested calls on the same thread share the connection, so only the
+        outermost block commits.
+        """
+        with self._pool.connection() as conn:
             yield conn, conn.cursor()
-            conn.commit()
+
+    def _read_only_conn(self, archive_years=()) -> sqlite3.Connection:
+        """Open a short-lived read-only connection with the given archive years attached as a<year>."""
+        conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {int(self.pragmas.get('busy_timeout', 5000))}")
+            for year in archive_years:
+                conn.execute(f'ATTACH DATABASE ? AS a{int(year)}', (self.archive_path(year),))
+            conn.execute('PRAGMA query_only = ON')
         except Exception:
-            conn.rollback()
+            conn.close()
+            raise
+        return conn
+
+    def _iter_rows(self, sql: str, params=(), batch_size: int = 1000, archive_years=()):
+        """Yield the rows of a long read, fetching batch_size at a time.
+
+        Uses its own short-lived read-only connection rather than the pool:
+        streaming responses resume the generator on whichever worker thread
+        is free, and in WAL mode the read sees one snapshot without blocking
+        writers.
+        """
+        conn = self._read_only_conn(archive_years)
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        except Exception as e:
+            logger.error("Error streaming rows: %s", e)
             raise
         finally:
             conn.close()
 
-    def init_database(self):
-        """Initialize SQLite database with all tables."""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                role TEXT DEFAULT 'user',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP
-            )
-        ''')
-        
-        # Inventory table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS inventory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                item_name TEXT UNIQUE NOT NULL,
-                quantity INTEGER DEFAULT 0,
-                threshold INTEGER DEFAULT 0,
-                cost_price REAL DEFAULT 0,
-                sale_price REAL DEFAULT 0,
-                description TEXT,
-                image_path TEXT,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Sales table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sales (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sale_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                item_name TEXT NOT NULL,
-                quantity INTEGER NOT NULL,
-                sale_price REAL NOT NULL,
-                total_amount REAL NOT NULL,
-                username TEXT NOT NULL,
-                FOREIGN KEY(username) REFERENCES users(username)
-            )
-        ''')
-        
-        # Email config table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS email_config (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                smtp_server TEXT,
-                smtp_port INTEGER,
-                sender_email TEXT,
-                sender_password TEXT,
-                recipient_email TEXT
-            )
-        ''')
-        
-        # Company info table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS company_info (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company_name TEXT,
-                address TEXT,
-                phone TEXT,
-                email TEXT,
-                tax_id TEXT,
-                bank_details TEXT
-            )
-        ''')
-        
-        # Activity log table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS activity_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                username TEXT NOT NULL,
-                action TEXT NOT NULL,
-                details TEXT,
-                FOREIGN KEY(username) REFERENCES users(username)
-            )
-        ''')
-        
-        # Visitors table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS visitors (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                address TEXT,
-                phone TEXT,
-                email TEXT,
-                company TEXT,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+    def iter_changes(self, table: str, since=None, batch_size: int = 1000):
+        """Stream rows of a change-feed table written after a watermark.
 
-        # Employees table (HR)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS employees (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                emp_number TEXT UNIQUE,
-                name TEXT NOT NULL,
-                joining_date TEXT,
-                designation TEXT,
-                manager TEXT,
-                team TEXT,
-                email TEXT,
-                phone TEXT,
-                emergency_contact TEXT,
-                photo_path TEXT,
-                notes TEXT,
-                is_active INTEGER DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        For sales, since is the last exported id (rows with a greater id are
+        returned). For inventory and payrolls it is the last exported
+        updated_at; rows stamped at or after it are returned, so a row may be
+        repeated across runs and readers keep the newest version per id.
+        Columns are those listed in _CHANGE_FEEDS, in that order.
+        """
+        if table not in self._CHANGE_FEEDS:
+            raise ValueError(f"No change feed for table: {table}")
+        key, columns = self._CHANGE_FEEDS[table]
+        sql = f'SELECT {", ".join(columns)} FROM {table}'
+        params = []
+        if since is not None:
+            sql += f' WHERE {key} {">" if key == "id" else ">="} ?'
+            params.append(since)
+        order = 'id' if key == 'id' else f'{key}, id'
+        return self._iter_rows(f'{sql} ORDER BY {order}', params, batch_size)
 
-        # Appraisals table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS appraisals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                employee_id INTEGER NOT NULL,
-                appraisal_date TEXT,
-                rating TEXT,
-                comments TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(employee_id) REFERENCES employees(id)
-            )
-        ''')
+    # === ARCHIVE ===
 
-        # Goals table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS goals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                employee_id INTEGER NOT NULL,
-                goal TEXT NOT NULL,
-                status TEXT,
-                due_date TEXT,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(employee_id) REFERENCES employees(id)
-            )
-        ''')
+    def archive_path(self, year: int) -> str:
+        """Path of the archive database holding rows dated in year."""
+        stem = os.path.splitext(os.path.basename(self.db_file))[0]
+        return os.path.join(self.archive_dir, f'{stem}_archive_{int(year)}.db')
 
-        # Payroll table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS payrolls (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                employee_id INTEGER NOT NULL,
-                period_start TEXT,
-                period_end TEXT,
-                base_salary REAL DEFAULT 0,
-                allowances REAL DEFAULT 0,
-                deductions REAL DEFAULT 0,
-                overtime_hours REAL DEFAULT 0,
-                overtime_rate REAL DEFAULT 0,
-                gross_pay REAL DEFAULT 0,
-                net_pay REAL DEFAULT 0,
-                status TEXT DEFAULT 'Draft',
-                paid_date TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(employee_id) REFERENCES employees(id)
-            )
-        ''')
+    def _archive_years(self, table: str, start_date: str = None, end_date: str = None) -> list:
+        """Archive years holding rows of table that a [start_date, end_date] read can touch."""
+        sql = 'SELECT year FROM archive_partitions WHERE table_name = ? AND row_count > 0'
+        params = [table]
+        if start_date:
+            sql += ' AND year >= ?'
+            params.append(int(start_date[:4]))
+        if end_date:
+            sql += ' AND year <= ?'
+            params.append(int(end_date[:4]))
+        with self._get_conn() as (conn, cursor):
+            cursor.execute(sql + ' ORDER BY year', params)
+            years = [row[0] for row in cursor.fetchall()]
+        return [y for y in years if os.path.exists(self.archive_path(y))]
 
-        # Appraisal cycles
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS appraisal_cycles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                employee_id INTEGER NOT NULL,
-                period_start TEXT,
-                period_end TEXT,
-                status TEXT DEFAULT 'Draft',
-                self_text TEXT,
-                self_rating REAL,
-                manager_text TEXT,
-                manager_rating REAL,
-                final_rating REAL,
-                created_by TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(employee_id) REFERENCES employees(id)
-            )
-        ''')
+    def _range_bands(self, table: str, start_date: str = None, end_date: str = None) -> list:
+        """Date bands covering a [start_date, end_date] read of table, newest first.
 
-        # Feedback requests
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS feedback_requests (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                appraisal_id INTEGER,
-                requester TEXT,
-                target_employee_id INTEGER NOT NULL,
-                message TEXT,
-                status TEXT DEFAULT 'Requested',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(appraisal_id) REFERENCES appraisal_cycles(id),
-                FOREIGN KEY(target_employee_id) REFERENCES employees(id)
-            )
-        ''')
+        Returns [(lo, hi, archive year or None)] with lo inclusive, hi
+        exclusive and None meaning unbounded. Rows from the archive horizon on
+        live only in the hot table; an archived year is read from the hot
+        table plus that year's archive, and the gaps from the hot table
+        alone. Without archives there is a single unbounded band.
+        """
+        years = self._archive_years(table, start_date, end_date)
+        horizon = self.get_archive_horizon(table) if years else None
+        if not horizon:
+            return [(None, None, None)]
+        horizon = datetime.strptime(horizon[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
+        bands, upper = [(horizon, None, None)], horizon
+        for year in reversed(years):
+            lo, hi = f'{int(year):04d}-01-01', min(f'{int(year) + 1:04d}-01-01', horizon)
+            if hi < upper:
+                bands.append((hi, upper, None))
+            bands.append((lo, hi, year))
+            upper = lo
+        bands.append((None, upper, None))
+        start = start_date[:10] if start_date else None
+        end = day_range(end_date)[1] if end_date else None
+        return [b for b in bands
+                if not (start and b[1] and b[1] <= start) and not (end and b[0] and b[0] >= end)]
 
-        # Feedback entries
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS feedback_entries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                appraisal_id INTEGER,
-                from_employee_id INTEGER,
-                to_employee_id INTEGER NOT NULL,
-                rating REAL,
-                feedback_text TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(appraisal_id) REFERENCES appraisal_cycles(id),
-                FOREIGN KEY(from_employee_id) REFERENCES employees(id),
-                FOREIGN KEY(to_employee_id) REFERENCES employees(id)
-            )
-        ''')
-        
-        # Migrate employees table if new columns need to be added
-        try:
-            cursor.execute('PRAGMA table_info(employees)')
-            existing_cols = {row[1] for row in cursor.fetchall()}
-            required_cols = {'emp_number', 'emergency_contact', 'photo_path', 'is_active'}
-            for col in required_cols:
-                if col not in existing_cols:
-                    if col == 'is_active':
-                        cursor.execute('ALTER TABLE employees ADD COLUMN is_active INTEGER DEFAULT 1')
-                    else:
-                        cursor.execute(f'ALTER TABLE employees ADD COLUMN {col} TEXT')
-        except Exception:
-            pass
+    def live_source(self, table: str, since: str) -> str:
+        """FROM-clause source for table's rows in the live database from since on.
+
+        For readers that cannot attach the archive databases, such as the
+        aiosqlite adapter, to read the unarchived part of a range.
+        """
+        return self._band_source(table, (since, None, None))
 
-        # Migrate inventory table if new columns need to be added
+    def _band_source(self, table: str, band: tuple) -> str:
+        """FROM-clause source for one band from _range_bands()."""
+        lo, hi, year = band
+        if lo is None and hi is None:
+            return table
+        column = self._ARCHIVE_TABLES[table][0]
+        bounds = [f"{column} >= '{lo}'"] if lo else []
+        bounds += [f"{column} < '{hi}'"] if hi else []
+        where = ' WHERE ' + ' AND '.join(bounds)
+        parts = [f'SELECT * FROM main.{table}{where}']
+        if year is not None:
+            parts.append(f'SELECT * FROM a{int(year)}.{table}{where}')
+        return f'({" UNION ALL ".join(parts)}) AS {table}'
+
+    def _read_range(self, table: str, sql: str, params=(), start_date: str = None, end_date: str = None,
+                    order: str = 'DESC', limit: int = None) -> list:
+        """fetchall() of sql, where {src} stands for table plus any archive years the range needs.
+
+        sql runs once per band of _range_bands(), newest band first (oldest
+        first for order='ASC'), until limit rows are in. So a newest-first
+        page is served from the hot table on the pool, and archive years are
+        attached one at a time, only once the hot rows run out.
+        """
+        bands = self._range_bands(table, start_date, end_date)
+        if order == 'ASC':
+            bands.reverse()
+        rows = []
+        for band in bands:
+            band_sql = sql.format(src=self._band_source(table, band))
+            if band[2] is None:
+                with self._get_conn() as (conn, cursor):
+                    cursor.execute(band_sql, params)
+                    rows.extend(cursor.fetchall())
+            else:
+                conn = self._read_only_conn([band[2]])
+                try:
+                    rows.extend(conn.execute(band_sql, params).fetchall())
+                finally:
+                    conn.close()
+            if limit and len(rows) >= limit:
+                return rows[:limit]
+        return rows
+
+    def _iter_range(self, table: str, sql: str, params=(), start_date: str = None, end_date: str = None,
+                    batch_size: int = 1000):
+        """Stream sql oldest band first, like _read_range(order='ASC'), through _iter_rows."""
+        for band in reversed(self._range_bands(table, start_date, end_date)):
+            yield from self._iter_rows(sql.format(src=self._band_source(table, band)), params, batch_size,
+                                       archive_years=() if band[2] is None else (band[2],))
+
+    def get_archive_horizon(self, table: str) -> str:
+        """Day before which table's rows have been archived (YYYY-MM-DD), or None."""
         try:
-            cursor.execute('PRAGMA table_info(inventory)')
-            existing_cols = {row[1] for row in cursor.fetchall()}
-            if 'image_path' not in existing_cols:
-                cursor.execute('ALTER TABLE inventory ADD COLUMN image_path TEXT')
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT archived_before FROM archive_state WHERE table_name = ?', (table,))
+                row = cursor.fetchone()
+            return row[0] if row else None
         except Exception:
-            pass
-        
-        # CRM Contacts table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS crm_contacts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                company TEXT DEFAULT '',
-                email TEXT DEFAULT '',
-                phone TEXT DEFAULT '',
-                source TEXT DEFAULT '',
-                status TEXT DEFAULT 'active',
-                notes TEXT DEFAULT '',
-                created_at TEXT DEFAULT (datetime('now'))
-            )
-        ''')
+            return None
 
-        # CRM Leads table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS crm_leads (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                contact_id INTEGER REFERENCES crm_contacts(id),
-                title TEXT NOT NULL,
-                stage TEXT DEFAULT 'New',
-                value REAL DEFAULT 0,
-                probability INTEGER DEFAULT 0,
-                owner TEXT DEFAULT '',
-                notes TEXT DEFAULT '',
-                created_at TEXT DEFAULT (datetime('now')),
-                updated_at TEXT DEFAULT (datetime('now'))
-            )
-        ''')
+    def get_archive_partitions(self, table: str = None) -> list:
+        """List (table_name, year, row_count, path) for every archive partition."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                if table:
+                    cursor.execute('SELECT table_name, year, row_count FROM archive_partitions '
+                                   'WHERE table_name = ? ORDER BY year', (table,))
+                else:
+                    cursor.execute('SELECT table_name, year, row_count FROM archive_partitions '
+                                   'ORDER BY table_name, year')
+                rows = cursor.fetchall()
+            return [row + (self.archive_path(row[1]),) for row in rows]
+        except Exception:
+            return []
 
-        # CRM Activities table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS crm_activities (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                lead_id INTEGER REFERENCES crm_leads(id),
-                type TEXT DEFAULT 'note',
-                note TEXT DEFAULT '',
-                due_date TEXT DEFAULT '',
-                done INTEGER DEFAULT 0,
-                created_at TEXT DEFAULT (datetime('now'))
+    def archive_rows(self, table: str, before: str) -> dict:
+        """Move rows of table dated before the day `before` into per-year archive databases.
+
+        Each year is copied and deleted in one transaction with that year's
+        archive attached; a re-run after a crash skips rows already copied.
+        Derived data (the sales_daily_item rollup) is left untouched.
+        Returns {year: rows moved}, or None on error.
+        """
+        if table not in self._ARCHIVE_TABLES:
+            raise ValueError(f"Table cannot be archived: {table}")
+        column, columns_sql = self._ARCHIVE_TABLES[table]
+        before = datetime.strptime(before[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
+        moved = {}
+        conn = sqlite3.connect(self.db_file, factory=StorageConnection, isolation_level=None,
+                               check_same_thread=False)
+        try:
+            conn.write_retries = self.write_retries
+            apply_pragmas(conn, self.pragmas)
+            oldest = conn.execute(f'SELECT MIN({column}) FROM {table} WHERE {column} < ?', (before,)).fetchone()[0]
+            for year in range(int(oldest[:4]), int(before[:4]) + 1) if oldest else ():
+                start, end = f'{year}-01-01', min(f'{year + 1}-01-01', before)
+                conn.execute('ATTACH DATABASE ? AS archive', (self.archive_path(year),))
+                try:
+                    conn.execute(f'CREATE TABLE IF NOT EXISTS archive.{table} ({columns_sql})')
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS archive.idx_{table}_{column} ON {table}({column})')
+                    conn.execute('BEGIN IMMEDIATE')
+                    try:
+                        bounds = (start, end)
+                        conn.execute(f'INSERT OR IGNORE INTO archive.{table} SELECT * FROM main.{table} '
+                                     f'WHERE {column} >= ? AND {column} < ?', bounds)
+                        count = conn.execute(f'DELETE FROM main.{table} WHERE {column} >= ? AND {column} < ?',
+                                             bounds).rowcount
+                        if count:
+                            conn.execute(
+                                'INSERT INTO archive_partitions (table_name, year, row_count) VALUES (?, ?, ?) '
+                                'ON CONFLICT(table_name, year) DO UPDATE SET row_count = row_count + excluded.row_count',
+                                (table, year, count)
+                            )
+                        conn.execute('COMMIT')
+                    except Exception:
+                        conn.execute('ROLLBACK')
+                        raise
+                finally:
+                    conn.execute('DETACH DATABASE archive')
+                if count:
+                    moved[year] = count
+            conn.execute(
+                'INSERT INTO archive_state (table_name, archived_before) VALUES (?, ?) '
+                'ON CONFLICT(table_name) DO UPDATE SET archived_before = MAX(archived_before, excluded.archived_before)',
+                (table, before)
             )
+        except Exception as e:
+            logger.error("Error archiving %s: %s", table, e)
+            return None
+        finally:
+            conn.close()
+        if moved:
+            self._notify_writes({table})
+        return moved
+
+    def _fetch_page(self, select_sql: str, filters: list, params: list, order: list,
+                    key_index: tuple, after=None, limit: int = 100, archive: tuple = None) -> tuple:
+        """Run a keyset-paginated SELECT. Returns (rows, next_after).
+
+        order is a list of (column, 'ASC'|'DESC') whose last column is unique;
+        key_index gives the positions of those columns in each result row.
+        after holds the sort-key values of the last row of the previous page.
+        next_after is None when there are no further rows.
+        archive is (table, start_date, end_date) to read through _read_range,
+        with select_sql naming the table as {src}.
+        """
+        sql, params = keyset_query(select_sql, filters, params, order, after, limit)
+        if archive:
+            rows = self._read_range(archive[0], sql, params, *archive[1:], order=order[0][1], limit=limit + 1)
+        else:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+        return split_page(rows, limit, key_index)
+
+    def init_database(self):
+        """Bring the schema up to date and make sure the default admin user exists.
+
+        An up-to-date database costs one schema_version lookup; pending
+        migrations (src/db/sqlite_schema.py) are applied in one transaction.
+        """
+        with self._get_conn() as (conn, cursor):
+            applied = migrate(conn, MIGRATIONS)
+            if applied:
+                logger.info("Migrated %s to schema version %s", self.db_file, applied[-1])
+            self._sync_fts_indexes(cursor)
+
+            # Create default admin user if not exists (credentials from env or config)
+            self.create_admin_user(ADMIN_USERNAME, PasswordManager.hash_password(ADMIN_PASSWORD))
+
+    def get_schema_version(self) -> int:
+        """Get the highest schema migration applied to this database."""
+        with self._get_conn() as (conn, cursor):
+            return current_version(conn)
+
+    def _sync_fts_indexes(self, cursor):
+        """Create or drop the full-text indexes to match this SQLite build.
+
+        FTS5 builds get the indexes (searches elsewhere fall back to LIKE).
+        Without FTS5, triggers left by an FTS5 build would make every write
+        fail, so they are dropped.
+        """
+        self.fts_enabled = _fts5_available()
+        triggers = [f'trg_{fts}_{suffix}' for fts, _, _ in _FTS_INDEXES.values() for suffix in ('ai', 'ad', 'au')]
+        cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN "
+            f"({', '.join('?' * len(triggers))})", triggers
+        )
+        present = {row[0] for row in cursor.fetchall()}
+        if self.fts_enabled:
+            for table, (fts, _, _) in _FTS_INDEXES.items():
+                if not all(f'trg_{fts}_{suffix}' in present for suffix in ('ai', 'ad', 'au')):
+                    self._create_fts_index(cursor, table)
+        else:
+            for name in present:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+
+    def _create_fts_index(self, cursor, table: str):
+        """Create an external-content FTS5 index on table and the triggers that sync it."""
+        fts, columns, _ = _FTS_INDEXES[table]
+        cols = ', '.join(columns)
+        new_cols = ', '.join(f'new.{c}' for c in columns)
+        old_cols = ', '.join(f'old.{c}' for c in columns)
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (f'trg_{fts}_ai',)
+        )
+        needs_rebuild = cursor.fetchone() is None
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{cols}, content='{table}', content_rowid='id', prefix='2 3')"
+        )
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            END
+        ''')
+        # Only fires when an indexed column changes (not on stock/price updates)
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+                INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols});
+            END
         ''')
+        if needs_rebuild:
+            # New index, or one that went stale while opened without FTS5
+            cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+    def _fts_search(self, table: str, query: str):
+        """Return (FTS5 match expression, rank expression) for query, or None to use LIKE."""
+        if not self.fts_enabled:
+            return None
+        match = _fts_match(query)
+        if match is None:
+            return None
+        fts, _, weights = _FTS_INDEXES[table]
+        return match, f"bm25({fts}, {', '.join(map(str, weights))})"
 
-        # Performance indexes
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_inventory_name ON inventory(item_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(sale_date)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_item ON sales(item_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_number ON employees(emp_number)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_visitors_date ON visitors(created_at)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_user ON activity_log(username)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_ts ON activity_log(timestamp)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_leads_stage ON crm_leads(stage)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_leads_contact ON crm_leads(contact_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_activities_lead ON crm_activities(lead_id)')
-
-        # Create default admin user if not exists (credentials from env or config)
-        self.create_admin_user(ADMIN_USERNAME, PasswordManager.hash_password(ADMIN_PASSWORD))
-        
-        conn.commit()
-        conn.close()
-    
     # === USERS & AUTH ===
     
     def create_admin_user(self, username: str, password_hash: str):
         """Create default admin user if not exists."""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
         try:
-            cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
-            if not cursor.fetchone():
-                cursor.execute(
-                    'INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)',
-                    (username, password_hash, 'admin')
-                )
-                conn.commit()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
+                if not cursor.fetchone():
+                    cursor.execute(
+                        'INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)',
+                        (username, password_hash, 'admin')
+                    )
         except Exception as e:
             logger.error("Error creating admin user: %s", e)
-        finally:
-            conn.close()
     
     def authenticate_user(self, username: str, password_hash: str) -> bool:
         """Verify user credentials."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT * FROM users WHERE username = ? AND password_hash = ?',
-                (username, password_hash)
-            )
-            result = cursor.fetchone()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT * FROM users WHERE username = ? AND password_hash = ?',
+                    (username, password_hash)
+                )
+                result = cursor.fetchone()
             return result is not None
         except Exception:
             return False
@@ -406,11 +577,9 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_user_role(self, username: str) -> str:
         """Get user role (admin, user, etc)."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT role FROM users WHERE username = ?', (username,))
-            result = cursor.fetchone()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT role FROM users WHERE username = ?', (username,))
+                result = cursor.fetchone()
             return result[0] if result else 'user'
         except Exception:
             return 'user'
@@ -418,14 +587,11 @@ class SQLiteAdapter(DatabaseAdapter):
     def update_last_login(self, username: str):
         """Update user's last login timestamp."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?',
-                (username,)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?',
+                    (username,)
+                )
         except Exception as e:
             logger.error("Error updating last login: %s", e)
     
@@ -434,23 +600,33 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_all_inventory(self) -> list:
         """Get all inventory items."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT item_name, quantity, threshold, cost_price, sale_price, description, image_path FROM inventory ORDER BY item_name')
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT item_name, quantity, threshold, cost_price, sale_price, description, image_path FROM inventory ORDER BY item_name')
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
     
+    def get_inventory_page(self, limit: int = 100, after=None, low_stock: bool = False) -> tuple:
+        """Get one page of inventory ordered by name. Returns (rows, next_after)."""
+        try:
+            return self._fetch_page(
+                'SELECT item_name, quantity, threshold, cost_price, sale_price, description, image_path FROM inventory',
+                ['quantity <= threshold AND threshold > 0'] if low_stock else [], [],
+                [('item_name', 'ASC')], (0,), after, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting inventory page: %s", e)
+            return [], None
+
     def get_inventory_by_name(self, name: str) -> dict:
         """Get inventory item by name."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM inventory WHERE item_name = ?', (name,))
-            row = cursor.fetchone()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM inventory WHERE item_name = ?', (name,))
+                row = cursor.fetchone()
             if row:
                 return {
                     'id': row[0], 'item_name': row[1], 'quantity': row[2],
@@ -466,57 +642,83 @@ class SQLiteAdapter(DatabaseAdapter):
                           image_path: str = None):
         """Add new inventory item."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO inventory (item_name, quantity, threshold, cost_price, sale_price, description, image_path) VALUES (?, ?, ?, ?, ?, ?, ?)',
-                (item_name, quantity, threshold, cost_price, sale_price, description, image_path)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO inventory (item_name, quantity, threshold, cost_price, sale_price, description, image_path) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (item_name, quantity, threshold, cost_price, sale_price, description, image_path)
+                )
             return True
         except Exception as e:
             logger.error("Error adding inventory item: %s", e)
             return False
     
+    def iter_inventory(self):
+        """Stream inventory rows (import column order) by name."""
+        return self._iter_rows(
+            'SELECT item_name, quantity, threshold, cost_price, sale_price, description '
+            'FROM inventory ORDER BY item_name'
+        )
+
+    def upsert_inventory_items(self, rows: list) -> int:
+        """Insert or update inventory rows by item_name in one transaction.
+
+        rows are (item_name, quantity, threshold, cost_price, sale_price, description)
+        tuples; image_path is left as it was. Returns rows written or -1 on error.
+        """
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.executemany(
+                    '''INSERT INTO inventory (item_name, quantity, threshold, cost_price, sale_price, description)
+                       VALUES (?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(item_name) DO UPDATE SET
+                           quantity = excluded.quantity,
+                           threshold = excluded.threshold,
+                           cost_price = excluded.cost_price,
+                           sale_price = excluded.sale_price,
+                           description = excluded.description,
+                           updated_at = CURRENT_TIMESTAMP''',
+                    rows
+                )
+            return len(rows)
+        except Exception as e:
+            logger.error("Error upserting inventory items: %s", e)
+            return -1
+
     def update_inventory_item(self, item_name: str, quantity: int = None,
                              threshold: int = None, cost_price: float = None,
                              sale_price: float = None, description: str = None,
                              image_path: str = None):
         """Update inventory item."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            with self._get_conn() as (conn, cursor):
             
-            updates = []
-            values = []
-            if quantity is not None:
-                updates.append('quantity = ?')
-                values.append(quantity)
-            if threshold is not None:
-                updates.append('threshold = ?')
-                values.append(threshold)
-            if cost_price is not None:
-                updates.append('cost_price = ?')
-                values.append(cost_price)
-            if sale_price is not None:
-                updates.append('sale_price = ?')
-                values.append(sale_price)
-            if description is not None:
-                updates.append('description = ?')
-                values.append(description)
-            if image_path is not None:
-                updates.append('image_path = ?')
-                values.append(image_path)
+                updates = []
+                values = []
+                if quantity is not None:
+                    updates.append('quantity = ?')
+                    values.append(quantity)
+                if threshold is not None:
+                    updates.append('threshold = ?')
+                    values.append(threshold)
+                if cost_price is not None:
+                    updates.append('cost_price = ?')
+                    values.append(cost_price)
+                if sale_price is not None:
+                    updates.append('sale_price = ?')
+                    values.append(sale_price)
+                if description is not None:
+                    updates.append('description = ?')
+                    values.append(description)
+                if image_path is not None:
+                    updates.append('image_path = ?')
+                    values.append(image_path)
             
-            if updates:
-                updates.append('updated_at = CURRENT_TIMESTAMP')
-                values.append(item_name)
-                query = f'UPDATE inventory SET {", ".join(updates)} WHERE item_name = ?'
-                cursor.execute(query, values)
-                conn.commit()
+                if updates:
+                    updates.append('updated_at = CURRENT_TIMESTAMP')
+                    values.append(item_name)
+                    query = f'UPDATE inventory SET {", ".join(updates)} WHERE item_name = ?'
+                    cursor.execute(query, values)
             
-            conn.close()
             return True
         except Exception as e:
             logger.error("Error updating inventory item: %s", e)
@@ -525,128 +727,252 @@ class SQLiteAdapter(DatabaseAdapter):
     def delete_inventory_item(self, item_name: str):
         """Delete inventory item."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM inventory WHERE item_name = ?', (item_name,))
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM inventory WHERE item_name = ?', (item_name,))
             return True
         except Exception as e:
             logger.error("Error deleting inventory item: %s", e)
             return False
     
     def search_inventory(self, query: str) -> list:
-        """Search inventory by name or description."""
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            q = f"%{query}%"
-            cursor.execute('SELECT item_name, quantity, threshold, cost_price, sale_price, description FROM inventory WHERE item_name LIKE ? OR description LIKE ? ORDER BY item_name', (q, q))
-            rows = cursor.fetchall()
-            conn.close()
+        """Search inventory by name or description (word-prefix match, best first)."""
+        fts = self._fts_search('inventory', query)
+        try:
+            with self._get_conn() as (conn, cursor):
+                if fts:
+                    cursor.execute(
+                        'SELECT i.item_name, i.quantity, i.threshold, i.cost_price, i.sale_price, i.description '
+                        'FROM inventory_fts JOIN inventory i ON i.id = inventory_fts.rowid '
+                        f'WHERE inventory_fts MATCH ? ORDER BY {fts[1]}, i.item_name',
+                        (fts[0],)
+                    )
+                else:
+                    q = f"%{query}%"
+                    cursor.execute('SELECT item_name, quantity, threshold, cost_price, sale_price, description FROM inventory WHERE item_name LIKE ? OR description LIKE ? ORDER BY item_name', (q, q))
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
     
+    def get_inventory_count(self) -> int:
+        """Count inventory items. Returns -1 on error."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT COUNT(*) FROM inventory')
+                return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error("Error counting inventory: %s", e)
+            return -1
+
     # === SALES & POS ===
     
     def record_sale(self, item_name: str, quantity: int, sale_price: float,
                    total_amount: float, username: str):
         """Record a sale transaction."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO sales (item_name, quantity, sale_price, total_amount, username) VALUES (?, ?, ?, ?, ?)',
-                (item_name, quantity, sale_price, total_amount, username)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO sales (item_name, quantity, sale_price, total_amount, username) VALUES (?, ?, ?, ?, ?)',
+                    (item_name, quantity, sale_price, total_amount, username)
+                )
             return True
         except Exception as e:
             logger.error("Error recording sale: %s", e)
             return False
     
+    def record_checkout(self, cart: list, username: str) -> bool:
+        """Record every cart line and decrement stock in one transaction.
+
+        cart is a list of dicts with item_name, quantity, sale_price and
+        total_amount. Stock is decremented with a guarded UPDATE per item, so
+        a line that is short on stock (or names an unknown item) raises
+        InsufficientStockError and rolls back the whole checkout.
+        """
+        try:
+            with self._get_conn() as (conn, cursor):
+                for item_name, quantity in checkout_demand(cart).items():
+                    cursor.execute(_CHECKOUT_STOCK_SQL, (quantity, item_name, quantity))
+                    if cursor.rowcount != 1:
+                        raise InsufficientStockError(item_name, quantity)
+                cursor.executemany(_CHECKOUT_SALE_SQL, checkout_rows(cart, username))
+            return True
+        except InsufficientStockError:
+            raise
+        except Exception as e:
+            logger.error("Error recording checkout: %s", e)
+            return False
+
     def get_sales_by_date(self, date_str: str) -> list:
-        """Get all sales for a specific date."""
+        """Get all sales for a specific date (from the archive if it is that old)."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM sales WHERE DATE(sale_date) = ?', (date_str,))
-            rows = cursor.fetchall()
-            conn.close()
-            return rows
+            return self._read_range(
+                'sales', 'SELECT * FROM {src} WHERE sale_date >= ? AND sale_date < ?',
+                day_range(date_str), date_str, date_str
+            )
         except Exception:
             return []
     
     def get_all_sales(self) -> list:
-        """Get all sales transactions."""
+        """Get all sales transactions, archived ones included."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM sales ORDER BY sale_date DESC')
-            rows = cursor.fetchall()
-            conn.close()
-            return rows
+            return self._read_range('sales', 'SELECT * FROM {src} ORDER BY sale_date DESC')
         except Exception:
             return []
 
+    def get_sales_page(self, limit: int = 100, after=None, start_date: str = None,
+                       end_date: str = None, username: str = None, item_name: str = None,
+                       search: str = None) -> tuple:
+        """Get one page of sales, newest first, with optional filters. Returns (rows, next_after).
+
+        search matches a substring of the item name or the username.
+        """
+        filters, params = sales_page_filters(start_date, end_date, username, item_name, search)
+        try:
+            return self._fetch_page(
+                'SELECT * FROM {src}', filters, params,
+                [('sale_date', 'DESC'), ('id', 'DESC')], (1, 0), after, limit,
+                archive=('sales', start_date, end_date)
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting sales page: %s", e)
+            return [], None
+
     def get_sales_between(self, start_date: str, end_date: str) -> list:
         """Get all sales between start_date and end_date (inclusive)."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT * FROM sales WHERE DATE(sale_date) BETWEEN ? AND ? ORDER BY sale_date ASC',
-                (start_date, end_date)
+            return self._read_range(
+                'sales', 'SELECT * FROM {src} WHERE sale_date >= ? AND sale_date < ? ORDER BY sale_date ASC',
+                day_range(start_date, end_date), start_date, end_date, order='ASC'
             )
-            rows = cursor.fetchall()
-            conn.close()
-            return rows
         except Exception:
             return []
 
+    def iter_sales(self, start_date: str = None, end_date: str = None):
+        """Stream sales oldest first, optionally bounded by inclusive YYYY-MM-DD days."""
+        filters, params = [], []
+        if start_date:
+            filters.append('sale_date >= ?')
+            params.append(start_date[:10])
+        if end_date:
+            filters.append('sale_date < ?')
+            params.append(day_range(end_date)[1])
+        # ORDER BY sale_date alone walks idx_sales_date_cover; no sort of the whole table
+        return self._iter_range(
+            'sales',
+            'SELECT id, sale_date, item_name, quantity, sale_price, total_amount, username FROM {src}'
+            + (' WHERE ' + ' AND '.join(filters) if filters else '') + ' ORDER BY sale_date',
+            params, start_date, end_date
+        )
+
     def get_sales_summary_by_item(self, start_date: str, end_date: str) -> list:
-        """Get sales summary grouped by item between dates."""
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                SELECT item_name, SUM(quantity) as total_qty, SUM(total_amount) as total_amount
-                FROM sales
-                WHERE DATE(sale_date) BETWEEN ? AND ?
-                GROUP BY item_name
-                ORDER BY total_qty DESC
-                ''',
-                (start_date, end_date)
-            )
-            rows = cursor.fetchall()
-            conn.close()
+        """Get sales summary grouped by item between dates (from the daily rollup)."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    SELECT item_name, SUM(total_qty) as total_qty, SUM(total_amount) as total_amount
+                    FROM sales_daily_item
+                    WHERE sale_day BETWEEN ? AND ?
+                    GROUP BY item_name
+                    ORDER BY total_qty DESC
+                    ''',
+                    (start_date[:10], end_date[:10])
+                )
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
 
     def get_sales_trend_by_day(self, start_date: str, end_date: str) -> list:
-        """Get sales totals grouped by day between dates."""
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                SELECT DATE(sale_date) as sale_day, SUM(total_amount) as total_amount
-                FROM sales
-                WHERE DATE(sale_date) BETWEEN ? AND ?
-                GROUP BY DATE(sale_date)
-                ORDER BY sale_day ASC
-                ''',
-                (start_date, end_date)
-            )
-            rows = cursor.fetchall()
-            conn.close()
+        """Get sales totals grouped by day between dates (from the daily rollup)."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    SELECT sale_day, SUM(total_amount) as total_amount
+                    FROM sales_daily_item
+                    WHERE sale_day BETWEEN ? AND ?
+                    GROUP BY sale_day
+                    ORDER BY sale_day ASC
+                    ''',
+                    (start_date[:10], end_date[:10])
+                )
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
+
+    def get_daily_item_quantities(self, start_date: str, end_date: str) -> list:
+        """Get (sale_day, item_name, total_qty) between dates (from the daily rollup)."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT sale_day, item_name, total_qty FROM sales_daily_item WHERE sale_day BETWEEN ? AND ?',
+                    (start_date[:10], end_date[:10])
+                )
+                rows = cursor.fetchall()
+            return rows
+        except Exception as e:
+            logger.error("Error getting daily item quantities: %s", e)
+            return []
+
+    def get_dashboard_kpis(self, today: str = None) -> dict:
+        """Compute dashboard KPIs with three aggregate queries.
+
+        Sales figures come from the daily rollup; the week-over-week windows
+        match the original endpoint (last 7 days vs the 7 before, inclusive).
+        """
+        try:
+            with self._get_conn() as (conn, cursor):
+                rows = []
+                for sql, params in zip(_KPI_QUERIES, ((), kpi_sales_params(today), ())):
+                    cursor.execute(sql, params)
+                    rows.append(cursor.fetchone())
+        except Exception as e:
+            logger.error("Error computing dashboard KPIs: %s", e)
+            return {}
+        return kpi_result(*rows)
+
+    def rebuild_sales_rollup(self, start_date: str = None, end_date: str = None) -> int:
+        """Recompute sales_daily_item from raw sales, for all days or an inclusive day range.
+
+        Days before the sales archive horizon are kept as they are: their raw
+        rows live in the archive databases, so the rollup is their only
+        summary in the hot database.
+        Returns the number of rollup rows written, or -1 on error.
+        """
+        horizon = self.get_archive_horizon('sales')
+        if horizon and (not start_date or start_date[:10] < horizon):
+            if end_date and end_date[:10] < horizon:
+                return 0
+            start_date = horizon
+            end_date = end_date or '9999-12-30'
+        try:
+            with self._get_conn() as (conn, cursor):
+                if start_date:
+                    bounds = day_range(start_date, end_date)
+                    cursor.execute(
+                        'DELETE FROM sales_daily_item WHERE sale_day >= ? AND sale_day < ?', bounds
+                    )
+                    where, params = 'WHERE sale_date >= ? AND sale_date < ?', bounds
+                else:
+                    cursor.execute('DELETE FROM sales_daily_item')
+                    where, params = '', ()
+                cursor.execute(
+                    f'''
+                    INSERT INTO sales_daily_item (sale_day, item_name, total_qty, total_amount, txn_count)
+                    SELECT DATE(sale_date), item_name, SUM(quantity), SUM(total_amount), COUNT(*)
+                    FROM sales {where}
+                    GROUP BY DATE(sale_date), item_name
+                    ''',
+                    params
+                )
+                return cursor.rowcount
+        except Exception as e:
+            logger.error("Error rebuilding sales rollup: %s", e)
+            return -1
     
     # === HR ===
     
@@ -656,14 +982,11 @@ class SQLiteAdapter(DatabaseAdapter):
                     is_active: int = 1):
         """Add new employee."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO employees (emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
-                (emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO employees (emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active)
+                )
             return True
         except Exception as e:
             logger.error("Error adding employee: %s", e)
@@ -672,28 +995,52 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_all_employees(self) -> list:
         """Get all employees."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT id, emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active FROM employees ORDER BY name'
-            )
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT id, emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active FROM employees ORDER BY name'
+                )
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
     
+    def get_employees_page(self, limit: int = 100, after=None, team: str = None,
+                           is_active: int = None, search: str = None) -> tuple:
+        """Get one page of employees ordered by name. Returns (rows, next_after).
+
+        search matches a substring of the number, name, designation, team or email.
+        """
+        filters, params = [], []
+        if team:
+            filters.append('team = ?')
+            params.append(team)
+        if is_active is not None:
+            filters.append('is_active = ?')
+            params.append(int(is_active))
+        if search:
+            filters.append('(emp_number LIKE ? OR name LIKE ? OR designation LIKE ? OR team LIKE ? OR email LIKE ?)')
+            params.extend([f'%{search}%'] * 5)
+        try:
+            return self._fetch_page(
+                'SELECT id, emp_number, name, joining_date, designation, manager, team, email, phone, '
+                'emergency_contact, photo_path, notes, is_active FROM employees',
+                filters, params, [('name', 'ASC'), ('id', 'ASC')], (2, 0), after, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting employees page: %s", e)
+            return [], None
+
     def get_employee_by_id(self, emp_id: int) -> dict:
         """Get employee by ID."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT id, emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active FROM employees WHERE id = ?',
-                (emp_id,)
-            )
-            row = cursor.fetchone()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT id, emp_number, name, joining_date, designation, manager, team, email, phone, emergency_contact, photo_path, notes, is_active FROM employees WHERE id = ?',
+                    (emp_id,)
+                )
+                row = cursor.fetchone()
             if row:
                 return {
                     'id': row[0], 'emp_number': row[1], 'name': row[2],
@@ -709,26 +1056,23 @@ class SQLiteAdapter(DatabaseAdapter):
     def update_employee(self, emp_id: int, **kwargs):
         """Update employee details."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            with self._get_conn() as (conn, cursor):
             
-            allowed_fields = {'name', 'joining_date', 'designation', 'manager', 'team', 'email', 'phone', 'emergency_contact', 'photo_path', 'notes', 'is_active'}
-            updates = []
-            values = []
+                allowed_fields = {'name', 'joining_date', 'designation', 'manager', 'team', 'email', 'phone', 'emergency_contact', 'photo_path', 'notes', 'is_active'}
+                updates = []
+                values = []
             
-            for key, value in kwargs.items():
-                if key in allowed_fields and value is not None:
-                    updates.append(f'{key} = ?')
-                    values.append(value)
+                for key, value in kwargs.items():
+                    if key in allowed_fields and value is not None:
+                        updates.append(f'{key} = ?')
+                        values.append(value)
             
-            if updates:
-                updates.append('updated_at = CURRENT_TIMESTAMP')
-                values.append(emp_id)
-                query = f'UPDATE employees SET {", ".join(updates)} WHERE id = ?'
-                cursor.execute(query, values)
-                conn.commit()
+                if updates:
+                    updates.append('updated_at = CURRENT_TIMESTAMP')
+                    values.append(emp_id)
+                    query = f'UPDATE employees SET {", ".join(updates)} WHERE id = ?'
+                    cursor.execute(query, values)
             
-            conn.close()
             return True
         except Exception as e:
             logger.error("Error updating employee: %s", e)
@@ -737,11 +1081,8 @@ class SQLiteAdapter(DatabaseAdapter):
     def delete_employee(self, emp_id: int):
         """Delete employee."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM employees WHERE id = ?', (emp_id,))
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM employees WHERE id = ?', (emp_id,))
             return True
         except Exception as e:
             logger.error("Error deleting employee: %s", e)
@@ -755,19 +1096,16 @@ class SQLiteAdapter(DatabaseAdapter):
                     net_pay: float, status: str, paid_date: str):
         """Add payroll record."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                INSERT INTO payrolls (employee_id, period_start, period_end, base_salary, allowances, deductions,
-                                     overtime_hours, overtime_rate, gross_pay, net_pay, status, paid_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''',
-                (employee_id, period_start, period_end, base_salary, allowances, deductions,
-                 overtime_hours, overtime_rate, gross_pay, net_pay, status, paid_date)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    INSERT INTO payrolls (employee_id, period_start, period_end, base_salary, allowances, deductions,
+                                         overtime_hours, overtime_rate, gross_pay, net_pay, status, paid_date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''',
+                    (employee_id, period_start, period_end, base_salary, allowances, deductions,
+                     overtime_hours, overtime_rate, gross_pay, net_pay, status, paid_date)
+                )
             return True
         except Exception as e:
             logger.error("Error adding payroll: %s", e)
@@ -776,23 +1114,29 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_all_payrolls(self) -> list:
         """Get all payroll records."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM payrolls ORDER BY created_at DESC')
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM payrolls ORDER BY created_at DESC')
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
 
+    def iter_payrolls(self):
+        """Stream payroll rows with employee number and name, in id order."""
+        return self._iter_rows(
+            '''SELECT p.id, p.employee_id, e.emp_number, e.name, p.period_start, p.period_end,
+                      p.base_salary, p.allowances, p.deductions, p.overtime_hours, p.overtime_rate,
+                      p.gross_pay, p.net_pay, p.status, p.paid_date
+               FROM payrolls p LEFT JOIN employees e ON e.id = p.employee_id
+               ORDER BY p.id'''
+        )
+
     def get_payrolls_by_employee(self, employee_id: int) -> list:
         """Get payroll records for an employee."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM payrolls WHERE employee_id = ? ORDER BY created_at DESC', (employee_id,))
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM payrolls WHERE employee_id = ? ORDER BY created_at DESC', (employee_id,))
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
@@ -800,25 +1144,22 @@ class SQLiteAdapter(DatabaseAdapter):
     def update_payroll(self, payroll_id: int, **kwargs):
         """Update payroll record."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            allowed = {
-                'employee_id', 'period_start', 'period_end', 'base_salary', 'allowances', 'deductions',
-                'overtime_hours', 'overtime_rate', 'gross_pay', 'net_pay', 'status', 'paid_date'
-            }
-            updates = []
-            values = []
-            for key, value in kwargs.items():
-                if key in allowed and value is not None:
-                    updates.append(f'{key} = ?')
-                    values.append(value)
-            if updates:
-                updates.append('updated_at = CURRENT_TIMESTAMP')
-                values.append(payroll_id)
-                query = f'UPDATE payrolls SET {", ".join(updates)} WHERE id = ?'
-                cursor.execute(query, values)
-                conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                allowed = {
+                    'employee_id', 'period_start', 'period_end', 'base_salary', 'allowances', 'deductions',
+                    'overtime_hours', 'overtime_rate', 'gross_pay', 'net_pay', 'status', 'paid_date'
+                }
+                updates = []
+                values = []
+                for key, value in kwargs.items():
+                    if key in allowed and value is not None:
+                        updates.append(f'{key} = ?')
+                        values.append(value)
+                if updates:
+                    updates.append('updated_at = CURRENT_TIMESTAMP')
+                    values.append(payroll_id)
+                    query = f'UPDATE payrolls SET {", ".join(updates)} WHERE id = ?'
+                    cursor.execute(query, values)
             return True
         except Exception as e:
             logger.error("Error updating payroll: %s", e)
@@ -827,11 +1168,8 @@ class SQLiteAdapter(DatabaseAdapter):
     def delete_payroll(self, payroll_id: int):
         """Delete payroll record."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM payrolls WHERE id = ?', (payroll_id,))
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM payrolls WHERE id = ?', (payroll_id,))
             return True
         except Exception as e:
             logger.error("Error deleting payroll: %s", e)
@@ -842,17 +1180,14 @@ class SQLiteAdapter(DatabaseAdapter):
     def create_appraisal_cycle(self, employee_id: int, period_start: str, period_end: str, created_by: str = ""):
         """Create appraisal cycle."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                INSERT INTO appraisal_cycles (employee_id, period_start, period_end, created_by)
-                VALUES (?, ?, ?, ?)
-                ''',
-                (employee_id, period_start, period_end, created_by)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    INSERT INTO appraisal_cycles (employee_id, period_start, period_end, created_by)
+                    VALUES (?, ?, ?, ?)
+                    ''',
+                    (employee_id, period_start, period_end, created_by)
+                )
             return True
         except Exception as e:
             logger.error("Error creating appraisal: %s", e)
@@ -861,11 +1196,9 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_all_appraisal_cycles(self) -> list:
         """Get all appraisal cycles."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM appraisal_cycles ORDER BY created_at DESC')
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM appraisal_cycles ORDER BY created_at DESC')
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
@@ -873,25 +1206,22 @@ class SQLiteAdapter(DatabaseAdapter):
     def update_appraisal_cycle(self, appraisal_id: int, **kwargs):
         """Update appraisal cycle."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            allowed = {
-                'employee_id', 'period_start', 'period_end', 'status',
-                'self_text', 'self_rating', 'manager_text', 'manager_rating', 'final_rating'
-            }
-            updates = []
-            values = []
-            for key, value in kwargs.items():
-                if key in allowed and value is not None:
-                    updates.append(f'{key} = ?')
-                    values.append(value)
-            if updates:
-                updates.append('updated_at = CURRENT_TIMESTAMP')
-                values.append(appraisal_id)
-                query = f'UPDATE appraisal_cycles SET {", ".join(updates)} WHERE id = ?'
-                cursor.execute(query, values)
-                conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                allowed = {
+                    'employee_id', 'period_start', 'period_end', 'status',
+                    'self_text', 'self_rating', 'manager_text', 'manager_rating', 'final_rating'
+                }
+                updates = []
+                values = []
+                for key, value in kwargs.items():
+                    if key in allowed and value is not None:
+                        updates.append(f'{key} = ?')
+                        values.append(value)
+                if updates:
+                    updates.append('updated_at = CURRENT_TIMESTAMP')
+                    values.append(appraisal_id)
+                    query = f'UPDATE appraisal_cycles SET {", ".join(updates)} WHERE id = ?'
+                    cursor.execute(query, values)
             return True
         except Exception as e:
             logger.error("Error updating appraisal: %s", e)
@@ -900,17 +1230,14 @@ class SQLiteAdapter(DatabaseAdapter):
     def create_feedback_request(self, appraisal_id: int, requester: str, target_employee_id: int, message: str = ""):
         """Create a 360 feedback request."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                INSERT INTO feedback_requests (appraisal_id, requester, target_employee_id, message)
-                VALUES (?, ?, ?, ?)
-                ''',
-                (appraisal_id, requester, target_employee_id, message)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    INSERT INTO feedback_requests (appraisal_id, requester, target_employee_id, message)
+                    VALUES (?, ?, ?, ?)
+                    ''',
+                    (appraisal_id, requester, target_employee_id, message)
+                )
             return True
         except Exception as e:
             logger.error("Error creating feedback request: %s", e)
@@ -919,11 +1246,9 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_feedback_requests(self) -> list:
         """Get all feedback requests."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM feedback_requests ORDER BY created_at DESC')
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM feedback_requests ORDER BY created_at DESC')
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
@@ -931,22 +1256,19 @@ class SQLiteAdapter(DatabaseAdapter):
     def update_feedback_request(self, request_id: int, **kwargs):
         """Update feedback request."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            allowed = {'status', 'message'}
-            updates = []
-            values = []
-            for key, value in kwargs.items():
-                if key in allowed and value is not None:
-                    updates.append(f'{key} = ?')
-                    values.append(value)
-            if updates:
-                updates.append('updated_at = CURRENT_TIMESTAMP')
-                values.append(request_id)
-                query = f'UPDATE feedback_requests SET {", ".join(updates)} WHERE id = ?'
-                cursor.execute(query, values)
-                conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                allowed = {'status', 'message'}
+                updates = []
+                values = []
+                for key, value in kwargs.items():
+                    if key in allowed and value is not None:
+                        updates.append(f'{key} = ?')
+                        values.append(value)
+                if updates:
+                    updates.append('updated_at = CURRENT_TIMESTAMP')
+                    values.append(request_id)
+                    query = f'UPDATE feedback_requests SET {", ".join(updates)} WHERE id = ?'
+                    cursor.execute(query, values)
             return True
         except Exception as e:
             logger.error("Error updating feedback request: %s", e)
@@ -956,17 +1278,14 @@ class SQLiteAdapter(DatabaseAdapter):
                            rating: float, feedback_text: str):
         """Add feedback entry."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                INSERT INTO feedback_entries (appraisal_id, from_employee_id, to_employee_id, rating, feedback_text)
-                VALUES (?, ?, ?, ?, ?)
-                ''',
-                (appraisal_id, from_employee_id, to_employee_id, rating, feedback_text)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    '''
+                    INSERT INTO feedback_entries (appraisal_id, from_employee_id, to_employee_id, rating, feedback_text)
+                    VALUES (?, ?, ?, ?, ?)
+                    ''',
+                    (appraisal_id, from_employee_id, to_employee_id, rating, feedback_text)
+                )
             return True
         except Exception as e:
             logger.error("Error adding feedback: %s", e)
@@ -975,11 +1294,9 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_feedback_entries(self) -> list:
         """Get all feedback entries."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM feedback_entries ORDER BY created_at DESC')
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM feedback_entries ORDER BY created_at DESC')
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
@@ -987,14 +1304,11 @@ class SQLiteAdapter(DatabaseAdapter):
     def add_appraisal(self, employee_id: int, appraisal_date: str, rating: str, comments: str):
         """Add employee appraisal."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO appraisals (employee_id, appraisal_date, rating, comments) VALUES (?, ?, ?, ?)',
-                (employee_id, appraisal_date, rating, comments)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO appraisals (employee_id, appraisal_date, rating, comments) VALUES (?, ?, ?, ?)',
+                    (employee_id, appraisal_date, rating, comments)
+                )
             return True
         except Exception as e:
             logger.error("Error adding appraisal: %s", e)
@@ -1003,11 +1317,9 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_employee_appraisals(self, employee_id: int) -> list:
         """Get all appraisals for an employee."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM appraisals WHERE employee_id = ? ORDER BY appraisal_date DESC', (employee_id,))
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM appraisals WHERE employee_id = ? ORDER BY appraisal_date DESC', (employee_id,))
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
@@ -1015,14 +1327,11 @@ class SQLiteAdapter(DatabaseAdapter):
     def add_goal(self, employee_id: int, goal: str, status: str, due_date: str, notes: str):
         """Add employee goal."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO goals (employee_id, goal, status, due_date, notes) VALUES (?, ?, ?, ?, ?)',
-                (employee_id, goal, status, due_date, notes)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO goals (employee_id, goal, status, due_date, notes) VALUES (?, ?, ?, ?, ?)',
+                    (employee_id, goal, status, due_date, notes)
+                )
             return True
         except Exception as e:
             logger.error("Error adding goal: %s", e)
@@ -1031,11 +1340,9 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_employee_goals(self, employee_id: int) -> list:
         """Get all goals for an employee."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM goals WHERE employee_id = ? ORDER BY due_date', (employee_id,))
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM goals WHERE employee_id = ? ORDER BY due_date', (employee_id,))
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
@@ -1045,14 +1352,11 @@ class SQLiteAdapter(DatabaseAdapter):
     def add_visitor(self, name: str, address: str, phone: str, email: str, company: str, notes: str):
         """Add new visitor."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO visitors (name, address, phone, email, company, notes) VALUES (?, ?, ?, ?, ?, ?)',
-                (name, address, phone, email, company, notes)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO visitors (name, address, phone, email, company, notes) VALUES (?, ?, ?, ?, ?, ?)',
+                    (name, address, phone, email, company, notes)
+                )
             return True
         except Exception as e:
             logger.error("Error adding visitor: %s", e)
@@ -1061,38 +1365,60 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_all_visitors(self) -> list:
         """Get all visitors."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM visitors ORDER BY name')
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT * FROM visitors ORDER BY name')
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
     
+    def get_visitors_page(self, limit: int = 100, after=None, search: str = None) -> tuple:
+        """Get one page of visitors ordered by name. Returns (rows, next_after).
+
+        search matches name, email or phone by word prefix (substring without
+        FTS5), or a substring of the company.
+        """
+        filters, params = [], []
+        if search:
+            fts = self._fts_search('visitors', search)
+            if fts:
+                filters.append('(id IN (SELECT rowid FROM visitors_fts WHERE visitors_fts MATCH ?) '
+                               'OR company LIKE ?)')
+                params.extend([fts[0], f'%{search}%'])
+            else:
+                filters.append('(name LIKE ? OR email LIKE ? OR phone LIKE ? OR company LIKE ?)')
+                params.extend([f'%{search}%'] * 4)
+        try:
+            return self._fetch_page(
+                'SELECT * FROM visitors', filters, params,
+                [('name', 'ASC'), ('id', 'ASC')], (1, 0), after, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting visitors page: %s", e)
+            return [], None
+
     def update_visitor(self, visitor_id: int, **kwargs):
         """Update visitor details."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            with self._get_conn() as (conn, cursor):
             
-            allowed_fields = {'name', 'address', 'phone', 'email', 'company', 'notes'}
-            updates = []
-            values = []
+                allowed_fields = {'name', 'address', 'phone', 'email', 'company', 'notes'}
+                updates = []
+                values = []
             
-            for key, value in kwargs.items():
-                if key in allowed_fields and value is not None:
-                    updates.append(f'{key} = ?')
-                    values.append(value)
+                for key, value in kwargs.items():
+                    if key in allowed_fields and value is not None:
+                        updates.append(f'{key} = ?')
+                        values.append(value)
             
-            if updates:
-                updates.append('updated_at = CURRENT_TIMESTAMP')
-                values.append(visitor_id)
-                query = f'UPDATE visitors SET {", ".join(updates)} WHERE id = ?'
-                cursor.execute(query, values)
-                conn.commit()
+                if updates:
+                    updates.append('updated_at = CURRENT_TIMESTAMP')
+                    values.append(visitor_id)
+                    query = f'UPDATE visitors SET {", ".join(updates)} WHERE id = ?'
+                    cursor.execute(query, values)
             
-            conn.close()
             return True
         except Exception as e:
             logger.error("Error updating visitor: %s", e)
@@ -1101,25 +1427,28 @@ class SQLiteAdapter(DatabaseAdapter):
     def delete_visitor(self, visitor_id: int):
         """Delete visitor."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM visitors WHERE id = ?', (visitor_id,))
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM visitors WHERE id = ?', (visitor_id,))
             return True
         except Exception as e:
             logger.error("Error deleting visitor: %s", e)
             return False
     
     def search_visitors(self, query: str) -> list:
-        """Search visitors by name, email, phone."""
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            q = f"%{query}%"
-            cursor.execute('SELECT * FROM visitors WHERE name LIKE ? OR email LIKE ? OR phone LIKE ? ORDER BY name', (q, q, q))
-            rows = cursor.fetchall()
-            conn.close()
+        """Search visitors by name, email, phone (word-prefix match, best first)."""
+        fts = self._fts_search('visitors', query)
+        try:
+            with self._get_conn() as (conn, cursor):
+                if fts:
+                    cursor.execute(
+                        'SELECT v.* FROM visitors_fts JOIN visitors v ON v.id = visitors_fts.rowid '
+                        f'WHERE visitors_fts MATCH ? ORDER BY {fts[1]}, v.name',
+                        (fts[0],)
+                    )
+                else:
+                    q = f"%{query}%"
+                    cursor.execute('SELECT * FROM visitors WHERE name LIKE ? OR email LIKE ? OR phone LIKE ? ORDER BY name', (q, q, q))
+                rows = cursor.fetchall()
             return rows
         except Exception:
             return []
@@ -1130,15 +1459,12 @@ class SQLiteAdapter(DatabaseAdapter):
                          sender_password: str, recipient_email: str):
         """Save email configuration."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM email_config')
-            cursor.execute(
-                'INSERT INTO email_config (smtp_server, smtp_port, sender_email, sender_password, recipient_email) VALUES (?, ?, ?, ?, ?)',
-                (smtp_server, smtp_port, sender_email, sender_password, recipient_email)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM email_config')
+                cursor.execute(
+                    'INSERT INTO email_config (smtp_server, smtp_port, sender_email, sender_password, recipient_email) VALUES (?, ?, ?, ?, ?)',
+                    (smtp_server, smtp_port, sender_email, sender_password, recipient_email)
+                )
             return True
         except Exception as e:
             logger.error("Error saving email config: %s", e)
@@ -1147,11 +1473,9 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_email_config(self) -> dict:
         """Get email configuration."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT smtp_server, smtp_port, sender_email, sender_password, recipient_email FROM email_config LIMIT 1')
-            row = cursor.fetchone()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT smtp_server, smtp_port, sender_email, sender_password, recipient_email FROM email_config LIMIT 1')
+                row = cursor.fetchone()
             if row:
                 return {
                     'smtp_server': row[0], 'smtp_port': row[1], 'sender_email': row[2],
@@ -1161,21 +1485,139 @@ class SQLiteAdapter(DatabaseAdapter):
         except Exception:
             return None
     
+    # === EMAIL QUEUE ===
+
+    def enqueue_email(self, subject: str, body: str, recipient: str = None) -> int:
+        """Queue an email for the background sender. recipient None means the
+        configured recipient. Returns the queue id or -1 on error."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO email_queue (recipient, subject, body) VALUES (?, ?, ?)',
+                    (recipient, subject, body)
+                )
+                return cursor.lastrowid
+        except Exception as e:
+            logger.error("Error queueing email: %s", e)
+            return -1
+
+    def claim_emails(self, limit: int = 20, stale_after_seconds: int = 600) -> list:
+        """Mark up to limit due emails as 'sending' and return them.
+
+        Rows are (id, recipient, subject, body, attempts). Emails left in
+        'sending' for stale_after_seconds (a sender that died mid-batch) are
+        due again.
+        """
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    "UPDATE email_queue SET status = 'pending' "
+                    "WHERE status = 'sending' AND updated_at < datetime('now', ?)",
+                    (f'-{int(stale_after_seconds)} seconds',)
+                )
+                cursor.execute(
+                    "UPDATE email_queue SET status = 'sending', updated_at = CURRENT_TIMESTAMP "
+                    "WHERE id IN (SELECT id FROM email_queue WHERE status = 'pending' "
+                    "AND next_attempt_at <= CURRENT_TIMESTAMP ORDER BY next_attempt_at, id LIMIT ?) "
+                    "RETURNING id, recipient, subject, body, attempts",
+                    (limit,)
+                )
+                rows = cursor.fetchall()
+            return sorted(rows)
+        except Exception as e:
+            logger.error("Error claiming emails: %s", e)
+            return []
+
+    def release_emails(self, email_ids: list) -> bool:
+        """Put claimed emails back to 'pending' without counting an attempt."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.executemany(
+                    "UPDATE email_queue SET status = 'pending', updated_at = CURRENT_TIMESTAMP "
+                    "WHERE id = ? AND status = 'sending'",
+                    [(email_id,) for email_id in email_ids]
+                )
+            return True
+        except Exception as e:
+            logger.error("Error releasing emails: %s", e)
+            return False
+
+    def mark_email_sent(self, email_id: int) -> bool:
+        """Record a successful delivery."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    "UPDATE email_queue SET status = 'sent', attempts = attempts + 1, last_error = NULL, "
+                    "sent_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    (email_id,)
+                )
+            return True
+        except Exception as e:
+            logger.error("Error marking email sent: %s", e)
+            return False
+
+    def mark_email_failed(self, email_id: int, error: str, retry_in_seconds: float = None) -> bool:
+        """Record a failed attempt: retry after retry_in_seconds, or give up if None."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                if retry_in_seconds is None:
+                    cursor.execute(
+                        "UPDATE email_queue SET status = 'failed', attempts = attempts + 1, last_error = ?, "
+                        "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                        (error, email_id)
+                    )
+                else:
+                    cursor.execute(
+                        "UPDATE email_queue SET status = 'pending', attempts = attempts + 1, last_error = ?, "
+                        "next_attempt_at = datetime('now', ?), updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                        (error, f'+{int(retry_in_seconds)} seconds', email_id)
+                    )
+            return True
+        except Exception as e:
+            logger.error("Error marking email failed: %s", e)
+            return False
+
+    def get_queued_email(self, email_id: int) -> dict:
+        """Get one queued email's delivery status."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT id, recipient, subject, status, attempts, last_error, next_attempt_at, '
+                    'created_at, sent_at FROM email_queue WHERE id = ?',
+                    (email_id,)
+                )
+                row = cursor.fetchone()
+            if row:
+                keys = ('id', 'recipient', 'subject', 'status', 'attempts', 'last_error',
+                        'next_attempt_at', 'created_at', 'sent_at')
+                return dict(zip(keys, row))
+            return None
+        except Exception:
+            return None
+
+    def get_email_queue_counts(self) -> dict:
+        """Count queued emails by status."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT status, COUNT(*) FROM email_queue GROUP BY status')
+                rows = cursor.fetchall()
+            return dict(rows)
+        except Exception as e:
+            logger.error("Error counting queued emails: %s", e)
+            return {}
+
     # === COMPANY INFO ===
     
     def save_company_info(self, company_name: str, address: str, phone: str,
                          email: str, tax_id: str, bank_details: str):
         """Save company information."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM company_info')
-            cursor.execute(
-                'INSERT INTO company_info (company_name, address, phone, email, tax_id, bank_details) VALUES (?, ?, ?, ?, ?, ?)',
-                (company_name, address, phone, email, tax_id, bank_details)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM company_info')
+                cursor.execute(
+                    'INSERT INTO company_info (company_name, address, phone, email, tax_id, bank_details) VALUES (?, ?, ?, ?, ?, ?)',
+                    (company_name, address, phone, email, tax_id, bank_details)
+                )
             return True
         except Exception as e:
             logger.error("Error saving company info: %s", e)
@@ -1184,11 +1626,9 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_company_info(self) -> dict:
         """Get company information."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT company_name, address, phone, email, tax_id, bank_details FROM company_info LIMIT 1')
-            row = cursor.fetchone()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('SELECT company_name, address, phone, email, tax_id, bank_details FROM company_info LIMIT 1')
+                row = cursor.fetchone()
             if row:
                 return {
                     'company_name': row[0], 'address': row[1], 'phone': row[2],
@@ -1203,29 +1643,51 @@ class SQLiteAdapter(DatabaseAdapter):
     def log_activity(self, username: str, action: str, details: str = ""):
         """Log user activity."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO activity_log (username, action, details) VALUES (?, ?, ?)',
-                (username, action, details)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO activity_log (username, action, details) VALUES (?, ?, ?)',
+                    (username, action, details)
+                )
         except Exception as e:
             logger.error("Error logging activity: %s", e)
     
-    def get_activity_log(self, username: str = None) -> list:
-        """Get activity log, optionally filtered by user."""
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            if username:
-                cursor.execute('SELECT * FROM activity_log WHERE username = ? ORDER BY timestamp DESC', (username,))
-            else:
-                cursor.execute('SELECT * FROM activity_log ORDER BY timestamp DESC')
-            rows = cursor.fetchall()
-            conn.close()
-            return rows
+    def log_activities(self, entries: list) -> int:
+        """Insert (timestamp, username, action, details) rows in one transaction.
+        Returns rows written or -1 on error."""
+        try:
+            with self._get_conn() as (conn, cursor):
+                cursor.executemany(
+                    'INSERT INTO activity_log (timestamp, username, action, details) VALUES (?, ?, ?, ?)',
+                    entries
+                )
+            return len(entries)
+        except Exception as e:
+            logger.error("Error logging activity batch: %s", e)
+            return -1
+
+    def get_activity_log(self, username: str = None, start_date: str = None,
+                         end_date: str = None, limit: int = None) -> list:
+        """Get activity log newest first, optionally filtered by user and inclusive day range.
+
+        Archived years are read only when start_date (or its absence) reaches them.
+        """
+        filters, params = [], []
+        if username:
+            filters.append('username = ?')
+            params.append(username)
+        if start_date:
+            filters.append('timestamp >= ?')
+            params.append(start_date[:10])
+        if end_date:
+            filters.append('timestamp < ?')
+            params.append(day_range(end_date)[1])
+        sql = 'SELECT * FROM {src}' + (' WHERE ' + ' AND '.join(filters) if filters else '')
+        sql += ' ORDER BY timestamp DESC, id DESC'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        try:
+            return self._read_range('activity_log', sql, params, start_date, end_date, limit=limit)
         except Exception:
             return []
     
@@ -1235,40 +1697,69 @@ class SQLiteAdapter(DatabaseAdapter):
                         phone: str = '', source: str = '', notes: str = '') -> int:
         """Add a new CRM contact. Returns new id or -1 on error."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO crm_contacts (name, company, email, phone, source, notes) VALUES (?, ?, ?, ?, ?, ?)',
-                (name, company, email, phone, source, notes)
-            )
-            new_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO crm_contacts (name, company, email, phone, source, notes) VALUES (?, ?, ?, ?, ?, ?)',
+                    (name, company, email, phone, source, notes)
+                )
+                new_id = cursor.lastrowid
             return new_id
         except Exception as e:
             logger.error("Error adding CRM contact: %s", e)
             return -1
 
     def get_crm_contacts(self, search: str = None) -> list:
-        """Get all CRM contacts, optionally filtered by search string."""
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            if search:
-                q = f"%{search}%"
-                cursor.execute(
-                    'SELECT * FROM crm_contacts WHERE name LIKE ? OR company LIKE ? OR email LIKE ? OR phone LIKE ? ORDER BY name',
-                    (q, q, q, q)
-                )
-            else:
-                cursor.execute('SELECT * FROM crm_contacts ORDER BY name')
-            rows = cursor.fetchall()
-            conn.close()
+        """Get all CRM contacts, optionally filtered by search string (best match first)."""
+        fts = self._fts_search('crm_contacts', search) if search else None
+        try:
+            with self._get_conn() as (conn, cursor):
+                if fts:
+                    cursor.execute(
+                        'SELECT c.* FROM crm_contacts_fts JOIN crm_contacts c ON c.id = crm_contacts_fts.rowid '
+                        f'WHERE crm_contacts_fts MATCH ? ORDER BY {fts[1]}, c.name',
+                        (fts[0],)
+                    )
+                elif search:
+                    q = f"%{search}%"
+                    cursor.execute(
+                        'SELECT * FROM crm_contacts WHERE name LIKE ? OR company LIKE ? OR email LIKE ? OR phone LIKE ? ORDER BY name',
+                        (q, q, q, q)
+                    )
+                else:
+                    cursor.execute('SELECT * FROM crm_contacts ORDER BY name')
+                rows = cursor.fetchall()
             return rows
         except Exception as e:
             logger.error("Error getting CRM contacts: %s", e)
             return []
 
+    def get_crm_contacts_page(self, limit: int = 100, after=None, search: str = None,
+                              status: str = None) -> tuple:
+        """Get one page of CRM contacts ordered by name. Returns (rows, next_after)."""
+        filters, params = [], []
+        fts = self._fts_search('crm_contacts', search) if search else None
+        if fts:
+            # Pages keep their name order; the index only narrows the rows
+            filters.append('id IN (SELECT rowid FROM crm_contacts_fts WHERE crm_contacts_fts MATCH ?)')
+            params.append(fts[0])
+        elif search:
+            q = f"%{search}%"
+            filters.append('(name LIKE ? OR company LIKE ? OR email LIKE ? OR phone LIKE ?)')
+            params.extend([q, q, q, q])
+        if status:
+            filters.append('status = ?')
+            params.append(status)
+        try:
+            return self._fetch_page(
+                'SELECT * FROM crm_contacts', filters, params,
+                [('name', 'ASC'), ('id', 'ASC')], (1, 0), after, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting CRM contacts page: %s", e)
+            return [], None
+
     def update_crm_contact(self, contact_id: int, **kwargs) -> bool:
         """Update a CRM contact by id."""
         try:
@@ -1282,11 +1773,8 @@ class SQLiteAdapter(DatabaseAdapter):
             if not updates:
                 return True
             values.append(contact_id)
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(f'UPDATE crm_contacts SET {", ".join(updates)} WHERE id = ?', values)
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(f'UPDATE crm_contacts SET {", ".join(updates)} WHERE id = ?', values)
             return True
         except Exception as e:
             logger.error("Error updating CRM contact: %s", e)
@@ -1295,11 +1783,8 @@ class SQLiteAdapter(DatabaseAdapter):
     def delete_crm_contact(self, contact_id: int) -> bool:
         """Delete a CRM contact by id."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM crm_contacts WHERE id = ?', (contact_id,))
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM crm_contacts WHERE id = ?', (contact_id,))
             return True
         except Exception as e:
             logger.error("Error deleting CRM contact: %s", e)
@@ -1309,15 +1794,12 @@ class SQLiteAdapter(DatabaseAdapter):
                      value: float = 0, probability: int = 0, owner: str = '', notes: str = '') -> int:
         """Add a new CRM lead. Returns new id or -1 on error."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO crm_leads (contact_id, title, stage, value, probability, owner, notes) VALUES (?, ?, ?, ?, ?, ?, ?)',
-                (contact_id, title, stage, value, probability, owner, notes)
-            )
-            new_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO crm_leads (contact_id, title, stage, value, probability, owner, notes) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (contact_id, title, stage, value, probability, owner, notes)
+                )
+                new_id = cursor.lastrowid
             return new_id
         except Exception as e:
             logger.error("Error adding CRM lead: %s", e)
@@ -1326,28 +1808,36 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_crm_leads(self, stage: str = None) -> list:
         """Get CRM leads with contact info, optionally filtered by stage."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            if stage:
-                cursor.execute(
-                    '''SELECT l.*, c.name as contact_name FROM crm_leads l
-                       LEFT JOIN crm_contacts c ON l.contact_id = c.id
-                       WHERE l.stage = ? ORDER BY l.created_at DESC''',
-                    (stage,)
-                )
-            else:
-                cursor.execute(
-                    '''SELECT l.*, c.name as contact_name FROM crm_leads l
-                       LEFT JOIN crm_contacts c ON l.contact_id = c.id
-                       ORDER BY l.created_at DESC'''
-                )
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(*crm_leads_query(stage))
+                rows = cursor.fetchall()
             return rows
         except Exception as e:
             logger.error("Error getting CRM leads: %s", e)
             return []
 
+    def get_crm_leads_page(self, limit: int = 100, after=None, stage: str = None,
+                           owner: str = None) -> tuple:
+        """Get one page of CRM leads with contact name, newest first. Returns (rows, next_after)."""
+        filters, params = [], []
+        if stage:
+            filters.append('l.stage = ?')
+            params.append(stage)
+        if owner:
+            filters.append('l.owner = ?')
+            params.append(owner)
+        try:
+            return self._fetch_page(
+                'SELECT l.*, c.name as contact_name FROM crm_leads l '
+                'LEFT JOIN crm_contacts c ON l.contact_id = c.id',
+                filters, params, [('l.created_at', 'DESC'), ('l.id', 'DESC')], (8, 0), after, limit
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error("Error getting CRM leads page: %s", e)
+            return [], None
+
     def update_crm_lead(self, lead_id: int, **kwargs) -> bool:
         """Update a CRM lead by id."""
         try:
@@ -1362,11 +1852,8 @@ class SQLiteAdapter(DatabaseAdapter):
                 return True
             updates.append('updated_at = datetime(\'now\')')
             values.append(lead_id)
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(f'UPDATE crm_leads SET {", ".join(updates)} WHERE id = ?', values)
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(f'UPDATE crm_leads SET {", ".join(updates)} WHERE id = ?', values)
             return True
         except Exception as e:
             logger.error("Error updating CRM lead: %s", e)
@@ -1375,11 +1862,8 @@ class SQLiteAdapter(DatabaseAdapter):
     def delete_crm_lead(self, lead_id: int) -> bool:
         """Delete a CRM lead by id."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM crm_leads WHERE id = ?', (lead_id,))
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('DELETE FROM crm_leads WHERE id = ?', (lead_id,))
             return True
         except Exception as e:
             logger.error("Error deleting CRM lead: %s", e)
@@ -1388,14 +1872,11 @@ class SQLiteAdapter(DatabaseAdapter):
     def add_crm_activity(self, lead_id: int, activity_type: str, note: str, due_date: str) -> bool:
         """Add a CRM activity to a lead."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO crm_activities (lead_id, type, note, due_date) VALUES (?, ?, ?, ?)',
-                (lead_id, activity_type, note, due_date)
-            )
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'INSERT INTO crm_activities (lead_id, type, note, due_date) VALUES (?, ?, ?, ?)',
+                    (lead_id, activity_type, note, due_date)
+                )
             return True
         except Exception as e:
             logger.error("Error adding CRM activity: %s", e)
@@ -1404,14 +1885,12 @@ class SQLiteAdapter(DatabaseAdapter):
     def get_crm_activities(self, lead_id: int) -> list:
         """Get all activities for a lead."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT * FROM crm_activities WHERE lead_id = ? ORDER BY created_at DESC',
-                (lead_id,)
-            )
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute(
+                    'SELECT * FROM crm_activities WHERE lead_id = ? ORDER BY created_at DESC',
+                    (lead_id,)
+                )
+                rows = cursor.fetchall()
             return rows
         except Exception as e:
             logger.error("Error getting CRM activities: %s", e)
@@ -1420,16 +1899,87 @@ class SQLiteAdapter(DatabaseAdapter):
     def update_crm_activity(self, activity_id: int, done: int) -> bool:
         """Mark a CRM activity as done or not done."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('UPDATE crm_activities SET done = ? WHERE id = ?', (done, activity_id))
-            conn.commit()
-            conn.close()
+            with self._get_conn() as (conn, cursor):
+                cursor.execute('UPDATE crm_activities SET done = ? WHERE id = ?', (done, activity_id))
             return True
         except Exception as e:
             logger.error("Error updating CRM activity: %s", e)
             return False
 
+    # === BACKUP ===
+
+    def backup_to(self, dest_path: str, pages_per_step: int = BACKUP_PAGES_PER_STEP,
+                  step_sleep_ms: int = BACKUP_STEP_SLEEP_MS, progress=None,
+                  max_restarts: int = BACKUP_MAX_RESTARTS) -> int:
+        """Copy a consistent snapshot of the live database to dest_path. Returns pages copied or -1.
+
+        Uses the online backup API on its own connection, pages_per_step pages
+        at a time with a pause between steps. A write from another connection
+        restarts a stepped copy; after max_restarts the copy is finished in one
+        step, which only holds a read snapshot (writers carry on under WAL).
+        progress(copied, total) is called after each step.
+        """
+        class _Restarted(Exception):
+            pass
+
+        seen = {'remaining': None, 'restarts': 0, 'total': 0}
+
+        def on_step(status, remaining, total):
+            if seen['remaining'] is not None and remaining > seen['remaining']:
+                seen['restarts'] += 1
+                if seen['restarts'] > max_restarts:
+                    raise _Restarted()
+            seen['remaining'], seen['total'] = remaining, total
+            if progress:
+                progress(total - remaining, total)
+            if remaining and step_sleep_ms:
+                time.sleep(step_sleep_ms / 1000.0)
+
+        src = sqlite3.connect(self.db_file, check_same_thread=False)
+        dest = sqlite3.connect(dest_path)
+        try:
+            src.execute(f"PRAGMA busy_timeout = {int(self.pragmas.get('busy_timeout', 5000))}")
+            try:
+                src.backup(dest, pages=max(1, pages_per_step), progress=on_step)
+            except _Restarted:
+                logger.warning("Backup restarted %s times by concurrent writes; copying in one step",
+                               seen['restarts'])
+                src.backup(dest, pages=-1, progress=on_step)
+            # A snapshot should be one self-contained file, not a WAL database.
+            dest.execute('PRAGMA journal_mode = DELETE')
+            return seen['total']
+        except Exception as e:
+            logger.error("Error backing up database: %s", e)
+            return -1
+        finally:
+            dest.close()
+            src.close()
+
+    def restore_from(self, src_path: str) -> bool:
+        """Replace the live database's contents with the snapshot at src_path.
+
+        Runs through SQLite's locking (one backup step holding the write
+        lock), so pooled connections stay valid and simply see the restored
+        data. Write listeners are told that every table changed.
+        """
+        try:
+            src = connect_read_only(src_path)
+        except sqlite3.Error as e:
+            logger.error("Error restoring database: %s", e)
+            return False
+        dest = sqlite3.connect(self.db_file, timeout=int(self.pragmas.get('busy_timeout', 5000)) / 1000.0)
+        try:
+            src.backup(dest)
+            tables = {row[0] for row in dest.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        except Exception as e:
+            logger.error("Error restoring database: %s", e)
+            return False
+        finally:
+            dest.close()
+            src.close()
+        self._notify_writes(tables | {ALL_TABLES})
+        return True
+
     def close(self):
-        """Close database connection."""
-        pass
+        """Close every pooled database connection."""
+        self._pool.close()
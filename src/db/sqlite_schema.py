@@ -0,0 +1,409 @@
+"""SQLite schema, as an ordered list of migrations (see src.db.migrations).
+
+Migration 1 is the schema of the last release before versioning, and each
+later migration adds one feature's objects. All of them are idempotent
+(IF NOT EXISTS, and backfills only into a table they just created), so an
+unversioned database from any earlier build is upgraded in place. Schema
+changes go in a new migration appended to MIGRATIONS — a shipped migration
+is never edited.
+
+Full-text indexes are not migrations: whether they exist depends on the
+SQLite build opening the database (see SQLiteAdapter._sync_fts_indexes).
+"""
+from src.db.migrations import Migration
+
+
+def _baseline(cursor):
+    # Users table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            role TEXT DEFAULT 'user',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP
+        )
+    ''')
+
+    # Inventory table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS inventory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_name TEXT UNIQUE NOT NULL,
+            quantity INTEGER DEFAULT 0,
+            threshold INTEGER DEFAULT 0,
+            cost_price REAL DEFAULT 0,
+            sale_price REAL DEFAULT 0,
+            description TEXT,
+            image_path TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Sales table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sale_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            item_name TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            sale_price REAL NOT NULL,
+            total_amount REAL NOT NULL,
+            username TEXT NOT NULL,
+            FOREIGN KEY(username) REFERENCES users(username)
+        )
+    ''')
+
+    # Email config table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS email_config (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            smtp_server TEXT,
+            smtp_port INTEGER,
+            sender_email TEXT,
+            sender_password TEXT,
+            recipient_email TEXT
+        )
+    ''')
+
+    # Company info table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS company_info (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_name TEXT,
+            address TEXT,
+            phone TEXT,
+            email TEXT,
+            tax_id TEXT,
+            bank_details TEXT
+        )
+    ''')
+
+    # Activity log table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS activity_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            username TEXT NOT NULL,
+            action TEXT NOT NULL,
+            details TEXT,
+            FOREIGN KEY(username) REFERENCES users(username)
+        )
+    ''')
+
+    # Visitors table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS visitors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            address TEXT,
+            phone TEXT,
+            email TEXT,
+            company TEXT,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Employees table (HR)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS employees (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            emp_number TEXT UNIQUE,
+            name TEXT NOT NULL,
+            joining_date TEXT,
+            designation TEXT,
+            manager TEXT,
+            team TEXT,
+            email TEXT,
+            phone TEXT,
+            emergency_contact TEXT,
+            photo_path TEXT,
+            notes TEXT,
+            is_active INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Appraisals table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS appraisals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_id INTEGER NOT NULL,
+            appraisal_date TEXT,
+            rating TEXT,
+            comments TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(employee_id) REFERENCES employees(id)
+        )
+    ''')
+
+    # Goals table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS goals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_id INTEGER NOT NULL,
+            goal TEXT NOT NULL,
+            status TEXT,
+            due_date TEXT,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(employee_id) REFERENCES employees(id)
+        )
+    ''')
+
+    # Payroll table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS payrolls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_id INTEGER NOT NULL,
+            period_start TEXT,
+            period_end TEXT,
+            base_salary REAL DEFAULT 0,
+            allowances REAL DEFAULT 0,
+            deductions REAL DEFAULT 0,
+            overtime_hours REAL DEFAULT 0,
+            overtime_rate REAL DEFAULT 0,
+            gross_pay REAL DEFAULT 0,
+            net_pay REAL DEFAULT 0,
+            status TEXT DEFAULT 'Draft',
+            paid_date TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(employee_id) REFERENCES employees(id)
+        )
+    ''')
+
+    # Appraisal cycles
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS appraisal_cycles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_id INTEGER NOT NULL,
+            period_start TEXT,
+            period_end TEXT,
+            status TEXT DEFAULT 'Draft',
+            self_text TEXT,
+            self_rating REAL,
+            manager_text TEXT,
+            manager_rating REAL,
+            final_rating REAL,
+            created_by TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(employee_id) REFERENCES employees(id)
+        )
+    ''')
+
+    # Feedback requests
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feedback_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            appraisal_id INTEGER,
+            requester TEXT,
+            target_employee_id INTEGER NOT NULL,
+            message TEXT,
+            status TEXT DEFAULT 'Requested',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(appraisal_id) REFERENCES appraisal_cycles(id),
+            FOREIGN KEY(target_employee_id) REFERENCES employees(id)
+        )
+    ''')
+
+    # Feedback entries
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feedback_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            appraisal_id INTEGER,
+            from_employee_id INTEGER,
+            to_employee_id INTEGER NOT NULL,
+            rating REAL,
+            feedback_text TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(appraisal_id) REFERENCES appraisal_cycles(id),
+            FOREIGN KEY(from_employee_id) REFERENCES employees(id),
+            FOREIGN KEY(to_employee_id) REFERENCES employees(id)
+        )
+    ''')
+
+    # Migrate employees table if new columns need to be added
+    try:
+        cursor.execute('PRAGMA table_info(employees)')
+        existing_cols = {row[1] for row in cursor.fetchall()}
+        required_cols = {'emp_number', 'emergency_contact', 'photo_path', 'is_active'}
+        for col in required_cols:
+            if col not in existing_cols:
+                if col == 'is_active':
+                    cursor.execute('ALTER TABLE employees ADD COLUMN is_active INTEGER DEFAULT 1')
+                else:
+                    cursor.execute(f'ALTER TABLE employees ADD COLUMN {col} TEXT')
+    except Exception:
+        pass
+
+    # Migrate inventory table if new columns need to be added
+    try:
+        cursor.execute('PRAGMA table_info(inventory)')
+        existing_cols = {row[1] for row in cursor.fetchall()}
+        if 'image_path' not in existing_cols:
+            cursor.execute('ALTER TABLE inventory ADD COLUMN image_path TEXT')
+    except Exception:
+        pass
+
+    # CRM Contacts table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS crm_contacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            company TEXT DEFAULT '',
+            email TEXT DEFAULT '',
+            phone TEXT DEFAULT '',
+            source TEXT DEFAULT '',
+            status TEXT DEFAULT 'active',
+            notes TEXT DEFAULT '',
+            created_at TEXT DEFAULT (datetime('now'))
+        )
+    ''')
+
+    # CRM Leads table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS crm_leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            contact_id INTEGER REFERENCES crm_contacts(id),
+            title TEXT NOT NULL,
+            stage TEXT DEFAULT 'New',
+            value REAL DEFAULT 0,
+            probability INTEGER DEFAULT 0,
+            owner TEXT DEFAULT '',
+            notes TEXT DEFAULT '',
+            created_at TEXT DEFAULT (datetime('now')),
+            updated_at TEXT DEFAULT (datetime('now'))
+        )
+    ''')
+
+    # CRM Activities table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS crm_activities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            lead_id INTEGER REFERENCES crm_leads(id),
+            type TEXT DEFAULT 'note',
+            note TEXT DEFAULT '',
+            due_date TEXT DEFAULT '',
+            done INTEGER DEFAULT 0,
+            created_at TEXT DEFAULT (datetime('now'))
+        )
+    ''')
+
+    # Performance indexes
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_inventory_name ON inventory(item_name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(sale_date)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_item ON sales(item_name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_number ON employees(emp_number)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_visitors_date ON visitors(created_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_user ON activity_log(username)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_ts ON activity_log(timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_leads_stage ON crm_leads(stage)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_leads_contact ON crm_leads(contact_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_activities_lead ON crm_activities(lead_id)')
+
+
+def _sales_date_cover_index(cursor):
+    # Covering index for date-range reports; supersedes idx_sales_date
+    cursor.execute('DROP INDEX IF EXISTS idx_sales_date')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_sales_date_cover '
+        'ON sales(sale_date, item_name, quantity, total_amount)'
+    )
+
+
+def _sales_daily_rollup(cursor):
+    # Daily per-item sales rollup, kept current by a trigger on sales inserts
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sales_daily_item'")
+    needs_rollup_backfill = cursor.fetchone() is None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_daily_item (
+            sale_day TEXT NOT NULL,
+            item_name TEXT NOT NULL,
+            total_qty INTEGER NOT NULL DEFAULT 0,
+            total_amount REAL NOT NULL DEFAULT 0,
+            txn_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (sale_day, item_name)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_sales_daily_item_insert AFTER INSERT ON sales
+        BEGIN
+            INSERT INTO sales_daily_item (sale_day, item_name, total_qty, total_amount, txn_count)
+            VALUES (DATE(NEW.sale_date), NEW.item_name, NEW.quantity, NEW.total_amount, 1)
+            ON CONFLICT(sale_day, item_name) DO UPDATE SET
+                total_qty = total_qty + excluded.total_qty,
+                total_amount = total_amount + excluded.total_amount,
+                txn_count = txn_count + 1;
+        END
+    ''')
+    # Fill the rollup from existing sales the first time it is created
+    if needs_rollup_backfill:
+        cursor.execute('''
+            INSERT INTO sales_daily_item (sale_day, item_name, total_qty, total_amount, txn_count)
+            SELECT DATE(sale_date), item_name, SUM(quantity), SUM(total_amount), COUNT(*)
+            FROM sales
+            GROUP BY DATE(sale_date), item_name
+        ''')
+
+
+def _keyset_page_indexes(cursor):
+    # Sort orders of the keyset-paginated lists
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_contacts_name ON crm_contacts(name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_visitors_name ON visitors(name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_crm_leads_created ON crm_leads(created_at)')
+
+
+def _email_queue(cursor):
+    # Outgoing email queue, drained by EmailOutbox
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS email_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipient TEXT,
+            subject TEXT NOT NULL,
+            body TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            sent_at TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_email_queue_due ON email_queue(status, next_attempt_at)')
+
+
+def _archive_bookkeeping(cursor):
+    # Archival bookkeeping: how far each table has been archived, and which years exist
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archive_state (
+            table_name TEXT PRIMARY KEY,
+            archived_before TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archive_partitions (
+            table_name TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (table_name, year)
+        ) WITHOUT ROWID
+    ''')
+
+
+MIGRATIONS = [
+    Migration(1, 'baseline', _baseline),
+    Migration(2, 'sales_date_cover_index', _sales_date_cover_index),
+    Migration(3, 'sales_daily_rollup', _sales_daily_rollup),
+    Migration(4, 'keyset_page_indexes', _keyset_page_indexes),
+    Migration(5, 'email_queue', _email_queue),
+    Migration(6, 'archive_bookkeeping', _archive_bookkeeping),
+]
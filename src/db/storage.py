@@ -0,0 +1,165 @@
+"""SQLite storage profiles and lock-contention handling.
+
+The API process and the desktop app share one inventory.db. A storage
+profile sets the journal mode and PRAGMAs applied to every pooled
+connection; StorageConnection retries writes that hit "database is locked"
+with exponential backoff instead of failing the request.
+"""
+import os
+import re
+import sqlite3
+import time
+import random
+import logging
+from urllib.request import pathname2url
+
+logger = logging.getLogger(__name__)
+
+# Named PRAGMA sets. cache_size is negative KiB (SQLite convention).
+STORAGE_PROFILES = {
+    # Concurrent readers alongside one writer; fsync only at checkpoints.
+    'wal': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 128 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # WAL, but fsync on every commit (e.g. the database lives on flaky storage).
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # SQLite defaults (rollback journal) — what BizHub used before profiles.
+    'legacy': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+    },
+}
+
+# Order matters: journal_mode must be set before anything opens a transaction.
+_PRAGMA_ORDER = ('busy_timeout', 'journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store')
+
+_WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'CREATE', 'DROP', 'ALTER', 'WITH')
+
+_WRITTEN_TABLE_RE = re.compile(
+    r'^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)'
+    r'\s+["`\[]?(\w+)',
+    re.IGNORECASE,
+)
+
+
+def written_table(sql: str):
+    """Return the table a DML statement writes to, or None."""
+    match = _WRITTEN_TABLE_RE.match(sql)
+    return match.group(1).lower() if match else None
+
+
+def resolve_profile(profile='wal', **overrides) -> dict:
+    """Return the PRAGMA dict for a profile name (or dict), with overrides applied."""
+    if isinstance(profile, dict):
+        pragmas = dict(profile)
+    else:
+        if profile not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile: {profile}")
+        pragmas = dict(STORAGE_PROFILES[profile])
+    pragmas.update({k: v for k, v in overrides.items() if v is not None})
+    return pragmas
+
+
+def pragma_statements(pragmas: dict) -> list:
+    """PRAGMA statements for a PRAGMA dict, in the order they must run."""
+    names = [name for name in _PRAGMA_ORDER if name in pragmas]
+    names += [name for name in pragmas if name not in _PRAGMA_ORDER]
+    return [f'PRAGMA {name} = {pragmas[name]}' for name in names]
+
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: dict):
+    """Apply a PRAGMA dict to a freshly opened connection."""
+    for statement in pragma_statements(pragmas):
+        conn.execute(statement)
+
+
+def connect_read_only(path: str, **kwargs) -> sqlite3.Connection:
+    """Open the database file at path read-only; raises instead of creating a missing file."""
+    return sqlite3.connect(f'file:{pathname2url(os.path.abspath(path))}?mode=ro', uri=True, **kwargs)
+
+
+def is_locked_error(exc: Exception) -> bool:
+    """True for the transient SQLITE_BUSY / SQLITE_LOCKED errors worth retrying."""
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    msg = str(exc).lower()
+    return 'database is locked' in msg or 'database table is locked' in msg
+
+
+def retry_on_locked(fn, retries: int = 5, base_delay: float = 0.05, max_delay: float = 1.0):
+    """Call fn(), retrying with jittered exponential backoff while the database is locked."""
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except sqlite3.OperationalError as e:
+            if attempt >= retries or not is_locked_error(e):
+                raise
+            delay = min(max_delay, base_delay * (2 ** attempt)) * (0.5 + random.random() / 2)
+            logger.warning("Database locked, retrying in %.3fs (attempt %d/%d)", delay, attempt + 1, retries)
+            time.sleep(delay)
+            attempt += 1
+
+
+class RetryingCursor(sqlite3.Cursor):
+    """Cursor whose write statements are retried while the database is locked."""
+
+    def execute(self, sql, parameters=()):
+        if sql.lstrip()[:7].upper().startswith(_WRITE_PREFIXES):
+            conn = self.connection
+            conn.note_write(sql)
+            return retry_on_locked(lambda: super(RetryingCursor, self).execute(sql, parameters),
+                                   conn.write_retries, conn.retry_base_delay)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        conn = self.connection
+        conn.note_write(sql)
+        # Materialise so a retry replays the same rows rather than an exhausted iterator.
+        rows = seq_of_parameters if isinstance(seq_of_parameters, (list, tuple)) else list(seq_of_parameters)
+        return retry_on_locked(lambda: super(RetryingCursor, self).executemany(sql, rows),
+                               conn.write_retries, conn.retry_base_delay)
+
+
+class StorageConnection(sqlite3.Connection):
+    """Connection that hands out RetryingCursor and retries a locked COMMIT.
+
+    It also records which tables the open transaction has written to, so the
+    pool can report them once the transaction commits.
+    """
+
+    write_retries = 5
+    retry_base_delay = 0.05
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.written_tables = set()
+
+    def note_write(self, sql: str):
+        table = written_table(sql)
+        if table:
+            self.written_tables.add(table)
+
+    def take_written_tables(self) -> set:
+        """Return and reset the tables written since the last call."""
+        tables, self.written_tables = self.written_tables, set()
+        return tables
+
+    def cursor(self, factory=RetryingCursor):
+        return super().cursor(factory)
+
+    def commit(self):
+        return retry_on_locked(super().commit, self.write_retries, self.retry_base_delay)
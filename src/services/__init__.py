@@ -4,12 +4,16 @@ from src.services.inventory_service import InventoryService
 from src.services.pos_service import POSService
 from src.services.hr_service import HRService
 from src.services.visitor_service import VisitorService
-from src.services.email_service import EmailService
+from src.services.email_service import EmailService, EmailOutbox
 from src.services.misc_service import ActivityService, CompanyService
 from src.services.analytics_service import AnalyticsService
 from src.services.payroll_service import PayrollService
 from src.services.appraisal_service import AppraisalService
 from src.services.crm_service import CRMService
+from src.services.export_service import ExportService
+from src.services.columnar_service import ColumnarExportService
+from src.services.archive_service import ArchiveService
+from src.services.backup_service import BackupService
 
 __all__ = [
     'AuthService',
@@ -18,10 +22,15 @@ __all__ = [
     'HRService',
     'VisitorService',
     'EmailService',
+    'EmailOutbox',
     'ActivityService',
     'CompanyService',
     'AnalyticsService',
     'PayrollService',
     'AppraisalService',
     'CRMService',
+    'ExportService',
+    'ColumnarExportService',
+    'ArchiveService',
+    'BackupService',
 ]
@@ -1,12 +1,29 @@
 """Analytics and projections service for BizHub."""
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from src.config import ANALYTICS_SOURCE, COLUMNAR_DIR
+from src.services import forecasting
+from src.services.cache import cached
+
 
 class AnalyticsService:
-    """Provide analytics, trends, and projections based on sales and inventory."""
+    """Provide analytics, trends, and projections based on sales and inventory.
+
+    With source='columnar', sales trend and summary queries scan the Parquet
+    snapshots in columnar_dir (see ColumnarExportService) instead of SQLite.
+    Those answers are as fresh as the last export.
+    """
 
-    def __init__(self, db_adapter):
+    SOURCES = ('sqlite', 'columnar')
+
+    def __init__(self, db_adapter, source: str = ANALYTICS_SOURCE, columnar_dir: str = COLUMNAR_DIR):
+        if source not in self.SOURCES:
+            raise ValueError(f"Unknown analytics source: {source}")
         self.db = db_adapter
+        self.source = source
+        self.columnar_dir = columnar_dir
 
     def get_date_range(self, period_key: str):
         """Return (start_date, end_date) for a given period key."""
@@ -23,34 +40,86 @@ class AnalyticsService:
 
     def get_sales_trend(self, start_date: str, end_date: str):
         """Get sales totals grouped by day for charts."""
+        if self.source == 'columnar':
+            from src.services.columnar_service import columnar_sales_trend
+            return columnar_sales_trend(self.columnar_dir, start_date, end_date)
         return self.db.get_sales_trend_by_day(start_date, end_date)
 
     def get_sales_summary(self, start_date: str, end_date: str):
         """Get sales summary grouped by item."""
+        if self.source == 'columnar':
+            from src.services.columnar_service import columnar_sales_summary
+            return columnar_sales_summary(self.columnar_dir, start_date, end_date)
         return self.db.get_sales_summary_by_item(start_date, end_date)
 
+    def get_dashboard_kpis(self, today: str = None) -> dict:
+        """Return dashboard KPIs computed in SQL, rounded for display."""
+        return self.format_kpis(self.db.get_dashboard_kpis(today))
+
+    async def get_dashboard_kpis_async(self, adb, today: str = None) -> dict:
+        """get_dashboard_kpis() through an AsyncDatabaseAdapter on the same database."""
+        return self.format_kpis(await adb.get_dashboard_kpis(today))
+
+    @staticmethod
+    def format_kpis(raw: dict) -> dict:
+        """Turn an adapter's get_dashboard_kpis() figures into the dashboard's KPIs."""
+        if not raw:
+            return {}
+        growth_pct = 0.0
+        if raw['prior_week_total'] > 0:
+            growth_pct = round(
+                ((raw['week_total'] - raw['prior_week_total']) / raw['prior_week_total']) * 100, 1
+            )
+        closed = raw['won_leads'] + raw['lost_leads']
+        return {
+            "today_sales": round(raw['today_total'], 2),
+            "inventory_value": round(raw['inventory_value'], 2),
+            "low_stock_count": raw['low_stock_count'],
+            "total_items": raw['total_items'],
+            "avg_daily_sales": round(raw['all_total'] / max(raw['sales_days'], 1), 2),
+            "growth_pct": growth_pct,
+            "pipeline_value": round(raw['pipeline_value'], 2),
+            "conversion_rate": round((raw['won_leads'] / closed) * 100, 1) if closed else 0.0,
+        }
+
     def get_top_selling_items(self, start_date: str, end_date: str, limit: int = 5):
         """Return top selling items by quantity."""
         rows = self.get_sales_summary(start_date, end_date)
         return rows[:limit]
 
-    def get_reorder_recommendations(self, start_date: str, end_date: str, window_days: int = 7, limit: int = 10):
-        """Suggest items to reorder based on recent demand and current stock."""
-        sales = self.get_sales_summary(start_date, end_date)
-        inventory = self.db.get_all_inventory()
-        inventory_map = {row[0]: row[1] for row in inventory}  # item_name -> quantity
-
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-        days = max(1, (end_dt - start_dt).days + 1)
-
-        recommendations = []
-        for item_name, total_qty, total_amount in sales:
-            current_qty = inventory_map.get(item_name, 0)
-            avg_daily = total_qty / days
-            recommended_qty = max(0, int(round(avg_daily * window_days - current_qty)))
-            if recommended_qty > 0:
-                recommendations.append((item_name, current_qty, avg_daily, recommended_qty))
-
-        recommendations.sort(key=lambda x: x[3], reverse=True)
-        return recommendations[:limit]
+    @cached('sales_daily_item', 'inventory')
+    def get_reorder_recommendations(self, start_date: str, end_date: str, window_days: int = 7,
+                                    limit: int = 10, cover_days: int = None,
+                                    service_z: float = forecasting.DEFAULT_SERVICE_Z) -> list:
+        """Suggest items to reorder from a forecast over the sales between the dates.
+
+        window_days is the replenishment lead time; orders cover a further
+        cover_days (default: window_days). Largest orders first.
+        """
+        start_dt = datetime.strptime(start_date[:10], "%Y-%m-%d")
+        days = max(1, (datetime.strptime(end_date[:10], "%Y-%m-%d") - start_dt).days + 1)
+        names, matrix = forecasting.demand_matrix(
+            self.db.get_daily_item_quantities(start_date, end_date), start_date, days
+        )
+        if not len(names):
+            return []
+        stock = {row[0]: row[1] or 0 for row in self.db.get_all_inventory()}
+        on_hand = np.array([stock.get(name, 0) for name in names], dtype=float)
+        plan = forecasting.reorder_plan(
+            matrix, start_dt.weekday(), on_hand, lead_time_days=window_days,
+            cover_days=window_days if cover_days is None else cover_days, z=service_z,
+        )
+        ordered = np.lexsort((names, -plan['recommended_qty']))
+        ordered = ordered[plan['recommended_qty'][ordered] > 0][:limit]
+        return [
+            {
+                'item_name': str(names[i]),
+                'current_qty': int(on_hand[i]),
+                'avg_daily': round(float(plan['avg_daily'][i]), 2),
+                'forecast_daily': round(float(plan['forecast_daily'][i]), 2),
+                'safety_stock': round(float(plan['safety_stock'][i]), 2),
+                'reorder_point': round(float(plan['reorder_point'][i]), 2),
+                'recommended_qty': int(plan['recommended_qty'][i]),
+            }
+            for i in ordered
+        ]
@@ -0,0 +1,39 @@
+"""Retention for the tables that grow forever: sales and activity_log.
+
+Rows older than a horizon move to one SQLite database per calendar year
+(``<db>_archive_<year>.db`` in ARCHIVE_DIR). The hot database keeps recent
+rows plus the full sales_daily_item rollup, so dashboards and analytics never
+touch the archives. Adapter reads that take a date range (sales by day or
+page, activity log) attach the archive years the range reaches, and only
+those; reads inside the hot window are unchanged.
+"""
+from datetime import date, timedelta
+
+from src.config import ARCHIVE_SALES_AFTER_DAYS, ARCHIVE_ACTIVITY_AFTER_DAYS
+
+
+class ArchiveService:
+    """Move old sales and activity log rows into per-year archive databases."""
+
+    def __init__(self, db_adapter, sales_after_days: int = ARCHIVE_SALES_AFTER_DAYS,
+                 activity_after_days: int = ARCHIVE_ACTIVITY_AFTER_DAYS):
+        self.db = db_adapter
+        self.retention_days = {'sales': sales_after_days, 'activity_log': activity_after_days}
+
+    def horizons(self, today: date = None) -> dict:
+        """Day (YYYY-MM-DD) before which each table's rows are archived; 0 days disables a table."""
+        today = today or date.today()
+        return {table: (today - timedelta(days=days)).isoformat()
+                for table, days in self.retention_days.items() if days > 0}
+
+    def run(self, today: date = None) -> dict:
+        """Archive every table past its horizon. Returns {table: {year: rows moved}}.
+
+        A table whose archive run failed maps to None (see the log).
+        """
+        return {table: self.db.archive_rows(table, before)
+                for table, before in self.horizons(today).items()}
+
+    def get_partitions(self, table: str = None) -> list:
+        """List (table_name, year, row_count, path) for every archive database."""
+        return self.db.get_archive_partitions(table)
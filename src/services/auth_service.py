@@ -1,5 +1,6 @@
 """Authentication and user management services."""
 from src.core import PasswordManager
+from src.services.cache import cached
 
 
 class AuthService:
@@ -22,6 +23,7 @@ class AuthService:
         password_hash = PasswordManager.hash_password(password)
         return self.db.authenticate_user(username, password_hash)
 
+    @cached('users')
     def get_user_role(self, username: str) -> str:
         """Get the role of a user."""
         return self.db.get_user_role(username)
@@ -32,4 +34,4 @@ class AuthService:
 
     def is_admin(self, username: str) -> bool:
         """Check if user is admin."""
-        return self.db.get_user_role(username) == 'admin'
+        return self.get_user_role(username) == 'admin'
@@ -0,0 +1,140 @@
+"""Online backups of the live database, with rotation, verification and restore.
+
+Snapshots are taken with SQLite's online backup API while the desktop app and
+the API keep writing: pages are copied in small steps with a pause between
+them, so a multi-GB copy never starves live traffic of disk I/O. Each
+snapshot is written to a ``.partial`` file, checked with ``PRAGMA
+integrity_check`` and only then renamed into place as
+``<db>-<YYYYmmdd-HHMMSS>.db`` in BACKUP_DIR. The newest BACKUP_KEEP snapshots
+are kept.
+
+Per-year archive databases (see archive_service) are not included; they
+change only when ``--archive`` runs.
+"""
+import glob
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from src.db.storage import connect_read_only
+from src.config import BACKUP_DIR, BACKUP_KEEP, BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP_MS
+
+logger = logging.getLogger(__name__)
+
+PRE_RESTORE_LABEL = 'pre-restore'
+
+
+def verify_snapshot(path: str) -> bool:
+    """True if the database file at path passes PRAGMA integrity_check."""
+    try:
+        conn = connect_read_only(path)
+        try:
+            conn.execute('PRAGMA query_only = ON')
+            return conn.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.error("Error verifying backup %s: %s", path, e)
+        return False
+
+
+class BackupService:
+    """Create, list, verify and restore rotating snapshots of the database."""
+
+    def __init__(self, db_adapter, backup_dir: str = BACKUP_DIR, keep: int = BACKUP_KEEP,
+                 pages_per_step: int = BACKUP_PAGES_PER_STEP, step_sleep_ms: int = BACKUP_STEP_SLEEP_MS):
+        self.db = db_adapter
+        self.backup_dir = backup_dir
+        self.keep = max(1, keep)
+        self.pages_per_step = pages_per_step
+        self.step_sleep_ms = step_sleep_ms
+
+    @property
+    def _stem(self) -> str:
+        return os.path.splitext(os.path.basename(self.db.db_file))[0]
+
+    def create_backup(self, progress=None, label: str = None, rotate: bool = True) -> dict:
+        """Snapshot the live database. Returns the new backup's info (see list_backups).
+
+        progress(copied_pages, total_pages) is called after each step.
+        rotate=False leaves old snapshots for the caller to rotate.
+        Raises RuntimeError if the copy or its integrity check fails.
+        """
+        os.makedirs(self.backup_dir, exist_ok=True)
+        name = f"{self._stem}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        if label:
+            name += f'-{label}'
+        path = os.path.join(self.backup_dir, name + '.db')
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(self.backup_dir, f'{name}-{suffix}.db')
+        partial = path + '.partial'
+
+        started = time.monotonic()
+        pages = self.db.backup_to(partial, self.pages_per_step, self.step_sleep_ms, progress)
+        if pages < 0 or not verify_snapshot(partial):
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise RuntimeError("Backup failed: the copy could not be made or did not pass its integrity check")
+        os.replace(partial, path)
+        logger.info("Backed up %s to %s (%s pages in %.1fs)", self.db.db_file, path, pages,
+                    time.monotonic() - started)
+        if rotate:
+            self._rotate()
+        return self._describe(path)
+
+    def list_backups(self) -> list:
+        """List snapshots newest first as dicts with path, name, size and created."""
+        paths = glob.glob(os.path.join(glob.escape(self.backup_dir), f'{glob.escape(self._stem)}-*.db'))
+        return [self._describe(p) for p in sorted(paths, key=os.path.getmtime, reverse=True)]
+
+    def verify(self, path: str) -> bool:
+        """Run an integrity check on a snapshot."""
+        return verify_snapshot(path)
+
+    def restore(self, path: str, progress=None) -> dict:
+        """Replace the live database with the snapshot at path.
+
+        The snapshot is verified first, and the current database is backed
+        up (labelled pre-restore) so a wrong restore can be undone. Old
+        snapshots are rotated only afterwards, and never the one restored
+        or the safety copy. Returns that safety snapshot's info. Raises
+        ValueError for a missing or corrupt snapshot and RuntimeError if
+        the restore fails.
+        """
+        if not os.path.isfile(path):
+            raise ValueError(f"Backup not found: {path}")
+        if not verify_snapshot(path):
+            raise ValueError(f"Backup failed its integrity check: {path}")
+        safety = self.create_backup(progress, label=PRE_RESTORE_LABEL, rotate=False)
+        try:
+            if not self.db.restore_from(path):
+                raise RuntimeError("Restore failed; the database was left as it was")
+        finally:
+            self._rotate(protect=(path, safety['path']))
+        logger.info("Restored %s from %s", self.db.db_file, path)
+        return safety
+
+    def _rotate(self, protect=()):
+        """Remove all but the newest `keep` snapshots, sparing the paths in protect."""
+        protect = {os.path.abspath(p) for p in protect}
+        for old in self.list_backups()[self.keep:]:
+            if os.path.abspath(old['path']) in protect:
+                continue
+            try:
+                os.remove(old['path'])
+            except OSError as e:
+                logger.error("Error removing old backup %s: %s", old['path'], e)
+
+    @staticmethod
+    def _describe(path: str) -> dict:
+        stat = os.stat(path)
+        return {
+            'path': path,
+            'name': os.path.basename(path),
+            'size': stat.st_size,
+            'created': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+        }
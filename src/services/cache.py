@@ -0,0 +1,159 @@
+"""Read-through cache for service objects.
+
+Service read methods decorated with ``@cached('table', ...)`` are served from
+an in-process LRU with a TTL. Entries are tagged with the tables they read;
+when a transaction committed through the same adapter writes one of those
+tables, the matching entries are dropped. The TTL bounds staleness for writes
+made by other processes (e.g. the desktop app and the API sharing one file).
+
+Set ``SERVICE_CACHE_ENABLED=false`` (or call ``cache.disable()``) to turn it off.
+"""
+import copy
+import functools
+import inspect
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from src.config import SERVICE_CACHE_ENABLED, SERVICE_CACHE_TTL_SECONDS, SERVICE_CACHE_SIZE
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry and table tags."""
+
+    def __init__(self, max_size: int = 256, ttl: float = 30.0, enabled: bool = True):
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key -> (expires_at, tables, value)
+        self._generations = {}          # table -> bumped on every invalidation
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, tables, loader):
+        """Return the cached value for key, calling loader() on a miss."""
+        if not self.enabled:
+            return loader()
+        hit, value, generations = self._lookup(key, tables)
+        if hit:
+            return value
+        value = loader()
+        self._store(key, tables, generations, value)
+        return _copy(value)
+
+    async def get_or_load_async(self, key, tables, loader):
+        """get_or_load() for a loader returning an awaitable."""
+        if not self.enabled:
+            return await loader()
+        hit, value, generations = self._lookup(key, tables)
+        if hit:
+            return value
+        value = await loader()
+        self._store(key, tables, generations, value)
+        return _copy(value)
+
+    def _lookup(self, key, tables) -> tuple:
+        """(True, value, None) on a hit, else (False, None, the tables' generations)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, _copy(entry[2]), None
+            self.misses += 1
+            return False, None, [self._generations.get(t, 0) for t in tables]
+
+    def _store(self, key, tables, generations, value):
+        with self._lock:
+            # A write that committed while loading makes the value suspect; don't keep it.
+            if generations == [self._generations.get(t, 0) for t in tables]:
+                self._entries[key] = (time.monotonic() + self.ttl, frozenset(tables), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+    def invalidate_tables(self, tables):
+        """Drop every entry that read any of the given tables."""
+        tables = set(tables)
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            for key in [k for k, e in self._entries.items() if e[1] & tables]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def disable(self):
+        self.enabled = False
+        self.clear()
+
+    def enable(self):
+        self.enabled = True
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+def _copy(value):
+    # Callers may mutate what they get back (append, sort, edit a dict).
+    return copy.copy(value) if isinstance(value, (list, dict)) else value
+
+
+_caches = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def cache_for(db_adapter) -> TTLCache:
+    """Return the cache shared by all services on db_adapter, creating it once."""
+    with _caches_lock:
+        cache = _caches.get(db_adapter)
+        if cache is None:
+            cache = TTLCache(SERVICE_CACHE_SIZE, SERVICE_CACHE_TTL_SECONDS, SERVICE_CACHE_ENABLED)
+            add_listener = getattr(db_adapter, 'add_write_listener', None)
+            if add_listener is None:
+                # No way to hear about writes, so never serve stale data.
+                cache.enabled = False
+            else:
+                add_listener(cache.invalidate_tables)
+            _caches[db_adapter] = cache
+        return cache
+
+
+def cached(*tables):
+    """Cache a service method's result, tagged with the tables it reads.
+
+    The service must expose its adapter as ``self.db``. Coroutine methods
+    are cached the same way, their awaited result being the cached value.
+    """
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(self, *args, **kwargs):
+                key = (type(self).__name__, fn.__name__, args, tuple(sorted(kwargs.items())))
+                return await cache_for(self.db).get_or_load_async(key, tables, lambda: fn(self, *args, **kwargs))
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            key = (type(self).__name__, fn.__name__, args, tuple(sorted(kwargs.items())))
+            return cache_for(self.db).get_or_load(key, tables, lambda: fn(self, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,228 @@
+"""Incremental Parquet snapshots of sales, inventory and payrolls for analytics.
+
+Layout under the snapshot directory::
+
+    sales/2024-03.parquet        one file per month of sale_date
+    inventory/2024-03.parquet    row versions, by month of updated_at
+    payrolls/2024-03.parquet     row versions, by month of updated_at
+    _watermarks.json             where the next export resumes
+
+Each run reads only rows written since the stored watermark (on its own
+read-only connection, so it never takes the POS write lock) and rewrites just
+the months those rows fall in. Sales are append-only. Inventory and payroll
+files hold every exported version of a row; readers keep the newest per id.
+
+Requires pyarrow (``pip install pyarrow``).
+"""
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+from src.config import COLUMNAR_DIR
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_FILE = '_watermarks.json'
+EXPORT_BATCH_ROWS = 50_000
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("pyarrow is required for columnar analytics. Install it with: pip install pyarrow")
+    return pyarrow
+
+
+def _schemas(pa) -> dict:
+    """Arrow schema per exported table; field order matches the adapter's change feed."""
+    return {
+        'sales': pa.schema([
+            ('id', pa.int64()), ('sale_date', pa.string()), ('item_name', pa.string()),
+            ('quantity', pa.int64()), ('sale_price', pa.float64()), ('total_amount', pa.float64()),
+            ('username', pa.string()),
+        ]),
+        'inventory': pa.schema([
+            ('id', pa.int64()), ('item_name', pa.string()), ('quantity', pa.int64()),
+            ('threshold', pa.int64()), ('cost_price', pa.float64()), ('sale_price', pa.float64()),
+            ('description', pa.string()), ('updated_at', pa.string()),
+        ]),
+        'payrolls': pa.schema([
+            ('id', pa.int64()), ('employee_id', pa.int64()), ('period_start', pa.string()),
+            ('period_end', pa.string()), ('base_salary', pa.float64()), ('allowances', pa.float64()),
+            ('deductions', pa.float64()), ('overtime_hours', pa.float64()), ('overtime_rate', pa.float64()),
+            ('gross_pay', pa.float64()), ('net_pay', pa.float64()), ('status', pa.string()),
+            ('paid_date', pa.string()), ('created_at', pa.string()), ('updated_at', pa.string()),
+        ]),
+    }
+
+
+# Column whose first 7 characters (YYYY-MM) pick the month file
+_PARTITION_COLUMN = {'sales': 'sale_date', 'inventory': 'updated_at', 'payrolls': 'updated_at'}
+
+
+class ColumnarExportService:
+    """Append rows written since the last run to monthly Parquet files."""
+
+    TABLES = ('sales', 'inventory', 'payrolls')
+
+    def __init__(self, db_adapter, root_dir: str = COLUMNAR_DIR):
+        self.db = db_adapter
+        self.root_dir = root_dir
+
+    def _watermark_path(self) -> str:
+        return os.path.join(self.root_dir, WATERMARK_FILE)
+
+    def load_watermarks(self) -> dict:
+        try:
+            with open(self._watermark_path(), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_watermarks(self, watermarks: dict):
+        tmp = self._watermark_path() + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(watermarks, f, indent=2)
+        os.replace(tmp, self._watermark_path())
+
+    def export(self, tables=TABLES) -> dict:
+        """Export new rows for each table. Returns {table: rows exported}."""
+        pa = _require_pyarrow()
+        os.makedirs(self.root_dir, exist_ok=True)
+        watermarks = self.load_watermarks()
+        exported = {}
+        for table in tables:
+            count, mark = self._export_table(pa, table, watermarks.get(table))
+            exported[table] = count
+            if mark is not None:
+                watermarks[table] = mark
+                # Saved per table so a failure later on does not re-export this one
+                self._save_watermarks(watermarks)
+        return exported
+
+    def _export_table(self, pa, table: str, since) -> tuple:
+        """Stream one table's changes into month files. Returns (rows, new watermark)."""
+        import pyarrow.parquet as pq
+        schema = _schemas(pa)[table]
+        key = 'id' if table == 'sales' else 'updated_at'
+        partition_at = schema.get_field_index(_PARTITION_COLUMN[table])
+        table_dir = os.path.join(self.root_dir, table)
+        os.makedirs(table_dir, exist_ok=True)
+        writers = {}   # month -> (ParquetWriter, temp path, final path)
+        count, mark = 0, None
+
+        def writer_for(month):
+            if month not in writers:
+                final = os.path.join(table_dir, f'{month}.parquet')
+                tmp = final + '.tmp'
+                writer = pq.ParquetWriter(tmp, schema)
+                if os.path.exists(final):
+                    writer.write_table(pq.read_table(final, schema=schema))
+                writers[month] = (writer, tmp, final)
+            return writers[month][0]
+
+        def flush(rows):
+            by_month = {}
+            for row in rows:
+                month = (row[partition_at] or '')[:7] or 'undated'
+                by_month.setdefault(month, []).append(row)
+            for month, month_rows in by_month.items():
+                columns = list(zip(*month_rows))
+                batch = pa.table([pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                                 schema=schema)
+                writer_for(month).write_table(batch)
+
+        try:
+            batch = []
+            for row in self.db.iter_changes(table, since):
+                batch.append(row)
+                if len(batch) >= EXPORT_BATCH_ROWS:
+                    flush(batch)
+                    count += len(batch)
+                    mark = batch[-1][schema.get_field_index(key)]
+                    batch = []
+            if batch:
+                flush(batch)
+                count += len(batch)
+                mark = batch[-1][schema.get_field_index(key)]
+        except Exception:
+            for writer, tmp, _ in writers.values():
+                writer.close()
+                os.remove(tmp)
+            raise
+        for writer, tmp, final in writers.values():
+            writer.close()
+            os.replace(tmp, final)
+        logger.info("Columnar export: %d %s rows into %d month file(s)", count, table, len(writers))
+        return count, mark
+
+
+def _month_paths(root_dir: str, table: str, start_date: str, end_date: str) -> list:
+    """Existing month files of table that can hold rows between the two days."""
+    table_dir = os.path.join(root_dir, table)
+    if not os.path.isdir(table_dir):
+        return []
+    first, last = start_date[:7], end_date[:7]
+    return sorted(
+        os.path.join(table_dir, name) for name in os.listdir(table_dir)
+        if name.endswith('.parquet') and first <= name[:-len('.parquet')] <= last
+    )
+
+
+def _read_sales(root_dir: str, start_date: str, end_date: str, columns: list):
+    """Sales rows with start_date <= day <= end_date, as one Arrow table."""
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+    next_day = (datetime.strptime(end_date[:10], '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+    filters = [('sale_date', '>=', start_date[:10]), ('sale_date', '<', next_day)]
+    parts = [pq.read_table(path, columns=columns, filters=filters)
+             for path in _month_paths(root_dir, 'sales', start_date, end_date)]
+    if not parts:
+        return pa.table({c: pa.array([], type=_schemas(pa)['sales'].field(c).type) for c in columns})
+    return pa.concat_tables(parts)
+
+
+def columnar_sales_trend(root_dir: str, start_date: str, end_date: str) -> list:
+    """[(day, total_amount)] by day ascending — same shape as get_sales_trend_by_day."""
+    pa = _require_pyarrow()
+    import pyarrow.compute as pc
+    sales = _read_sales(root_dir, start_date, end_date, ['sale_date', 'total_amount'])
+    days = pa.table({'day': pc.utf8_slice_codeunits(sales['sale_date'], 0, 10),
+                     'total': sales['total_amount']})
+    grouped = days.group_by('day').aggregate([('total', 'sum')]).sort_by('day')
+    return list(zip(grouped['day'].to_pylist(), grouped['total_sum'].to_pylist()))
+
+
+def columnar_sales_summary(root_dir: str, start_date: str, end_date: str) -> list:
+    """[(item_name, total_qty, total_amount)] by quantity descending — same shape as
+    get_sales_summary_by_item."""
+    sales = _read_sales(root_dir, start_date, end_date, ['item_name', 'quantity', 'total_amount'])
+    grouped = sales.group_by('item_name').aggregate([('quantity', 'sum'), ('total_amount', 'sum')])
+    grouped = grouped.sort_by([('quantity_sum', 'descending'), ('item_name', 'ascending')])
+    return list(zip(grouped['item_name'].to_pylist(), grouped['quantity_sum'].to_pylist(),
+                    grouped['total_amount_sum'].to_pylist()))
+
+
+def read_latest(root_dir: str, table: str):
+    """Newest exported version of every inventory or payroll row, as an Arrow table.
+
+    Rows deleted from the database since they were exported are still included.
+    """
+    pa = _require_pyarrow()
+    import numpy as np
+    import pyarrow.parquet as pq
+    table_dir = os.path.join(root_dir, table)
+    paths = sorted(os.path.join(table_dir, n) for n in os.listdir(table_dir)
+                   if n.endswith('.parquet')) if os.path.isdir(table_dir) else []
+    if not paths:
+        return _schemas(pa)[table].empty_table()
+    versions = pa.concat_tables(pq.read_table(p) for p in paths)
+    versions = versions.sort_by([('id', 'ascending'), ('updated_at', 'descending')])
+    ids = versions['id'].to_numpy()
+    first_of_id = np.ones(len(ids), dtype=bool)
+    first_of_id[1:] = ids[1:] != ids[:-1]
+    return versions.filter(pa.array(first_of_id))
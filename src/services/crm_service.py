@@ -1,6 +1,8 @@
 """CRM Service — manages contacts, leads, pipeline stages, and activities."""
 import logging
 
+from src.services.cache import cached
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +37,11 @@ class CRMService:
         """Get contacts, optionally filtered by search string."""
         return self.db.get_crm_contacts(search=search)
 
+    def get_contacts_page(self, limit: int = 100, after=None, search: str = None,
+                          status: str = None) -> tuple:
+        """Get one page of contacts. Returns (rows, next_after)."""
+        return self.db.get_crm_contacts_page(limit=limit, after=after, search=search, status=status)
+
     def update_contact(self, contact_id: int, **kwargs) -> bool:
         """Update contact fields. Returns True on success."""
         if not contact_id:
@@ -78,10 +85,21 @@ class CRMService:
             notes=notes.strip() if notes else '',
         )
 
+    @cached('crm_leads', 'crm_contacts')
     def get_leads(self, stage: str = None) -> list:
         """Get leads, optionally filtered by stage."""
         return self.db.get_crm_leads(stage=stage)
 
+    @cached('crm_leads', 'crm_contacts')
+    async def get_leads_async(self, adb, stage: str = None) -> list:
+        """get_leads() through an AsyncDatabaseAdapter on the same database."""
+        return await adb.get_crm_leads(stage=stage)
+
+    def get_leads_page(self, limit: int = 100, after=None, stage: str = None,
+                       owner: str = None) -> tuple:
+        """Get one page of leads, newest first. Returns (rows, next_after)."""
+        return self.db.get_crm_leads_page(limit=limit, after=after, stage=stage, owner=owner)
+
     def update_lead(self, lead_id: int, **kwargs) -> bool:
         """Update lead fields. Returns True on success."""
         if not lead_id:
@@ -137,9 +155,17 @@ class CRMService:
 
     def get_pipeline_summary(self) -> dict:
         """Return a dict mapping each stage to the list of leads in that stage."""
-        summary = {stage: [] for stage in self.STAGES}
-        all_leads = self.db.get_crm_leads()
-        for lead in all_leads:
+        return self.group_by_stage(self.get_leads())
+
+    async def get_pipeline_summary_async(self, adb) -> dict:
+        """get_pipeline_summary() through an AsyncDatabaseAdapter on the same database."""
+        return self.group_by_stage(await self.get_leads_async(adb))
+
+    @classmethod
+    def group_by_stage(cls, leads: list) -> dict:
+        """Group lead rows by stage, in pipeline order; unknown stages count as New."""
+        summary = {stage: [] for stage in cls.STAGES}
+        for lead in leads:
             stage = lead[3] if len(lead) > 3 else 'New'  # index 3 = stage column
             if stage in summary:
                 summary[stage].append(lead)
@@ -149,7 +175,7 @@ class CRMService:
 
     def get_conversion_rate(self) -> float:
         """Return ratio of Won leads to total closed (Won + Lost) leads, as a percentage."""
-        all_leads = self.db.get_crm_leads()
+        all_leads = self.get_leads()
         won = sum(1 for l in all_leads if len(l) > 3 and l[3] == 'Won')
         lost = sum(1 for l in all_leads if len(l) > 3 and l[3] == 'Lost')
         total_closed = won + lost
@@ -159,7 +185,7 @@ class CRMService:
 
     def get_pipeline_value(self) -> float:
         """Return total pipeline value (sum of all non-Lost lead values)."""
-        all_leads = self.db.get_crm_leads()
+        all_leads = self.get_leads()
         total = 0.0
         for lead in all_leads:
             if len(lead) > 3 and lead[3] != 'Lost':
@@ -1,72 +1,263 @@
-"""Email and notification services."""
+"""Email and notification services.
+
+Notifications are queued in the ``email_queue`` table and delivered by an
+EmailOutbox worker thread, so a slow or unreachable mail server never holds
+up a checkout or a UI click. The worker sends each batch over one
+authenticated SMTP session, spaces messages to a rate limit and retries
+failures with exponential backoff before marking them failed. Only errors
+for a message use up its attempts: when the server can't be reached (or no
+config is saved) the batch is put back and the whole outbox backs off.
+"""
 import smtplib
 import logging
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+from src.config import (
+    EMAIL_STARTTLS, SMTP_TIMEOUT_SECONDS, EMAIL_BATCH_SIZE, EMAIL_MAX_ATTEMPTS,
+    EMAIL_RETRY_BASE_SECONDS, EMAIL_RETRY_MAX_SECONDS, EMAIL_RATE_PER_MINUTE, EMAIL_POLL_SECONDS,
+)
+
 logger = logging.getLogger(__name__)
 
+# The connection itself is gone; later messages in the batch need a new session.
+_SESSION_ERRORS = (smtplib.SMTPServerDisconnected, OSError)
+
+
+def _build_message(sender: str, to_addr: str, subject: str, body: str) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg['From'] = sender
+    msg['To'] = to_addr
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def open_smtp(config: dict, starttls: bool = EMAIL_STARTTLS,
+              timeout: float = SMTP_TIMEOUT_SECONDS) -> smtplib.SMTP:
+    """Connect, upgrade to TLS and log in with the saved email config."""
+    smtp = smtplib.SMTP(config['smtp_server'], int(config['smtp_port']), timeout=timeout)
+    try:
+        if starttls:
+            smtp.starttls()
+        if config.get('sender_password'):
+            smtp.login(config['sender_email'], config['sender_password'])
+    except Exception:
+        smtp.close()
+        raise
+    return smtp
+
 
 class EmailService:
     """Handle email operations."""
-    
-    def __init__(self, db_adapter):
+
+    def __init__(self, db_adapter, outbox=None):
         self.db = db_adapter
-    
+        self.outbox = outbox
+
     def save_config(self, smtp_server: str, smtp_port: int, sender_email: str,
                    sender_password: str, recipient_email: str) -> bool:
         """Save email configuration."""
         if not all([smtp_server, sender_email, sender_password, recipient_email]):
             raise ValueError("All email config fields are required")
         return self.db.save_email_config(smtp_server, smtp_port, sender_email, sender_password, recipient_email)
-    
+
     def get_config(self) -> dict:
         """Get email configuration."""
         return self.db.get_email_config()
-    
+
     def send_email(self, subject: str, body: str, recipient: str = None) -> bool:
-        """Send an email."""
+        """Send an email now, on the caller's thread (e.g. a settings test).
+
+        Notifications should use queue_email() instead.
+        """
         config = self.get_config()
         if not config:
             raise RuntimeError("Email configuration is missing")
-        
-        server = config['smtp_server']
-        port = config['smtp_port']
-        sender = config['sender_email']
-        password = config['sender_password']
-        to_addr = recipient or config['recipient_email']
-        
+
         try:
-            msg = MIMEMultipart()
-            msg['From'] = sender
-            msg['To'] = to_addr
-            msg['Subject'] = subject
-            msg.attach(MIMEText(body, 'plain'))
-            
-            with smtplib.SMTP(server, int(port)) as smtp:
-                smtp.starttls()
-                smtp.login(sender, password)
+            msg = _build_message(config['sender_email'], recipient or config['recipient_email'], subject, body)
+            with open_smtp(config) as smtp:
                 smtp.send_message(msg)
-            
             return True
         except Exception as e:
             logger.error("Error sending email: %s", e)
             return False
-    
+
+    def queue_email(self, subject: str, body: str, recipient: str = None) -> int:
+        """Queue an email for background delivery. Returns the queue id or -1.
+
+        recipient defaults to the configured recipient at send time.
+        """
+        email_id = self.db.enqueue_email(subject, body, recipient)
+        if email_id > 0 and self.outbox is not None:
+            self.outbox.wake()
+        return email_id
+
+    def get_email_status(self, email_id: int) -> dict:
+        """Get the delivery status of a queued email."""
+        return self.db.get_queued_email(email_id)
+
+    def get_outbox_counts(self) -> dict:
+        """Count queued emails by status (pending, sending, sent, failed)."""
+        return self.db.get_email_queue_counts()
+
     def send_low_stock_alerts(self, low_stock_items: list) -> bool:
-        """Send low stock alert email."""
+        """Queue a low stock alert email."""
         if not low_stock_items:
             return False
-        
+
         body = "Low stock alert:\n\n"
         for item in low_stock_items:
             name = item[0] if isinstance(item, tuple) else item.get('item_name', 'Unknown')
             qty = item[1] if isinstance(item, tuple) else item.get('quantity', 0)
             threshold = item[2] if isinstance(item, tuple) else item.get('threshold', 0)
             body += f"- {name}: Qty={qty}, Threshold={threshold}\n"
-        
+
+        return self.queue_email("BizHub - Low Stock Alerts", body) > 0
+
+
+class EmailOutbox:
+    """Background worker that delivers the email_queue."""
+
+    def __init__(self, db_adapter, batch_size: int = EMAIL_BATCH_SIZE,
+                 max_attempts: int = EMAIL_MAX_ATTEMPTS,
+                 retry_base_seconds: float = EMAIL_RETRY_BASE_SECONDS,
+                 retry_max_seconds: float = EMAIL_RETRY_MAX_SECONDS,
+                 rate_per_minute: float = EMAIL_RATE_PER_MINUTE,
+                 poll_seconds: float = EMAIL_POLL_SECONDS,
+                 starttls: bool = EMAIL_STARTTLS, timeout: float = SMTP_TIMEOUT_SECONDS):
+        self.db = db_adapter
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.min_interval = 60.0 / rate_per_minute if rate_per_minute else 0.0
+        self.poll_seconds = poll_seconds
+        self.starttls = starttls
+        self.timeout = timeout
+        self._next_send = 0.0
+        self._connect_failures = 0
+        self._resume_at = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the sender thread (once)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="bizhub-email", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Ask the sender to finish its current message and exit."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wake(self):
+        """Send newly queued mail now instead of at the next poll."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.send_pending()
+            except Exception as e:
+                logger.error("Email outbox error: %s", e)
+            self._wake.wait(self.poll_seconds)
+
+    def retry_delay(self, attempts: int) -> float:
+        """Backoff before the next try, after attempts failed tries."""
+        return min(self.retry_base_seconds * 2 ** max(attempts - 1, 0), self.retry_max_seconds)
+
+    def send_pending(self) -> dict:
+        """Deliver every due email. Returns counts of sent, retrying and failed.
+
+        Does nothing while backing off after a failed connection.
+        """
+        result = {'sent': 0, 'retrying': 0, 'failed': 0}
+        if time.monotonic() < self._resume_at:
+            return result
+        smtp, tried, more = None, set(), True
         try:
-            return self.send_email("BizHub - Low Stock Alerts", body)
+            while more and not self._stop.is_set():
+                batch = self.db.claim_emails(self.batch_size)
+                # A retry already due again is left for the next pass.
+                again = [row[0] for row in batch if row[0] in tried]
+                if again:
+                    self.db.release_emails(again)
+                    batch, more = [row for row in batch if row[0] not in tried], False
+                if not batch:
+                    break
+                tried.update(row[0] for row in batch)
+                config = self.db.get_email_config()
+                for position, (email_id, recipient, subject, body, attempts) in enumerate(batch):
+                    if smtp is None:
+                        # Once per batch, and again only if the session dropped
+                        smtp = self._connect(config)
+                        if smtp is None:
+                            self.db.release_emails([row[0] for row in batch[position:]])
+                            return result
+                    if not self._wait_for_rate_limit():
+                        self.db.release_emails([row[0] for row in batch[position:]])
+                        return result
+                    try:
+                        msg = _build_message(config['sender_email'], recipient or config['recipient_email'],
+                                             subject, body)
+                        smtp.send_message(msg)
+                    except Exception as e:
+                        if isinstance(e, _SESSION_ERRORS):
+                            smtp = self._close(smtp)
+                        result[self._failed(email_id, attempts + 1, e)] += 1
+                    else:
+                        self.db.mark_email_sent(email_id)
+                        result['sent'] += 1
+        finally:
+            self._close(smtp, quit=True)
+        return result
+
+    def _connect(self, config: dict):
+        """Open an SMTP session, or start backing off and return None if that fails."""
+        try:
+            if not config:
+                raise RuntimeError("Email configuration is missing")
+            smtp = open_smtp(config, self.starttls, self.timeout)
         except Exception as e:
-            logger.error("Error sending low stock alerts: %s", e)
+            self._connect_failures += 1
+            delay = self.retry_delay(self._connect_failures)
+            self._resume_at = time.monotonic() + delay
+            logger.error("Could not open an SMTP session, retrying in %.0fs: %s", delay, e)
+            return None
+        self._connect_failures = 0
+        return smtp
+
+    def _wait_for_rate_limit(self) -> bool:
+        """Sleep until the next send is allowed. False if stopped meanwhile."""
+        delay = self._next_send - time.monotonic()
+        if delay > 0 and self._stop.wait(delay):
             return False
+        self._next_send = max(self._next_send, time.monotonic()) + self.min_interval
+        return True
+
+    def _failed(self, email_id: int, attempts: int, error: Exception) -> str:
+        logger.error("Error sending queued email %s (attempt %s): %s", email_id, attempts, error)
+        if attempts >= self.max_attempts:
+            self.db.mark_email_failed(email_id, str(error))
+            return 'failed'
+        self.db.mark_email_failed(email_id, str(error), self.retry_delay(attempts))
+        return 'retrying'
+
+    @staticmethod
+    def _close(smtp, quit: bool = False):
+        if smtp is not None:
+            try:
+                smtp.quit() if quit else smtp.close()
+            except Exception:
+                smtp.close()
+        return None
@@ -0,0 +1,87 @@
+"""Streaming CSV/XLSX exports for sales, inventory and payroll."""
+import csv
+import io
+import tempfile
+
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+EXPORT_COLUMNS = {
+    'sales': ["Sale ID", "Sale Date", "Item Name", "Quantity", "Sale Price", "Total Amount", "Username"],
+    # Same columns as the inventory import, so an export can be edited and re-imported
+    'inventory': ["Item Name", "Quantity", "Threshold", "Cost Price", "Sale Price", "Description"],
+    'payroll': ["Payroll ID", "Employee ID", "Employee Number", "Employee Name", "Period Start",
+                "Period End", "Base Salary", "Allowances", "Deductions", "Overtime Hours",
+                "Overtime Rate", "Gross Pay", "Net Pay", "Status", "Paid Date"],
+}
+
+
+def _csv_chunks(header: list, rows):
+    """Encode rows as UTF-8 CSV (with BOM for Excel), yielding ~64 KiB chunks."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _xlsx_chunks(openpyxl, title: str, header: list, rows):
+    """Build a write-only workbook in a temp file, then yield it in chunks.
+
+    Write-only mode flushes rows to disk as they are appended, so memory does
+    not grow with the row count.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    ws.append(header)
+    for row in rows:
+        ws.append(list(row))
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while True:
+            chunk = tmp.read(EXPORT_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+
+class ExportService:
+    """Stream table exports without loading whole tables into memory."""
+
+    DATASETS = tuple(EXPORT_COLUMNS)
+
+    def __init__(self, db_adapter):
+        self.db = db_adapter
+
+    def rows(self, dataset: str, start_date: str = None, end_date: str = None):
+        """Row iterator for a dataset. Date bounds apply to sales only."""
+        if dataset == 'sales':
+            return self.db.iter_sales(start_date, end_date)
+        if dataset == 'inventory':
+            return self.db.iter_inventory()
+        if dataset == 'payroll':
+            return self.db.iter_payrolls()
+        raise ValueError(f"Unknown export: {dataset}")
+
+    def stream_csv(self, dataset: str, **filters):
+        """Iterator of CSV byte chunks for dataset."""
+        return _csv_chunks(EXPORT_COLUMNS[dataset], self.rows(dataset, **filters))
+
+    def stream_xlsx(self, dataset: str, **filters):
+        """Iterator of .xlsx byte chunks for dataset. Raises ImportError without openpyxl."""
+        import openpyxl
+        return _xlsx_chunks(openpyxl, dataset.title(), EXPORT_COLUMNS[dataset], self.rows(dataset, **filters))
+
+    def write_file(self, dataset: str, path: str, **filters):
+        """Export dataset to path; .xlsx paths get a workbook, anything else CSV."""
+        stream = self.stream_xlsx if path.lower().endswith('.xlsx') else self.stream_csv
+        chunks = stream(dataset, **filters)
+        with open(path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
@@ -0,0 +1,87 @@
+"""Vectorised demand forecasting and reorder points for every SKU at once.
+
+Daily sales are laid out as an item x day matrix. From it, in one pass over
+all items:
+
+- day-of-week factors: mean demand per weekday over mean daily demand,
+  shrunk toward 1 when the history holds only a few of each weekday;
+- level: exponentially weighted mean of the deseasonalised demand, so
+  recent days count more;
+- safety stock: z * std(deseasonalised demand) * sqrt(lead time);
+- reorder point: seasonal demand over the lead time plus safety stock.
+
+An item at or below its reorder point gets an order that brings it up to
+the reorder point plus the demand expected over the cover period.
+"""
+import numpy as np
+
+DEFAULT_ALPHA = 0.2           # EWMA smoothing; higher follows recent days more closely
+DEFAULT_SERVICE_Z = 1.65      # ~95% cycle service level
+SEASON_SHRINK_WEEKS = 2       # weekday factors count fully only with several weeks of history
+
+
+def demand_matrix(rows, start_date: str, days: int):
+    """Build (item_names, matrix) from (day, item_name, qty) rows.
+
+    matrix[i, t] is the quantity of item_names[i] sold on start_date + t days.
+    """
+    if not rows:
+        return np.array([], dtype=str), np.zeros((0, days))
+    day_col, item_col, qty_col = zip(*rows)
+    offsets = (np.array(day_col, dtype='datetime64[D]') - np.datetime64(start_date[:10], 'D')).astype(int)
+    names, item_index = np.unique(np.array(item_col, dtype=str), return_inverse=True)
+    in_range = (offsets >= 0) & (offsets < days)
+    matrix = np.zeros((len(names), days))
+    np.add.at(matrix, (item_index[in_range], offsets[in_range]),
+              np.asarray(qty_col, dtype=float)[in_range])
+    return names, matrix
+
+
+def weekday_factors(matrix: np.ndarray, first_weekday: int) -> np.ndarray:
+    """Per-item multiplicative day-of-week factors, shape (items, 7), Monday = 0."""
+    items, days = matrix.shape
+    weekdays = (first_weekday + np.arange(days)) % 7
+    counts = np.bincount(weekdays, minlength=7)
+    if counts.min() == 0:
+        return np.ones((items, 7))
+    onehot = np.eye(7)[weekdays]                       # (days, 7)
+    weekday_mean = (matrix @ onehot) / counts          # (items, 7)
+    overall = matrix.mean(axis=1, keepdims=True)
+    raw = np.divide(weekday_mean, overall, out=np.ones_like(weekday_mean), where=overall > 0)
+    weeks = counts.min()
+    factors = 1 + (raw - 1) * (weeks / (weeks + SEASON_SHRINK_WEEKS))
+    return factors / factors.mean(axis=1, keepdims=True)
+
+
+def reorder_plan(matrix: np.ndarray, first_weekday: int, on_hand: np.ndarray,
+                 lead_time_days: int = 7, cover_days: int = 7,
+                 alpha: float = DEFAULT_ALPHA, z: float = DEFAULT_SERVICE_Z) -> dict:
+    """Forecast, safety stock, reorder point and order quantity for every row of matrix.
+
+    Returns a dict of arrays aligned with the matrix rows.
+    """
+    items, days = matrix.shape
+    factors = weekday_factors(matrix, first_weekday)
+    weekdays = (first_weekday + np.arange(days)) % 7
+    seasonal = factors[:, weekdays]
+    deseasonalised = np.divide(matrix, seasonal, out=np.zeros_like(matrix), where=seasonal > 0)
+
+    weights = (1 - alpha) ** np.arange(days - 1, -1, -1)
+    level = deseasonalised @ weights / weights.sum() if days else np.zeros(items)
+    sigma = deseasonalised.std(axis=1, ddof=1) if days > 1 else np.zeros(items)
+
+    ahead = (first_weekday + days + np.arange(lead_time_days + cover_days)) % 7
+    ahead_factors = factors[:, ahead]
+    lead_demand = level * ahead_factors[:, :lead_time_days].sum(axis=1)
+    cover_demand = level * ahead_factors[:, lead_time_days:].sum(axis=1)
+    safety_stock = z * sigma * np.sqrt(lead_time_days)
+    reorder_point = lead_demand + safety_stock
+    order_up_to = reorder_point + cover_demand
+    recommended = np.where(on_hand <= reorder_point, np.ceil(order_up_to - on_hand), 0)
+    return {
+        'avg_daily': matrix.mean(axis=1) if days else np.zeros(items),
+        'forecast_daily': level,
+        'safety_stock': safety_stock,
+        'reorder_point': reorder_point,
+        'recommended_qty': np.maximum(recommended, 0).astype(int),
+    }
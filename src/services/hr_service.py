@@ -22,6 +22,13 @@ class HRService:
         """Get all employees."""
         return self.db.get_all_employees()
     
+    def get_employees_page(self, limit: int = 100, after=None, **filters) -> tuple:
+        """Get one page of employees ordered by name. Returns (rows, next_after).
+
+        filters: team, is_active, search.
+        """
+        return self.db.get_employees_page(limit=limit, after=after, **filters)
+
     def get_employee(self, emp_id: int) -> dict:
         """Get employee by ID."""
         return self.db.get_employee_by_id(emp_id)
@@ -1,5 +1,76 @@
 """Inventory management services."""
 from src.core import InventoryCalculator
+from src.services.cache import cached
+from src.services.item_index import item_index_for
+
+IMPORT_CHUNK_SIZE = 5000     # rows per upsert transaction
+MAX_IMPORT_ERRORS = 1000     # per-row errors kept in an import report
+
+_IMPORT_FIELDS = ('item_name', 'quantity', 'threshold', 'cost_price', 'sale_price', 'description')
+_HEADER_NAMES = ('item name', 'item_name', 'name')
+
+
+def _column_key(header) -> str:
+    key = str(header or '').strip().lower().replace(' ', '_')
+    return 'item_name' if key == 'name' else key
+
+
+def parse_import_row(row) -> tuple:
+    """Turn one import row into an upsert tuple. Raises ValueError if it is invalid.
+
+    row is a dict keyed by column name ("Item Name" or "item_name" style) or a
+    sequence in _IMPORT_FIELDS order.
+    """
+    if isinstance(row, dict):
+        values = {_column_key(k): v for k, v in row.items()}
+        fields = [values.get(f) for f in _IMPORT_FIELDS]
+    else:
+        fields = (list(row) + [None] * len(_IMPORT_FIELDS))[:len(_IMPORT_FIELDS)]
+    name, qty, thr, cost, sale, desc = fields
+    name = str(name).strip() if name is not None else ''
+    if not name:
+        raise ValueError("Missing item name")
+    try:
+        qty, thr = int(float(qty or 0)), int(float(thr or 0))
+        cost, sale = float(cost or 0), float(sale or 0)
+    except (TypeError, ValueError):
+        raise ValueError("Quantity, threshold and prices must be numbers")
+    if qty < 0 or cost < 0 or sale < 0:
+        raise ValueError("Quantity and prices cannot be negative")
+    return name, qty, thr, cost, sale, str(desc) if desc is not None else ''
+
+
+def iter_xlsx_rows(source):
+    """Stream the first sheet of an .xlsx file (path or file object) as import rows.
+
+    A header row is used for column names; without one, columns are read in
+    _IMPORT_FIELDS order. Raises ImportError if openpyxl is not installed.
+    """
+    import openpyxl
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+
+    def rows():
+        try:
+            sheet = wb.active.iter_rows(values_only=True)
+            first = next(sheet, None)
+            if first is None:
+                return
+            if str(first[0] or '').strip().lower() in _HEADER_NAMES:
+                header = [_column_key(h) for h in first]
+                for values in sheet:
+                    yield dict(zip(header, values))
+            else:
+                yield first
+                yield from sheet
+        finally:
+            wb.close()
+
+    return rows()
+
+
+def _is_blank(row) -> bool:
+    values = row.values() if isinstance(row, dict) else row
+    return all(v is None or str(v).strip() == '' for v in values)
 
 
 class InventoryService:
@@ -8,10 +79,16 @@ class InventoryService:
     def __init__(self, db_adapter):
         self.db = db_adapter
     
+    @cached('inventory')
     def get_all_items(self) -> list:
         """Get all inventory items."""
         return self.db.get_all_inventory()
     
+    def get_items_page(self, limit: int = 100, after=None, low_stock: bool = False) -> tuple:
+        """Get one page of inventory items. Returns (rows, next_after)."""
+        return self.db.get_inventory_page(limit=limit, after=after, low_stock=low_stock)
+
+    @cached('inventory')
     def get_item(self, name: str) -> dict:
         """Get specific inventory item."""
         return self.db.get_inventory_by_name(name)
@@ -32,9 +109,58 @@ class InventoryService:
         """Delete inventory item."""
         return self.db.delete_inventory_item(item_name)
     
+    def bulk_upsert(self, rows, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+        """Insert or update items by name from an iterable of rows (CSV/Excel/JSON import).
+
+        Rows are consumed lazily and written in chunk_size transactions, so a
+        large file never has to be held in memory. Blank rows are ignored.
+        Returns {'imported', 'skipped', 'errors'}; each error is
+        {'row', 'item_name', 'error'} with row counting data rows from 1.
+        """
+        report = {'imported': 0, 'skipped': 0, 'errors': []}
+        chunk, chunk_rows = [], []
+
+        def add_error(row_number, item_name, error):
+            report['skipped'] += 1
+            if len(report['errors']) < MAX_IMPORT_ERRORS:
+                report['errors'].append({'row': row_number, 'item_name': item_name, 'error': error})
+
+        def flush():
+            if self.db.upsert_inventory_items(chunk) < 0:
+                for row_number, parsed in zip(chunk_rows, chunk):
+                    add_error(row_number, parsed[0], "Database error")
+            else:
+                report['imported'] += len(chunk)
+            chunk.clear()
+            chunk_rows.clear()
+
+        for row_number, row in enumerate(rows, 1):
+            if _is_blank(row):
+                continue
+            try:
+                chunk.append(parse_import_row(row))
+                chunk_rows.append(row_number)
+            except ValueError as e:
+                name = (row.get('Item Name') or row.get('item_name') or row.get('name')) if isinstance(row, dict) else row[0]
+                add_error(row_number, name, str(e))
+                continue
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+        return report
+
     def search(self, query: str) -> list:
         """Search inventory by name or description."""
         return self.db.search_inventory(query)
+
+    def quick_search(self, query: str, limit: int = None) -> list:
+        """Search item names and descriptions in memory (word-prefix match, name hits first).
+
+        Meant for search-as-you-type; rows are (item_name, quantity, threshold,
+        cost_price, sale_price, description). An empty query returns every item.
+        """
+        return item_index_for(self.db).search(query, limit=limit)
     
     def get_low_stock_items(self) -> list:
         """Get items where quantity < threshold."""
@@ -0,0 +1,166 @@
+"""In-memory word-prefix index over inventory item names and descriptions.
+
+Built once per adapter from the inventory change feed and kept as a sorted
+array of ``(word, item_id)`` keys, so a query word is a bisect range instead
+of a database round trip. Writes committed through the adapter mark the
+index stale; the next search pulls rows changed since the last
+``updated_at`` watermark and patches them in. Other processes on the same
+database (the API and the desktop app share inventory.db) send no
+notification, so a search also re-checks the watermark once RECHECK_SECONDS
+have passed since the last check. If rows were deleted (the item count no
+longer matches) the index is rebuilt.
+
+Matching follows the FTS search: every query word must prefix some word of
+the item's name or description. Items matching on name alone rank first.
+"""
+import re
+import threading
+import time
+import weakref
+from bisect import bisect_left, insort
+
+from src.db.base import ALL_TABLES
+
+_WORD = re.compile(r'\w+')
+_MAX_CHAR = '\U0010ffff'
+REBUILD_MIN_CHANGES = 500   # more changed rows than this (or a tenth of the index) -> rebuild
+RECHECK_SECONDS = 1.0       # how stale other processes' writes can look to a search
+
+
+def _words(text) -> set:
+    return set(_WORD.findall(str(text or '').casefold()))
+
+
+class ItemIndex:
+    """Sorted-key index of inventory rows, refreshed lazily after writes.
+
+    Rows are (item_name, quantity, threshold, cost_price, sale_price, description).
+    """
+
+    def __init__(self, db_adapter):
+        self.db = db_adapter
+        self._lock = threading.Lock()
+        self._keys = []        # sorted (word, item_id)
+        self._rows = {}        # item_id -> row
+        self._words = {}       # item_id -> (name words, all words)
+        self._watermark = None
+        self._built = False
+        self._stale = False
+        self._checked_at = 0.0
+        self.listening = True   # False: no write notifications, check for changes on every search
+        self.recheck_seconds = RECHECK_SECONDS
+
+    def invalidate_tables(self, tables):
+        """Write listener: note that inventory changed."""
+        if ALL_TABLES in tables:
+            self._built = False   # replaced wholesale (restore); watermarks mean nothing now
+        elif 'inventory' in tables:
+            self._stale = True
+
+    def search(self, query: str, limit: int = None) -> list:
+        """Return rows whose words start with every word of query, best first.
+
+        An empty query returns every item ordered by name.
+        """
+        terms = sorted(_words(query))
+        with self._lock:
+            self._sync()
+            if not terms:
+                ids = self._rows.keys()
+            else:
+                ids = None
+                for term in terms:
+                    found = self._prefix_ids(term)
+                    ids = found if ids is None else ids & found
+                    if not ids:
+                        return []
+            rows = [(self._rank(i, terms), self._rows[i][0].casefold(), self._rows[i]) for i in ids]
+        rows.sort(key=lambda r: r[:2])
+        if limit is not None:
+            rows = rows[:limit]
+        return [r[2] for r in rows]
+
+    def __len__(self):
+        with self._lock:
+            self._sync()
+            return len(self._rows)
+
+    def _prefix_ids(self, prefix: str) -> set:
+        lo = bisect_left(self._keys, (prefix,))
+        hi = bisect_left(self._keys, (prefix + _MAX_CHAR,), lo)
+        return {item_id for _, item_id in self._keys[lo:hi]}
+
+    def _rank(self, item_id, terms) -> int:
+        name_words = self._words[item_id][0]
+        return 0 if all(any(w.startswith(t) for w in name_words) for t in terms) else 1
+
+    def _sync(self):
+        if not self._built:
+            self._rebuild()
+            return
+        now = time.monotonic()
+        if not self._stale and self.listening and now - self._checked_at < self.recheck_seconds:
+            return
+        # Cleared before reading so a write landing mid-sync triggers another pass.
+        self._stale = False
+        self._checked_at = now
+        # The watermark is inclusive, so rows seen last time come back too.
+        changes = [c for c in self.db.iter_changes('inventory', since=self._watermark)
+                   if self._rows.get(c[0]) != tuple(c[1:7])]
+        if len(changes) > max(REBUILD_MIN_CHANGES, len(self._rows) // 10):
+            self._rebuild()   # e.g. a bulk import; sorting once beats many inserts
+            return
+        for change in changes:
+            self._put(change)
+        if self.db.get_inventory_count() != len(self._rows):
+            self._rebuild()
+
+    def _rebuild(self):
+        self._stale = False
+        self._checked_at = time.monotonic()
+        self._keys, self._rows, self._words, self._watermark = [], {}, {}, None
+        keys = []
+        for change in self.db.iter_changes('inventory'):
+            keys.extend(self._put(change, index=False))
+        keys.sort()
+        self._keys = keys
+        self._built = True
+
+    def _put(self, change, index: bool = True) -> list:
+        """Store one change-feed row; returns its keys when index is False."""
+        item_id, name, qty, thr, cost, sale, desc, updated_at = change
+        if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+        if index and item_id in self._words:
+            for word in self._words[item_id][1]:
+                del self._keys[bisect_left(self._keys, (word, item_id))]
+        name_words = _words(name)
+        all_words = name_words | _words(desc)
+        self._rows[item_id] = (name, qty, thr, cost, sale, desc)
+        self._words[item_id] = (name_words, all_words)
+        keys = [(word, item_id) for word in all_words]
+        if not index:
+            return keys
+        for key in keys:
+            insort(self._keys, key)
+        return []
+
+
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def item_index_for(db_adapter) -> ItemIndex:
+    """Return the item index shared by all services on db_adapter, creating it once."""
+    with _indexes_lock:
+        index = _indexes.get(db_adapter)
+        if index is None:
+            index = ItemIndex(db_adapter)
+            add_listener = getattr(db_adapter, 'add_write_listener', None)
+            if add_listener is None:
+                # No way to hear about writes, so re-check on every search.
+                index.listening = False
+            else:
+                add_listener(index.invalidate_tables)
+            _indexes[db_adapter] = index
+        return index
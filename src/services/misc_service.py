@@ -1,19 +1,136 @@
 """Activity and audit logging services."""
+import atexit
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+
+from src.config import (
+    ACTIVITY_LOG_DURABILITY, ACTIVITY_LOG_FLUSH_MS, ACTIVITY_LOG_BATCH_SIZE, ACTIVITY_LOG_MAX_PENDING,
+)
+from src.services.cache import cached
+
+logger = logging.getLogger(__name__)
+
+IDLE_FLUSHES_BEFORE_EXIT = 40   # empty flush intervals before the writer thread exits
+
+
+class ActivityLogWriter:
+    """Buffer audit entries in memory and write them in batches from a background thread.
+
+    Entries are (timestamp, username, action, details); the timestamp is taken
+    when the action is logged, not when it is written. The thread wakes every
+    flush_ms, or early once batch_size entries are waiting, and exits when idle;
+    the next entry starts it again. When max_pending entries are waiting the
+    caller writes the backlog itself, and if the database is failing the
+    oldest entries beyond max_pending are dropped (counted in ``dropped``).
+    """
+
+    def __init__(self, db_adapter, flush_ms: int = ACTIVITY_LOG_FLUSH_MS,
+                 batch_size: int = ACTIVITY_LOG_BATCH_SIZE, max_pending: int = ACTIVITY_LOG_MAX_PENDING):
+        self.db = db_adapter
+        self.interval = flush_ms / 1000.0
+        self.batch_size = max(1, batch_size)
+        self.max_pending = max(self.batch_size, max_pending)
+        self.dropped = 0
+        self._pending = deque()
+        self._lock = threading.Lock()          # guards _pending and _thread
+        self._flush_lock = threading.Lock()    # one writer at a time keeps entries in order
+        self._wake = threading.Event()
+        self._thread = None
+        _writers.add(self)
+
+    def add(self, entry: tuple):
+        with self._lock:
+            self._pending.append(entry)
+            pending = len(self._pending)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="bizhub-activity-log", daemon=True)
+                self._thread.start()
+        if pending >= self.max_pending:
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wake.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Write everything buffered so far. Returns rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+            if not batch:
+                return 0
+            if self.db.log_activities(batch) >= 0:
+                return len(batch)
+            with self._lock:
+                # Keep them for the next flush, newest first if we must shed some.
+                self._pending.extendleft(reversed(batch))
+                overflow = len(self._pending) - self.max_pending
+                for _ in range(max(overflow, 0)):
+                    self._pending.popleft()
+                self.dropped += max(overflow, 0)
+            if overflow > 0:
+                logger.error("Activity log backlog full; dropped %s entries", overflow)
+            return 0
+
+    def _run(self):
+        idle = 0
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                idle = 0 if self.flush() else idle + 1
+            except Exception as e:
+                logger.error("Error flushing activity log: %s", e)
+            with self._lock:
+                if idle >= IDLE_FLUSHES_BEFORE_EXIT and not self._pending:
+                    self._thread = None
+                    return
+
+
+_writers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_writers():
+    for writer in list(_writers):
+        writer.flush()
 
 
 class ActivityService:
     """Handle activity logging."""
-    
-    def __init__(self, db_adapter):
+
+    DURABILITY_MODES = ('buffered', 'sync')
+
+    def __init__(self, db_adapter, durability: str = ACTIVITY_LOG_DURABILITY):
+        if durability not in self.DURABILITY_MODES:
+            raise ValueError(f"Unknown activity log durability: {durability}")
         self.db = db_adapter
-    
+        self.durability = durability
+        self.writer = ActivityLogWriter(db_adapter) if durability == 'buffered' else None
+
     def log(self, username: str, action: str, details: str = ""):
         """Log user activity."""
-        self.db.log_activity(username, action, details)
-    
-    def get_activity_log(self, username: str = None) -> list:
-        """Get activity log."""
-        return self.db.get_activity_log(username)
+        if self.writer is None:
+            self.db.log_activity(username, action, details)
+        else:
+            self.writer.add((time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()), username, action, details))
+
+    def flush(self):
+        """Write any buffered entries now (e.g. before shutdown)."""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def get_activity_log(self, username: str = None, start_date: str = None,
+                         end_date: str = None, limit: int = None) -> list:
+        """Get activity log, newest first. Archived years are read only if the range reaches them."""
+        self.flush()
+        return self.db.get_activity_log(username, start_date=start_date, end_date=end_date, limit=limit)
 
 
 class CompanyService:
@@ -27,6 +144,7 @@ class CompanyService:
         """Save company information."""
         return self.db.save_company_info(company_name, address, phone, email, tax_id, bank_details)
     
+    @cached('company_info')
     def get_info(self) -> dict:
         """Get company information."""
         return self.db.get_company_info()
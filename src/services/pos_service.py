@@ -14,6 +14,41 @@ class POSService:
         total_amount = quantity * sale_price
         return self.db.record_sale(item_name, quantity, sale_price, total_amount, username)
     
+    def record_checkout(self, cart: list, username: str) -> bool:
+        """Record a whole cart atomically.
+
+        Each cart line is a dict with item_name, quantity and sale_price (or
+        price, as used by the desktop cart). Raises InsufficientStockError if
+        any line is short on stock; nothing is recorded in that case.
+        """
+        return self.db.record_checkout(self.checkout_lines(cart), username)
+
+    async def record_checkout_async(self, adb, cart: list, username: str) -> bool:
+        """record_checkout() through an AsyncDatabaseAdapter on the same database."""
+        return await adb.record_checkout(self.checkout_lines(cart), username)
+
+    @staticmethod
+    def checkout_lines(cart: list) -> list:
+        """Validate a cart and return the lines record_checkout() stores.
+
+        Raises ValueError for an empty cart or an invalid line.
+        """
+        if not cart:
+            raise ValueError("Cart is empty")
+        lines = []
+        for item in cart:
+            quantity = int(item['quantity'])
+            sale_price = float(item.get('sale_price', item.get('price', 0)))
+            if quantity <= 0 or sale_price < 0:
+                raise ValueError(f"Invalid cart line for '{item['item_name']}'")
+            lines.append({
+                'item_name': item['item_name'],
+                'quantity': quantity,
+                'sale_price': sale_price,
+                'total_amount': quantity * sale_price,
+            })
+        return lines
+
     def get_today_sales(self) -> list:
         """Get all sales for today."""
         today = datetime.now().strftime("%Y-%m-%d")
@@ -27,6 +62,17 @@ class POSService:
     def get_all_sales(self) -> list:
         """Get all sales history."""
         return self.db.get_all_sales()
+
+    def get_sales_page(self, limit: int = 100, after=None, **filters) -> tuple:
+        """Get one page of sales history, newest first. Returns (rows, next_after).
+
+        filters: start_date, end_date, username, item_name, search.
+        """
+        return self.db.get_sales_page(limit=limit, after=after, **filters)
+
+    async def get_sales_page_async(self, adb, limit: int = 100, after=None, **filters) -> tuple:
+        """get_sales_page() through an AsyncDatabaseAdapter on the same database."""
+        return await adb.get_sales_page(limit=limit, after=after, **filters)
     
     @staticmethod
     def calculate_total(items: list) -> float:
@@ -18,6 +18,10 @@ class VisitorService:
         """Get all visitors."""
         return self.db.get_all_visitors()
     
+    def get_visitors_page(self, limit: int = 100, after=None, search: str = None) -> tuple:
+        """Get one page of visitors ordered by name. Returns (rows, next_after)."""
+        return self.db.get_visitors_page(limit=limit, after=after, search=search)
+
     def update_visitor(self, visitor_id: int, **kwargs) -> bool:
         """Update visitor details."""
         return self.db.update_visitor(visitor_id, **kwargs)
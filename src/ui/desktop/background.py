@@ -0,0 +1,112 @@
+"""Run desktop data loads off the Tk main loop.
+
+Tk widgets may only be touched from the main thread, so workers never call
+back directly: each finished load is queued, and the main loop drains the
+queue via ``root.after`` while any load is pending. Loads are keyed (one key
+per tab); submitting a new load for a key supersedes the previous one, whose
+result is dropped even if it is already running.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_MS = 30
+
+
+class BackgroundTasks:
+    """Keyed background loader that delivers results on the Tk main thread."""
+
+    def __init__(self, root, max_workers: int = 2):
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bizhub-load")
+        self._done = queue.Queue()
+        self._latest = {}      # key -> (generation, future) of the load whose result is wanted
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._polling = False
+
+    def submit(self, key, load, on_done, on_error=None):
+        """Run load() in a worker; call on_done(result) or on_error(exc) on the main thread.
+
+        Supersedes any earlier load still pending for the same key.
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous[1].cancel()   # only succeeds if it has not started yet
+            future = self._executor.submit(self._run, key, generation, load, on_done, on_error)
+            self._latest[key] = (generation, future)
+        self._schedule_poll()
+
+    def cancel(self, key):
+        """Drop the pending load for key, if any; its callbacks will not run."""
+        with self._lock:
+            previous = self._latest.pop(key, None)
+        if previous is not None:
+            previous[1].cancel()
+
+    def cancel_all(self):
+        """Drop every pending load, e.g. before the widgets they update are destroyed."""
+        with self._lock:
+            pending, self._latest = self._latest, {}
+        for _, future in pending.values():
+            future.cancel()
+
+    def is_pending(self, key) -> bool:
+        with self._lock:
+            return key in self._latest
+
+    def _run(self, key, generation, load, on_done, on_error):
+        try:
+            outcome = (on_done, load())
+        except Exception as e:
+            logger.exception("Background load %r failed", key)
+            outcome = (on_error, e)
+        self._done.put((key, generation) + outcome)
+
+    def poll(self):
+        """Deliver finished, still-current loads. Runs on the main thread."""
+        while True:
+            try:
+                key, generation, callback, value = self._done.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                current = self._latest.get(key)
+                if current is None or current[0] != generation:
+                    continue   # superseded or cancelled
+                del self._latest[key]
+            if callback is not None:
+                try:
+                    callback(value)
+                except Exception:
+                    logger.exception("Applying background load %r failed", key)
+
+    def _schedule_poll(self):
+        with self._lock:
+            if self._polling:
+                return
+            self._polling = True
+        try:
+            self.root.after(POLL_INTERVAL_MS, self._poll_tick)
+        except Exception:
+            # Root already destroyed; nothing left to deliver to.
+            self._polling = False
+
+    def _poll_tick(self):
+        self.poll()
+        with self._lock:
+            self._polling = False
+            pending = bool(self._latest)
+        if pending:
+            self._schedule_poll()
+
+    def shutdown(self):
+        """Stop accepting loads and drop everything queued."""
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
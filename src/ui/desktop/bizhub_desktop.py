@@ -21,9 +21,10 @@ if project_root not in sys.path:
 from src.db import SQLiteAdapter
 from src.services import (
     AuthService, InventoryService, POSService, HRService,
-    VisitorService, EmailService, ActivityService, CompanyService, AnalyticsService,
-    PayrollService, AppraisalService, CRMService,
+    VisitorService, EmailService, EmailOutbox, ActivityService, CompanyService, AnalyticsService,
+    PayrollService, AppraisalService, CRMService, ExportService, BackupService,
 )
+from src.ui.desktop.background import BackgroundTasks
 from src.ui.desktop.tabs import DashboardTab, CRMTab, HRTab, SettingsTab
 
 logger = logging.getLogger(__name__)
@@ -49,13 +50,22 @@ class BizHubDesktopApp:
         self.payroll_service     = PayrollService(self.db)
         self.appraisal_service   = AppraisalService(self.db)
         self.visitor_service     = VisitorService(self.db)
-        self.email_service       = EmailService(self.db)
+        self.email_outbox        = EmailOutbox(self.db)
+        self.email_service       = EmailService(self.db, outbox=self.email_outbox)
         self.activity_service    = ActivityService(self.db)
         self.company_service     = CompanyService(self.db)
         self.analytics_service   = AnalyticsService(self.db)
         self.crm_service         = CRMService(self.db)
+        self.export_service      = ExportService(self.db)
+        self.backup_service      = BackupService(self.db)
         logger.debug("All services initialized")
 
+        # Tab data loads run here, off the Tk main loop
+        self.tasks = BackgroundTasks(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        # Queued notification emails are sent from their own thread
+        self.email_outbox.start()
+
         # Session state
         self.current_user: str | None = None
         self.current_role: str | None = None
@@ -172,6 +182,8 @@ class BizHubDesktopApp:
     # ==========================================================================
 
     def clear_root(self):
+        if hasattr(self, "tasks"):
+            self.tasks.cancel_all()
         for widget in self.root.winfo_children():
             widget.destroy()
 
@@ -531,6 +543,14 @@ class BizHubDesktopApp:
     # Logout
     # ==========================================================================
 
+    def _on_close(self):
+        self.tasks.shutdown()
+        self.email_outbox.stop(timeout=1.0)
+        self.activity_service.flush()
+        self.root.destroy()
+        # Last: closing the pooled connections checkpoints and removes the WAL
+        self.db.close()
+
     def logout(self):
         self.activity_service.log(self.current_user, "Logout", "User logged out")
         self.current_user = None
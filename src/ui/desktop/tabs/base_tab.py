@@ -1,10 +1,17 @@
 """Base class for all BizHub tab modules."""
+import logging
+import math
 import os
 import subprocess
 import tempfile
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+logger = logging.getLogger(__name__)
+
+VIRTUAL_PAGE_SIZE = 200
+SEARCH_DEBOUNCE_MS = 150
+
 
 class BaseTab:
     """
@@ -14,7 +21,8 @@ class BaseTab:
     - Receives the parent notebook and the main BizHubDesktopApp instance
     - Creates its own frame, adds it to the notebook in _build()
     - Owns all its UI widgets as instance variables
-    - Exposes a refresh() method for on-demand data reload
+    - Exposes a refresh() method for on-demand data reload; slow refreshes
+      read data through load_async() so the window stays responsive
 
     Access pattern inside any tab:
         self.colors                 → current theme dict (auto-updates with dark mode)
@@ -51,6 +59,38 @@ class BaseTab:
         """Reload/refresh tab data. Override in subclasses as needed."""
         pass
 
+    def load_async(self, load, apply):
+        """Run load() on a worker thread, then apply(result) on the UI thread.
+
+        load must not touch widgets or Tk variables; read those first and pass
+        them in. A newer load_async() from the same tab supersedes this one.
+        """
+        self._set_loading(True)
+
+        def done(result):
+            self._set_loading(False)
+            apply(result)
+
+        def failed(exc):
+            self._set_loading(False)
+            messagebox.showerror("Load Error", f"Could not load data: {exc}")
+
+        self.app.tasks.submit(self, load, done, failed)
+
+    def _set_loading(self, loading: bool):
+        """Show or hide the tab's "Loading…" badge."""
+        badge = getattr(self, "_loading_badge", None)
+        if loading:
+            if badge is None:
+                badge = self._loading_badge = tk.Label(
+                    self.frame, text="Loading…", bg=self.colors["card"],
+                    fg=self.colors["muted"], font=("Arial", 9, "italic"), padx=8, pady=2,
+                )
+            badge.place(relx=1.0, rely=0.0, x=-16, y=8, anchor="ne")
+            badge.lift()
+        elif badge is not None:
+            badge.place_forget()
+
     # ------------------------------------------------------------------
     # Shared print utilities (used by POS, HR, etc.)
     # ------------------------------------------------------------------
@@ -134,3 +174,216 @@ class BaseTab:
                     lambda e: canvas.itemconfig(window_id, width=e.width))
 
         return canvas, scroll, inner, window_id
+
+    def _bind_debounced_search(self, entry, search, delay_ms: int = SEARCH_DEBOUNCE_MS):
+        """Run search() once typing in entry pauses for delay_ms; Return runs it at once."""
+        pending = [None]
+
+        def run(_event=None):
+            if pending[0] is not None:
+                entry.after_cancel(pending[0])
+                pending[0] = None
+            search()
+
+        def schedule(_event=None):
+            if pending[0] is not None:
+                entry.after_cancel(pending[0])
+            pending[0] = entry.after(delay_ms, run)
+
+        entry.bind("<KeyRelease>", schedule, add="+")
+        entry.bind("<Return>", run, add="+")
+
+    def _sync_tree(self, tree: ttk.Treeview, rows):
+        """Show rows, a list of (iid, values), in tree without rebuilding it.
+
+        Items are inserted once and kept: rows that drop out of a search are
+        only detached, values are rewritten only when they change, and order
+        is set with a single set_children() call.
+        """
+        shown = getattr(tree, "shown_values", None)
+        if shown is None:
+            shown = tree.shown_values = {}
+        order = []
+        for iid, values in rows:
+            values = tuple(values)
+            old = shown.get(iid)
+            if old is None:
+                tree.insert("", "end", iid=iid, values=values)
+            elif old != values:
+                tree.item(iid, values=values)
+            shown[iid] = values
+            order.append(iid)
+        tree.set_children("", *order)
+
+    def _make_virtual_list(self, parent, make_cell, fill_cell, row_height: int,
+                           columns: int = 1, empty_text: str = "Nothing to show") -> "VirtualList":
+        """Create a VirtualList themed for this tab that pages in on the app's worker threads."""
+        return VirtualList(parent, make_cell, fill_cell, row_height, columns=columns,
+                           bg=self.colors["bg"], fg=self.colors["muted"], empty_text=empty_text,
+                           tasks=self.app.tasks, on_loading=self._set_loading)
+
+
+class VirtualList:
+    """Scrollable list or card grid that only builds widgets for the rows in view.
+
+    make_cell(parent) builds one empty cell widget; fill_cell(cell, item) shows
+    an item in it. Roughly a screenful of cells exists at any time, each bound
+    to a fixed slot and re-filled as rows scroll into it. Rows have a fixed
+    height so positions are computed rather than measured.
+
+    Items come from fetch_page(after) -> (items, next_after), keyset style.
+    The first page is fetched by reset(); later pages as the view nears the
+    end of what is loaded. With tasks (a BackgroundTasks) pages are fetched
+    on a worker thread, so fetch_page must not touch widgets.
+    """
+
+    PREFETCH_ROWS = 10
+
+    def __init__(self, parent, make_cell, fill_cell, row_height: int, columns: int = 1,
+                 gap: int = 6, bg: str = None, fg: str = None, empty_text: str = "Nothing to show",
+                 tasks=None, on_loading=None):
+        self.make_cell = make_cell
+        self.fill_cell = fill_cell
+        self.row_height = row_height
+        self.columns = max(1, columns)
+        self.gap = gap
+        self.tasks = tasks
+        self.on_loading = on_loading or (lambda _loading: None)
+        self.items = []
+        self._fetch_page = None
+        self._next_after = None
+        self._exhausted = True
+        self._loading = False
+        self._cells = []            # [canvas window id, widget, item index shown or None]
+        self._scrollregion = None
+
+        self.canvas = tk.Canvas(parent, bg=bg, highlightthickness=0)
+        self.scroll = ttk.Scrollbar(parent, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+        self.scroll.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self._empty_id = self.canvas.create_text(12, 12, text=empty_text, anchor="nw",
+                                                 fill=fg, state="hidden")
+
+        self.canvas.bind("<Configure>", lambda _e: self._layout(refill=True))
+        self.canvas.bind("<Enter>", self._bind_wheel)
+        self.canvas.bind("<Leave>", self._unbind_wheel)
+
+    # -- data ----------------------------------------------------------
+
+    def reset(self, fetch_page):
+        """Drop loaded items, scroll to the top and page in from fetch_page."""
+        self.items = []
+        self._fetch_page = fetch_page
+        self._next_after = None
+        self._exhausted = False
+        self._loading = False
+        self.canvas.itemconfigure(self._empty_id, state="hidden")
+        self.canvas.yview_moveto(0)
+        self._layout(refill=True)
+        self._load_more()
+
+    def _load_more(self):
+        if self._loading or self._exhausted or self._fetch_page is None:
+            return
+        self._loading = True
+        self.on_loading(True)
+        fetch, after = self._fetch_page, self._next_after
+        if self.tasks is None:
+            try:
+                self._append(fetch(after))
+            except Exception as e:
+                self._failed(e)
+        else:
+            self.tasks.submit(self, lambda: fetch(after), self._append, self._failed)
+
+    def _append(self, page):
+        items, next_after = page
+        self._loading = False
+        self.on_loading(False)
+        self.items.extend(items)
+        self._next_after = next_after
+        self._exhausted = next_after is None
+        self.canvas.itemconfigure(self._empty_id, state="hidden" if self.items else "normal")
+        self._layout(refill=True)
+
+    def _failed(self, exc):
+        self._loading = False
+        self._exhausted = True
+        self.on_loading(False)
+        logger.error("Error loading list page: %s", exc)
+        messagebox.showerror("Load Error", f"Could not load data: {exc}")
+
+    # -- layout --------------------------------------------------------
+
+    def _on_yscroll(self, first, last):
+        self.scroll.set(first, last)
+        self._layout()
+
+    def _layout(self, refill: bool = False):
+        """Position cells over the visible rows; fill those whose item changed."""
+        canvas = self.canvas
+        width, height = max(1, canvas.winfo_width()), max(1, canvas.winfo_height())
+        pitch = self.row_height + self.gap
+        total_rows = math.ceil(len(self.items) / self.columns)
+        region = (0, 0, width, max(total_rows * pitch - self.gap, 1))
+        if region != self._scrollregion:
+            self._scrollregion = region
+            canvas.configure(scrollregion=region)
+
+        first_row = max(0, int(canvas.canvasy(0) // pitch))
+        visible_rows = height // pitch + 2
+        needed = visible_rows * self.columns
+        if len(self._cells) < needed:
+            while len(self._cells) < needed:
+                widget = self.make_cell(canvas)
+                window = canvas.create_window(0, 0, window=widget, anchor="nw", state="hidden")
+                self._cells.append([window, widget, None])
+            refill = True   # slot assignment is index % pool size, which just changed
+
+        cell_width = max(1, (width - self.gap * (self.columns - 1)) // self.columns)
+        first = first_row * self.columns
+        shown = range(first, min(first + needed, len(self.items)))
+        pool = len(self._cells)
+        used = set()
+        for index in shown:
+            slot = index % pool
+            used.add(slot)
+            window, widget, current = self._cells[slot]
+            row, col = divmod(index, self.columns)
+            canvas.coords(window, col * (cell_width + self.gap), row * pitch)
+            canvas.itemconfigure(window, width=cell_width, height=self.row_height, state="normal")
+            if refill or current != index:
+                self.fill_cell(widget, self.items[index])
+                self._cells[slot][2] = index
+        for slot, cell in enumerate(self._cells):
+            if slot not in used and cell[2] is not None:
+                canvas.itemconfigure(cell[0], state="hidden")
+                cell[2] = None
+
+        if total_rows - (first_row + visible_rows) <= self.PREFETCH_ROWS:
+            self._load_more()
+
+    # -- mouse wheel ---------------------------------------------------
+
+    def _bind_wheel(self, _event=None):
+        self.canvas.bind_all("<MouseWheel>", self._on_wheel)
+        self.canvas.bind_all("<Button-4>", self._on_wheel)
+        self.canvas.bind_all("<Button-5>", self._on_wheel)
+
+    def _unbind_wheel(self, _event=None):
+        # <Leave> also fires when the pointer moves onto a cell inside the canvas
+        under = self.canvas.winfo_containing(*self.canvas.winfo_pointerxy())
+        if under is not None and str(under).startswith(str(self.canvas)):
+            return
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.unbind_all(sequence)
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4:
+            step = -1
+        elif getattr(event, "num", None) == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(step * 3, "units")
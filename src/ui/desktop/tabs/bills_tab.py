@@ -4,7 +4,7 @@ from tkinter import ttk
 from datetime import datetime, timedelta
 
 from src.core import CurrencyFormatter
-from .base_tab import BaseTab
+from .base_tab import BaseTab, VIRTUAL_PAGE_SIZE
 
 
 class BillsTab(BaseTab):
@@ -63,12 +63,13 @@ class BillsTab(BaseTab):
         ttk.Button(filter_row, text="Reset", style="Info.TButton",
                    command=self._reset_filter).pack(side="left")
 
-        # Scrollable timeline
-        canvas_frame = tk.Frame(container, bg=self.colors["bg"])
-        canvas_frame.pack(fill="both", expand=True)
-
-        self._canvas, self._scroll, self._timeline_frame, self._canvas_window = \
-            self._make_scrollable_canvas(canvas_frame)
+        # Virtualised timeline: day headers and sales as one flat list of rows
+        timeline_frame = tk.Frame(container, bg=self.colors["bg"])
+        timeline_frame.pack(fill="both", expand=True)
+        self._list = self._make_virtual_list(
+            timeline_frame, self._make_row, self._fill_row,
+            row_height=64, empty_text="No sales found for the selected period",
+        )
 
         self.refresh()
 
@@ -93,81 +94,87 @@ class BillsTab(BaseTab):
     # ------------------------------------------------------------------
 
     def refresh(self):
-        if not hasattr(self, "_timeline_frame"):
+        if not hasattr(self, "_list"):
             return
-        for w in self._timeline_frame.winfo_children():
-            w.destroy()
-
-        sales = self.app.pos_service.get_all_sales()
-
-        # Period filter
         cutoff = self._date_cutoff()
-        if cutoff:
-            sales = [r for r in sales if str(r[1])[:10] >= cutoff]
-
-        # Search filter
-        query = (self._search_var.get() or "").strip().lower()
-        if query:
-            sales = [r for r in sales if query in str(r[2]).lower()
-                     or query in str(r[6] or "").lower()]
-
-        if not sales:
-            empty = tk.Frame(self._timeline_frame, bg=self.colors["card"], padx=12, pady=12)
-            empty.pack(fill="x", pady=6)
-            tk.Label(empty, text="No sales found for the selected period",
-                     bg=self.colors["card"], fg=self.colors["muted"]).pack(anchor="w")
+        query = (self._search_var.get() or "").strip() or None
+        self._list.reset(self._timeline_pager(cutoff, query))
+
+    def _timeline_pager(self, cutoff, query):
+        """fetch_page for the timeline: sales pages, newest first, with a header row per day.
+
+        A day's header total grows as later pages bring in the rest of that day.
+        """
+        current = {"header": None}
+
+        def fetch(after):
+            rows, next_after = self.app.pos_service.get_sales_page(
+                limit=VIRTUAL_PAGE_SIZE, after=after, start_date=cutoff, search=query)
+            items = []
+            for row in rows:
+                day = str(row[1])[:10]
+                header = current["header"]
+                if header is None or header["day"] != day:
+                    header = current["header"] = {"day": day, "total": 0.0}
+                    items.append(("day", header))
+                header["total"] += row[5] or 0
+                items.append(("sale", row))
+            return items, next_after
+
+        return fetch
+
+    def _make_row(self, parent) -> tk.Frame:
+        """Build an empty timeline row; _fill_row shows a day header or a sale in it."""
+        bg = self.colors["card"]
+        row = tk.Frame(parent, bg=bg, padx=12, pady=6)
+
+        # Day header
+        day_hdr = tk.Frame(row, bg=bg)
+        day = tk.Label(day_hdr, bg=bg, fg=self.colors["text"], font=("Arial", 10, "bold"))
+        day.pack(side="left")
+        day_total = tk.Label(day_hdr, bg=bg, fg=self.colors["muted"], font=("Arial", 9))
+        day_total.pack(side="right")
+
+        # Sale entry
+        entry = tk.Frame(row, bg=bg)
+        left = tk.Frame(entry, bg=bg)
+        left.pack(side="left", fill="x", expand=True)
+        item = tk.Label(left, bg=bg, fg=self.colors["text"], font=("Arial", 9, "bold"))
+        item.pack(anchor="w")
+        detail = tk.Label(left, bg=bg, fg=self.colors["muted"], font=("Arial", 9))
+        detail.pack(anchor="w")
+
+        right_col = tk.Frame(entry, bg=bg)
+        right_col.pack(side="right")
+        print_btn = ttk.Button(right_col, text="Print", style="Info.TButton")
+        print_btn.pack(side="right", padx=(8, 0))
+        amount = tk.Label(right_col, bg=bg, fg=self.colors["text"], font=("Arial", 9, "bold"))
+        amount.pack(anchor="e")
+        time_lbl = tk.Label(right_col, bg=bg, fg=self.colors["muted"], font=("Arial", 8))
+        time_lbl.pack(anchor="e")
+
+        row.parts = dict(day_hdr=day_hdr, day=day, day_total=day_total, entry=entry, item=item,
+                         detail=detail, amount=amount, time=time_lbl, print=print_btn)
+        return row
+
+    def _fill_row(self, row: tk.Frame, timeline_item):
+        parts = row.parts
+        kind, value = timeline_item
+        if kind == "day":
+            parts["entry"].pack_forget()
+            parts["day_hdr"].pack(fill="x", expand=True)
+            parts["day"].config(text=value["day"])
+            parts["day_total"].config(
+                text=f"Day total: {CurrencyFormatter.format_currency(value['total'])}")
             return
-
-        # Group by date
-        grouped: dict = {}
-        for row in sales:
-            day = str(row[1])[:10]
-            grouped.setdefault(day, []).append(row)
-
-        for day in sorted(grouped.keys(), reverse=True):
-            day_rows  = grouped[day]
-            day_total = sum(r[5] for r in day_rows)
-
-            day_card = tk.Frame(self._timeline_frame, bg=self.colors["card"],
-                                padx=12, pady=10)
-            day_card.pack(fill="x", pady=6)
-
-            # Day header
-            day_hdr = tk.Frame(day_card, bg=self.colors["card"])
-            day_hdr.pack(fill="x")
-            tk.Label(day_hdr, text=day, bg=self.colors["card"],
-                     fg=self.colors["text"], font=("Arial", 10, "bold")).pack(side="left")
-            tk.Label(day_hdr,
-                     text=f"Day total: {CurrencyFormatter.format_currency(day_total)}",
-                     bg=self.colors["card"], fg=self.colors["muted"],
-                     font=("Arial", 9)).pack(side="right")
-
-            for row in day_rows:
-                _, sale_date, item_name, qty, sale_price, total_amount, username = row
-                entry = tk.Frame(day_card, bg=self.colors["card"])
-                entry.pack(fill="x", pady=4)
-
-                left = tk.Frame(entry, bg=self.colors["card"])
-                left.pack(side="left", fill="x", expand=True)
-                tk.Label(left, text=item_name, bg=self.colors["card"],
-                         fg=self.colors["text"], font=("Arial", 9, "bold")).pack(anchor="w")
-                tk.Label(left, text=f"Qty: {qty}  •  By: {username}",
-                         bg=self.colors["card"], fg=self.colors["muted"],
-                         font=("Arial", 9)).pack(anchor="w")
-
-                right_col = tk.Frame(entry, bg=self.colors["card"])
-                right_col.pack(side="right")
-                tk.Label(right_col,
-                         text=CurrencyFormatter.format_currency(total_amount),
-                         bg=self.colors["card"], fg=self.colors["text"],
-                         font=("Arial", 9, "bold")).pack(anchor="e")
-                tk.Label(right_col, text=str(sale_date)[11:16],
-                         bg=self.colors["card"], fg=self.colors["muted"],
-                         font=("Arial", 8)).pack(anchor="e")
-                ttk.Button(
-                    right_col, text="Print", style="Info.TButton",
-                    command=lambda r=row: self._print_sale(r),
-                ).pack(anchor="e", pady=(4, 0))
+        parts["day_hdr"].pack_forget()
+        parts["entry"].pack(fill="x", expand=True)
+        _, sale_date, item_name, qty, sale_price, total_amount, username = value
+        parts["item"].config(text=item_name)
+        parts["detail"].config(text=f"Qty: {qty}  •  By: {username}")
+        parts["amount"].config(text=CurrencyFormatter.format_currency(total_amount))
+        parts["time"].config(text=str(sale_date)[11:16])
+        parts["print"].config(command=lambda: self._print_sale(value))
 
     # ------------------------------------------------------------------
     # Print — delegates to POSTab
@@ -129,12 +129,13 @@ class DashboardTab(BaseTab):
 
         self._reorder_tree = ttk.Treeview(
             reorder_card,
-            columns=("Item", "Current", "AvgDaily", "Recommend"),
+            columns=("Item", "Current", "Forecast", "ReorderPoint", "Recommend"),
             show="headings", height=6,
         )
         for col, text, width in [
             ("Item", "Item", 160), ("Current", "Current Qty", 90),
-            ("AvgDaily", "Avg Daily", 90), ("Recommend", "Recommend", 90),
+            ("Forecast", "Forecast/Day", 90), ("ReorderPoint", "Reorder Point", 90),
+            ("Recommend", "Recommend", 90),
         ]:
             self._reorder_tree.heading(col, text=text)
             self._reorder_tree.column(col, anchor="center", width=width)
@@ -181,29 +182,39 @@ class DashboardTab(BaseTab):
 
     def refresh(self):
         period_key = self._period_map.get(self._period_var.get(), "7")
-        start_date, end_date, days = self.app.analytics_service.get_date_range(period_key)
+        self.load_async(lambda: self._load(period_key), self._render)
 
-        trend = self.app.analytics_service.get_sales_trend(start_date, end_date)
-        summary = self.app.analytics_service.get_sales_summary(start_date, end_date)
-        reorder = self.app.analytics_service.get_reorder_recommendations(
-            start_date, end_date, window_days=7
-        )
+    def _load(self, period_key: str) -> dict:
+        """Query everything the dashboard shows. Runs on a worker thread."""
+        analytics = self.app.analytics_service
+        start_date, end_date, days = analytics.get_date_range(period_key)
+        prev_end = datetime.strptime(start_date, "%Y-%m-%d") - timedelta(days=1)
+        prev_start = prev_end - timedelta(days=max(1, days) - 1)
+        return {
+            "days": days,
+            "trend": analytics.get_sales_trend(start_date, end_date),
+            "summary": analytics.get_sales_summary(start_date, end_date),
+            "reorder": analytics.get_reorder_recommendations(start_date, end_date, window_days=7),
+            "prev_trend": analytics.get_sales_trend(
+                prev_start.strftime("%Y-%m-%d"), prev_end.strftime("%Y-%m-%d")
+            ),
+            "inv_value": self.app.inventory_service.get_inventory_value(),
+            "low_stock": self.app.inventory_service.get_low_stock_items(),
+            "visitors": self.app.visitor_service.get_total_visitors_count(),
+        }
+
+    def _render(self, data: dict):
+        trend, summary, reorder = data["trend"], data["summary"], data["reorder"]
+        days, inv_value = data["days"], data["inv_value"]
+        low_stock, visitors, prev_trend = data["low_stock"], data["visitors"], data["prev_trend"]
 
         self._sales_trend_data = trend
         self._sales_summary_data = summary
 
         sales_total = sum(r[1] for r in trend) if trend else 0.0
         avg_daily = (sales_total / days) if days else 0.0
-        inv_value = self.app.inventory_service.get_inventory_value()
-        low_stock = self.app.inventory_service.get_low_stock_items()
-        visitors = self.app.visitor_service.get_total_visitors_count()
 
         # Growth vs previous period
-        prev_end = datetime.strptime(start_date, "%Y-%m-%d") - timedelta(days=1)
-        prev_start = prev_end - timedelta(days=max(1, days) - 1)
-        prev_trend = self.app.analytics_service.get_sales_trend(
-            prev_start.strftime("%Y-%m-%d"), prev_end.strftime("%Y-%m-%d")
-        )
         prev_total = sum(r[1] for r in prev_trend) if prev_trend else 0.0
         if prev_total > 0:
             growth_text = f"{((sales_total - prev_total) / prev_total) * 100:+.1f}%"
@@ -230,10 +241,11 @@ class DashboardTab(BaseTab):
         # Reorder table
         for row in self._reorder_tree.get_children():
             self._reorder_tree.delete(row)
-        for item_name, current_qty, avg_d, recommended in reorder:
+        for rec in reorder:
             self._reorder_tree.insert(
                 "", "end",
-                values=(item_name, current_qty, f"{avg_d:.2f}", recommended),
+                values=(rec["item_name"], rec["current_qty"], f"{rec['forecast_daily']:.2f}",
+                        f"{rec['reorder_point']:.0f}", rec["recommended_qty"]),
             )
 
         # Low stock table
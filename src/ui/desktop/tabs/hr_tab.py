@@ -3,7 +3,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from src.core import CurrencyFormatter, HRCalculator
-from .base_tab import BaseTab
+from .base_tab import BaseTab, VIRTUAL_PAGE_SIZE
 
 
 class HRTab(BaseTab):
@@ -80,11 +80,12 @@ class HRTab(BaseTab):
         ttk.Button(actions, text="Reset", style="Info.TButton",
                    command=self._reset_search).pack(side="left")
 
-        canvas_frame = tk.Frame(container, bg=self.colors["bg"])
-        canvas_frame.pack(fill="both", expand=True)
-
-        self._hr_canvas, self._hr_scroll, self._hr_cards_frame, self._hr_window = \
-            self._make_scrollable_canvas(canvas_frame)
+        cards_frame = tk.Frame(container, bg=self.colors["bg"])
+        cards_frame.pack(fill="both", expand=True)
+        self._hr_list = self._make_virtual_list(
+            cards_frame, self._make_employee_card, self._fill_employee_card,
+            row_height=230, columns=2, empty_text="No employees found",
+        )
 
         self.refresh()
 
@@ -93,90 +94,78 @@ class HRTab(BaseTab):
         self.refresh()
 
     def refresh(self):
-        if not hasattr(self, "_hr_cards_frame"):
-            return
-        for w in self._hr_cards_frame.winfo_children():
-            w.destroy()
-
-        query = (self._hr_search_var.get() or "").strip().lower()
-        employees = self.app.hr_service.get_all_employees()
-
-        filtered = [
-            r for r in employees
-            if not query or any(
-                query in str(v).lower()
-                for v in [r[1] or "", r[2] or "", r[4] or "", r[6] or "", r[7] or ""]
-            )
-        ]
-
-        if not filtered:
-            empty = tk.Frame(self._hr_cards_frame, bg=self.colors["card"], padx=12, pady=12)
-            empty.pack(fill="x", pady=6)
-            tk.Label(empty, text="No employees found",
-                     bg=self.colors["card"], fg=self.colors["muted"]).pack(anchor="w")
+        if not hasattr(self, "_hr_list"):
             return
+        query = (self._hr_search_var.get() or "").strip() or None
+        self._hr_list.reset(lambda after: self.app.hr_service.get_employees_page(
+            limit=VIRTUAL_PAGE_SIZE, after=after, search=query))
 
-        for idx, row in enumerate(filtered):
-            card = self._employee_card(self._hr_cards_frame, row)
-            card.grid(row=idx // 2, column=idx % 2, padx=6, pady=6, sticky="nsew")
-
-        self._hr_cards_frame.grid_columnconfigure(0, weight=1)
-        self._hr_cards_frame.grid_columnconfigure(1, weight=1)
+    def _make_employee_card(self, parent) -> tk.Frame:
+        """Build an empty employee card; _fill_employee_card shows a record in it."""
+        bg = self.colors["card"]
+        card = tk.Frame(parent, bg=bg, padx=12, pady=12)
 
-    def _employee_card(self, parent, row) -> tk.Frame:
-        emp_id       = row[0]
-        emp_number   = row[1] or "—"
-        name         = row[2] or "—"
-        joining_date = row[3] or "—"
-        designation  = row[4] or "—"
-        manager      = row[5] or "—"
-        team         = row[6] or "—"
-        email        = row[7] or "—"
-        phone        = row[8] or "—"
-        is_active    = row[12] if len(row) > 12 else 1
+        title = tk.Frame(card, bg=bg)
+        title.pack(fill="x")
+        name = tk.Label(title, bg=bg, fg=self.colors["text"], font=("Arial", 11, "bold"))
+        name.pack(side="left")
+        status = tk.Label(title, bg=bg, font=("Arial", 9, "bold"))
+        status.pack(side="right")
+        number = tk.Label(title, bg=bg, fg=self.colors["muted"], font=("Arial", 9))
+        number.pack(side="right", padx=(0, 8))
 
-        card = tk.Frame(parent, bg=self.colors["card"], padx=12, pady=12)
+        designation = tk.Label(card, bg=bg, fg=self.colors["muted"], font=("Arial", 9))
+        designation.pack(anchor="w", pady=(4, 0))
 
-        title = tk.Frame(card, bg=self.colors["card"])
-        title.pack(fill="x")
-        tk.Label(title, text=name, bg=self.colors["card"], fg=self.colors["text"],
-                 font=("Arial", 11, "bold")).pack(side="left")
-        status_color = self.colors["accent"] if is_active else self.colors["muted"]
-        tk.Label(title, text="Active" if is_active else "Inactive",
-                 bg=self.colors["card"], fg=status_color,
-                 font=("Arial", 9, "bold")).pack(side="right")
-        tk.Label(title, text=emp_number, bg=self.colors["card"], fg=self.colors["muted"],
-                 font=("Arial", 9)).pack(side="right", padx=(0, 8))
-
-        tk.Label(card, text=designation, bg=self.colors["card"], fg=self.colors["muted"],
-                 font=("Arial", 9)).pack(anchor="w", pady=(4, 0))
-
-        info = tk.Frame(card, bg=self.colors["card"])
+        info = tk.Frame(card, bg=bg)
         info.pack(fill="x", pady=(8, 0))
-        for line in [f"Team: {team}", f"Manager: {manager}", f"Joined: {joining_date}"]:
-            tk.Label(info, text=line, bg=self.colors["card"], fg=self.colors["text"],
-                     font=("Arial", 9)).pack(anchor="w")
+        info_lines = []
+        for _ in range(3):   # team, manager, joined
+            lbl = tk.Label(info, bg=bg, fg=self.colors["text"], font=("Arial", 9))
+            lbl.pack(anchor="w")
+            info_lines.append(lbl)
 
-        contact = tk.Frame(card, bg=self.colors["card"])
+        contact = tk.Frame(card, bg=bg)
         contact.pack(fill="x", pady=(8, 0))
-        tk.Label(contact, text=f"Email: {email}", bg=self.colors["card"],
-                 fg=self.colors["text"], font=("Arial", 9)).pack(anchor="w")
-        tk.Label(contact, text=f"Phone: {phone}", bg=self.colors["card"],
-                 fg=self.colors["text"], font=("Arial", 9)).pack(anchor="w")
+        email = tk.Label(contact, bg=bg, fg=self.colors["text"], font=("Arial", 9))
+        email.pack(anchor="w")
+        phone = tk.Label(contact, bg=bg, fg=self.colors["text"], font=("Arial", 9))
+        phone.pack(anchor="w")
 
-        btns = tk.Frame(card, bg=self.colors["card"])
+        btns = tk.Frame(card, bg=bg)
         btns.pack(fill="x", pady=(10, 0))
-        ttk.Button(btns, text="Print ID Card", style="Info.TButton",
-                   command=lambda r=row: self._print_id_card(r)).pack(side="left")
-        if is_active:
-            ttk.Button(btns, text="Deactivate", style="Danger.TButton",
-                       command=lambda e=emp_id: self._set_active(e, False)).pack(side="left", padx=6)
-        else:
-            ttk.Button(btns, text="Activate", style="Success.TButton",
-                       command=lambda e=emp_id: self._set_active(e, True)).pack(side="left", padx=6)
+        print_btn = ttk.Button(btns, text="Print ID Card", style="Info.TButton")
+        print_btn.pack(side="left")
+        toggle = ttk.Button(btns)
+        toggle.pack(side="left", padx=6)
 
+        card.parts = dict(name=name, status=status, number=number, designation=designation,
+                          info=info_lines, email=email, phone=phone, print=print_btn, toggle=toggle)
         return card
 
+    def _fill_employee_card(self, card: tk.Frame, row):
+        parts = card.parts
+        emp_id    = row[0]
+        is_active = row[12] if len(row) > 12 else 1
+
+        parts["name"].config(text=row[2] or "—")
+        parts["number"].config(text=row[1] or "—")
+        parts["status"].config(text="Active" if is_active else "Inactive",
+                               fg=self.colors["accent"] if is_active else self.colors["muted"])
+        parts["designation"].config(text=row[4] or "—")
+        for lbl, line in zip(parts["info"], [f"Team: {row[6] or '—'}", f"Manager: {row[5] or '—'}",
+                                             f"Joined: {row[3] or '—'}"]):
+            lbl.config(text=line)
+        parts["email"].config(text=f"Email: {row[7] or '—'}")
+        parts["phone"].config(text=f"Phone: {row[8] or '—'}")
+        parts["print"].config(command=lambda: self._print_id_card(row))
+        if is_active:
+            parts["toggle"].config(text="Deactivate", style="Danger.TButton",
+                                   command=lambda: self._set_active(emp_id, False))
+        else:
+            parts["toggle"].config(text="Activate", style="Success.TButton",
+                                   command=lambda: self._set_active(emp_id, True))
+
     def _set_active(self, emp_id: int, active: bool):
         try:
             if not active:
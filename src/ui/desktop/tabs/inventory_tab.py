@@ -6,6 +6,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
 from src.core import CurrencyFormatter
+from src.services.inventory_service import iter_xlsx_rows
 from .base_tab import BaseTab
 
 
@@ -103,6 +104,7 @@ class InventoryTab(BaseTab):
         self._search.pack(side="left", fill="x", expand=True)
         ttk.Button(search_row, text="🔎",     command=self._search_items,   style="Info.TButton").pack(side="left", padx=6)
         ttk.Button(search_row, text="Refresh", command=self.refresh,         style="Info.TButton").pack(side="left")
+        self._bind_debounced_search(self._search, self._search_items)
 
         # Inventory treeview
         cols = ("Item", "Qty", "Threshold", "Cost", "Sale", "Description")
@@ -121,18 +123,18 @@ class InventoryTab(BaseTab):
     # ------------------------------------------------------------------
 
     def refresh(self):
-        self._load_items(self.app.inventory_service.get_all_items())
+        self._search_items()
 
     def _load_items(self, items):
-        for row in self._tree.get_children():
-            self._tree.delete(row)
-        for item in items:
-            self._tree.insert("", "end", values=(
+        self._sync_tree(self._tree, [
+            (item[0], (
                 item[0], item[1], item[2],
                 CurrencyFormatter.format_currency(item[3]),
                 CurrencyFormatter.format_currency(item[4]),
                 item[5] or "",
             ))
+            for item in items
+        ])
 
     # ------------------------------------------------------------------
     # Form actions
@@ -213,10 +215,7 @@ class InventoryTab(BaseTab):
             entry.delete(0, tk.END)
 
     def _search_items(self):
-        query = self._search.get().strip()
-        items = (self.app.inventory_service.search(query) if query
-                 else self.app.inventory_service.get_all_items())
-        self._load_items(items)
+        self._load_items(self.app.inventory_service.quick_search(self._search.get()))
 
     def _on_select(self, event=None):
         sel = self._tree.selection()
@@ -224,7 +223,7 @@ class InventoryTab(BaseTab):
             return
         vals = self._tree.item(sel[0])["values"]
         self._name.delete(0, tk.END)
-        self._name.insert(0, vals[0])
+        self._name.insert(0, sel[0])
         self._qty.delete(0, tk.END)
         self._qty.insert(0, vals[1])
         self._threshold.delete(0, tk.END)
@@ -235,7 +234,7 @@ class InventoryTab(BaseTab):
         self._sale.insert(0, CurrencyFormatter.parse_currency(str(vals[4])))
         self._desc.delete(0, tk.END)
         self._desc.insert(0, vals[5])
-        details = self.app.inventory_service.get_item(vals[0])
+        details = self.app.inventory_service.get_item(sel[0])
         self._image.delete(0, tk.END)
         if details and details.get("image_path"):
             self._image.insert(0, details["image_path"])
@@ -266,8 +265,7 @@ class InventoryTab(BaseTab):
     # ------------------------------------------------------------------
 
     def _export_csv(self):
-        items = self.app.inventory_service.get_all_items()
-        if not items:
+        if not self.app.inventory_service.get_items_page(limit=1)[0]:
             messagebox.showwarning("Export", "No inventory data to export.")
             return
         path = filedialog.asksaveasfilename(
@@ -278,27 +276,21 @@ class InventoryTab(BaseTab):
         if not path:
             return
         try:
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Item Name", "Quantity", "Threshold",
-                                 "Cost Price", "Sale Price", "Description"])
-                for item in items:
-                    writer.writerow(item)
+            self.app.export_service.write_file("inventory", path)
             messagebox.showinfo("Export", f"Inventory exported to {path}")
         except Exception as e:
             messagebox.showerror("Export", f"Failed to export: {e}")
 
     def _export_excel(self):
         try:
-            import openpyxl
+            import openpyxl  # noqa: F401  (used by ExportService)
         except ImportError:
             messagebox.showerror(
                 "Missing Dependency",
                 "openpyxl is required for Excel export.\n\nInstall it with:\n  pip install openpyxl",
             )
             return
-        items = self.app.inventory_service.get_all_items()
-        if not items:
+        if not self.app.inventory_service.get_items_page(limit=1)[0]:
             messagebox.showwarning("Export", "No inventory data to export.")
             return
         path = filedialog.asksaveasfilename(
@@ -309,14 +301,7 @@ class InventoryTab(BaseTab):
         if not path:
             return
         try:
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Inventory"
-            ws.append(["Item Name", "Quantity", "Threshold",
-                        "Cost Price", "Sale Price", "Description"])
-            for item in items:
-                ws.append(list(item))
-            wb.save(path)
+            self.app.export_service.write_file("inventory", path)
             messagebox.showinfo("Export", f"Inventory exported to {path}")
         except Exception as e:
             messagebox.showerror("Export", f"Failed to export: {e}")
@@ -328,36 +313,17 @@ class InventoryTab(BaseTab):
         )
         if not path:
             return
-        imported = skipped = 0
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                for row in csv.DictReader(f):
-                    try:
-                        name = row.get("Item Name") or row.get("item_name")
-                        qty  = int(row.get("Quantity")   or row.get("quantity")   or 0)
-                        thr  = int(row.get("Threshold")  or row.get("threshold")  or 0)
-                        cost = float(row.get("Cost Price") or row.get("cost_price") or 0)
-                        sale = float(row.get("Sale Price") or row.get("sale_price") or 0)
-                        desc = row.get("Description") or row.get("description") or ""
-                        svc  = self.app.inventory_service
-                        if svc.update_item(name, quantity=qty, threshold=thr,
-                                           cost_price=cost, sale_price=sale,
-                                           description=desc):
-                            imported += 1
-                        elif svc.add_item(name, qty, thr, cost, sale, desc):
-                            imported += 1
-                        else:
-                            skipped += 1
-                    except Exception:
-                        skipped += 1
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                report = self.app.inventory_service.bulk_upsert(csv.DictReader(f))
             self.refresh()
-            messagebox.showinfo("Import", f"Imported: {imported}, Skipped: {skipped}")
+            self._show_import_report(report)
         except Exception as e:
             messagebox.showerror("Import", f"Failed to import: {e}")
 
     def _import_excel(self):
         try:
-            import openpyxl
+            import openpyxl  # noqa: F401  (used by iter_xlsx_rows)
         except ImportError:
             messagebox.showerror(
                 "Missing Dependency",
@@ -370,36 +336,18 @@ class InventoryTab(BaseTab):
         )
         if not path:
             return
-        imported = skipped = 0
         try:
-            wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
-            ws = wb.active
-            rows = list(ws.iter_rows(values_only=True))
-            # Skip header row if first cell looks like a label
-            start = 1 if rows and str(rows[0][0]).lower() in ("item name", "item_name", "name") else 0
-            svc = self.app.inventory_service
-            for row in rows[start:]:
-                try:
-                    name = str(row[0]).strip() if row[0] else ""
-                    qty  = int(row[1] or 0)
-                    thr  = int(row[2] or 0)
-                    cost = float(row[3] or 0)
-                    sale = float(row[4] or 0)
-                    desc = str(row[5] or "")
-                    if not name:
-                        skipped += 1
-                        continue
-                    if svc.update_item(name, quantity=qty, threshold=thr,
-                                       cost_price=cost, sale_price=sale, description=desc):
-                        imported += 1
-                    elif svc.add_item(name, qty, thr, cost, sale, desc):
-                        imported += 1
-                    else:
-                        skipped += 1
-                except Exception:
-                    skipped += 1
-            wb.close()
+            report = self.app.inventory_service.bulk_upsert(iter_xlsx_rows(path))
             self.refresh()
-            messagebox.showinfo("Import", f"Imported: {imported}, Skipped: {skipped}")
+            self._show_import_report(report)
         except Exception as e:
             messagebox.showerror("Import", f"Failed to import: {e}")
+
+    def _show_import_report(self, report: dict):
+        message = f"Imported: {report['imported']}, Skipped: {report['skipped']}"
+        if report["errors"]:
+            lines = [f"Row {e['row']} ({e['item_name'] or '?'}): {e['error']}" for e in report["errors"][:10]]
+            if report["skipped"] > len(lines):
+                lines.append(f"... and {report['skipped'] - len(lines)} more")
+            message += "\n\n" + "\n".join(lines)
+        messagebox.showinfo("Import", message)
@@ -3,7 +3,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
-from src.core import CurrencyFormatter
+from src.core import CurrencyFormatter, InsufficientStockError
 from .base_tab import BaseTab
 
 
@@ -54,7 +54,8 @@ class POSTab(BaseTab):
         ttk.Button(search_row, text="Search", style="Info.TButton",
                    command=self._search_items).pack(side="left", padx=6)
         ttk.Button(search_row, text="Reset", style="Info.TButton",
-                   command=self._load_items).pack(side="left")
+                   command=self._reset_search).pack(side="left")
+        self._bind_debounced_search(self._search_entry, self._search_items)
 
         self._items_tree = ttk.Treeview(
             left, columns=("Item", "Qty", "Price"), show="headings", height=10
@@ -126,23 +127,19 @@ class POSTab(BaseTab):
     # ------------------------------------------------------------------
 
     def _load_items(self):
-        for row in self._items_tree.get_children():
-            self._items_tree.delete(row)
-        for item in self.app.inventory_service.get_all_items():
-            self._items_tree.insert("", "end", values=(
-                item[0], item[1], CurrencyFormatter.format_currency(item[4])
-            ))
+        """Re-run the current search, e.g. after a checkout changed stock."""
+        self._search_items()
+
+    def _reset_search(self):
+        self._search_entry.delete(0, tk.END)
+        self._search_items()
 
     def _search_items(self):
-        query = self._search_entry.get().strip()
-        items = (self.app.inventory_service.search(query) if query
-                 else self.app.inventory_service.get_all_items())
-        for row in self._items_tree.get_children():
-            self._items_tree.delete(row)
-        for item in items:
-            self._items_tree.insert("", "end", values=(
-                item[0], item[1], CurrencyFormatter.format_currency(item[4])
-            ))
+        items = self.app.inventory_service.quick_search(self._search_entry.get())
+        self._sync_tree(self._items_tree, [
+            (item[0], (item[0], item[1], CurrencyFormatter.format_currency(item[4])))
+            for item in items
+        ])
 
     def _load_quick_add(self):
         for w in self._quick_add_frame.winfo_children():
@@ -171,12 +168,12 @@ class POSTab(BaseTab):
         if event is not None:
             sel = self._items_tree.selection()
             if sel:
-                self._selected_item = self._items_tree.item(sel[0])["values"][0]
+                self._selected_item = sel[0]
 
         if not self._selected_item:
             sel = self._items_tree.selection()
             if sel:
-                self._selected_item = self._items_tree.item(sel[0])["values"][0]
+                self._selected_item = sel[0]
 
         if not self._selected_item:
             messagebox.showerror("POS", "Select an item to add")
@@ -277,26 +274,24 @@ class POSTab(BaseTab):
             messagebox.showerror("POS", "Cart is empty")
             return
 
+        try:
+            ok = self.app.pos_service.record_checkout(self._cart, self.app.current_user)
+        except InsufficientStockError as e:
+            messagebox.showerror("POS", f"{e}. Nothing was charged.")
+            return
+        if not ok:
+            messagebox.showerror("POS", "Checkout failed. Nothing was charged.")
+            return
+
         sale_time = datetime.now()
         receipt = self._build_receipt(self._cart, sale_time, self.app.current_user)
         self._last_receipt_text = receipt
         self._last_receipt_time = sale_time
 
-        for item in self._cart:
-            name  = item["item_name"]
-            qty   = item["quantity"]
-            price = item["price"]
-            self.app.pos_service.record_sale(name, qty, price, self.app.current_user)
-            current = self.app.inventory_service.get_item(name)
-            if current:
-                new_qty = max(0, (current.get("quantity", 0) - qty))
-                self.app.inventory_service.update_item(name, quantity=new_qty)
-
         self.app.activity_service.log(
             self.app.current_user, "POS Checkout",
             f"Processed {len(self._cart)} items",
         )
-        self._clear_cart.__wrapped__ = None  # skip confirmation for post-checkout clear
         self._cart = []
         self._selected_item = None
         self._refresh_cart()
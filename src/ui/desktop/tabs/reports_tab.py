@@ -133,10 +133,17 @@ class ReportsTab(BaseTab):
 
     def refresh(self):
         period_key = self._period_map.get(self._period_var.get(), "30")
+        self.load_async(lambda: self._load(period_key), self._render)
+
+    def _load(self, period_key: str) -> tuple:
+        """Query the report data. Runs on a worker thread."""
         start_date, end_date, days = self.app.analytics_service.get_date_range(period_key)
+        return (days,
+                self.app.analytics_service.get_sales_trend(start_date, end_date),
+                self.app.analytics_service.get_sales_summary(start_date, end_date))
 
-        trend   = self.app.analytics_service.get_sales_trend(start_date, end_date)
-        summary = self.app.analytics_service.get_sales_summary(start_date, end_date)
+    def _render(self, data: tuple):
+        days, trend, summary = data
 
         self._trend_data   = trend
         self._summary_data = summary
@@ -1,12 +1,13 @@
-"""Settings tab — company info and email configuration."""
+"""Settings tab — company info, email configuration and database backups."""
+import os
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 
 from .base_tab import BaseTab
 
 
 class SettingsTab(BaseTab):
-    """Admin-only settings: company profile and SMTP email config."""
+    """Admin-only settings: company profile, SMTP email config and backups."""
 
     def __init__(self, notebook: ttk.Notebook, app):
         super().__init__(notebook, app)
@@ -25,7 +26,7 @@ class SettingsTab(BaseTab):
         header = tk.Frame(container, bg=self.colors["bg"])
         header.pack(fill="x", pady=(0, 12))
         ttk.Label(header, text="⚙️ Settings", style="Header.TLabel").pack(side="left")
-        ttk.Label(header, text="Company & Email configuration",
+        ttk.Label(header, text="Company, Email & Backups",
                   style="Subheader.TLabel").pack(side="left", padx=10)
 
         body = tk.Frame(container, bg=self.colors["bg"])
@@ -90,8 +91,28 @@ class SettingsTab(BaseTab):
         ttk.Button(em_btns, text="Test", style="Info.TButton",
                    command=self._test_email).pack(side="left", padx=6)
 
+        # --- Backups card ---
+        backup_card = tk.Frame(container, bg=self.colors["card"], padx=12, pady=12)
+        backup_card.pack(fill="x", pady=(12, 0))
+
+        tk.Label(backup_card, text="Backups", bg=self.colors["card"],
+                 fg=self.colors["text"], font=("Arial", 10, "bold")).pack(anchor="w")
+        self._backup_status = tk.Label(backup_card, text="", bg=self.colors["card"],
+                                       fg=self.colors["muted"], font=("Arial", 9), anchor="w")
+        self._backup_status.pack(fill="x", pady=(4, 0))
+
+        bk_btns = tk.Frame(backup_card, bg=self.colors["card"])
+        bk_btns.pack(fill="x", pady=(8, 0))
+        self._backup_btn = ttk.Button(bk_btns, text="Back Up Now", style="Success.TButton",
+                                      command=self._backup_now)
+        self._backup_btn.pack(side="left")
+        self._restore_btn = ttk.Button(bk_btns, text="Restore…", style="Info.TButton",
+                                       command=self._restore_backup)
+        self._restore_btn.pack(side="left", padx=6)
+
         self._load_company()
         self._load_email()
+        self._show_latest_backup()
 
     # ------------------------------------------------------------------
     # Company info helpers
@@ -189,9 +210,90 @@ class SettingsTab(BaseTab):
         messagebox.showinfo("Email Settings", "Email settings saved")
 
     def _test_email(self):
-        try:
-            self.app.email_service.send_email(
-                "BizHub Test", "This is a test email from BizHub.")
-            messagebox.showinfo("Email Settings", "Test email sent")
-        except Exception as e:
-            messagebox.showerror("Email Settings", f"Test email failed: {e}")
+        # Sent on a worker thread so a slow SMTP server cannot freeze the window.
+        def done(sent):
+            if sent:
+                messagebox.showinfo("Email Settings", "Test email sent")
+            else:
+                messagebox.showerror("Email Settings", "Test email failed; check the log for details")
+
+        def failed(exc):
+            messagebox.showerror("Email Settings", f"Test email failed: {exc}")
+
+        self.app.tasks.submit(
+            "test-email",
+            lambda: self.app.email_service.send_email("BizHub Test", "This is a test email from BizHub."),
+            done, failed,
+        )
+
+    # ------------------------------------------------------------------
+    # Backup helpers
+    # ------------------------------------------------------------------
+
+    def _show_latest_backup(self):
+        service = self.app.backup_service
+        backups = service.list_backups() if os.path.isdir(service.backup_dir) else []
+        if backups:
+            text = f"Latest: {backups[0]['name']} ({backups[0]['created']}) — {len(backups)} kept in {service.backup_dir}"
+        else:
+            text = f"No backups yet in {service.backup_dir}"
+        self._backup_status.config(text=text)
+
+    def _set_backup_busy(self, busy: bool, text: str = ""):
+        state = "disabled" if busy else "normal"
+        self._backup_btn.configure(state=state)
+        self._restore_btn.configure(state=state)
+        if busy:
+            self._backup_status.config(text=text)
+        else:
+            self._show_latest_backup()
+
+    def _backup_now(self):
+        # The copy runs in small steps on a worker thread; the app stays usable.
+        def done(info):
+            self._set_backup_busy(False)
+            self.app.activity_service.log(self.app.current_user, "Backup", f"Backed up to {info['name']}")
+            messagebox.showinfo("Backups", f"Backup saved and verified:\n{info['path']}")
+
+        def failed(exc):
+            self._set_backup_busy(False)
+            messagebox.showerror("Backups", f"Backup failed: {exc}")
+
+        self._set_backup_busy(True, "Backing up…")
+        self.app.tasks.submit("backup", self.app.backup_service.create_backup, done, failed)
+
+    def _restore_backup(self):
+        service = self.app.backup_service
+        path = filedialog.askopenfilename(
+            title="Restore from backup",
+            initialdir=service.backup_dir if os.path.isdir(service.backup_dir) else None,
+            filetypes=[("SQLite database", "*.db"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        if not messagebox.askyesno(
+                "Restore", f"Replace all current data with {os.path.basename(path)}?\n\n"
+                           "The current data is backed up first."):
+            return
+
+        def restore():
+            self.app.activity_service.flush()
+            return service.restore(path)
+
+        def done(safety):
+            self._set_backup_busy(False)
+            self.app.activity_service.log(
+                self.app.current_user, "Restore", f"Restored from {os.path.basename(path)}")
+            self._load_company()
+            self._load_email()
+            for tab in self.app._tab_instances.values():
+                if tab is not self:
+                    tab.refresh()
+            messagebox.showinfo("Restore", f"Restore complete. Previous data saved to:\n{safety['path']}")
+
+        def failed(exc):
+            self._set_backup_busy(False)
+            messagebox.showerror("Restore", f"Restore failed: {exc}")
+
+        self._set_backup_busy(True, "Restoring…")
+        self.app.tasks.submit("restore", restore, done, failed)
@@ -2,7 +2,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-from .base_tab import BaseTab
+from .base_tab import BaseTab, VIRTUAL_PAGE_SIZE
 
 
 class VisitorsTab(BaseTab):
@@ -41,12 +41,13 @@ class VisitorsTab(BaseTab):
         ttk.Button(actions, text="Reset", style="Info.TButton",
                    command=self._reset_search).pack(side="left")
 
-        # Scrollable cards area
-        canvas_frame = tk.Frame(container, bg=self.colors["bg"])
-        canvas_frame.pack(fill="both", expand=True)
-
-        self._canvas, self._scroll, self._cards_frame, self._canvas_window = \
-            self._make_scrollable_canvas(canvas_frame)
+        # Virtualised card grid, paged in from the database
+        cards_frame = tk.Frame(container, bg=self.colors["bg"])
+        cards_frame.pack(fill="both", expand=True)
+        self._list = self._make_virtual_list(
+            cards_frame, self._make_visitor_card, self._fill_visitor_card,
+            row_height=170, columns=2, empty_text="No contacts found",
+        )
 
         self.refresh()
 
@@ -63,78 +64,62 @@ class VisitorsTab(BaseTab):
     # ------------------------------------------------------------------
 
     def refresh(self):
-        if not hasattr(self, "_cards_frame"):
+        if not hasattr(self, "_list"):
             return
-        for w in self._cards_frame.winfo_children():
-            w.destroy()
-
-        query    = (self._search_var.get() or "").strip().lower()
-        visitors = self.app.visitor_service.get_all_visitors()
-
-        filtered = [
-            r for r in visitors
-            if not query or any(
-                query in str(v).lower()
-                for v in [r[1] or "", r[3] or "", r[4] or "", r[5] or ""]
-            )
-        ]
-
-        if not filtered:
-            empty = tk.Frame(self._cards_frame, bg=self.colors["card"], padx=12, pady=12)
-            empty.pack(fill="x", pady=6)
-            tk.Label(empty, text="No contacts found",
-                     bg=self.colors["card"], fg=self.colors["muted"]).pack(anchor="w")
-            return
-
-        for idx, row in enumerate(filtered):
-            card = self._visitor_card(self._cards_frame, row)
-            card.grid(row=idx // 2, column=idx % 2, padx=6, pady=6, sticky="nsew")
-
-        self._cards_frame.grid_columnconfigure(0, weight=1)
-        self._cards_frame.grid_columnconfigure(1, weight=1)
+        query = (self._search_var.get() or "").strip() or None
+        self._list.reset(lambda after: self.app.visitor_service.get_visitors_page(
+            limit=VIRTUAL_PAGE_SIZE, after=after, search=query))
 
     # ------------------------------------------------------------------
     # Card builder
     # ------------------------------------------------------------------
 
-    def _visitor_card(self, parent, row) -> tk.Frame:
-        visitor_id = row[0]
-        name    = row[1] or "—"
-        address = row[2] or "—"
-        phone   = row[3] or "—"
-        email   = row[4] or "—"
-        company = row[5] or "—"
-
-        card = tk.Frame(parent, bg=self.colors["card"], padx=12, pady=12)
+    def _make_visitor_card(self, parent) -> tk.Frame:
+        """Build an empty visitor card; _fill_visitor_card shows a record in it."""
+        bg = self.colors["card"]
+        card = tk.Frame(parent, bg=bg, padx=12, pady=12)
 
         # Title row: name + company
-        title = tk.Frame(card, bg=self.colors["card"])
+        title = tk.Frame(card, bg=bg)
         title.pack(fill="x")
-        tk.Label(title, text=name, bg=self.colors["card"], fg=self.colors["text"],
-                 font=("Arial", 11, "bold")).pack(side="left")
-        tk.Label(title, text=company, bg=self.colors["card"], fg=self.colors["muted"],
-                 font=("Arial", 9)).pack(side="right")
+        name = tk.Label(title, bg=bg, fg=self.colors["text"], font=("Arial", 11, "bold"))
+        name.pack(side="left")
+        company = tk.Label(title, bg=bg, fg=self.colors["muted"], font=("Arial", 9))
+        company.pack(side="right")
 
-        tk.Label(card, text=address, bg=self.colors["card"], fg=self.colors["muted"],
-                 font=("Arial", 9)).pack(anchor="w", pady=(4, 0))
+        address = tk.Label(card, bg=bg, fg=self.colors["muted"], font=("Arial", 9))
+        address.pack(anchor="w", pady=(4, 0))
 
-        contact = tk.Frame(card, bg=self.colors["card"])
+        contact = tk.Frame(card, bg=bg)
         contact.pack(fill="x", pady=(8, 0))
-        tk.Label(contact, text=f"✉  {email}", bg=self.colors["card"],
-                 fg=self.colors["text"], font=("Arial", 9)).pack(anchor="w")
-        tk.Label(contact, text=f"📞 {phone}", bg=self.colors["card"],
-                 fg=self.colors["text"], font=("Arial", 9)).pack(anchor="w")
+        email = tk.Label(contact, bg=bg, fg=self.colors["text"], font=("Arial", 9))
+        email.pack(anchor="w")
+        phone = tk.Label(contact, bg=bg, fg=self.colors["text"], font=("Arial", 9))
+        phone.pack(anchor="w")
 
         # Edit / Delete buttons
-        btn_row = tk.Frame(card, bg=self.colors["card"])
+        btn_row = tk.Frame(card, bg=bg)
         btn_row.pack(fill="x", pady=(10, 0))
-        ttk.Button(btn_row, text="Edit", style="Info.TButton",
-                   command=lambda: self._open_edit_form(row)).pack(side="left", padx=(0, 6))
-        ttk.Button(btn_row, text="Delete", style="Danger.TButton",
-                   command=lambda: self._delete_contact(visitor_id, name)).pack(side="left")
+        edit = ttk.Button(btn_row, text="Edit", style="Info.TButton")
+        edit.pack(side="left", padx=(0, 6))
+        delete = ttk.Button(btn_row, text="Delete", style="Danger.TButton")
+        delete.pack(side="left")
 
+        card.parts = dict(name=name, company=company, address=address, email=email,
+                          phone=phone, edit=edit, delete=delete)
         return card
 
+    def _fill_visitor_card(self, card: tk.Frame, row):
+        parts = card.parts
+        visitor_id, name = row[0], row[1] or "—"
+        parts["name"].config(text=name)
+        parts["company"].config(text=row[5] or "—")
+        parts["address"].config(text=row[2] or "—")
+        parts["email"].config(text=f"✉  {row[4] or '—'}")
+        parts["phone"].config(text=f"📞 {row[3] or '—'}")
+        parts["edit"].config(command=lambda: self._open_edit_form(row))
+        parts["delete"].config(command=lambda: self._delete_contact(visitor_id, name))
+
     # ------------------------------------------------------------------
     # Add contact form
     # ------------------------------------------------------------------
@@ -0,0 +1,52 @@
+"""Tests for the adapter factory and the API's per-worker database lifecycle."""
+import pytest
+
+from src.db import SQLiteAdapter, create_adapter
+
+
+def test_create_adapter_follows_config(tmp_path, monkeypatch):
+    """Test the factory opens the configured SQLite file and rejects unknown types."""
+    monkeypatch.setenv('DB_TYPE', 'sqlite')
+    monkeypatch.setenv('DB_FILE', str(tmp_path / 'factory.db'))
+    db = create_adapter()
+    try:
+        assert isinstance(db, SQLiteAdapter)
+        assert db.db_file == str(tmp_path / 'factory.db')
+        assert db.get_schema_version() >= 1
+    finally:
+        db.close()
+    with pytest.raises(ValueError):
+        create_adapter({'type': 'oracle'})
+
+
+def test_api_opens_database_in_lifespan_and_closes_it(tmp_path, monkeypatch):
+    """Test importing the app opens nothing; the lifespan opens and closes the adapter."""
+    pytest.importorskip('fastapi')
+    pytest.importorskip('httpx')
+    from fastapi.testclient import TestClient
+    from src.api import deps
+    from src.api.main import app
+
+    deps.close_database()
+    monkeypatch.setenv('DB_TYPE', 'sqlite')
+    monkeypatch.setenv('DB_FILE', str(tmp_path / 'api.db'))
+    assert deps._db is None
+    with TestClient(app) as client:
+        assert deps._db is not None and deps._db.db_file == str(tmp_path / 'api.db')
+        assert client.get('/inventory').status_code == 200
+        assert deps.get_inventory_service() is deps.get_inventory_service()
+    assert deps._db is None
+
+
+def test_dependencies_open_lazily_without_lifespan(tmp_path, monkeypatch):
+    """Test a dependency used outside the lifespan still gets an adapter."""
+    pytest.importorskip('fastapi')
+    from src.api import deps
+
+    deps.close_database()
+    monkeypatch.setenv('DB_TYPE', 'sqlite')
+    monkeypatch.setenv('DB_FILE', str(tmp_path / 'lazy.db'))
+    try:
+        assert deps.get_pos_service().db is deps.get_db()
+    finally:
+        deps.close_database()
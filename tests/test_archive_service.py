@@ -0,0 +1,113 @@
+"""Tests for archiving old sales and activity rows into per-year databases."""
+import os
+from datetime import date
+
+import pytest
+from src.db import SQLiteAdapter
+from src.services import ArchiveService
+
+
+@pytest.fixture()
+def db(tmp_path):
+    adapter = SQLiteAdapter(str(tmp_path / "hot.db"), archive_dir=str(tmp_path / "archive"))
+    os.makedirs(adapter.archive_dir)
+    with adapter._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [('2022-03-01 10:00:00', 'Pen', 1, 1.0, 1.0, 'admin'),
+             ('2023-06-15 11:00:00', 'Pen', 2, 1.0, 2.0, 'admin'),
+             ('2023-12-31 23:00:00', 'Pad', 1, 3.0, 3.0, 'admin'),
+             ('2024-02-01 09:00:00', 'Pen', 4, 1.0, 4.0, 'admin')]
+        )
+    adapter.log_activities([('2022-05-01 08:00:00', 'admin', 'Login', 'old'),
+                            ('2024-02-02 08:00:00', 'admin', 'Login', 'new')])
+    yield adapter
+    adapter.close()
+
+
+def test_archive_moves_old_rows_by_year(db):
+    """Test rows before the horizon leave the hot tables but the rollup keeps them."""
+    rollup_before = db.get_sales_summary_by_item('2022-01-01', '2024-12-31')
+    archived = ArchiveService(db, sales_after_days=30, activity_after_days=30).run(today=date(2024, 2, 20))
+    assert archived == {'sales': {2022: 1, 2023: 2}, 'activity_log': {2022: 1}}
+    assert [p[:3] for p in db.get_archive_partitions('sales')] == [('sales', 2022, 1), ('sales', 2023, 2)]
+    assert os.path.exists(db.archive_path(2023))
+    assert db.get_archive_horizon('sales') == '2024-01-21'
+
+    with db._get_conn() as (conn, cursor):
+        cursor.execute('SELECT COUNT(*) FROM sales')
+        assert cursor.fetchone()[0] == 1
+    assert db.get_sales_summary_by_item('2022-01-01', '2024-12-31') == rollup_before
+    assert db.rebuild_sales_rollup() >= 0
+    assert db.get_sales_summary_by_item('2022-01-01', '2024-12-31') == rollup_before
+
+    # Running again moves nothing new.
+    assert db.archive_rows('sales', '2024-01-21') == {}
+
+
+def test_reads_union_archives_only_when_range_needs_them(db):
+    """Test date-ranged reads return archived rows transparently."""
+    db.archive_rows('sales', '2024-01-01')
+    db.archive_rows('activity_log', '2024-01-01')
+
+    assert [r[2] for r in db.get_sales_by_date('2023-06-15')] == ['Pen']
+    assert len(db.get_sales_between('2023-01-01', '2024-12-31')) == 3
+    assert len(db.get_sales_between('2024-01-01', '2024-12-31')) == 1
+    assert len(db.get_all_sales()) == 4
+    assert [r[1][:10] for r in db.iter_sales('2022-01-01', '2023-12-31')] == ['2022-03-01', '2023-06-15', '2023-12-31']
+
+    rows, after = db.get_sales_page(limit=2)
+    more, end = db.get_sales_page(limit=2, after=after)
+    assert [r[1][:4] for r in rows + more] == ['2024', '2023', '2023', '2022'] and end is None
+
+    assert [r[4] for r in db.get_activity_log()] == ['new', 'old']
+    assert [r[4] for r in db.get_activity_log(start_date='2024-01-01')] == ['new']
+    assert [r[4] for r in db.get_activity_log('admin', limit=1)] == ['new']
+
+
+def test_unknown_table_cannot_be_archived(db):
+    """Test only sales and activity_log can be archived."""
+    with pytest.raises(ValueError):
+        db.archive_rows('inventory', '2024-01-01')
+
+
+def test_reads_span_more_archive_years_than_sqlite_can_attach(db, monkeypatch):
+    """Test 14 archive years stay readable and newest-first pages start on the hot table."""
+    with db._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+            'VALUES (?, ?, 1, 1.0, 1.0, ?)',
+            [(f'{year}-07-01 12:00:00', f'Old {year}', 'admin') for year in range(2008, 2022)]
+        )
+    db.log_activities([(f'{year}-07-01 12:00:00', 'admin', 'Login', str(year)) for year in range(2008, 2022)])
+    assert len(db.archive_rows('sales', '2024-01-01')) == 16
+    assert len(db.archive_rows('activity_log', '2024-01-01')) == 15
+
+    assert len(db.get_activity_log()) == 16
+    assert [r[4] for r in db.get_activity_log(limit=3)] == ['new', 'old', '2021']
+    assert len(db.get_all_sales()) == 18
+    dates = [r[1][:4] for r in db.iter_sales()]
+    assert dates == sorted(dates) and len(dates) == 18
+    assert len(db.get_sales_between('2008-01-01', '2024-12-31')) == 18
+
+    # A sale written back-dated into an archived year is still found, in order
+    with db._get_conn() as (conn, cursor):
+        cursor.executemany("INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) "
+                           "VALUES (?, ?, 1, 1.0, 1.0, 'admin')",
+                           [('2015-01-02 00:00:00', 'Late'), ('2024-03-01 09:00:00', 'Hot')])
+
+    attached = []
+    read_only_conn = db._read_only_conn
+    monkeypatch.setattr(db, '_read_only_conn', lambda years=(): attached.append(list(years)) or read_only_conn(years))
+    first, after = db.get_sales_page(limit=1)
+    assert [r[1][:4] for r in first] == ['2024'] and attached == []
+
+    seen = list(first)
+    while after:
+        page, after = db.get_sales_page(limit=5, after=after)
+        seen += page
+    keys = [(r[1], r[0]) for r in seen]
+    assert keys == sorted(keys, reverse=True) and len(seen) == 20
+    assert 'Late' in [r[2] for r in seen]
+    assert attached and all(len(years) == 1 for years in attached)
@@ -0,0 +1,154 @@
+"""Tests for the async database adapters and the async API routes built on them."""
+import asyncio
+import os
+
+import pytest
+from src.core import InsufficientStockError
+from src.db import (
+    AsyncDatabaseAdapter, SQLiteAdapter, ThreadedAsyncAdapter, create_async_adapter,
+)
+
+
+@pytest.fixture()
+def db(tmp_path):
+    """SQLiteAdapter with stock, sales and a couple of leads."""
+    adapter = SQLiteAdapter(str(tmp_path / "async.db"), archive_dir=str(tmp_path / "archive"))
+    adapter.add_inventory_item('Pen', 5, 1, 1.0, 2.0, '')
+    adapter.add_inventory_item('Pad', 3, 1, 2.0, 4.0, '')
+    with adapter._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [(f'2024-02-0{d} 10:00:00', 'Pen', 1, 2.0, 2.0, 'admin') for d in range(1, 6)]
+        )
+    contact = adapter.add_crm_contact('Ada', 'Acme')
+    adapter.add_crm_lead(contact, 'Big deal', 'Qualified', 100.0)
+    adapter.add_crm_lead(contact, 'Small deal', 'Won', 10.0)
+    yield adapter
+    adapter.close()
+
+
+def _adapters():
+    modes = ['threaded']
+    try:
+        import aiosqlite  # noqa: F401
+        modes.append('native')
+    except ImportError:
+        pass
+    return modes
+
+
+@pytest.fixture(params=_adapters())
+def adb(db, request):
+    """The async adapter for db, natively (when aiosqlite is installed) and on threads."""
+    adapter = create_async_adapter(db, mode=request.param)
+    assert isinstance(adapter, AsyncDatabaseAdapter)
+    assert isinstance(adapter, ThreadedAsyncAdapter) == (request.param == 'threaded')
+    yield adapter
+    asyncio.run(adapter.close())
+
+
+def test_checkout_is_atomic_and_reports_writes(db, adb):
+    """Test an async checkout decrements stock, and a short line rolls it all back."""
+    seen = []
+    db.add_write_listener(seen.append)
+    line = {'item_name': 'Pen', 'quantity': 2, 'sale_price': 2.0, 'total_amount': 4.0}
+
+    async def run():
+        assert await adb.record_checkout([line, dict(line, item_name='Pad', quantity=1)], 'admin')
+        with pytest.raises(InsufficientStockError):
+            await adb.record_checkout([dict(line, item_name='Pad', quantity=1), dict(line, quantity=9)], 'admin')
+
+    asyncio.run(run())
+    assert db.get_inventory_by_name('Pen')['quantity'] == 3
+    assert db.get_inventory_by_name('Pad')['quantity'] == 2
+    assert len(db.get_all_sales()) == 7
+    assert seen and seen[0] >= {'inventory', 'sales', 'sales_daily_item'}
+
+
+def test_reads_match_the_sync_adapter(db, adb):
+    """Test sales pages, KPIs and leads come back exactly as the sync adapter returns them."""
+    async def run():
+        first = await adb.get_sales_page(limit=3, username='admin')
+        second = await adb.get_sales_page(limit=3, after=first[1], username='admin')
+        return first, second, await adb.get_dashboard_kpis('2024-02-05'), await adb.get_crm_leads()
+
+    first, second, kpis, leads = asyncio.run(run())
+    assert first == db.get_sales_page(limit=3, username='admin')
+    assert second == db.get_sales_page(limit=3, after=first[1], username='admin')
+    assert [r[1][:10] for r in first[0] + second[0]] == [f'2024-02-0{d}' for d in range(5, 0, -1)]
+    assert second[1] is None
+    assert kpis == db.get_dashboard_kpis('2024-02-05') and kpis['today_total'] == 2.0
+    assert leads == db.get_crm_leads()
+
+
+def test_archived_sales_stay_visible(db, adb):
+    """Test a page reaching into archived years still returns the archived rows."""
+    os.makedirs(db.archive_dir)
+    assert db.archive_rows('sales', '2024-02-03') == {2024: 2}
+    rows, after = asyncio.run(adb.get_sales_page(limit=10))
+    assert len(rows) == 5 and after is None
+
+
+def test_native_sqlite_adapter_bounds_open_connections(db):
+    """Test a burst of requests shares at most pool_size aiosqlite connections."""
+    pytest.importorskip('aiosqlite')
+    from src.db import AioSQLiteAdapter
+
+    adb = AioSQLiteAdapter(db, pool_size=2)
+    opened = []
+    connect = adb._connect
+
+    async def counting_connect():
+        opened.append(1)
+        return await connect()
+
+    adb._connect = counting_connect
+
+    async def run():
+        try:
+            return await asyncio.gather(*(adb.get_crm_leads() for _ in range(20)))
+        finally:
+            await adb.close()
+
+    assert all(leads == db.get_crm_leads() for leads in asyncio.run(run()))
+    assert len(opened) == 2
+
+
+def test_unknown_async_mode_is_rejected(db):
+    with pytest.raises(ValueError):
+        create_async_adapter(db, mode='fibers')
+
+
+def test_async_routes(tmp_path, monkeypatch):
+    """Test the async checkout, sales list, KPI and pipeline routes end to end."""
+    pytest.importorskip('fastapi')
+    pytest.importorskip('httpx')
+    from fastapi.testclient import TestClient
+    from src.api import deps
+    from src.api.main import app
+
+    deps.close_database()
+    monkeypatch.setenv('DB_TYPE', 'sqlite')
+    monkeypatch.setenv('DB_FILE', str(tmp_path / 'api.db'))
+    with TestClient(app) as client:
+        assert deps._async_db is not None and deps._async_db.db is deps._db
+        deps._db.add_inventory_item('Pen', 5, 1, 1.0, 2.0, '')
+        contact = deps._db.add_crm_contact('Ada')
+        deps._db.add_crm_lead(contact, 'Deal', 'Proposal', 50.0)
+        assert [l['title'] for l in client.get('/leads/pipeline').json()['Proposal']] == ['Deal']
+
+        cart = {'items': [{'item_name': 'Pen', 'quantity': 2, 'sale_price': 2.0}], 'username': 'api'}
+        response = client.post('/sales/checkout', json=cart)
+        assert response.status_code == 200 and response.json()['total'] == 4.0
+        cart['items'][0]['quantity'] = 9
+        assert client.post('/sales/checkout', json=cart).status_code == 400
+        assert client.post('/sales/checkout', json={'items': []}).status_code == 400
+
+        assert [s['item_name'] for s in client.get('/sales').json()] == ['Pen']
+        assert client.get('/dashboard/kpis').json()['today_sales'] == 4.0
+
+        # A write through the sync adapter invalidates the cached pipeline
+        deps._db.add_crm_lead(contact, 'Second', 'Proposal', 5.0)
+        assert len(client.get('/leads/pipeline').json()['Proposal']) == 2
+    assert deps._async_db is None and deps._db is None
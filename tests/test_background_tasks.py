@@ -0,0 +1,79 @@
+"""Tests for the desktop background loader (no display needed)."""
+import threading
+import time
+
+from src.ui.desktop.background import BackgroundTasks
+
+
+class ManualRoot:
+    """Collects root.after callbacks so a test can run the 'main loop' by hand."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, _ms, callback):
+        self.scheduled.append(callback)
+
+    def run_pending(self):
+        callbacks, self.scheduled = self.scheduled, []
+        for callback in callbacks:
+            callback()
+
+
+def _drain(root, timeout=5.0):
+    """Run the polling callbacks until the loader stops rescheduling itself."""
+    deadline = time.monotonic() + timeout
+    while root.scheduled:
+        assert time.monotonic() < deadline, "background loads did not finish"
+        root.run_pending()
+        time.sleep(0.01)
+
+
+def test_results_delivered_on_polling_thread():
+    """Test results reach on_done on the thread running root.after callbacks."""
+    root = ManualRoot()
+    tasks = BackgroundTasks(root)
+    seen = []
+    tasks.submit('a', lambda: threading.get_ident(), lambda worker: seen.append((worker, threading.get_ident())))
+    _drain(root)
+    tasks.shutdown()
+    [(worker, delivered)] = seen
+    assert worker != delivered == threading.get_ident()
+
+
+def test_newer_load_supersedes_older_one():
+    """Test only the latest load per key is applied, and errors go to on_error."""
+    root = ManualRoot()
+    tasks = BackgroundTasks(root, max_workers=1)
+    release = threading.Event()
+    applied, errors = [], []
+    tasks.submit('a', lambda: release.wait(5) and 'stale', applied.append)
+    tasks.submit('a', lambda: 'fresh', applied.append)
+    tasks.submit('b', lambda: 1 / 0, applied.append, errors.append)
+    release.set()
+    _drain(root)
+    tasks.shutdown()
+    assert applied == ['fresh']
+    assert isinstance(errors[0], ZeroDivisionError)
+
+
+def test_cancelled_load_is_not_applied():
+    """Test cancel_all drops results of loads already running."""
+    root = ManualRoot()
+    tasks = BackgroundTasks(root)
+    started, release = threading.Event(), threading.Event()
+    applied = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 'late'
+
+    tasks.submit('a', slow, applied.append)
+    started.wait(5)
+    tasks.cancel_all()
+    release.set()
+    tasks.shutdown()
+    tasks._executor.shutdown(wait=True)
+    tasks.poll()
+    assert applied == []
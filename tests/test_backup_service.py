@@ -0,0 +1,108 @@
+"""Tests for online backups, rotation and restore."""
+import os
+import sqlite3
+
+import pytest
+from src.db import SQLiteAdapter
+from src.services import BackupService, InventoryService
+
+
+@pytest.fixture()
+def db(tmp_path):
+    adapter = SQLiteAdapter(str(tmp_path / "live.db"))
+    with adapter._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO inventory (item_name, quantity, cost_price, sale_price, description, threshold) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [(f'Item {i}', i, 1.0, 2.0, 'x' * 200, 1) for i in range(2000)]
+        )
+    yield adapter
+    adapter.close()
+
+
+def _names(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {row[0] for row in conn.execute('SELECT item_name FROM inventory')}
+    finally:
+        conn.close()
+
+
+def test_backup_copies_in_steps_and_verifies(db, tmp_path):
+    """Test a stepped backup produces a complete, verified, non-WAL snapshot."""
+    steps = []
+    service = BackupService(db, backup_dir=str(tmp_path / "backups"), pages_per_step=8, step_sleep_ms=0)
+    info = service.create_backup(progress=lambda copied, total: steps.append((copied, total)))
+
+    assert len(steps) > 1 and steps[-1][0] == steps[-1][1]
+    assert service.verify(info['path'])
+    assert len(_names(info['path'])) == 2000
+    assert not os.path.exists(info['path'] + '.partial')
+    conn = sqlite3.connect(info['path'])
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+    conn.close()
+
+
+def test_rotation_keeps_newest(db, tmp_path):
+    """Test only the newest `keep` snapshots are kept."""
+    service = BackupService(db, backup_dir=str(tmp_path / "backups"), keep=2)
+    paths = [service.create_backup()['path'] for _ in range(4)]
+    assert [b['path'] for b in service.list_backups()] == paths[:1:-1]
+
+
+def test_restore_replaces_data_and_keeps_safety_copy(db, tmp_path):
+    """Test restore brings back the snapshot and saves the replaced data first."""
+    service = BackupService(db, backup_dir=str(tmp_path / "backups"))
+    inventory = InventoryService(db)
+    snapshot = service.create_backup()['path']
+    assert inventory.quick_search('Item 1999')
+
+    db.delete_inventory_item('Item 1999')
+    db.add_inventory_item('Restored Away', 1, 1, 1.0, 2.0, '')
+    assert not inventory.quick_search('Item 1999')
+
+    safety = service.restore(snapshot)
+    assert 'pre-restore' in safety['name'] and 'Restored Away' in _names(safety['path'])
+    assert db.get_inventory_by_name('Item 1999') is not None
+    assert db.get_inventory_by_name('Restored Away') is None
+    # The in-memory search index is rebuilt after the restore.
+    assert inventory.quick_search('Item 1999')
+    assert not inventory.quick_search('Restored')
+
+
+def test_restore_rejects_missing_or_corrupt_files(db, tmp_path):
+    """Test restore refuses files that are absent or fail the integrity check."""
+    service = BackupService(db, backup_dir=str(tmp_path / "backups"))
+    with pytest.raises(ValueError):
+        service.restore(str(tmp_path / "missing.db"))
+    junk = tmp_path / "junk.db"
+    junk.write_bytes(b'not a database' * 100)
+    with pytest.raises(ValueError):
+        service.restore(str(junk))
+    assert service.list_backups() == []
+    assert len(_names(db.db_file)) == 2000
+
+
+def test_restore_oldest_snapshot_when_keep_is_full(db, tmp_path):
+    """Test restoring the oldest kept snapshot neither deletes it nor empties the database."""
+    service = BackupService(db, backup_dir=str(tmp_path / "backups"), keep=2)
+    oldest = service.create_backup()['path']
+    db.add_inventory_item('Newer', 1, 1, 1.0, 2.0, '')
+    newest = service.create_backup()['path']
+    os.utime(oldest, (1, 1))
+    assert [b['path'] for b in service.list_backups()] == [newest, oldest]
+
+    safety = service.restore(oldest)
+    assert os.path.exists(oldest) and os.path.exists(safety['path'])
+    assert len(_names(db.db_file)) == 2000
+    assert db.get_inventory_by_name('Newer') is None
+    assert 'Newer' in _names(safety['path'])
+    assert len(service.list_backups()) == 3
+
+
+def test_restore_from_missing_file_leaves_no_file_behind(db, tmp_path):
+    """Test the adapter opens the restore source read-only instead of creating it."""
+    missing = str(tmp_path / "gone.db")
+    assert not db.restore_from(missing)
+    assert not os.path.exists(missing)
+    assert len(_names(db.db_file)) == 2000
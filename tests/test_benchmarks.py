@@ -0,0 +1,49 @@
+"""Smoke tests for the benchmark data generator and runner."""
+import json
+
+from benchmarks.datagen import resolve_spec, generate
+from benchmarks.run import compare, main, run
+from src.db import SQLiteAdapter
+
+TINY = {'items': 20, 'sales': 300, 'years': 1, 'employees': 5, 'visitors': 10,
+        'contacts': 10, 'leads': 15, 'activities': 20}
+
+
+def test_generate_fills_every_table(tmp_path):
+    """Test generated row counts match the spec and the rollup is populated."""
+    path = str(tmp_path / "gen.db")
+    generate(path, TINY, seed=1)
+    db = SQLiteAdapter(path)
+    with db._get_conn() as (conn, cursor):
+        counts = {t: cursor.execute(f'SELECT COUNT(*) FROM {t}').fetchone()[0]
+                  for t in ('inventory', 'sales', 'employees', 'visitors', 'crm_contacts',
+                            'crm_leads', 'crm_activities')}
+        rolled_up = cursor.execute('SELECT SUM(txn_count) FROM sales_daily_item').fetchone()[0]
+    db.close()
+    assert counts == {'inventory': 20, 'sales': 300, 'employees': 5, 'visitors': 10,
+                      'crm_contacts': 10, 'crm_leads': 15, 'crm_activities': 20}
+    assert rolled_up == 300
+
+
+def test_resolve_spec_overrides():
+    """Test preset values can be overridden individually."""
+    spec = resolve_spec('large', sales=10)
+    assert spec['sales'] == 10
+    assert spec['contacts'] == 50_000
+
+
+def test_run_reports_every_case(tmp_path):
+    """Test a run produces timing stats for each case, comparable to a baseline."""
+    report = run(str(tmp_path / "run.db"), TINY, repeat=2, include_api=False, import_rows=10)
+    assert report['meta']['spec'] == TINY
+    assert 'pos.checkout_3_items' in report['results']
+    assert all(stats['n'] >= 1 and stats['min_ms'] <= stats['max_ms'] for stats in report['results'].values())
+    assert set(compare(report, report).values()) == {1.0}
+
+
+def test_main_writes_json(tmp_path):
+    """Test the CLI writes a JSON report to --output."""
+    out = tmp_path / "bench.json"
+    args = [f'--{k}={v}' for k, v in TINY.items()]
+    assert main(args + ['--repeat=1', '--no-api', '--import-rows=4', f'--output={out}']) == 0
+    assert json.loads(out.read_text())['results']
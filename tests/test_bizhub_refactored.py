@@ -1,10 +1,14 @@
 """Updated tests for BizHub refactored architecture."""
+import time
+
 import pytest
 import tkinter as tk
+from src.core import InsufficientStockError
 from src.db import SQLiteAdapter
 from src.services import (
     AuthService, InventoryService, POSService, HRService,
-    VisitorService, EmailService, ActivityService, CompanyService
+    VisitorService, EmailService, ActivityService, CompanyService,
+    AnalyticsService, CRMService, ExportService,
 )
 
 
@@ -118,6 +122,106 @@ def test_delete_inventory_item(db):
     assert len(inv.get_all_items()) == 0
 
 
+def test_bulk_upsert_inserts_updates_and_reports(db):
+    """Test bulk import upserts by name and reports bad rows without aborting."""
+    inv = InventoryService(db)
+    inv.add_item('Pen', 5, 2, 1.0, 2.0, 'old', image_path='pen.png')
+    rows = [
+        {'Item Name': 'Pen', 'Quantity': '50', 'Threshold': '5', 'Cost Price': '1.5',
+         'Sale Price': '2.5', 'Description': 'blue'},
+        {'item_name': 'Pad', 'quantity': 3},
+        {'Item Name': '', 'Quantity': '1'},
+        {'Item Name': 'Ink', 'Quantity': 'lots'},
+        {'Item Name': '', 'Quantity': ''},
+        ('Clip', 7.0, 1, 0.1, 0.2, None),
+    ]
+    report = inv.bulk_upsert(iter(rows), chunk_size=2)
+    assert report['imported'] == 3
+    assert report['skipped'] == 2
+    assert [(e['row'], e['item_name']) for e in report['errors']] == [(3, None), (4, 'Ink')]
+    pen = inv.get_item('Pen')
+    assert (pen['quantity'], pen['description'], pen['image_path']) == (50, 'blue', 'pen.png')
+    assert inv.get_item('Clip')['quantity'] == 7
+
+
+def test_bulk_upsert_reads_xlsx(db, tmp_path):
+    """Test Excel rows are streamed with header-based column mapping."""
+    openpyxl = pytest.importorskip('openpyxl')
+    from src.services.inventory_service import iter_xlsx_rows
+    path = tmp_path / 'items.xlsx'
+    wb = openpyxl.Workbook()
+    wb.active.append(['Item Name', 'Quantity', 'Threshold', 'Cost Price', 'Sale Price', 'Description'])
+    wb.active.append(['Stapler', 4, 1, 3.0, 5.0, 'metal'])
+    wb.active.append([None, None, None, None, None, None])
+    wb.save(path)
+    report = InventoryService(db).bulk_upsert(iter_xlsx_rows(str(path)))
+    assert report == {'imported': 1, 'skipped': 0, 'errors': []}
+    assert db.get_inventory_by_name('Stapler')['description'] == 'metal'
+
+
+
+def test_import_route_spools_large_csv(tmp_path, monkeypatch):
+    """Test POST /inventory/import streams a CSV bigger than the in-memory spool."""
+    pytest.importorskip('fastapi')
+    pytest.importorskip('httpx')
+    from fastapi.testclient import TestClient
+    from src.api import deps
+    from src.api.main import app
+    from src.api.routers import inventory
+
+    deps.close_database()
+    monkeypatch.setenv('DB_TYPE', 'sqlite')
+    monkeypatch.setenv('DB_FILE', str(tmp_path / 'import.db'))
+    monkeypatch.setattr(inventory, 'IMPORT_SPOOL_MAX_BYTES', 1024)
+    body = 'Item Name,Quantity,Threshold,Cost Price,Sale Price,Description\n' + ''.join(
+        f'Item {i:04d},{i},1,1.0,2.0,"line one\nline two"\n' for i in range(500))
+
+    def chunks():
+        data = body.encode('utf-8')
+        for i in range(0, len(data), 700):
+            yield data[i:i + 700]
+
+    with TestClient(app) as client:
+        response = client.post('/inventory/import', content=chunks(), headers={'content-type': 'text/csv'})
+        assert response.json() == {'imported': 500, 'skipped': 0, 'errors': []}
+        assert deps.get_db().get_inventory_by_name('Item 0499')['description'] == 'line one\nline two'
+        bad = client.post('/inventory/import', content=b'Item Name,Quantity\n\xff\xfe,1\n',
+                          headers={'content-type': 'text/csv'})
+        assert bad.status_code == 400
+
+
+def test_list_routes_page_and_reject_bad_input(tmp_path, monkeypatch):
+    """Test list routes follow X-Next-Cursor and answer 400 for bad cursors and dates."""
+    pytest.importorskip('fastapi')
+    pytest.importorskip('httpx')
+    from fastapi.testclient import TestClient
+    from src.api import deps
+    from src.api.main import app
+    from src.api.pagination import encode_cursor
+
+    deps.close_database()
+    monkeypatch.setenv('DB_TYPE', 'sqlite')
+    monkeypatch.setenv('DB_FILE', str(tmp_path / 'pages.db'))
+    with TestClient(app) as client:
+        for i in range(5):
+            deps.get_db().add_inventory_item(f'Item {i}', i, 1, 1.0, 2.0, '')
+        names, cursor = [], None
+        while True:
+            response = client.get('/inventory', params={'limit': 2, **({'cursor': cursor} if cursor else {})})
+            names += [item['item_name'] for item in response.json()]
+            cursor = response.headers.get('X-Next-Cursor')
+            if cursor is None:
+                break
+        assert names == [f'Item {i}' for i in range(5)]
+
+        for path, cursor in (('/sales', encode_cursor(['x'])), ('/hr/employees', encode_cursor([1])),
+                             ('/inventory', encode_cursor([{'a': 1}])), ('/leads', 'not base64!')):
+            assert client.get(path, params={'cursor': cursor}).status_code == 400, path
+        for params in ({'start_date': 'garbage'}, {'end_date': '2024-13-40'}):
+            response = client.get('/sales', params=params)
+            assert response.status_code == 400 and response.json()['detail'] == 'Dates must be YYYY-MM-DD'
+
+
 # === POS SERVICE TESTS ===
 
 def test_pos_calculate_total():
@@ -160,6 +264,164 @@ def test_today_sales_total(db):
     assert total == expected
 
 
+def test_record_checkout_decrements_stock(db):
+    """Test a checkout records every line and decrements stock."""
+    inv = InventoryService(db)
+    pos = POSService(db)
+    inv.add_item('Pen', 10, 2, 0.5, 1.0)
+    inv.add_item('Pad', 5, 1, 1.0, 3.0)
+    cart = [
+        {'item_name': 'Pen', 'quantity': 3, 'price': 1.0},
+        {'item_name': 'Pad', 'quantity': 2, 'sale_price': 3.0},
+        {'item_name': 'Pen', 'quantity': 1, 'price': 1.0},
+    ]
+    assert pos.record_checkout(cart, 'admin') is True
+    assert inv.get_item('Pen')['quantity'] == 6
+    assert inv.get_item('Pad')['quantity'] == 3
+    assert pos.get_today_sales_total() == 3.0 + 6.0 + 1.0
+
+
+def test_record_checkout_rolls_back_when_short(db):
+    """Test a short line rejects the whole checkout."""
+    inv = InventoryService(db)
+    pos = POSService(db)
+    inv.add_item('Pen', 10, 2, 0.5, 1.0)
+    inv.add_item('Pad', 1, 1, 1.0, 3.0)
+    cart = [
+        {'item_name': 'Pen', 'quantity': 3, 'sale_price': 1.0},
+        {'item_name': 'Pad', 'quantity': 2, 'sale_price': 3.0},
+    ]
+    with pytest.raises(InsufficientStockError) as exc:
+        pos.record_checkout(cart, 'admin')
+    assert exc.value.item_name == 'Pad'
+    assert inv.get_item('Pen')['quantity'] == 10
+    assert pos.get_all_sales() == []
+
+
+# === EXPORT SERVICE TESTS ===
+
+def test_export_sales_csv_streams_in_date_range(db, monkeypatch):
+    """Test sales CSV export honours inclusive day bounds and arrives in chunks."""
+    import src.services.export_service as export_module
+    monkeypatch.setattr(export_module, 'EXPORT_CHUNK_BYTES', 64)
+    with db._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+            'VALUES (?, ?, 1, 2.0, 2.0, ?)',
+            [(f'2024-03-{d:02d} 12:00:00', f'Item {d}', 'admin') for d in range(1, 11)]
+        )
+    chunks = list(ExportService(db).stream_csv('sales', start_date='2024-03-03', end_date='2024-03-05'))
+    assert len(chunks) > 1
+    lines = b''.join(chunks).decode('utf-8-sig').splitlines()
+    assert lines[0].startswith('Sale ID,Sale Date,Item Name')
+    assert [line.split(',')[2] for line in lines[1:]] == ['Item 3', 'Item 4', 'Item 5']
+
+
+def test_export_inventory_round_trips_through_import(db, tmp_path):
+    """Test an inventory export (CSV and XLSX) can be re-imported unchanged."""
+    inv, exports = InventoryService(db), ExportService(db)
+    inv.add_item('Pen', 5, 2, 1.0, 2.5, 'blue, fine')
+    inv.add_item('Pad', 3, 1, 0.5, 1.0)
+    for suffix in ('csv', 'xlsx'):
+        if suffix == 'xlsx':
+            pytest.importorskip('openpyxl')
+        path = tmp_path / f'inventory.{suffix}'
+        exports.write_file('inventory', str(path))
+        if suffix == 'csv':
+            import csv
+            with open(path, encoding='utf-8-sig', newline='') as f:
+                report = inv.bulk_upsert(csv.DictReader(f))
+        else:
+            from src.services.inventory_service import iter_xlsx_rows
+            report = inv.bulk_upsert(iter_xlsx_rows(str(path)))
+        assert report == {'imported': 2, 'skipped': 0, 'errors': []}
+    assert inv.get_item('Pen')['description'] == 'blue, fine'
+
+
+def test_export_payroll_includes_employee(db):
+    """Test payroll export rows carry the employee's number and name."""
+    db.add_employee('EMP1', 'Ana', '2024-01-01', 'Dev', '', 'Tech', '', '', '', '', '')
+    emp_id = db.get_all_employees()[0][0]
+    db.add_payroll(emp_id, '2024-01-01', '2024-01-31', 1000, 0, 0, 0, 0, 1000, 900, 'Paid', '2024-02-01')
+    lines = b''.join(ExportService(db).stream_csv('payroll')).decode('utf-8-sig').splitlines()
+    assert lines[1].split(',')[2:4] == ['EMP1', 'Ana']
+
+
+# === ANALYTICS SERVICE TESTS ===
+
+def test_dashboard_kpis(db):
+    """Test SQL-side dashboard KPIs."""
+    inv = InventoryService(db)
+    inv.add_item('Pen', 10, 2, 0.5, 1.0)
+    inv.add_item('Pad', 1, 3, 2.0, 4.0)
+    with db._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+            'VALUES (?, ?, 1, ?, ?, ?)',
+            [('2024-03-20 09:00:00', 'Pen', 30.0, 30.0, 'admin'),
+             ('2024-03-20 10:00:00', 'Pad', 10.0, 10.0, 'admin'),
+             ('2024-03-15 10:00:00', 'Pen', 20.0, 20.0, 'admin'),
+             ('2024-03-08 10:00:00', 'Pen', 25.0, 25.0, 'admin')]
+        )
+    crm = CRMService(db)
+    crm.add_lead(None, 'Deal A', stage='Won', value=100)
+    crm.add_lead(None, 'Deal B', stage='Lost', value=50)
+    crm.add_lead(None, 'Deal C', stage='Proposal', value=25)
+    crm.add_lead(None, 'Deal D', stage='Won', value=10)
+
+    kpis = AnalyticsService(db).get_dashboard_kpis(today='2024-03-20')
+    assert kpis == {
+        'today_sales': 40.0,
+        'inventory_value': 7.0,
+        'low_stock_count': 1,
+        'total_items': 2,
+        'avg_daily_sales': round(85.0 / 3, 2),
+        'growth_pct': 140.0,
+        'pipeline_value': 135.0,
+        'conversion_rate': 66.7,
+    }
+
+
+def test_reorder_recommendations_follow_weekday_demand(db):
+    """Test reorder points include the weekly peak and well-stocked items are skipped."""
+    inv = InventoryService(db)
+    inv.add_item('Pen', 5, 2, 0.5, 1.0)
+    inv.add_item('Pad', 500, 2, 1.0, 3.0)
+    rows = []
+    for day in range(1, 29):                       # 2024-01-01 is a Monday
+        pen_qty = 10 if day % 7 == 6 else 2        # Saturdays peak
+        rows.append((f'2024-01-{day:02d} 10:00:00', 'Pen', pen_qty, 1.0, pen_qty, 'admin'))
+        rows.append((f'2024-01-{day:02d} 10:00:00', 'Pad', 1, 3.0, 3.0, 'admin'))
+    with db._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+            'VALUES (?, ?, ?, ?, ?, ?)', rows
+        )
+    recs = AnalyticsService(db).get_reorder_recommendations('2024-01-01', '2024-01-28', window_days=7)
+    assert [r['item_name'] for r in recs] == ['Pen']
+    pen = recs[0]
+    assert pen['avg_daily'] == round((4 * 10 + 24 * 2) / 28, 2)
+    # One week of lead time holds six ordinary days and one peak: 6*2 + 10
+    assert 21.5 <= pen['reorder_point'] <= 24
+    assert pen['recommended_qty'] >= pen['reorder_point'] - pen['current_qty']
+
+
+def test_demand_matrix_and_plan_are_vectorised():
+    """Test the forecasting helpers on a hand-built matrix."""
+    import numpy as np
+    from src.services import forecasting
+    names, matrix = forecasting.demand_matrix(
+        [('2024-01-01', 'B', 2), ('2024-01-03', 'A', 5), ('2024-01-03', 'B', 1), ('2023-12-31', 'A', 9)],
+        '2024-01-01', 3,
+    )
+    assert list(names) == ['A', 'B']
+    assert matrix.tolist() == [[0, 0, 5], [2, 0, 1]]
+    flat = np.full((2, 21), 3.0)
+    plan = forecasting.reorder_plan(flat, 0, np.array([0.0, 100.0]), lead_time_days=7, cover_days=7)
+    assert np.allclose(plan['reorder_point'], 21.0)
+    assert plan['recommended_qty'].tolist() == [42, 0]
+
+
 # === HR SERVICE TESTS ===
 
 def test_add_employee(db):
@@ -247,3 +509,40 @@ def test_log_activity(db):
     activity.log('admin', 'Test Action', 'This is a test')
     logs = activity.get_activity_log('admin')
     assert len(logs) > 0
+
+
+def test_buffered_activity_log_writes_in_batches(db, monkeypatch):
+    """Test buffered entries are written by the background writer, in order and in batches."""
+    activity = ActivityService(db)
+    batches = []
+    write = db.log_activities
+    monkeypatch.setattr(db, 'log_activities', lambda entries: batches.append(len(entries)) or write(entries))
+    activity.writer.interval = 0.01
+    for i in range(5):
+        activity.log('admin', 'Step', str(i))
+    deadline = time.monotonic() + 5
+    while activity.writer.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    activity.flush()   # waits for a batch the writer thread may still be committing
+    assert activity.writer.pending() == 0 and sum(batches) == 5 and len(batches) < 5
+    steps = sorted(row for row in db.get_activity_log('admin') if row[3] == 'Step')
+    assert [row[4] for row in steps] == ['0', '1', '2', '3', '4']
+
+
+def test_activity_log_backpressure_and_modes(db, monkeypatch):
+    """Test a failing database caps the backlog, and sync mode writes immediately."""
+    activity = ActivityService(db)
+    activity.writer.interval = 60
+    activity.writer.max_pending = 3
+    monkeypatch.setattr(db, 'log_activities', lambda entries: -1)
+    for i in range(5):
+        activity.log('admin', 'Step', str(i))
+    assert activity.writer.pending() == 3 and activity.writer.dropped == 2
+    monkeypatch.undo()
+    assert activity.writer.flush() == 3
+
+    sync = ActivityService(db, durability='sync')
+    sync.log('admin', 'Now', 'committed')
+    assert any(row[3] == 'Now' for row in db.get_activity_log('admin'))
+    with pytest.raises(ValueError):
+        ActivityService(db, durability='later')
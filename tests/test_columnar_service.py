@@ -0,0 +1,82 @@
+"""Tests for the incremental Parquet export and columnar analytics mode."""
+import os
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from src.db import SQLiteAdapter
+from src.services import AnalyticsService, ColumnarExportService, InventoryService
+from src.services.columnar_service import read_latest
+
+
+@pytest.fixture()
+def db(tmp_path):
+    """Create temporary database for testing."""
+    return SQLiteAdapter(str(tmp_path / "columnar.db"))
+
+
+def _insert_sales(db, rows):
+    with db._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [(day, item, qty, price, qty * price, 'admin') for day, item, qty, price in rows]
+        )
+
+
+def test_export_is_incremental_and_split_by_month(db, tmp_path):
+    """Test a second run appends only new sales to the right month files."""
+    root = str(tmp_path / "snap")
+    exporter = ColumnarExportService(db, root)
+    _insert_sales(db, [('2024-02-28 10:00:00', 'Pen', 1, 2.0), ('2024-03-01 09:00:00', 'Pad', 2, 3.0)])
+    assert exporter.export(('sales',)) == {'sales': 2}
+    assert sorted(os.listdir(os.path.join(root, 'sales'))) == ['2024-02.parquet', '2024-03.parquet']
+
+    assert exporter.export(('sales',)) == {'sales': 0}
+    _insert_sales(db, [('2024-03-02 09:00:00', 'Pen', 4, 2.0)])
+    assert exporter.export(('sales',)) == {'sales': 1}
+    assert exporter.load_watermarks()['sales'] == 3
+
+    import pyarrow.parquet as pq
+    march = pq.read_table(os.path.join(root, 'sales', '2024-03.parquet'))
+    assert march['item_name'].to_pylist() == ['Pad', 'Pen']
+
+
+def test_columnar_analytics_match_sqlite(db, tmp_path):
+    """Test trend and summary from the snapshots equal the SQLite answers."""
+    _insert_sales(db, [
+        ('2024-03-01 09:00:00', 'Pen', 3, 1.0), ('2024-03-01 17:00:00', 'Pad', 1, 4.0),
+        ('2024-03-05 12:00:00', 'Pen', 2, 1.0), ('2024-03-31 23:59:59', 'Ink', 3, 2.5),
+        ('2024-04-01 00:00:00', 'Pen', 9, 1.0), ('2024-02-29 12:00:00', 'Pad', 7, 4.0),
+    ])
+    root = str(tmp_path / "snap")
+    ColumnarExportService(db, root).export()
+    sqlite_mode = AnalyticsService(db)
+    columnar_mode = AnalyticsService(db, source='columnar', columnar_dir=root)
+    for start, end in (('2024-03-01', '2024-03-31'), ('2024-01-01', '2024-12-31'), ('2025-01-01', '2025-01-31')):
+        assert columnar_mode.get_sales_trend(start, end) == [tuple(r) for r in sqlite_mode.get_sales_trend(start, end)]
+        assert (columnar_mode.get_sales_summary(start, end)
+                == [tuple(r) for r in sqlite_mode.get_sales_summary(start, end)])
+
+
+def test_read_latest_keeps_newest_inventory_version(db, tmp_path):
+    """Test re-exported inventory rows collapse to their newest version."""
+    inv = InventoryService(db)
+    inv.add_item('Pen', 10, 2, 0.5, 1.0)
+    inv.add_item('Pad', 5, 1, 1.0, 3.0)
+    root = str(tmp_path / "snap")
+    exporter = ColumnarExportService(db, root)
+    exporter.export(('inventory',))
+    with db._get_conn() as (conn, cursor):
+        cursor.execute("UPDATE inventory SET quantity = 4, updated_at = '2999-01-01 00:00:00' "
+                       "WHERE item_name = 'Pen'")
+    exporter.export(('inventory',))
+    latest = read_latest(root, 'inventory')
+    assert dict(zip(latest['item_name'].to_pylist(), latest['quantity'].to_pylist())) == {'Pen': 4, 'Pad': 5}
+
+
+def test_unknown_analytics_source_rejected(db):
+    """Test an unknown source fails fast instead of silently using SQLite."""
+    with pytest.raises(ValueError):
+        AnalyticsService(db, source='duckdb')
@@ -0,0 +1,149 @@
+"""Tests for the queued email sender against a local debugging SMTP server."""
+import socket
+import socketserver
+import threading
+
+import pytest
+from src.db import SQLiteAdapter
+from src.services import EmailService, EmailOutbox
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept mail; refuses recipients starting with 'bounce'."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.sessions += 1
+        self.reply("220 localhost test server")
+        message = None
+        while True:
+            line = self.rfile.readline().decode().rstrip("\r\n")
+            verb = line[:4].upper()
+            if not line or verb == "QUIT":
+                self.reply("221 bye")
+                return
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                message = {"to": []}
+                self.reply("250 ok")
+            elif verb == "RCPT":
+                address = line.split(":", 1)[1].strip("<> ")
+                if address.startswith("bounce"):
+                    self.reply("550 no such user")
+                else:
+                    message["to"].append(address)
+                    self.reply("250 ok")
+            elif verb == "DATA":
+                self.reply("354 go ahead")
+                while self.rfile.readline().rstrip(b"\r\n") != b".":
+                    pass
+                server.received.append(message)
+                self.reply("250 queued")
+            else:
+                self.reply("250 ok")   # RSET, NOOP
+
+
+@pytest.fixture()
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.sessions, server.received = 0, []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def db(tmp_path, smtp_server):
+    adapter = SQLiteAdapter(str(tmp_path / "test_email.db"))
+    adapter.save_email_config("127.0.0.1", smtp_server.server_address[1], "shop@example.com",
+                              "", "owner@example.com")
+    yield adapter
+    adapter.close()
+
+
+def _outbox(db, **kwargs):
+    options = dict(starttls=False, rate_per_minute=0, retry_base_seconds=0, timeout=5)
+    options.update(kwargs)
+    return EmailOutbox(db, **options)
+
+
+def test_batch_is_sent_over_one_session(db, smtp_server):
+    """Test queued mail is delivered in one SMTP session and marked sent."""
+    service = EmailService(db)
+    ids = [service.queue_email(f"Note {i}", "body") for i in range(3)]
+    assert service.send_low_stock_alerts([("Pen", 1, 5)])
+    assert service.get_outbox_counts() == {'pending': 4}
+    assert smtp_server.sessions == 0   # queueing never touches the server
+
+    assert _outbox(db).send_pending() == {'sent': 4, 'retrying': 0, 'failed': 0}
+    assert smtp_server.sessions == 1
+    assert [m["to"] for m in smtp_server.received] == [["owner@example.com"]] * 4
+    status = service.get_email_status(ids[0])
+    assert status["status"] == "sent" and status["attempts"] == 1
+
+
+def test_failures_retry_then_give_up(db, smtp_server):
+    """Test a refused message is retried with backoff and then marked failed."""
+    service = EmailService(db)
+    bad = service.queue_email("Hello", "body", recipient="bounce@example.com")
+    good = service.queue_email("Hello", "body", recipient="ok@example.com")
+    outbox = _outbox(db, max_attempts=2)
+
+    assert outbox.send_pending() == {'sent': 1, 'retrying': 1, 'failed': 0}
+    assert service.get_email_status(bad)["status"] == "pending"
+    assert outbox.send_pending() == {'sent': 0, 'retrying': 0, 'failed': 1}
+    status = service.get_email_status(bad)
+    assert status["status"] == "failed" and status["attempts"] == 2 and "550" in status["last_error"]
+    assert service.get_email_status(good)["status"] == "sent"
+
+    backoff = _outbox(db, retry_base_seconds=60, retry_max_seconds=600)
+    assert [backoff.retry_delay(n) for n in (1, 2, 3, 5)] == [60, 120, 240, 600]
+
+
+def test_worker_thread_delivers_after_wake(db, smtp_server):
+    """Test the background worker sends newly queued mail promptly."""
+    outbox = _outbox(db, poll_seconds=60)
+    service = EmailService(db, outbox=outbox)
+    outbox.start()
+    try:
+        email_id = service.queue_email("Hello", "body")
+        for _ in range(100):
+            if service.get_email_status(email_id)["status"] == "sent":
+                break
+            threading.Event().wait(0.05)
+    finally:
+        outbox.stop()
+    assert service.get_email_status(email_id)["status"] == "sent"
+
+
+def test_unreachable_server_defers_batch_without_using_attempts(db, smtp_server):
+    """Test a failed connection is tried once per batch and puts the mail back."""
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+    db.save_email_config("127.0.0.1", closed_port, "shop@example.com", "", "owner@example.com")
+    service = EmailService(db)
+    ids = [service.queue_email(f"Note {i}", "body") for i in range(3)]
+    outbox = _outbox(db, retry_base_seconds=60)
+
+    assert outbox.send_pending() == {'sent': 0, 'retrying': 0, 'failed': 0}
+    assert service.get_outbox_counts() == {'pending': 3}
+    assert all(service.get_email_status(i)["attempts"] == 0 for i in ids)
+
+    # Backing off: the next pass doesn't touch the server, even once it is back
+    db.save_email_config("127.0.0.1", smtp_server.server_address[1], "shop@example.com",
+                         "", "owner@example.com")
+    assert outbox.send_pending() == {'sent': 0, 'retrying': 0, 'failed': 0}
+    assert smtp_server.sessions == 0
+
+    outbox._resume_at = 0.0
+    assert outbox.send_pending() == {'sent': 3, 'retrying': 0, 'failed': 0}
+    assert smtp_server.sessions == 1
+    assert all(service.get_email_status(i)["attempts"] == 1 for i in ids)
@@ -0,0 +1,56 @@
+"""Tests for the in-memory inventory search index."""
+import pytest
+from src.db import SQLiteAdapter
+from src.services import InventoryService
+from src.services.item_index import item_index_for
+
+
+@pytest.fixture()
+def inv(tmp_path):
+    """Create an inventory service on a temporary database."""
+    adapter = SQLiteAdapter(str(tmp_path / "test_index.db"))
+    service = InventoryService(adapter)
+    service.add_item("Blue Pen", 10, 2, 0.5, 1.0, "ballpoint ink")
+    service.add_item("Red Pencil", 5, 2, 0.2, 0.6, "graphite")
+    service.add_item("Paper Pad", 3, 1, 1.0, 2.5, "lined, pen friendly")
+    yield service
+    adapter.close()
+
+
+def _names(rows):
+    return [row[0] for row in rows]
+
+
+def test_word_prefix_matching_and_ranking(inv):
+    """Test every query word must prefix a word, and name hits rank first."""
+    assert _names(inv.quick_search("pen")) == ["Blue Pen", "Red Pencil", "Paper Pad"]
+    assert _names(inv.quick_search("PEN bl")) == ["Blue Pen"]
+    assert _names(inv.quick_search("ink")) == ["Blue Pen"]
+    assert _names(inv.quick_search("en")) == []
+    assert _names(inv.quick_search("")) == ["Blue Pen", "Paper Pad", "Red Pencil"]
+    assert _names(inv.quick_search("p", limit=2)) == ["Blue Pen", "Paper Pad"]
+
+
+def test_index_follows_writes(inv):
+    """Test updates, inserts and deletes show up in later searches."""
+    assert _names(inv.quick_search("pad")) == ["Paper Pad"]
+    inv.update_item("Paper Pad", quantity=9, description="sticky notes")
+    inv.add_item("Sticky Tape", 4, 1, 0.3, 0.9, "")
+    assert _names(inv.quick_search("sticky")) == ["Sticky Tape", "Paper Pad"]
+    assert inv.quick_search("pad")[0][1] == 9
+    assert _names(inv.quick_search("lined")) == []
+
+    inv.delete_item("Red Pencil")
+    assert _names(inv.quick_search("pen")) == ["Blue Pen"]
+
+
+def test_index_sees_writes_from_another_process(inv, tmp_path):
+    """Test a write through a second adapter on the same file reaches the index after the recheck."""
+    assert inv.quick_search("blue pen")[0][1] == 10
+    other = SQLiteAdapter(inv.db.db_file)
+    try:
+        other.update_inventory_item("Blue Pen", quantity=3)
+    finally:
+        other.close()
+    item_index_for(inv.db).recheck_seconds = 0
+    assert inv.quick_search("blue pen")[0][1] == 3
@@ -0,0 +1,225 @@
+"""Tests for PostgresAdapter against a real server.
+
+Set BIZHUB_TEST_PG_URL (e.g. postgresql://postgres@localhost/bizhub_test) to
+run them; each test gets its own schema, dropped afterwards.
+"""
+import os
+import uuid
+
+import pytest
+
+psycopg = pytest.importorskip('psycopg')
+pytest.importorskip('psycopg_pool')
+
+from psycopg.conninfo import make_conninfo
+
+from src.core import InsufficientStockError
+from src.db import PostgresAdapter
+
+PG_URL = os.getenv('BIZHUB_TEST_PG_URL')
+
+pytestmark = pytest.mark.skipif(not PG_URL, reason='BIZHUB_TEST_PG_URL not set')
+
+
+@pytest.fixture()
+def db():
+    """PostgresAdapter on a fresh schema."""
+    schema = f'bizhub_test_{uuid.uuid4().hex[:8]}'
+    with psycopg.connect(PG_URL, autocommit=True) as conn:
+        conn.execute(f'CREATE SCHEMA {schema}')
+    adapter = PostgresAdapter(make_conninfo(PG_URL, options=f'-c search_path={schema}'), pool_size=4, min_size=1)
+    yield adapter
+    adapter.close()
+    with psycopg.connect(PG_URL, autocommit=True) as conn:
+        conn.execute(f'DROP SCHEMA {schema} CASCADE')
+
+
+def test_schema_is_migrated_once(db):
+    """Test init_database versions the schema and creates the admin user."""
+    assert db.get_schema_version() == 1
+    db.init_database()
+    assert db.get_schema_version() == 1
+    assert db.get_user_role('admin') == 'admin'
+
+
+def test_web_schema_files_are_stamped_then_migrated(db, tmp_path):
+    """Test migrations/*.sql-style files are tracked in web_schema_version apart from the adapter schema."""
+    (tmp_path / '001_widgets.sql').write_text('CREATE TABLE widgets (id BIGSERIAL PRIMARY KEY);')
+    (tmp_path / '002_gadgets.sql').write_text('CREATE TABLE gadgets (id BIGSERIAL PRIMARY KEY);')
+    assert db.stamp_web_schema(1, str(tmp_path)) == [1]
+    assert db.migrate_web_schema(str(tmp_path)) == [2]
+    assert db.migrate_web_schema(str(tmp_path)) == []
+    assert db.get_web_schema_version() == 2 and db.get_schema_version() == 1
+    with db._get_conn() as (conn, cursor):
+        cursor.execute("SELECT to_regclass('widgets'), to_regclass('gadgets')")
+        assert cursor.fetchone() == (None, 'gadgets')
+
+
+def test_inventory_search_and_pages(db):
+    """Test prefix search, ILIKE fallback and keyset pages return SQLite-shaped rows."""
+    for name in ('Blue Widget', 'Red Widget', 'Gadget'):
+        assert db.add_inventory_item(name, 5, 2, 1.0, 2.0, f'{name} description')
+    assert [r[0] for r in db.search_inventory('widg')] == ['Blue Widget', 'Red Widget']
+    assert db.get_inventory_by_name('Gadget')['quantity'] == 5
+
+    rows, after = db.get_inventory_page(limit=2)
+    assert [r[0] for r in rows] == ['Blue Widget', 'Gadget'] and after == ['Gadget']
+    rows, after = db.get_inventory_page(limit=2, after=after)
+    assert [r[0] for r in rows] == ['Red Widget'] and after is None
+
+
+def test_upsert_copies_rows_and_last_duplicate_wins(db):
+    """Test the COPY-based bulk upsert inserts, updates and de-duplicates by name."""
+    db.add_inventory_item('Bolt', 1, 0, 0.1, 0.2, 'old', 'bolt.png')
+    written = db.upsert_inventory_items([
+        ('Bolt', 10, 2, 0.1, 0.3, 'new'),
+        ('Nut', 5, 1, 0.05, 0.1, ''),
+        ('Nut', 7, 1, 0.05, 0.1, 'second'),
+    ])
+    assert written == 3
+    bolt = db.get_inventory_by_name('Bolt')
+    assert (bolt['quantity'], bolt['description'], bolt['image_path']) == (10, 'new', 'bolt.png')
+    assert db.get_inventory_by_name('Nut')['quantity'] == 7
+
+
+def test_checkout_updates_rollup_and_rolls_back_when_short(db):
+    """Test checkout is atomic and the trigger keeps the daily rollup current."""
+    db.add_inventory_item('Pen', 3, 0, 1.0, 2.0, '')
+    assert db.record_checkout([{'item_name': 'Pen', 'quantity': 2, 'sale_price': 2.0, 'total_amount': 4.0}], 'admin')
+    with pytest.raises(InsufficientStockError):
+        db.record_checkout([{'item_name': 'Pen', 'quantity': 2, 'sale_price': 2.0, 'total_amount': 4.0}], 'admin')
+    assert db.get_inventory_by_name('Pen')['quantity'] == 1
+
+    day = db.get_sales_page()[0][0][1][:10]
+    assert db.get_sales_summary_by_item(day, day) == [('Pen', 2, 4.0)]
+    assert db.rebuild_sales_rollup() == 1
+    assert db.get_dashboard_kpis(day)['today_total'] == 4.0
+
+
+def test_email_claims_skip_rows_already_claimed(db):
+    """Test two claims never hand out the same email."""
+    ids = [db.enqueue_email(f'Subject {i}', 'Body') for i in range(3)]
+    first = db.claim_emails(limit=2)
+    second = db.claim_emails(limit=2)
+    assert [r[0] for r in first] == ids[:2]
+    assert [r[0] for r in second] == ids[2:]
+    assert db.mark_email_failed(ids[0], 'timeout', retry_in_seconds=60)
+    assert db.get_queued_email(ids[0])['status'] == 'pending'
+    assert db.release_emails(ids[1:])
+    assert db.get_email_queue_counts() == {'pending': 3}
+
+
+def test_archive_moves_rows_and_reads_still_see_them(db):
+    """Test archived sales and activity rows stay readable through the range reads."""
+    with db._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+            'VALUES (%s, %s, %s, %s, %s, %s)',
+            [('2022-03-01 10:00:00', 'Old', 1, 1.0, 1.0, 'admin'),
+             ('2023-06-01 10:00:00', 'Mid', 1, 1.0, 1.0, 'admin'),
+             ('2024-02-01 10:00:00', 'New', 1, 1.0, 1.0, 'admin')]
+        )
+    assert db.log_activities([('2022-05-05 08:00:00', 'admin', 'Login', ''),
+                              ('2024-02-02 08:00:00', 'admin', 'Login', '')]) == 2
+
+    assert db.archive_rows('sales', '2024-01-01') == {2022: 1, 2023: 1}
+    assert db.archive_rows('activity_log', '2024-01-01') == {2022: 1}
+    assert db.get_archive_horizon('sales') == '2024-01-01'
+    assert [p[:3] for p in db.get_archive_partitions('sales')] == [('sales', 2022, 1), ('sales', 2023, 1)]
+
+    assert [r[2] for r in db.get_sales_between('2022-01-01', '2024-12-31')] == ['Old', 'Mid', 'New']
+    assert [r[2] for r in db.iter_sales('2023-01-01')] == ['Mid', 'New']
+    assert [r[2] for r in db.get_sales_between('2024-01-01', '2024-12-31')] == ['New']
+    assert len(db.get_activity_log()) == 2
+    assert db.get_sales_by_date('2022-03-01')[0][1] == '2022-03-01 10:00:00'
+
+
+def test_change_feed_streams_through_server_side_cursor(db):
+    """Test iter_changes streams every row past the watermark in small batches."""
+    db.upsert_inventory_items([(f'Item {i:03d}', i, 0, 1.0, 2.0, '') for i in range(25)])
+    with db._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO sales (item_name, quantity, sale_price, total_amount, username) VALUES (%s, 1, 1, 1, %s)',
+            [(f'Item {i:03d}', 'admin') for i in range(25)]
+        )
+    rows = list(db.iter_changes('sales', batch_size=10))
+    assert len(rows) == 25
+    assert [r[0] for r in db.iter_changes('sales', since=rows[19][0], batch_size=10)] == [r[0] for r in rows[20:]]
+
+
+def test_write_listeners_see_committed_tables(db):
+    """Test listeners get the written tables (and derived ones) once per commit."""
+    seen = []
+    db.add_write_listener(seen.append)
+    db.record_sale('Pen', 1, 2.0, 2.0, 'admin')
+    db.log_activities([('2024-01-01 00:00:00', 'admin', 'Sale', '')])
+    assert seen == [{'sales', 'sales_daily_item'}, {'activity_log'}]
+
+
+def _async_adapter(db):
+    """AsyncPGAdapter on db's test schema."""
+    pytest.importorskip('asyncpg')
+    from src.db import AsyncPGAdapter
+
+    with db._get_conn() as (conn, cursor):
+        cursor.execute('SELECT current_schema()')
+        schema = cursor.fetchone()[0]
+    # asyncpg passes unknown URL parameters on as server settings
+    return AsyncPGAdapter(db, f"{PG_URL}{'&' if '?' in PG_URL else '?'}search_path={schema}", pool_size=2, min_size=1)
+
+
+def test_async_adapter_matches_sync(db):
+    """Test the asyncpg adapter's checkout and reads agree with the sync adapter."""
+    import asyncio
+
+    adb = _async_adapter(db)
+    db.add_inventory_item('Pen', 3, 0, 1.0, 2.0, '')
+    line = {'item_name': 'Pen', 'quantity': 2, 'sale_price': 2.0, 'total_amount': 4.0}
+
+    async def run():
+        try:
+            assert await adb.record_checkout([line], 'admin')
+            with pytest.raises(InsufficientStockError):
+                await adb.record_checkout([line], 'admin')
+            return await adb.get_sales_page(), await adb.get_dashboard_kpis(), await adb.get_crm_leads()
+        finally:
+            await adb.close()
+
+    page, kpis, leads = asyncio.run(run())
+    assert db.get_inventory_by_name('Pen')['quantity'] == 1
+    assert page == db.get_sales_page()
+    assert kpis == db.get_dashboard_kpis() and kpis['today_total'] == 4.0
+    assert leads == db.get_crm_leads() == []
+
+
+def test_async_sales_pages_read_through_the_archive(db):
+    """Test asyncpg sales pages walk past the archive horizon like the sync adapter's."""
+    import asyncio
+
+    with db._get_conn() as (conn, cursor):
+        cursor.executemany(
+            'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+            'VALUES (%s, %s, %s, %s, %s, %s)',
+            [(f'{year}-0{month}-01 10:00:00', f'Item {year}-{month}', 1, 1.0, 1.0, 'admin')
+             for year in (2022, 2023, 2024) for month in (1, 2)]
+        )
+    assert db.archive_rows('sales', '2024-01-01') == {2022: 2, 2023: 2}
+    adb = _async_adapter(db)
+
+    async def walk(**filters):
+        pages, after = [], None
+        try:
+            while True:
+                rows, after = await adb.get_sales_page(limit=3, after=after, **filters)
+                pages.append(rows)
+                if after is None:
+                    return pages
+        finally:
+            await adb.close()
+
+    pages = asyncio.run(walk())
+    assert [len(p) for p in pages] == [3, 3]
+    assert pages[0] == db.get_sales_page(limit=3)[0]
+    assert [r[2] for r in pages[1]] == ['Item 2023-1', 'Item 2022-2', 'Item 2022-1']
+    assert [r[2] for r in asyncio.run(walk(start_date='2023-02-01'))[0]] == [
+        'Item 2024-2', 'Item 2024-1', 'Item 2023-2']
@@ -0,0 +1,109 @@
+"""Tests for the service read cache and its write invalidation."""
+import sqlite3
+
+import pytest
+from src.db import SQLiteAdapter
+from src.services import AuthService, CRMService, CompanyService, InventoryService, POSService
+from src.services.cache import TTLCache, cache_for
+
+
+@pytest.fixture()
+def db(tmp_path):
+    """Create temporary database for testing."""
+    adapter = SQLiteAdapter(str(tmp_path / "test_cache.db"))
+    yield adapter
+    adapter.close()
+
+
+def test_repeat_reads_are_cache_hits(db):
+    """Test a second identical read is served without touching the database."""
+    inventory = InventoryService(db)
+    inventory.add_item('Widget', 5, 1, 1.0, 2.0)
+    assert len(inventory.get_all_items()) == 1
+    calls = []
+    with db._get_conn() as (conn, _):
+        conn.set_trace_callback(calls.append)
+        try:
+            assert len(inventory.get_all_items()) == 1
+        finally:
+            conn.set_trace_callback(None)
+    assert calls == []
+    assert cache_for(db).stats()['hits'] >= 1
+
+
+def test_write_invalidates_only_its_tables(db):
+    """Test a committed write drops entries for that table and keeps others."""
+    inventory, company = InventoryService(db), CompanyService(db)
+    company.save_info('Acme')
+    inventory.get_all_items()
+    company.get_info()
+    inventory.add_item('Widget', 5, 1, 1.0, 2.0)
+    assert [r[0] for r in inventory.get_all_items()] == ['Widget']
+    misses = cache_for(db).stats()['misses']
+    assert company.get_info()['company_name'] == 'Acme'
+    assert cache_for(db).stats()['misses'] == misses
+
+
+def test_checkout_invalidates_inventory(db):
+    """Test stock changes made inside a multi-table transaction are seen."""
+    inventory = InventoryService(db)
+    inventory.add_item('Widget', 5, 1, 1.0, 2.0)
+    assert inventory.get_item('Widget')['quantity'] == 5
+    POSService(db).record_checkout([{'item_name': 'Widget', 'quantity': 2, 'sale_price': 2.0}], 'admin')
+    assert inventory.get_item('Widget')['quantity'] == 3
+
+
+def test_rolled_back_write_keeps_cache(db):
+    """Test a rolled-back transaction does not invalidate anything."""
+    auth = AuthService(db)
+    assert auth.get_user_role('admin') == 'admin'
+    with pytest.raises(RuntimeError):
+        with db._get_conn() as (conn, cursor):
+            cursor.execute("UPDATE users SET role = 'user' WHERE username = 'admin'")
+            raise RuntimeError("boom")
+    size = cache_for(db).stats()['size']
+    assert auth.is_admin('admin') is True
+    assert cache_for(db).stats()['size'] == size
+
+
+def test_cached_results_are_copies(db):
+    """Test mutating a returned list does not corrupt the cached value."""
+    crm = CRMService(db)
+    crm.add_lead(None, 'Deal', value=100)
+    leads = crm.get_leads()
+    leads.clear()
+    assert len(crm.get_leads()) == 1
+
+
+def test_external_write_seen_after_ttl(db):
+    """Test writes from another connection show up once the TTL lapses."""
+    inventory = InventoryService(db)
+    cache = cache_for(db)
+    cache.ttl = 0
+    assert inventory.get_all_items() == []
+    other = sqlite3.connect(db.db_file)
+    other.execute("INSERT INTO inventory (item_name, quantity) VALUES ('Outside', 1)")
+    other.commit()
+    other.close()
+    assert [r[0] for r in inventory.get_all_items()] == ['Outside']
+
+
+def test_disabled_cache_always_loads():
+    """Test a disabled cache calls the loader every time and stores nothing."""
+    cache = TTLCache(enabled=False)
+    calls = []
+    for _ in range(2):
+        cache.get_or_load('k', ('t',), lambda: calls.append(1))
+    assert len(calls) == 2
+    assert cache.stats()['size'] == 0
+
+
+def test_lru_evicts_oldest():
+    """Test the least recently used entry is evicted at capacity."""
+    cache = TTLCache(max_size=2)
+    cache.get_or_load('a', ('t',), lambda: 1)
+    cache.get_or_load('b', ('t',), lambda: 2)
+    cache.get_or_load('a', ('t',), lambda: 1)
+    cache.get_or_load('c', ('t',), lambda: 3)
+    assert cache.get_or_load('a', ('t',), lambda: 'reloaded') == 1
+    assert cache.get_or_load('b', ('t',), lambda: 'reloaded') == 'reloaded'
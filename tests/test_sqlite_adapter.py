@@ -0,0 +1,454 @@
+"""Tests for SQLiteAdapter internals: pooling, storage and query behaviour."""
+import re
+import sqlite3
+import threading
+
+import pytest
+from src.db import SQLiteAdapter
+from src.db.migrations import (
+    Migration, SQL_MIGRATIONS_TABLE, migrate, stamp, current_version, load_sql_migrations,
+)
+from src.db.sqlite_schema import MIGRATIONS
+
+
+@pytest.fixture()
+def db(tmp_path):
+    """Create temporary database for testing."""
+    adapter = SQLiteAdapter(str(tmp_path / "test_adapter.db"))
+    yield adapter
+    adapter.close()
+
+
+# === CONNECTION POOL TESTS ===
+
+def test_pool_reuses_connection_per_thread(db):
+    """Test the same thread gets the same connection back."""
+    with db._get_conn() as (conn1, _):
+        pass
+    with db._get_conn() as (conn2, _):
+        pass
+    assert conn1 is conn2
+
+
+def test_pool_gives_each_thread_its_own_connection(db):
+    """Test worker threads do not share a connection."""
+    seen = []
+
+    def worker():
+        with db._get_conn() as (conn, _):
+            seen.append(conn)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with db._get_conn() as (main_conn, _):
+        pass
+    assert len({id(c) for c in seen + [main_conn]}) == 4
+
+
+def test_pool_nested_blocks_commit_once(db):
+    """Test an exception in the outer block rolls back inner writes too."""
+    with pytest.raises(RuntimeError):
+        with db._get_conn() as (conn, cursor):
+            db.add_inventory_item('Nested', 1, 0, 1.0, 2.0, '')
+            raise RuntimeError("boom")
+    assert db.get_inventory_by_name('Nested') is None
+
+
+def test_pool_replaces_broken_connection(db):
+    """Test a closed connection is detected by the health check and reopened."""
+    db._pool.health_check_interval = 0
+    with db._get_conn() as (conn, _):
+        pass
+    conn.close()
+    assert db.add_inventory_item('Healthy', 1, 0, 1.0, 2.0, '') is True
+    assert db.get_inventory_by_name('Healthy')['quantity'] == 1
+
+
+def test_close_shuts_down_pool(tmp_path):
+    """Test close() releases connections and refuses further work."""
+    adapter = SQLiteAdapter(str(tmp_path / "closed.db"))
+    adapter.close()
+    assert adapter._pool.stats()['size'] == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        with adapter._get_conn():
+            pass
+
+
+
+def test_close_removes_wal_after_many_short_threads(tmp_path):
+    """Test connections of finished threads are closed, even when a new thread reuses the ident."""
+    adapter = SQLiteAdapter(str(tmp_path / "threads.db"))
+    for i in range(6):
+        worker = threading.Thread(target=adapter.add_inventory_item, args=(f'Item {i}', 1, 1, 1.0, 2.0, ''))
+        worker.start()
+        worker.join()
+    adapter.close()
+    assert not (tmp_path / "threads.db-wal").exists()
+
+
+# === STORAGE PROFILE TESTS ===
+
+def test_default_profile_enables_wal(db):
+    """Test every pooled connection gets the WAL storage profile."""
+    with db._get_conn() as (conn, cursor):
+        assert cursor.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert cursor.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+        assert cursor.execute('PRAGMA busy_timeout').fetchone()[0] == 5000
+
+
+def test_legacy_profile_keeps_rollback_journal(tmp_path):
+    """Test the legacy profile leaves SQLite's rollback journal in place."""
+    adapter = SQLiteAdapter(str(tmp_path / "legacy.db"), storage_profile='legacy')
+    with adapter._get_conn() as (conn, cursor):
+        assert cursor.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+    adapter.close()
+
+
+def test_unknown_profile_rejected(tmp_path):
+    """Test an unknown storage profile name raises ValueError."""
+    with pytest.raises(ValueError):
+        SQLiteAdapter(str(tmp_path / "bad.db"), storage_profile='turbo')
+
+
+def test_write_retries_while_database_locked(tmp_path):
+    """Test a write waits out another process's lock instead of failing."""
+    path = str(tmp_path / "locked.db")
+    adapter = SQLiteAdapter(path, busy_timeout_ms=1)
+    blocker = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    blocker.execute('BEGIN IMMEDIATE')
+    timer = threading.Timer(0.2, blocker.rollback)
+    timer.start()
+    try:
+        assert adapter.add_inventory_item('Contended', 1, 0, 1.0, 2.0, '') is True
+    finally:
+        timer.join()
+        blocker.close()
+        adapter.close()
+
+
+# === SALES DATE-RANGE TESTS ===
+
+def _insert_sale(db, sale_date, item_name='Widget', quantity=1, price=10.0):
+    with db._get_conn() as (conn, cursor):
+        cursor.execute(
+            'INSERT INTO sales (sale_date, item_name, quantity, sale_price, total_amount, username) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (sale_date, item_name, quantity, price, quantity * price, 'admin')
+        )
+
+
+def _captured_plan(db, call, table='sales'):
+    """Run call() and return the EXPLAIN QUERY PLAN details of its query on table."""
+    statements = []
+    with db._get_conn() as (conn, cursor):
+        conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+        sql = next(s for s in statements if re.search(rf'FROM {table}\b', s))
+        return ' | '.join(row[3] for row in cursor.execute('EXPLAIN QUERY PLAN ' + sql))
+
+
+def test_sales_day_bounds_are_inclusive(db):
+    """Test date ranges include the whole of the first and last day only."""
+    _insert_sale(db, '2024-03-09 23:59:59')
+    _insert_sale(db, '2024-03-10 00:00:00')
+    _insert_sale(db, '2024-03-11 23:59:59')
+    _insert_sale(db, '2024-03-12 00:00:00')
+    assert len(db.get_sales_by_date('2024-03-10')) == 1
+    assert len(db.get_sales_between('2024-03-10', '2024-03-11')) == 2
+    assert db.get_sales_trend_by_day('2024-03-10', '2024-03-11') == [('2024-03-10', 10.0), ('2024-03-11', 10.0)]
+    assert db.get_sales_summary_by_item('2024-03-10', '2024-03-11') == [('Widget', 2, 20.0)]
+
+
+@pytest.mark.parametrize("method", ['get_sales_summary_by_item', 'get_sales_trend_by_day'])
+def test_sales_reports_search_rollup(db, method):
+    """Test report queries range-search the daily rollup instead of raw sales."""
+    plan = _captured_plan(db, lambda: getattr(db, method)('2024-03-01', '2024-03-31'),
+                          table='sales_daily_item')
+    assert 'SEARCH sales_daily_item USING PRIMARY KEY (sale_day>? AND sale_day<?)' in plan
+
+
+def test_rollup_rebuild_uses_covering_index(db):
+    """Test a ranged rollup rebuild reads sales through the covering index."""
+    plan = _captured_plan(db, lambda: db.rebuild_sales_rollup('2024-03-01', '2024-03-31'))
+    assert 'SEARCH sales USING COVERING INDEX idx_sales_date_cover' in plan
+
+
+@pytest.mark.parametrize("call", [
+    lambda db: db.get_sales_by_date('2024-03-10'),
+    lambda db: db.get_sales_between('2024-03-01', '2024-03-31'),
+])
+def test_sales_lookups_search_date_index(db, call):
+    """Test row lookups by date use an index range search."""
+    plan = _captured_plan(db, lambda: call(db))
+    assert 'SEARCH sales USING INDEX idx_sales_date_cover (sale_date>? AND sale_date<?)' in plan
+
+
+# === DAILY ROLLUP TESTS ===
+
+def _rollup(db):
+    with db._get_conn() as (conn, cursor):
+        return cursor.execute(
+            'SELECT sale_day, item_name, total_qty, total_amount, txn_count '
+            'FROM sales_daily_item ORDER BY sale_day, item_name'
+        ).fetchall()
+
+
+def test_record_sale_updates_rollup(db):
+    """Test each recorded sale is folded into the daily rollup."""
+    db.record_sale('Widget', 2, 5.0, 10.0, 'admin')
+    db.record_sale('Widget', 3, 5.0, 15.0, 'admin')
+    db.record_sale('Gadget', 1, 7.0, 7.0, 'admin')
+    rows = {r[1]: r[2:] for r in _rollup(db)}
+    assert rows == {'Widget': (5, 25.0, 2), 'Gadget': (1, 7.0, 1)}
+
+
+def test_rebuild_rollup_matches_raw_sales(db):
+    """Test rebuilding repairs a rollup that drifted from the sales table."""
+    _insert_sale(db, '2024-03-10 09:00:00', quantity=2)
+    _insert_sale(db, '2024-03-11 09:00:00', quantity=1)
+    with db._get_conn() as (conn, cursor):
+        cursor.execute("UPDATE sales_daily_item SET total_qty = 99")
+    assert db.rebuild_sales_rollup('2024-03-10', '2024-03-10') == 1
+    assert _rollup(db) == [('2024-03-10', 'Widget', 2, 20.0, 1), ('2024-03-11', 'Widget', 99, 10.0, 1)]
+    db.rebuild_sales_rollup()
+    assert _rollup(db) == [('2024-03-10', 'Widget', 2, 20.0, 1), ('2024-03-11', 'Widget', 1, 10.0, 1)]
+
+
+def test_rollup_backfilled_for_existing_database(tmp_path):
+    """Test opening a database created before the rollup backfills it."""
+    path = str(tmp_path / "old.db")
+    adapter = SQLiteAdapter(path)
+    _insert_sale(adapter, '2024-03-10 09:00:00', quantity=4)
+    with adapter._get_conn() as (conn, cursor):
+        cursor.execute('DROP TRIGGER trg_sales_daily_item_insert')
+        cursor.execute('DROP TABLE sales_daily_item')
+        # Databases from before the rollup also predate schema versioning
+        cursor.execute('DROP TABLE schema_version')
+    adapter.close()
+    reopened = SQLiteAdapter(path)
+    assert reopened.get_sales_summary_by_item('2024-03-10', '2024-03-10') == [('Widget', 4, 40.0)]
+    reopened.close()
+
+
+def test_database_at_baseline_gains_later_schema(tmp_path):
+    """Test a database stamped at migration 1 gets every later object on open."""
+    path = str(tmp_path / "baseline.db")
+    adapter = SQLiteAdapter(path)
+    _insert_sale(adapter, '2024-03-10 09:00:00', quantity=4)
+    later = ['sales_daily_item', 'trg_sales_daily_item_insert', 'idx_sales_date_cover',
+             'idx_employees_name', 'idx_crm_contacts_name', 'idx_visitors_name',
+             'idx_crm_leads_created', 'email_queue', 'idx_email_queue_due',
+             'archive_state', 'archive_partitions']
+    with adapter._get_conn() as (conn, cursor):
+        cursor.execute('DROP TRIGGER trg_sales_daily_item_insert')
+        for table in ('sales_daily_item', 'email_queue', 'archive_state', 'archive_partitions'):
+            cursor.execute(f'DROP TABLE {table}')
+        for index in ('idx_sales_date_cover', 'idx_employees_name', 'idx_crm_contacts_name',
+                      'idx_visitors_name', 'idx_crm_leads_created'):
+            cursor.execute(f'DROP INDEX {index}')
+        cursor.execute('CREATE INDEX idx_sales_date ON sales(sale_date)')
+        cursor.execute('DELETE FROM schema_version WHERE version > 1')
+    adapter.close()
+
+    reopened = SQLiteAdapter(path)
+    assert reopened.get_schema_version() == MIGRATIONS[-1].version
+    with reopened._get_conn() as (conn, cursor):
+        cursor.execute('SELECT name FROM sqlite_master')
+        names = {row[0] for row in cursor.fetchall()}
+    assert set(later) <= names
+    assert 'idx_sales_date' not in names
+    assert reopened.get_sales_summary_by_item('2024-03-10', '2024-03-10') == [('Widget', 4, 40.0)]
+    reopened.close()
+
+
+# === KEYSET PAGINATION TESTS ===
+
+def _walk(fetch, **kwargs):
+    """Follow next_after cursors until exhausted; return all rows and page count."""
+    rows, after, pages = [], None, 0
+    while True:
+        page, after = fetch(after=after, **kwargs)
+        rows.extend(page)
+        pages += 1
+        if after is None:
+            return rows, pages
+
+
+def test_sales_pages_cover_all_rows_once(db):
+    """Test sales pages are newest first, with ties broken by id and no gaps."""
+    for i in range(7):
+        _insert_sale(db, '2024-03-10 12:00:00' if i < 4 else f'2024-03-1{i} 08:00:00', quantity=i + 1)
+    rows, pages = _walk(db.get_sales_page, limit=3)
+    assert pages == 3
+    assert [r[0] for r in rows] == [7, 6, 5, 4, 3, 2, 1]
+
+
+def test_sales_page_filters(db):
+    """Test date, user and item filters are applied in SQL."""
+    _insert_sale(db, '2024-03-09 10:00:00', item_name='Pen')
+    _insert_sale(db, '2024-03-10 10:00:00', item_name='Pen')
+    _insert_sale(db, '2024-03-10 11:00:00', item_name='Pad')
+    rows, after = db.get_sales_page(start_date='2024-03-10', end_date='2024-03-10', item_name='Pen')
+    assert [r[1] for r in rows] == ['2024-03-10 10:00:00']
+    assert after is None
+    assert db.get_sales_page(username='nobody')[0] == []
+
+
+def test_pages_raise_on_malformed_input(db):
+    """Test a cursor of the wrong shape or a bad date raises instead of reading as an empty page."""
+    _insert_sale(db, '2024-03-10 10:00:00')
+    for after in (['x'], [1, 2, 3], [['2024-03-10'], 1], [True, 1]):
+        with pytest.raises(ValueError):
+            db.get_sales_page(after=after)
+    with pytest.raises(ValueError):
+        db.get_employees_page(after=[1])
+    with pytest.raises(ValueError):
+        db.get_sales_page(start_date='garbage')
+
+
+def test_inventory_and_contact_pages(db):
+    """Test name-ordered pages for inventory and contacts, including duplicate names."""
+    for name in ['Delta', 'Alpha', 'Charlie', 'Bravo']:
+        db.add_inventory_item(name, 1, 5 if name < 'C' else 0, 1.0, 2.0, '')
+    items, _ = _walk(db.get_inventory_page, limit=3)
+    assert [r[0] for r in items] == ['Alpha', 'Bravo', 'Charlie', 'Delta']
+    low, _ = db.get_inventory_page(low_stock=True)
+    assert [r[0] for r in low] == ['Alpha', 'Bravo']
+
+    for name in ['Sam', 'Alex', 'Sam', 'Sam']:
+        db.add_crm_contact(name)
+    contacts, pages = _walk(db.get_crm_contacts_page, limit=2)
+    assert pages == 2
+    assert [(c[1], c[0]) for c in contacts] == [('Alex', 2), ('Sam', 1), ('Sam', 3), ('Sam', 4)]
+
+
+def test_pages_with_search(db):
+    """Test the search filters used by the desktop timeline and card grids."""
+    _insert_sale(db, '2024-03-10 10:00:00', item_name='Blue Pen')
+    _insert_sale(db, '2024-03-11 10:00:00', item_name='Pad')
+    assert [r[2] for r in db.get_sales_page(search='pen')[0]] == ['Blue Pen']
+
+    db.add_employee('E2', 'Zed', '2024-01-01', 'Clerk', '', 'Ops', 'zed@x.io', '', '', '', '')
+    db.add_employee('E1', 'Ann', '2024-01-01', 'Engineer', '', 'Tech', 'ann@x.io', '', '', '', '')
+    assert [r[2] for r in db.get_employees_page(search='tech')[0]] == ['Ann']
+
+    for name, company in [('Cy', 'Initech'), ('Bo', 'Acme'), ('Al', 'Acme')]:
+        db.add_visitor(name, '', '', f'{name.lower()}@mail.com', company, '')
+    rows, _ = _walk(db.get_visitors_page, limit=1, search='acme')
+    assert [r[1] for r in rows] == ['Al', 'Bo']
+    assert [r[1] for r in db.get_visitors_page(search='cy')[0]] == ['Cy']
+
+
+# === FULL-TEXT SEARCH TESTS ===
+
+def test_inventory_search_prefix_and_rank(db):
+    """Test word-prefix matching with name hits ranked above description hits."""
+    db.add_inventory_item('Blue Pen', 1, 0, 1.0, 2.0, 'ballpoint')
+    db.add_inventory_item('Notebook', 1, 0, 1.0, 2.0, 'lined, pairs well with a pen')
+    db.add_inventory_item('Stapler', 1, 0, 1.0, 2.0, '')
+    assert [r[0] for r in db.search_inventory('pe')] == ['Blue Pen', 'Notebook']
+    assert [r[0] for r in db.search_inventory('blue pe')] == ['Blue Pen']
+    assert len(db.search_inventory('')) == 3
+
+
+def test_search_index_follows_writes(db):
+    """Test triggers keep the index in sync on update and delete."""
+    db.add_inventory_item('Widget', 1, 0, 1.0, 2.0, '')
+    db.update_inventory_item('Widget', description='sprocket')
+    assert [r[0] for r in db.search_inventory('sprock')] == ['Widget']
+    db.delete_inventory_item('Widget')
+    assert db.search_inventory('sprock') == []
+
+    db.add_visitor('Ada Lovelace', '', '555-0100', 'ada@example.com', '', '')
+    visitor_id = db.search_visitors('ada')[0][0]
+    db.update_visitor(visitor_id, name='Grace Hopper')
+    assert db.search_visitors('lovelace') == []
+    assert [r[1] for r in db.search_visitors('hop')] == ['Grace Hopper']
+
+
+def test_contact_search_uses_fts(db):
+    """Test contact search and its paginated form both match via the index."""
+    db.add_crm_contact('Sam Smith', company='Acme')
+    db.add_crm_contact('Alex Acme')
+    db.add_crm_contact('Jo Other')
+    assert [r[1] for r in db.get_crm_contacts(search='acme')] == ['Alex Acme', 'Sam Smith']
+    rows, _ = db.get_crm_contacts_page(search='acm')
+    assert [r[1] for r in rows] == ['Alex Acme', 'Sam Smith']
+    plan = _captured_plan(db, lambda: db.get_crm_contacts(search='acme'), table='crm_contacts_fts')
+    assert 'VIRTUAL TABLE INDEX' in plan
+
+
+def test_search_falls_back_to_like(db):
+    """Test substring LIKE search is used when FTS5 is unavailable."""
+    db.add_inventory_item('Blue Pen', 1, 0, 1.0, 2.0, '')
+    db.fts_enabled = False
+    assert [r[0] for r in db.search_inventory('ue p')] == ['Blue Pen']
+
+
+def test_stale_index_rebuilt_on_open(tmp_path):
+    """Test an index whose triggers were dropped is rebuilt when reopened."""
+    path = str(tmp_path / "stale.db")
+    adapter = SQLiteAdapter(path)
+    with adapter._get_conn() as (conn, cursor):
+        for suffix in ('ai', 'ad', 'au'):
+            cursor.execute(f'DROP TRIGGER trg_inventory_fts_{suffix}')
+    adapter.add_inventory_item('Orphan', 1, 0, 1.0, 2.0, '')
+    adapter.close()
+    reopened = SQLiteAdapter(path)
+    assert [r[0] for r in reopened.search_inventory('orph')] == ['Orphan']
+    reopened.close()
+
+
+# === SCHEMA MIGRATION TESTS ===
+
+def test_new_database_is_at_latest_version(db):
+    """Test a new database records every migration and reopening applies none."""
+    assert db.get_schema_version() == MIGRATIONS[-1].version
+    with db._get_conn() as (conn, cursor):
+        assert migrate(conn, MIGRATIONS) == []
+
+
+def test_pending_migrations_apply_once_in_order(db):
+    """Test new migrations (functions or SQL text) run once, in version order."""
+    latest = db.get_schema_version()
+    extra = [
+        Migration(latest + 2, 'add_notes', "-- comment\nALTER TABLE widgets ADD COLUMN notes TEXT;\n"),
+        Migration(latest + 1, 'widgets', lambda cursor: cursor.execute('CREATE TABLE widgets (id INTEGER)')),
+    ]
+    with db._get_conn() as (conn, cursor):
+        assert migrate(conn, MIGRATIONS + extra) == [latest + 1, latest + 2]
+        assert migrate(conn, MIGRATIONS + extra) == []
+        cursor.execute('PRAGMA table_info(widgets)')
+        assert [row[1] for row in cursor.fetchall()] == ['id', 'notes']
+    assert db.get_schema_version() == latest + 2
+
+
+def test_failed_migration_rolls_back_the_whole_upgrade(db):
+    """Test an error leaves neither the schema nor schema_version changed."""
+    latest = db.get_schema_version()
+    extra = [
+        Migration(latest + 1, 'widgets', 'CREATE TABLE widgets (id INTEGER);'),
+        Migration(latest + 2, 'broken', 'ALTER TABLE no_such_table ADD COLUMN x TEXT;'),
+    ]
+    with db._get_conn() as (conn, cursor):
+        with pytest.raises(sqlite3.OperationalError):
+            migrate(conn, MIGRATIONS + extra)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'widgets'")
+        assert cursor.fetchone() is None
+    assert db.get_schema_version() == latest
+
+
+def test_postgres_sql_migrations_are_versioned_files():
+    """Test the numbered SQL files load in order and can be stamped as applied."""
+    files = load_sql_migrations()
+    assert [(m.version, m.name) for m in files] == [(1, 'payroll_phase1'), (2, 'leave_balances')]
+    conn = sqlite3.connect(':memory:')
+    assert stamp(conn, files, 1, table=SQL_MIGRATIONS_TABLE) == [1]
+    assert current_version(conn, SQL_MIGRATIONS_TABLE) == 1 and current_version(conn) == 0
+    conn.close()